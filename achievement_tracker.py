@@ -8,22 +8,72 @@ Usage:
     from core.achievement_tracker import check_achievements
     newly_unlocked = check_achievements(party)
     # Returns list of achievement dicts for newly earned achievements
+
+Only achievements marked dirty by one of their declared flags/events
+(see achievements.py) are re-evaluated; everything is dirty after a
+new game or load.
 """
 
 from achievements import ACHIEVEMENTS
+from core import events
 from core.story_flags import get_flag, set_flag
 
 
+# ═══════════════════════════════════════════════════════════════
+#  DEPENDENCY INDEX
+# ═══════════════════════════════════════════════════════════════
+
+_by_flag_head = {}   # "boss_defeated" → [ach_id, ...]
+_by_event = {}       # "level_up" → [ach_id, ...]
+_always = []         # achievements with no declared dependencies
+_dirty = set(ACHIEVEMENTS)
+
+for _ach_id, _ach in ACHIEVEMENTS.items():
+    for _head in _ach.get("flags", ()):
+        _by_flag_head.setdefault(_head, []).append(_ach_id)
+    for _ev in _ach.get("events", ()):
+        _by_event.setdefault(_ev, []).append(_ach_id)
+    if not _ach.get("flags") and not _ach.get("events"):
+        _always.append(_ach_id)
+
+
+def _on_flag_set(key, value=None):
+    ids = _by_flag_head.get(key.split(".", 1)[0])
+    if ids:
+        _dirty.update(ids)
+
+
+def _on_flags_reset():
+    _dirty.update(ACHIEVEMENTS)
+
+
+def _mark_event(event):
+    ids = _by_event[event]
+    def _handler(**_payload):
+        _dirty.update(ids)
+    return _handler
+
+
+events.subscribe(events.FLAG_SET, _on_flag_set)
+events.subscribe(events.FLAGS_RESET, _on_flags_reset)
+for _ev in _by_event:
+    events.subscribe(_ev, _mark_event(_ev))
+
+
 def check_achievements(party) -> list:
-    """Check all achievements and return list of newly unlocked ones.
+    """Check dirty achievements and return list of newly unlocked ones.
 
     Call this after combat, after quest completion, and on town entry.
     """
     # Import _flags fresh each call — reset() creates a new dict object,
     # so a module-level reference becomes stale after any reset.
     from core.story_flags import _flags as current_flags
+    pending = _dirty | set(_always)
+    _dirty.clear()
     newly = []
     for ach_id, ach in ACHIEVEMENTS.items():
+        if ach_id not in pending:
+            continue
         flag_key = f"achievement.unlocked.{ach_id}"
         if get_flag(flag_key):
             continue  # already earned
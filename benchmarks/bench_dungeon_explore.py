@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Realm of Shadows — Dungeon auto-explore benchmark
+
+Auto-explores the first floor of every dungeon (clearing whatever stops
+the walk: enemies are killed, traps disarmed, chests opened) and times
+the planning side of it two ways:
+
+  incremental  — AutoWalk as shipped: the frontier is refreshed in the
+                 sight window after each step, paths are reused until the
+                 target leaves the frontier
+  rescan       — the frontier rebuilt from the whole floor and a fresh
+                 BFS before every step
+
+DungeonState.move is excluded from both columns (it is the same work
+either way). Both runs must visit the same number of tiles.
+
+Run:  python3 benchmarks/bench_dungeon_explore.py [--seed 5]
+"""
+import os
+import sys
+import time
+import random
+import argparse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from data.dungeon import DUNGEONS, DungeonState
+import data.dungeon_explore as explore
+
+
+def _clear(ds, event):
+    fl = ds.get_current_floor_data()
+    if event["type"] == "random_encounter":
+        for e in fl["enemies"]:
+            if (e["x"], e["y"]) == ds._last_contact_enemy:
+                e["state"] = "dead"
+    elif event["type"] == "trap":
+        event["data"]["disarmed"] = True
+    elif event["type"] == "chest_approach":
+        event["data"]["opened"] = True
+    elif event["type"] == "interactable":
+        event["data"]["used"] = True
+
+
+def run(dungeon_id, seed, rescan):
+    """Explore floor 1; returns (planning seconds, steps, walks)."""
+    random.seed(seed)
+    ds = DungeonState(dungeon_id, [])
+    real_move = ds.move
+    moving = [0.0]
+
+    def timed_move(dx, dy):
+        t0 = time.perf_counter()
+        try:
+            return real_move(dx, dy)
+        finally:
+            moving[0] += time.perf_counter() - t0
+    ds.move = timed_move
+
+    steps = walks = 0
+    t0 = time.perf_counter()
+    for _ in range(500):
+        walk = explore.AutoWalk(ds, "explore")
+        walks += 1
+        while walk.active:
+            if rescan:
+                walk.frontier = explore.ExploreFrontier(ds.get_current_floor_data())
+                walk._path.clear()
+            event = walk.step()
+            if event:
+                _clear(ds, event)
+        steps += walk.steps_taken
+        if walk.status == "explored":
+            break
+    return time.perf_counter() - t0 - moving[0], steps, walks
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    ap.add_argument("--seed", type=int, default=5)
+    args = ap.parse_args()
+
+    print(f"{'dungeon':<22}{'walks':>7}{'steps':>7}{'incremental ms':>16}{'rescan ms':>11}{'speedup':>9}")
+    tot_inc = tot_full = 0.0
+    for dungeon_id in DUNGEONS:
+        inc, steps, walks = run(dungeon_id, args.seed, rescan=False)
+        full, steps_full, _ = run(dungeon_id, args.seed, rescan=True)
+        if steps != steps_full:
+            raise SystemExit(f"{dungeon_id}: explored {steps} vs {steps_full} steps")
+        tot_inc += inc
+        tot_full += full
+        print(f"{dungeon_id:<22}{walks:>7}{steps:>7}{inc * 1000:>16.1f}{full * 1000:>11.1f}"
+              f"{full / max(inc, 1e-9):>8.1f}x")
+    print(f"{'TOTAL':<36}{tot_inc * 1000:>16.1f}{tot_full * 1000:>11.1f}"
+          f"{tot_full / max(tot_inc, 1e-9):>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Realm of Shadows — Dungeon floor cache memory benchmark
+
+Scripted full-campaign traversal: every dungeon is entered in order, each
+floor is walked for a while (fog cleared, chests opened, enemies killed)
+and the party descends to the bottom. Every DungeonState is kept in a
+dungeon_cache dict exactly like main.py does for the whole session.
+
+Runs the traversal twice — with the floor cache unbounded (old behaviour)
+and with the default MAX_RESIDENT_FLOORS — and reports tracemalloc
+current/peak memory plus a save round-trip check.
+
+Run:  python3 benchmarks/bench_dungeon_memory.py [--steps N]
+"""
+import os
+import sys
+import random
+import argparse
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import data.dungeon as dungeon
+from data.dungeon import DungeonState, DUNGEONS
+
+
+def _play_floor(ds, rng, steps):
+    """Random-walk the current floor and leave some marks on it."""
+    for _ in range(steps):
+        dx, dy = rng.choice(((1, 0), (-1, 0), (0, 1), (0, -1)))
+        ds.move(dx, dy)
+    floor = ds.floors[ds.current_floor]
+    for row in floor["tiles"]:
+        for tile in row:
+            ev = tile.get("event")
+            if ev and ev.get("type") == "treasure" and rng.random() < 0.5:
+                ev["opened"] = True
+    for e in floor.get("enemies", [])[::2]:
+        e["state"] = "dead"
+
+
+def traverse(steps, budget):
+    dungeon.MAX_RESIDENT_FLOORS = budget
+    dungeon.PREFETCH_FLOORS = False        # keep the measurement single-threaded
+    dungeon._resident.clear()
+    rng = random.Random(1234)
+    random.seed(1234)
+    dungeon_cache = {}
+    tracemalloc.start()
+    for dungeon_id in DUNGEONS:
+        ds = DungeonState(dungeon_id, [])
+        dungeon_cache[dungeon_id] = ds
+        while True:
+            _play_floor(ds, rng, steps)
+            if not ds.go_downstairs():
+                break
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return dungeon_cache, current, peak
+
+
+def _snapshot(cache):
+    from core.save_load import _serialize_dungeon_explored
+    return _serialize_dungeon_explored(cache)
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    ap.add_argument("--steps", type=int, default=300, help="steps walked per floor")
+    args = ap.parse_args()
+
+    n_floors = sum(d["floors"] for d in DUNGEONS.values())
+    print(f"Traversal: {len(DUNGEONS)} dungeons, {n_floors} floors, "
+          f"{args.steps} steps/floor\n")
+
+    default_budget = dungeon.MAX_RESIDENT_FLOORS
+    rows = []
+    saves = {}
+    for label, budget in (("unbounded", 10 ** 6), (f"LRU {default_budget}", default_budget)):
+        cache, current, peak = traverse(args.steps, budget)
+        saves[label] = _snapshot(cache)
+        rows.append((label, dungeon.resident_floor_count(), current, peak))
+        del cache
+
+    print(f"{'policy':<12} {'resident':>8} {'current MB':>11} {'peak MB':>9}")
+    for label, resident, current, peak in rows:
+        print(f"{label:<12} {resident:>8} {current / 1e6:>11.2f} {peak / 1e6:>9.2f}")
+    saved = rows[0][2] - rows[1][2]
+    print(f"\nRetained memory saved: {saved / 1e6:.2f} MB "
+          f"({100 * saved / max(1, rows[0][2]):.0f}%)")
+    a, b = saves.values()
+    print("Save data identical with eviction:", a == b)
+    dungeon.MAX_RESIDENT_FLOORS = default_budget
+
+
+if __name__ == "__main__":
+    main()
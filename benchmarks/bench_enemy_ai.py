@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Realm of Shadows — Enemy AI decision benchmark
+
+Builds large synthetic encounters (a mix of aggressive, tactical, support,
+caster and boss enemies against a full party) and times enemy_choose_action
+for every enemy of a round:
+
+  per-call  — each decision rebuilds living lists and threat scores
+              (ctx=None, the old behaviour)
+  shared    — one AIContext per round, as CombatState uses it
+
+Both runs start from the same RNG state and must pick the same actions and
+targets; the script aborts if they ever diverge. A seeded full fight is
+also timed through CombatState.execute_enemy_turn.
+
+Run:  python3 benchmarks/bench_enemy_ai.py [--enemies 10 20 40] [--rounds N]
+"""
+import os
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.character import Character
+from core.combat_engine import CombatState, AIContext, enemy_choose_action
+from core.combat_config import FRONT, MID, BACK
+from data.enemies import ENEMIES, ENCOUNTERS
+
+MIX = ["Goblin Warrior", "Goblin Archer", "Bandit", "Wolf", "Bandit Captain",
+       "Mercenary Monk", "Mercenary War-Cleric", "High Cultist", "Orc Chieftain"]
+PARTY = (("Aldric", "Fighter", FRONT), ("Brom", "Knight", FRONT),
+         ("Sera", "Cleric", MID), ("Vex", "Thief", MID),
+         ("Ilsa", "Mage", BACK), ("Rook", "Ranger", BACK))
+
+
+def _register_encounter(n):
+    key = f"_bench_ai_{n}"
+    groups = []
+    rows = (FRONT, MID, BACK)
+    for i in range(n):
+        name = MIX[i % len(MIX)]
+        if name in ENEMIES:
+            groups.append({"enemy": name, "count": 1, "row": rows[i % 3]})
+    ENCOUNTERS[key] = {"name": f"Benchmark horde ({n})", "groups": groups}
+    return key
+
+
+def _party():
+    party = []
+    for name, cls, _row in PARTY:
+        c = Character(name, cls)
+        c.finalize_with_class(cls)
+        party.append(c)
+    return party
+
+
+def _decide_round(cs, shared):
+    """One decision per living enemy; returns the (action, target) trail."""
+    trail = []
+    ctx = AIContext(cs.players, cs.enemies) if shared else None
+    for e in cs.enemies:
+        if not e["alive"]:
+            continue
+        action, target, _ab = enemy_choose_action(e, cs.players, cs.enemies, ctx)
+        trail.append((action, id(target) if isinstance(target, dict) else
+                      tuple(map(id, target)) if isinstance(target, list) else target))
+    return trail
+
+
+def bench_decisions(n, rounds):
+    cs = CombatState(_party(), _register_encounter(n), seed=7)
+    for p, (_n, _c, row) in zip(cs.players, PARTY):
+        p["row"] = row
+    # Wound the party a little so finish bonuses and heals come into play
+    rng = random.Random(3)
+    for p in cs.players:
+        p["hp"] = max(1, int(p["max_hp"] * rng.uniform(0.2, 1.0)))
+    for e in cs.enemies[::3]:
+        e["hp"] = max(1, e["max_hp"] // 3)
+
+    timings = {}
+    trails = {}
+    for shared in (False, True):
+        random.seed(1234)
+        t0 = time.perf_counter()
+        trail = []
+        for _ in range(rounds):
+            trail.extend(_decide_round(cs, shared))
+        timings[shared] = time.perf_counter() - t0
+        trails[shared] = trail
+    if trails[False] != trails[True]:
+        raise SystemExit(f"decisions diverged with {n} enemies")
+    return timings[False], timings[True], len(trails[True])
+
+
+def bench_fight(n, max_actions=2000):
+    cs = CombatState(_party(), _register_encounter(n), seed=11)
+    t_enemy = 0.0
+    turns = 0
+    for _ in range(max_actions):
+        if cs.phase in ("victory", "defeat", "fled"):
+            break
+        actor = cs.get_current_combatant()
+        if actor is None:
+            break
+        if actor["type"] == "player":
+            tgt = next((e for e in cs.enemies if e["alive"]), None)
+            cs.execute_player_action("attack", target=tgt)
+        else:
+            t0 = time.perf_counter()
+            cs.execute_enemy_turn()
+            t_enemy += time.perf_counter() - t0
+            turns += 1
+    return turns, t_enemy, cs.round_num, cs.phase
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    ap.add_argument("--enemies", type=int, nargs="+", default=[10, 20, 40])
+    ap.add_argument("--rounds", type=int, default=200)
+    args = ap.parse_args()
+
+    print(f"{'enemies':>8} {'decisions':>10} {'per-call ms':>12} {'shared ms':>10} {'speedup':>8}")
+    for n in args.enemies:
+        old, new, count = bench_decisions(n, args.rounds)
+        print(f"{n:>8} {count:>10} {old * 1000:>12.1f} {new * 1000:>10.1f} "
+              f"{old / max(new, 1e-9):>7.2f}x")
+
+    print()
+    print(f"{'enemies':>8} {'enemy turns':>12} {'ms/turn':>8} {'rounds':>7}  result")
+    for n in args.enemies:
+        turns, t, rounds, phase = bench_fight(n)
+        print(f"{n:>8} {turns:>12} {t * 1000 / max(turns, 1):>8.3f} {rounds:>7}  {phase}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,437 @@
+#!/usr/bin/env python3
+"""
+Realm of Shadows — Headless frame benchmark
+
+Boots the real Game with SDL's dummy video/audio drivers, loads a fixture
+save and plays scripted input through Game.on_event (via the pygame event
+queue), frame by frame:
+
+  overworld   — 200 steps on the world map
+  dungeon     — walk and explore Goblin Warren floor 1
+  combat      — 10 rounds of a fight (party attacks the first living enemy)
+  shop_inv    — browse a town shop, then the inventory screen
+
+Each frame is split into Game._frame_update (timers, input) and
+Game._frame_draw (render + flip) and timed separately. Allocated blocks
+per frame (sys.getallocatedblocks delta) and peak RSS are recorded. The
+clock is replaced with a fixed 16 ms step so every run plays the same
+frames and results can be compared between commits.
+
+Run:  python3 benchmarks/bench_headless.py [-o report.json] [--compare old.json]
+      python3 benchmarks/bench_headless.py --make-fixture   # rebuild the save
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import tempfile
+import subprocess
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+FIXTURE = os.path.join(ROOT, "benchmarks", "fixtures", "bench_save.json")
+FIXTURE_SLOT = "bench_fixture"
+FRAME_MS = 16
+
+try:
+    import resource
+except ImportError:          # Windows
+    resource = None
+
+
+def _peak_rss_kb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak   # macOS: bytes
+
+
+def _git_rev():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                              capture_output=True, text=True).stdout.strip() or None
+    except Exception:
+        return None
+
+
+# ═══════════════════════════════════════════════════════════════
+#  FIXTURE SAVE
+# ═══════════════════════════════════════════════════════════════
+
+def make_fixture():
+    """Write a deterministic level-5 party + world save to FIXTURE."""
+    import core.save_load as sl
+    from core.character import Character
+    from core.progression import apply_level_up, xp_for_level
+    from data.world_map import WorldState
+
+    random.seed(2024)
+    names = ["Aldric", "Lyra", "Sera", "Kael", "Wren", "Zhen"]
+    classes = ["Fighter", "Mage", "Cleric", "Thief", "Ranger", "Monk"]
+    races = ["Human", "Elf", "Dwarf", "Halfling", "Gnome", "Half-Orc"]
+    party = []
+    for name, cls, race in zip(names, classes, races):
+        c = Character(name, race_name=race)
+        c.quick_roll(cls)
+        for lvl in range(2, 6):
+            c.xp = max(c.xp, xp_for_level(lvl))
+            apply_level_up(c)
+        c.gold = 500
+        party.append(c)
+    ws = WorldState(party)
+
+    tmp = tempfile.mkdtemp()
+    old_dir, sl.SAVE_DIR = sl.SAVE_DIR, tmp
+    try:
+        ok, path, msg = sl.save_game(party, world_state=ws, slot_name=FIXTURE_SLOT)
+        if not ok:
+            raise SystemExit(msg)
+        with open(path) as f:
+            data = json.load(f)
+    finally:
+        sl.SAVE_DIR = old_dir
+    data["timestamp"] = "2024-01-01T00:00:00"
+    know = data.get("knowledge", {})
+    if isinstance(know.get("identified_items"), list):     # saved from a set
+        know["identified_items"].sort()
+    os.makedirs(os.path.dirname(FIXTURE), exist_ok=True)
+    with open(FIXTURE, "w") as f:
+        json.dump(data, f, indent=1, sort_keys=True)
+    print(f"fixture written: {os.path.relpath(FIXTURE, ROOT)}")
+
+
+# ═══════════════════════════════════════════════════════════════
+#  GAME BOOT
+# ═══════════════════════════════════════════════════════════════
+
+_cursor = [0, 0]     # virtual mouse position (see boot_game)
+
+
+class FixedClock:
+    """Stands in for pygame.time.Clock: every frame lasts FRAME_MS."""
+
+    def tick(self, *_fps):
+        return FRAME_MS
+
+    def get_time(self):
+        return FRAME_MS
+
+    def get_fps(self):
+        return 1000.0 / FRAME_MS
+
+
+def boot_game(save_dir):
+    """Create Game and apply the fixture save like the load screen does."""
+    import core.save_load as sl
+    sl.SAVE_DIR = save_dir           # never touch the player's real saves
+    with open(FIXTURE) as f:
+        data = json.load(f)
+    with open(os.path.join(save_dir, f"{FIXTURE_SLOT}.json"), "w") as f:
+        json.dump(data, f)
+
+    import pygame
+    import main
+    main.IDLE_WAIT_MS = 1            # idle frames must not sleep the benchmark
+    # The dummy video driver has no real pointer: hover follows posted motion
+    pygame.mouse.get_pos = lambda: tuple(_cursor)
+    game = main.Game()
+    game.clock = FixedClock()
+    ok, party, world_state, msg, *_rest = sl.load_game(FIXTURE_SLOT)
+    if not ok:
+        raise SystemExit(f"fixture failed to load: {msg}")
+    game.party = party
+    game.char_index = main.PARTY_SIZE
+    game.world_state = world_state
+    game.world_state.party = party
+    game._init_world_map()
+    game.fade = 0
+    game.go(main.S_WORLD_MAP)
+    return main, game
+
+
+# ═══════════════════════════════════════════════════════════════
+#  FRAME RECORDER
+# ═══════════════════════════════════════════════════════════════
+
+class Recorder:
+    def __init__(self, game):
+        self.game = game
+        self.update_ms = []
+        self.draw_ms = []
+        self.alloc_blocks = []
+        self.skipped0 = game.frames_skipped
+
+    def frame(self, events=()):
+        import pygame
+        for ev in events:
+            if ev.type == pygame.MOUSEMOTION:
+                _cursor[:] = ev.pos
+            pygame.event.post(ev)
+        blocks0 = sys.getallocatedblocks()
+        t0 = time.perf_counter()
+        frame = self.game._frame_update()
+        t1 = time.perf_counter()
+        if frame is None:
+            raise SystemExit("game quit or crashed during benchmark")
+        if not self.game._frame_draw(*frame):
+            raise SystemExit("game crashed while drawing")
+        t2 = time.perf_counter()
+        self.update_ms.append((t1 - t0) * 1000)
+        self.draw_ms.append((t2 - t1) * 1000)
+        self.alloc_blocks.append(sys.getallocatedblocks() - blocks0)
+
+    def frames(self, n, events=()):
+        self.frame(events)
+        for _ in range(n - 1):
+            self.frame()
+
+    def report(self, raw=False):
+        def stats(xs):
+            if not xs:
+                return {}
+            s = sorted(xs)
+            return {"mean": round(sum(s) / len(s), 4),
+                    "p50": round(s[len(s) // 2], 4),
+                    "p95": round(s[min(len(s) - 1, int(len(s) * 0.95))], 4),
+                    "max": round(s[-1], 4)}
+        out = {
+            "frames": len(self.update_ms),
+            "frames_skipped": self.game.frames_skipped - self.skipped0,
+            "update_ms": stats(self.update_ms),
+            "draw_ms": stats(self.draw_ms),
+            "alloc_blocks": {"mean": round(sum(self.alloc_blocks) / max(1, len(self.alloc_blocks)), 1),
+                             "max": max(self.alloc_blocks, default=0),
+                             "net": sum(self.alloc_blocks)},
+            "peak_rss_kb": _peak_rss_kb(),
+        }
+        if raw:
+            out["raw"] = {"update_ms": self.update_ms, "draw_ms": self.draw_ms,
+                          "alloc_blocks": self.alloc_blocks}
+        return out
+
+
+def _key(pygame, key, up=False):
+    return pygame.event.Event(pygame.KEYUP if up else pygame.KEYDOWN,
+                              key=key, mod=0, unicode="", scancode=0)
+
+
+def _motion(pygame, x, y):
+    return pygame.event.Event(pygame.MOUSEMOTION, pos=(x, y), rel=(0, 0), buttons=(0, 0, 0))
+
+
+def _wheel(pygame, x, y, button):
+    return pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=(x, y), button=button)
+
+
+def _back_to(main, game, state, reenter=None):
+    """Undo anything a scripted step triggered (encounter, chest, dialogue,
+    walking out of a dungeon). reenter() rebuilds the scenario's screen
+    objects the step may have torn down (e.g. dungeon_ui on leaving)."""
+    if game.state != state:
+        game.combat_state = None
+        game.dialogue_ui = None
+        game.chest_ui = None
+        if reenter is not None:
+            reenter()
+        game.state = state
+        game._transition = None
+        return True
+    return False
+
+
+def dungeon_reenter(main, game, ds):
+    """reenter callback for _back_to: put the party back inside ds."""
+    from ui.dungeon_ui import DungeonUI
+
+    def reenter():
+        if game.dungeon_state is not ds or game.dungeon_ui is None:
+            game.dungeon_state = ds
+            game.dungeon_ui = DungeonUI(ds)
+        game.pre_dungeon_state = main.S_WORLD_MAP
+    return reenter
+
+
+# ═══════════════════════════════════════════════════════════════
+#  SCENARIOS
+# ═══════════════════════════════════════════════════════════════
+
+def scenario_overworld(main, game, rec, steps=200):
+    import pygame
+    rng = random.Random(1)
+    dirs = [pygame.K_RIGHT, pygame.K_DOWN, pygame.K_LEFT, pygame.K_UP]
+    heading = 0
+    interrupted = 0
+    _back_to(main, game, main.S_WORLD_MAP)
+    for _ in range(steps):
+        if rng.random() < 0.2:
+            heading = rng.randrange(4)
+        rec.frames(3, [_key(pygame, dirs[heading]), _key(pygame, dirs[heading], up=True)])
+        interrupted += _back_to(main, game, main.S_WORLD_MAP)
+    return {"steps": steps, "interrupted": interrupted}
+
+
+def scenario_dungeon(main, game, rec, steps=150):
+    import pygame
+    from data.dungeon import DungeonState
+    from ui.dungeon_ui import DungeonUI
+    ds = DungeonState("goblin_warren", game.party)
+    game.dungeon_state = ds
+    game.dungeon_cache["goblin_warren"] = ds
+    game.dungeon_ui = DungeonUI(ds)
+    game.pre_dungeon_state = main.S_WORLD_MAP
+    game.go(main.S_DUNGEON)
+    game.fade = 0
+    rng = random.Random(2)
+    dirs = [pygame.K_RIGHT, pygame.K_DOWN, pygame.K_LEFT, pygame.K_UP]
+    heading = 0
+    interrupted = 0
+    reenter = dungeon_reenter(main, game, ds)
+    for _ in range(steps):
+        if rng.random() < 0.25:
+            heading = rng.randrange(4)
+        rec.frames(4, [_key(pygame, dirs[heading])])
+        rec.frame([_key(pygame, dirs[heading], up=True)])
+        interrupted += _back_to(main, game, main.S_DUNGEON, reenter)
+    floor = ds.floors[ds.current_floor]
+    seen = sum(1 for row in floor["tiles"] for t in row if t.get("discovered"))
+    return {"steps": steps, "interrupted": interrupted, "tiles_discovered": seen}
+
+
+def scenario_combat(main, game, rec, rounds=10, encounter="easy_goblins"):
+    from core.classes import get_all_resources
+    fights = 0
+    played = 0
+    while played < rounds:
+        for c in game.party:       # fresh party for every fight
+            c.resources.update(get_all_resources(c.class_name, c.stats, c.level))
+        game.start_combat(encounter)
+        game.fade = 0
+        fights += 1
+        cs = game.combat_state
+        start = cs.round_num
+        for _ in range(5000):
+            if cs.phase in ("victory", "defeat", "fled") or played + cs.round_num - start >= rounds:
+                break
+            if cs.is_player_turn():
+                tgt = next((e for e in cs.enemies if e["alive"]), None)
+                game.process_combat_action({"type": "attack", "target": tgt})
+            rec.frame()
+        played += max(1, cs.round_num - start)
+    _back_to(main, game, main.S_WORLD_MAP)
+    return {"rounds": played, "fights": fights}
+
+
+def scenario_shop_inventory(main, game, rec):
+    import pygame
+    from ui.town_ui import TownUI
+    from ui.inventory_ui import InventoryUI
+    from ui.renderer import SCREEN_W, SCREEN_H
+    game.town_ui = TownUI(game.party, town_id="briarhollow")
+    game.town_ui.view = game.town_ui.VIEW_SHOP_BUY
+    game.town_ui.shop_scroll = 0
+    game.go(main.S_TOWN)
+    game.fade = 0
+    rec.frames(10)
+    for y in range(80, SCREEN_H - 80, 24):          # hover down the item list
+        rec.frame([_motion(pygame, SCREEN_W // 3, y)])
+    for button in (5, 5, 5, 4, 4, 4):               # scroll the list
+        rec.frames(3, [_wheel(pygame, SCREEN_W // 3, SCREEN_H // 2, button)])
+    rec.frames(30)                                   # idle on a static list
+
+    game.inventory_ui = InventoryUI(game.party)
+    game.inventory_return_state = main.S_WORLD_MAP
+    game.go(main.S_INVENTORY)
+    game.fade = 0
+    rec.frames(10)
+    for y in range(120, SCREEN_H - 60, 30):
+        for x in range(60, SCREEN_W - 60, 160):
+            rec.frame([_motion(pygame, x, y)])
+    rec.frames(30)
+    _back_to(main, game, main.S_WORLD_MAP)
+    return {}
+
+
+SCENARIOS = {
+    "overworld": scenario_overworld,
+    "dungeon":   scenario_dungeon,
+    "combat":    scenario_combat,
+    "shop_inv":  scenario_shop_inventory,
+}
+
+
+# ═══════════════════════════════════════════════════════════════
+#  REPORT
+# ═══════════════════════════════════════════════════════════════
+
+def compare(old, new):
+    print(f"\n{'scenario':<11} {'metric':<13} {'old':>9} {'new':>9} {'change':>8}")
+    for name, cur in new["scenarios"].items():
+        prev = old.get("scenarios", {}).get(name)
+        if not prev:
+            continue
+        for metric in ("update_ms", "draw_ms"):
+            a, b = prev[metric].get("mean"), cur[metric].get("mean")
+            if a and b:
+                print(f"{name:<11} {metric + ' mean':<13} {a:>9.3f} {b:>9.3f} {(b - a) / a * 100:>+7.1f}%")
+        a, b = prev["alloc_blocks"]["mean"], cur["alloc_blocks"]["mean"]
+        print(f"{name:<11} {'alloc/frame':<13} {a:>9.1f} {b:>9.1f}")
+
+
+def main_cli():
+    ap = argparse.ArgumentParser(description="Headless frame benchmark")
+    ap.add_argument("-o", "--output", default="bench_report.json")
+    ap.add_argument("--scenario", choices=sorted(SCENARIOS), action="append",
+                    help="run only these scenarios (default: all)")
+    ap.add_argument("--raw", action="store_true", help="include per-frame arrays")
+    ap.add_argument("--compare", metavar="OLD_JSON", help="print deltas against a report")
+    ap.add_argument("--make-fixture", action="store_true")
+    args = ap.parse_args()
+
+    if args.make_fixture:
+        make_fixture()
+        return
+
+    import pygame
+    save_dir = tempfile.mkdtemp(prefix="ros_bench_")
+    main, game = boot_game(save_dir)
+    random.seed(0)
+
+    report = {
+        "commit": _git_rev(),
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "frame_ms": FRAME_MS,
+        "scenarios": {},
+    }
+    print(f"{'scenario':<11} {'frames':>7} {'upd ms':>8} {'draw ms':>8} {'p95 draw':>9} "
+          f"{'alloc/f':>8} {'skipped':>8} {'rss MB':>7}")
+    for name in args.scenario or list(SCENARIOS):
+        rec = Recorder(game)
+        extra = SCENARIOS[name](main, game, rec)
+        res = rec.report(raw=args.raw)
+        res.update(extra or {})
+        report["scenarios"][name] = res
+        rss = res["peak_rss_kb"]
+        print(f"{name:<11} {res['frames']:>7} {res['update_ms']['mean']:>8.3f} "
+              f"{res['draw_ms']['mean']:>8.3f} {res['draw_ms']['p95']:>9.3f} "
+              f"{res['alloc_blocks']['mean']:>8.1f} {res['frames_skipped']:>8} "
+              f"{(rss or 0) / 1024:>7.1f}")
+
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nreport: {args.output}")
+    if args.compare:
+        with open(args.compare) as f:
+            compare(json.load(f), report)
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Realm of Shadows — Sound synthesis benchmark
+
+Times every generator in core.sound's _gen_batch1 queue and every
+on-demand music/ambience track (_TRACKS, formerly _gen_batch2), side by
+side:
+
+  list      — list-style helpers in pure Python (set_dsp_backend("list"))
+  array     — the same helpers on the numpy DSP layer (the default)
+  baseline  — optional: core/sound.py from another git revision
+              (--baseline REV), e.g. the commit before the DSP port
+
+pygame is not needed: _make_sound is replaced by a converter that copies
+the samples into a 16-bit buffer, as pygame.mixer.Sound(buffer=...) does,
+so the list → buffer cost is still counted.
+
+The golden fingerprints used by the test suite cover every generated
+sound: the list-helper sounds are written from the list backend (the
+reference implementation), the numpy-only generators (hit/miss/cast/buff/
+debuff, music, biomes) are marked "numpy" and written as they render.
+
+Run:  python3 benchmarks/bench_sound_dsp.py [--repeat N] [--baseline REV]
+      python3 benchmarks/bench_sound_dsp.py --write-golden
+"""
+import os
+import sys
+import json
+import math
+import time
+import array
+import types
+import argparse
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import core.sound as snd
+
+GOLDEN = os.path.join(ROOT, "tests", "fixtures", "sound_golden.json")
+GOLDEN_BINS = 64
+
+
+def _to_buffer(samples):
+    if snd._HAS_NUMPY and isinstance(samples, snd._np.ndarray):
+        return snd._np.clip(samples, -32767, 32767).astype(snd._np.int16).tobytes()
+    return array.array('h', samples).tobytes()
+
+
+def _load_baseline(rev):
+    src = subprocess.run(["git", "show", f"{rev}:core/sound.py"], cwd=ROOT,
+                         capture_output=True, text=True, check=True).stdout
+    mod = types.ModuleType(f"sound_{rev}")
+    mod.__file__ = os.path.join(ROOT, "core", "sound.py")
+    exec(compile(src, mod.__file__, "exec"), mod.__dict__)
+    return mod
+
+
+def _best_ms(fn, repeat):
+    best = math.inf
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        try:
+            fn()
+        except Exception:
+            return None
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000
+
+
+def _time_queues(mod, repeat):
+    """{(batch, label): best ms} for every generator of a sound module.
+    Music/ambience rows are keyed by sound name so revisions from before
+    the on-demand tracks (everything in _gen_batch2) line up."""
+    mod._make_sound = _to_buffer
+    mod._build_gen_queues()
+    out = {}
+    for label, fn in mod._gen_batch1:
+        out[("1", label)] = _best_ms(fn, repeat)
+    tracks = getattr(mod, "_TRACKS", None)
+    if tracks is not None:
+        for name, fn in tracks.items():
+            out[("2", name)] = _best_ms(lambda: mod._make_sound(fn()), repeat)
+    else:
+        for label, fn in mod._gen_batch2:
+            mod._sounds.clear()
+            t = _best_ms(fn, repeat)
+            out[("2", ",".join(sorted(mod._sounds)) or label)] = t
+    mod._sounds.clear()
+    return out
+
+
+# ═══════════════════════════════════════════════════════════════
+#  GOLDEN FINGERPRINTS
+# ═══════════════════════════════════════════════════════════════
+
+def _sum_squares(part):
+    if snd._HAS_NUMPY and isinstance(part, snd._np.ndarray):
+        return float((part.astype(snd._np.int64) ** 2).sum())
+    return sum(int(v) * int(v) for v in part)
+
+
+def fingerprint(samples, bins=GOLDEN_BINS):
+    """Length plus the RMS of each of `bins` equal slices of the sound."""
+    n = len(samples)
+    env = []
+    for b in range(bins):
+        lo, hi = n * b // bins, n * (b + 1) // bins
+        env.append(round(math.sqrt(_sum_squares(samples[lo:hi]) / (hi - lo)), 2)
+                   if hi > lo else 0.0)
+    return {"n": n, "rms": env}
+
+
+def render_named(mod, tracks=None):
+    """Run every _gen_batch1 generator plus the named _TRACKS (all of them
+    by default) and return {sound name: samples}. Aliases (hit_physical is
+    hit_medium ...) are left out."""
+    keep = mod._make_sound
+    mod._make_sound = lambda s: s
+    try:
+        mod._sounds.clear()
+        mod._build_gen_queues()
+        for _label, fn in mod._gen_batch1:
+            fn()
+        for name in (mod._TRACKS if tracks is None else tracks):
+            mod._sounds[name] = mod._TRACKS[name]()
+        out, seen = {}, set()
+        for k, v in mod._sounds.items():
+            if v is not None and id(v) not in seen:
+                seen.add(id(v))
+                out[k] = v
+        return out
+    finally:
+        mod._make_sound = keep
+        mod._sounds.clear()
+
+
+def write_golden():
+    if not snd._HAS_NUMPY:
+        sys.exit("--write-golden needs numpy/scipy: half of the sounds are numpy-only")
+    prev = snd.set_dsp_backend("list")
+    try:
+        named = render_named(snd)
+    finally:
+        snd.set_dsp_backend(prev)
+    # Under the list backend only the numpy-only generators return arrays
+    data = {}
+    for k, v in sorted(named.items()):
+        data[k] = fingerprint(v)
+        if not isinstance(v, list):
+            data[k]["numpy"] = True
+    os.makedirs(os.path.dirname(GOLDEN), exist_ok=True)
+    with open(GOLDEN, "w") as f:    # one sound per line keeps diffs readable
+        f.write("{\n" + ",\n".join(f"{json.dumps(k)}: {json.dumps(v)}"
+                                    for k, v in data.items()) + "\n}\n")
+    print(f"golden written: {os.path.relpath(GOLDEN, ROOT)} ({len(data)} sounds)")
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    ap.add_argument("--repeat", type=int, default=3, help="runs per generator (best is kept)")
+    ap.add_argument("--baseline", metavar="REV", help="also time core/sound.py at this git revision")
+    ap.add_argument("--write-golden", action="store_true", help="rewrite tests/fixtures/sound_golden.json")
+    args = ap.parse_args()
+
+    if args.write_golden:
+        write_golden()
+        return
+
+    cols = {}
+    if args.baseline:
+        cols["baseline"] = _time_queues(_load_baseline(args.baseline), args.repeat)
+    prev = snd.set_dsp_backend("list")
+    cols["list"] = _time_queues(snd, args.repeat)
+    if snd._HAS_NUMPY:
+        snd.set_dsp_backend("array")
+        cols["array"] = _time_queues(snd, args.repeat)
+    snd.set_dsp_backend(prev)
+    if not snd._HAS_NUMPY:
+        print("numpy/scipy not installed — array column unavailable, "
+              "music and biome generators are skipped by core.sound\n")
+
+    names = list(cols)
+    ref = "baseline" if "baseline" in cols else "list"
+    header = f"{'b':>1} {'generator':<26}" + "".join(f"{n + ' ms':>13}" for n in names)
+    if "array" in cols:
+        header += f"{'speedup':>9}"
+    print(header)
+    totals = dict.fromkeys(names, 0.0)
+    keys = list(cols["list"])
+    keys += [k for k in cols.get("baseline", {}) if k not in cols["list"]]
+    for key in keys:
+        row = f"{key[0]:>1} {key[1]:<26}"
+        for n in names:
+            ms = cols[n].get(key)
+            row += f"{ms:>13.1f}" if ms is not None else f"{'—':>13}"
+            totals[n] += ms or 0.0
+        if "array" in cols and cols[ref].get(key) and cols["array"].get(key):
+            row += f"{cols[ref][key] / cols['array'][key]:>8.1f}x"
+        print(row)
+    row = f"  {'TOTAL':<26}" + "".join(f"{totals[n]:>13.1f}" for n in names)
+    if "array" in cols and totals["array"]:
+        row += f"{totals[ref] / totals['array']:>8.1f}x"
+    print(row)
+
+
+if __name__ == "__main__":
+    main()
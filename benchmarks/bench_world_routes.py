@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Realm of Shadows — Overworld route planning benchmark
+
+Plans a route between every pair of locations for each travel mode and
+times it two ways:
+
+  grid     — plain A* over the tile grid (what a single search costs; a
+             goal on another land mass floods the whole continent)
+  planner  — RoutePlanner.land_route: land-region check first, then A*
+
+Both must agree on every route cost. The longest single planner slice
+(time between two yields of the planning generator) is the most one
+AutoTravel.update() call can block a frame for, before its time budget
+is checked.
+
+Run:  python3 benchmarks/bench_world_routes.py [--modes walk horse carpet]
+"""
+import os
+import sys
+import time
+import argparse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from core.character import Character
+from data.world_map import WorldState, LOCATIONS
+import data.world_travel as world_travel
+
+
+def _world():
+    c = Character("Rook", "Ranger")
+    c.finalize_with_class("Ranger")
+    return WorldState([c])
+
+
+def _drain(gen, slices):
+    """Run a planning generator to the end; record each slice's duration."""
+    while True:
+        t0 = time.perf_counter()
+        try:
+            next(gen)
+        except StopIteration as done:
+            slices.append(time.perf_counter() - t0)
+            return done.value
+        slices.append(time.perf_counter() - t0)
+
+
+def bench_mode(ws, mode):
+    ws.travel.travel_mode = mode
+    planner = world_travel.RoutePlanner(ws.tiles)
+    slices = []
+    t0 = time.perf_counter()
+    _drain(planner.regions(ws.travel), slices)
+    t_regions = time.perf_counter() - t0
+    cost, unit = planner._grid(ws.travel)
+
+    tiles = [world_travel.tile_index(l["x"], l["y"]) for l in LOCATIONS.values()]
+    t_grid = t_plan = 0.0
+    worst_grid = worst_plan = 0.0
+    routes = 0
+    for a in tiles:
+        for b in tiles:
+            t0 = time.perf_counter()
+            want = _drain(world_travel._astar(cost, unit, a, b), [])
+            dt = time.perf_counter() - t0
+            t_grid += dt
+            worst_grid = max(worst_grid, dt)
+            t0 = time.perf_counter()
+            got = _drain(planner.land_route(ws.travel, a, b), slices)
+            dt = time.perf_counter() - t0
+            t_plan += dt
+            worst_plan = max(worst_plan, dt)
+            if a != b and (want and want[1]) != (got and got[1]):
+                raise SystemExit(f"{mode}: route cost differs for {a} → {b}: {want and want[1]} vs {got and got[1]}")
+            routes += got is not None
+    return {"pairs": len(tiles) ** 2, "routes": routes, "regions": t_regions,
+            "grid": t_grid, "plan": t_plan, "worst_grid": worst_grid,
+            "worst_plan": worst_plan, "slice": max(slices)}
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    ap.add_argument("--modes", nargs="+", default=["walk", "horse", "carpet"])
+    args = ap.parse_args()
+
+    ws = _world()
+    print(f"{'mode':<8}{'pairs':>7}{'routes':>8}{'regions ms':>12}{'grid ms':>10}{'planner ms':>12}"
+          f"{'speedup':>9}{'worst grid':>12}{'worst plan':>12}{'max slice':>11}")
+    for mode in args.modes:
+        r = bench_mode(ws, mode)
+        print(f"{mode:<8}{r['pairs']:>7}{r['routes']:>8}{r['regions'] * 1000:>12.1f}"
+              f"{r['grid'] * 1000:>10.1f}{r['plan'] * 1000:>12.1f}"
+              f"{r['grid'] / max(r['plan'], 1e-9):>8.1f}x"
+              f"{r['worst_grid'] * 1000:>12.2f}{r['worst_plan'] * 1000:>12.2f}"
+              f"{r['slice'] * 1000:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
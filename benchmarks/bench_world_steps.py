@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Realm of Shadows — Overworld step benchmark
+
+Random-walks a party across the world map through WorldState.move and
+times it, then times the three per-step checks on their own at every
+visited position:
+
+  _update_fog                — reveal the sight circle around the party
+  _near_location             — safe zone (no encounters next to locations)
+  _check_nearby_discoveries  — roll for hidden locations in range
+
+With --baseline REV the same walk is replayed against data/world_map.py
+from that git revision (e.g. the commit before the spatial masks) and the
+script aborts unless both produce the same events, fog and discoveries.
+
+Run:  python3 benchmarks/bench_world_steps.py [--steps 10000] [--baseline REV]
+"""
+import os
+import sys
+import time
+import types
+import random
+import argparse
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from core.character import Character
+import data.world_map as world_map
+
+PARTY = (("Aldric", "Fighter"), ("Sera", "Cleric"), ("Vex", "Thief"),
+         ("Ilsa", "Mage"), ("Rook", "Ranger"), ("Brom", "Knight"))
+DIRS = ((1, 0), (-1, 0), (0, 1), (0, -1))
+
+
+def _load_baseline(rev):
+    src = subprocess.run(["git", "show", f"{rev}:data/world_map.py"], cwd=ROOT,
+                         capture_output=True, text=True, check=True).stdout
+    mod = types.ModuleType(f"world_map_{rev}")
+    mod.__file__ = os.path.join(ROOT, "data", "world_map.py")
+    exec(compile(src, mod.__file__, "exec"), mod.__dict__)
+    return mod
+
+
+def _party():
+    party = []
+    for name, cls in PARTY:
+        c = Character(name, cls)
+        c.finalize_with_class(cls)
+        party.append(c)
+    return party
+
+
+def walk(mod, steps, seed):
+    """Random walk; returns (seconds, event trail, visited positions, world)."""
+    ws = mod.WorldState(_party())
+    rng = random.Random(seed)
+    random.seed(seed)
+    trail, visited = [], []
+    t0 = time.perf_counter()
+    for _ in range(steps):
+        ev = ws.move(*rng.choice(DIRS))
+        trail.append((ev or {}).get("type"))
+        visited.append((ws.party_x, ws.party_y))
+    elapsed = time.perf_counter() - t0
+    return elapsed, trail, visited, ws
+
+
+def time_checks(ws, visited, seed):
+    """Seconds spent in each per-step check over the visited positions."""
+    out = {}
+    random.seed(seed)
+    found = set(ws.discovered_locations)
+    for name, call in (("_update_fog", lambda: ws._update_fog()),
+                       ("_near_location", lambda: ws._near_location(ws.party_x, ws.party_y)),
+                       ("_check_nearby_discoveries", lambda: ws._check_nearby_discoveries())):
+        t0 = time.perf_counter()
+        for x, y in visited:
+            ws.party_x, ws.party_y = x, y
+            call()
+        out[name] = time.perf_counter() - t0
+        ws.discovered_locations = set(found)
+    return out
+
+
+def _fog(ws):
+    return sum(t["discovered"] for row in ws.tiles for t in row)
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    ap.add_argument("--steps", type=int, default=10000)
+    ap.add_argument("--seed", type=int, default=7)
+    ap.add_argument("--baseline", metavar="REV", help="compare with data/world_map.py at this git revision")
+    args = ap.parse_args()
+
+    runs = {}
+    if args.baseline:
+        runs["baseline"] = _load_baseline(args.baseline)
+    runs["current"] = world_map
+
+    results = {}
+    for label, mod in runs.items():
+        elapsed, trail, visited, ws = walk(mod, args.steps, args.seed)
+        results[label] = (elapsed, trail, visited, ws, time_checks(ws, visited, args.seed))
+
+    if "baseline" in results:
+        b, c = results["baseline"], results["current"]
+        if b[1] != c[1] or b[2] != c[2]:
+            raise SystemExit("event trail diverged from baseline")
+        if _fog(b[3]) != _fog(c[3]) or b[3].discovered_locations != c[3].discovered_locations:
+            raise SystemExit("fog / discoveries diverged from baseline")
+
+    labels = list(results)
+    print(f"{args.steps} random-walk steps (seed {args.seed})")
+    print(f"{'':<28}" + "".join(f"{l + ' ms':>15}" for l in labels)
+          + (f"{'speedup':>9}" if len(labels) > 1 else ""))
+
+    def row(name, values):
+        line = f"{name:<28}" + "".join(f"{v * 1000:>15.1f}" for v in values)
+        if len(values) > 1:
+            line += f"{values[0] / max(values[1], 1e-9):>8.1f}x"
+        print(line)
+
+    row("WorldState.move (total)", [results[l][0] for l in labels])
+    for check in ("_update_fog", "_near_location", "_check_nearby_discoveries"):
+        row("  " + check, [results[l][4][check] for l in labels])
+    cur = results["current"]
+    events = {}
+    for ev in cur[1]:
+        events[ev] = events.get(ev, 0) + 1
+    print("\nevents:", ", ".join(f"{k or 'none'}={v}" for k, v in sorted(events.items(), key=lambda kv: str(kv[0]))))
+    print(f"fog tiles revealed: {_fog(cur[3])}   locations discovered: {len(cur[3].discovered_locations)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Realm of Shadows — Memory soak test
+
+Boots the real Game headless (same fixture and driver setup as
+bench_headless.py) and plays the same loop over and over:
+
+  towns     — enter each town hub, idle, leave to the world map
+  dungeons  — enter a dungeon, walk a few steps, leave
+  combat    — a couple of fights against a standard encounter
+
+After every cycle the garbage collector runs and resident memory (RSS)
+and the registered caches (core.mem_stats) are sampled. The first
+--warmup cycles fill the caches legitimately; after that, memory should
+level off. The run fails (exit 1) if RSS grows by more than
+--max-growth-kb over the measured cycles and the fitted per-cycle slope
+is above --max-slope-kb, i.e. memory keeps climbing instead of settling.
+
+Run:  python3 benchmarks/soak_memory.py [--cycles 20] [-o soak.json]
+      python3 benchmarks/soak_memory.py --trace DIR   # tracemalloc diff per cycle
+"""
+import os
+import gc
+import sys
+import json
+import random
+import argparse
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+import bench_headless as bh      # sets the SDL dummy drivers on import
+
+TOWNS    = ("briarhollow", "woodhaven", "ironhearth", "saltmere")
+DUNGEONS = ("goblin_warren", "spiders_nest", "abandoned_mine")
+
+
+# ═══════════════════════════════════════════════════════════════
+#  LOOPS
+# ═══════════════════════════════════════════════════════════════
+
+def loop_towns(main, game, rec):
+    from ui.town_ui import TownUI
+    for town in TOWNS:
+        game.town_ui = TownUI(game.party, town_id=town)
+        game.go(main.S_TOWN)
+        game.fade = 0
+        rec.frames(20)
+        game.town_ui = None
+        bh._back_to(main, game, main.S_WORLD_MAP)
+        game.go(main.S_WORLD_MAP)
+        rec.frames(5)
+
+
+def loop_dungeons(main, game, rec, steps=12):
+    import pygame
+    from data.dungeon import DungeonState
+    from ui.dungeon_ui import DungeonUI
+    rng = random.Random(3)
+    dirs = [pygame.K_RIGHT, pygame.K_DOWN, pygame.K_LEFT, pygame.K_UP]
+    for did in DUNGEONS:
+        ds = game.dungeon_cache.get(did)        # revisits reuse the state, as in play
+        if ds is None:
+            ds = game.dungeon_cache[did] = DungeonState(did, game.party)
+        game.dungeon_state = ds
+        game.dungeon_ui = DungeonUI(ds)
+        game.pre_dungeon_state = main.S_WORLD_MAP
+        game.go(main.S_DUNGEON)
+        game.fade = 0
+        reenter = bh.dungeon_reenter(main, game, ds)
+        for _ in range(steps):
+            key = dirs[rng.randrange(4)]
+            rec.frames(3, [bh._key(pygame, key)])
+            rec.frame([bh._key(pygame, key, up=True)])
+            bh._back_to(main, game, main.S_DUNGEON, reenter)
+        game.dungeon_state = None
+        game.dungeon_ui = None
+        game.go(main.S_WORLD_MAP)
+        rec.frames(5)
+
+
+def loop_combat(main, game, rec):
+    bh.scenario_combat(main, game, rec, rounds=6)
+    game.combat_state = None
+    game.combat_ui = None
+
+
+LOOPS = (("towns", loop_towns), ("dungeons", loop_dungeons), ("combat", loop_combat))
+
+
+# ═══════════════════════════════════════════════════════════════
+#  VERDICT
+# ═══════════════════════════════════════════════════════════════
+
+def slope(ys):
+    """Least-squares slope of ys against 0..n-1 (per-cycle growth)."""
+    n = len(ys)
+    if n < 2:
+        return 0.0
+    mx = (n - 1) / 2
+    my = sum(ys) / n
+    num = sum((i - mx) * (y - my) for i, y in enumerate(ys))
+    den = sum((i - mx) ** 2 for i in range(n))
+    return num / den
+
+
+def verdict(rss, warmup, max_growth_kb, max_slope_kb):
+    """(ok, growth_kb, slope_kb) over the samples after warm-up."""
+    measured = [r for r in rss[warmup:] if r is not None]
+    if len(measured) < 2:
+        return True, 0, 0.0
+    growth = measured[-1] - measured[0]
+    per_cycle = slope(measured)
+    return not (growth > max_growth_kb and per_cycle > max_slope_kb), growth, per_cycle
+
+
+def main_cli():
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    ap.add_argument("--cycles", type=int, default=20)
+    ap.add_argument("--warmup", type=int, default=3,
+                    help="cycles allowed to fill caches before measuring")
+    ap.add_argument("--max-growth-kb", type=int, default=8 * 1024,
+                    help="RSS growth over the measured cycles that counts as climbing")
+    ap.add_argument("--max-slope-kb", type=float, default=256,
+                    help="fitted RSS growth per cycle that counts as climbing")
+    ap.add_argument("--trace", metavar="DIR", help="write a tracemalloc diff per cycle")
+    ap.add_argument("-o", "--output", default="soak_report.json")
+    args = ap.parse_args()
+
+    import pygame
+    from core import mem_stats
+    save_dir = tempfile.mkdtemp(prefix="ros_soak_")
+    main, game = bh.boot_game(save_dir)
+    random.seed(0)
+    if args.trace:
+        mem_stats.start_trace(out_dir=args.trace)
+
+    samples = []
+    print(f"{'cycle':>5} {'rss MB':>8} {'delta KB':>9}  largest caches")
+    prev = None
+    for cycle in range(args.cycles):
+        rec = bh.Recorder(game)
+        for _name, fn in LOOPS:
+            fn(main, game, rec)
+        gc.collect()
+        rss = mem_stats.rss_kb()
+        caches = mem_stats.report()
+        samples.append({"cycle": cycle, "rss_kb": rss, "frames": len(rec.update_ms),
+                        "caches": caches})
+        if args.trace:
+            mem_stats.write_trace(label=f"cycle {cycle}")
+        top = ", ".join(f"{c['name']} {mem_stats.format_bytes(c['bytes'])}" for c in caches[:3])
+        delta = "" if prev is None or rss is None else f"{rss - prev:+d}"
+        print(f"{cycle:>5} {(rss or 0) / 1024:>8.1f} {delta:>9}  {top}")
+        prev = rss
+
+    rss_series = [s["rss_kb"] for s in samples]
+    ok, growth, per_cycle = verdict(rss_series, args.warmup,
+                                    args.max_growth_kb, args.max_slope_kb)
+    report = {
+        "commit": bh._git_rev(),
+        "cycles": args.cycles,
+        "warmup": args.warmup,
+        "rss_growth_kb": growth,
+        "rss_slope_kb_per_cycle": round(per_cycle, 1),
+        "ok": ok,
+        "samples": samples,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nRSS after warm-up: {growth:+d} KB, {per_cycle:+.1f} KB/cycle — "
+          f"{'OK' if ok else 'FAIL: memory keeps climbing'}")
+    print(f"report: {args.output}")
+    pygame.quit()
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,83 @@
+"""
+Realm of Shadows — Weighted Random Tables
+
+Encounter, loot and trap tables are compiled once into alias tables
+(Vose's alias method), so a draw costs one column pick plus at most one
+coin flip whatever the table's size or weighting:
+
+  AliasTable(items, weights=None)  — weights default to 1 per item
+  table.draw(rng)                  — rng: a random.Random or the random module
+  table_for(key, items, weights)   — compiled once per key, then reused
+
+Every draw takes an explicit RNG so seeded generators (dungeon floors are
+seeded per dungeon and floor) stay reproducible. With equal weights no
+column needs a coin flip and draw(rng) is exactly rng.choice(items): the
+same item from the same RNG state, consuming the same random numbers.
+Floors generated before the tables were compiled — and the floor deltas
+saved against them — therefore still line up.
+"""
+from core import mem_stats
+
+_tables = {}     # key → AliasTable (see table_for)
+mem_stats.register("alias_tables", _tables)
+
+
+class AliasTable:
+    __slots__ = ("items", "weights", "_n", "_prob", "_alias")
+
+    def __init__(self, items, weights=None):
+        items = tuple(items)
+        if not items:
+            raise ValueError("AliasTable needs at least one item")
+        n = len(items)
+        if weights is None:
+            weights = (1,) * n
+        elif len(weights) != n:
+            raise ValueError("AliasTable: one weight per item")
+        total = sum(weights)
+        if total <= 0 or any(w < 0 for w in weights):
+            raise ValueError("AliasTable: weights must be >= 0 with a positive sum")
+        self.items = items
+        self.weights = tuple(w / total for w in weights)    # probability per item
+        self._n = n
+
+        # Vose: scale to mean 1, pair each short column with a tall one
+        scaled = [w * n / total for w in weights]
+        prob = [1.0] * n
+        alias = list(range(n))
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s, g = small.pop(), large.pop()
+            prob[s] = scaled[s]
+            alias[s] = g
+            scaled[g] -= 1.0 - scaled[s]
+            (small if scaled[g] < 1.0 else large).append(g)
+        # Whatever is left is 1 up to rounding error: always keep the column
+        self._prob = tuple(prob)
+        self._alias = tuple(alias)
+
+    def __len__(self):
+        return self._n
+
+    def draw(self, rng):
+        """One item, chosen with its weight, using rng."""
+        i = rng.randrange(self._n)
+        p = self._prob[i]
+        if p >= 1.0 or rng.random() < p:
+            return self.items[i]
+        return self.items[self._alias[i]]
+
+
+def table_for(key, items, weights=None):
+    """The AliasTable compiled for key; items/weights are only read the
+    first time. Tables built from data that can change at runtime should
+    be dropped with clear_tables()."""
+    table = _tables.get(key)
+    if table is None:
+        table = _tables[key] = AliasTable(items, weights)
+    return table
+
+
+def clear_tables():
+    _tables.clear()
@@ -51,14 +51,16 @@ class Character:
         for stat in STAT_NAMES:
             self.stats[stat] += random.randint(0, 1)
 
-    def quick_roll(self, class_name):
+    def quick_roll(self, class_name, rng=None):
         """Skip life path: use class starting stats + small random bonus + racial mods.
-        Always applies racial stat modifiers — this is the canonical path for quick and inn recruits."""
+        Always applies racial stat modifiers — this is the canonical path for quick and inn recruits.
+        rng: a random.Random for reproducible rolls (tavern recruit pools)."""
+        rng = rng or random
         self.class_name = class_name
         self.quick_rolled = True
         start = CLASSES[class_name]["starting_stats"]
         for stat in STAT_NAMES:
-            self.stats[stat] = start[stat] + random.randint(0, 2)
+            self.stats[stat] = start[stat] + rng.randint(0, 2)
         from core.races import apply_racial_stats
         apply_racial_stats(self.stats, self.race_name)
         self._finalize()
@@ -196,6 +198,8 @@ class Character:
         # Auto-identify non-magical items (pelts, common weapons, materials, etc.)
         from core.identification import auto_identify_mundane
         auto_identify_mundane(item)
+        from core import events
+        events.emit(events.ITEM_ACQUIRED, item=item, character=self)
 
         if _is_stackable(item):
             # Find existing stack of same name
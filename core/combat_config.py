@@ -26,6 +26,11 @@ SPEED_MODIFIERS = {
     "Petrified":    0.0,    # skip turn
 }
 
+# Turn scheduling (core.turn_scheduler)
+TURN_SCHEDULER   = "round"  # "round": re-rank every round | "timeline": faster acts more often
+TIMELINE_ROUND   = 1000     # timeline ticks per round (mean-speed combatant acts once)
+TURN_PREVIEW_LEN = 6        # projected next-round turns shown in the turn bar
+
 
 # ═══════════════════════════════════════════════════════════════
 #  ACCURACY
@@ -329,3 +334,11 @@ CLASS_THREAT_DEFAULT = 4
 # Buff/debuff durations applied by enemy abilities
 ENEMY_BUFF_DURATION = 3   # rounds for War Cry etc.
 ENEMY_BUFF_DMG_MULT = 1.2  # War Cry damage multiplier
+
+
+# ═══════════════════════════════════════════════════════════════
+#  COMBAT LOG
+# ═══════════════════════════════════════════════════════════════
+
+COMBAT_LOG_CAPACITY   = 200   # text lines kept in the on-screen log ring
+COMBAT_EVENT_CAPACITY = 200   # typed CombatEvent records kept per fight
@@ -9,6 +9,8 @@ References: Combat_System_Design_v3.md, Weapon_System_Design_v2.md
 """
 import random
 import math
+import weakref
+from contextlib import contextmanager
 from core.combat_config import *
 from core.combat_config import (
     STATUS_TICK_DAMAGE, STATUS_INCAPACITATE, STATUS_DURATION_TICK,
@@ -17,6 +19,9 @@ from core.combat_config import (
 )
 from data.weapons import get_weapon, is_proficient, STARTING_WEAPONS, WEAPONS
 from data.weapons import NON_PROFICIENT_DAMAGE_MULT, NON_PROFICIENT_ACCURACY, NON_PROFICIENT_SPEED
+from core.combat_log import (CombatLog, CombatEvent, CombatRecorder,
+                             encode_target)
+from core.turn_scheduler import TurnScheduler
 
 
 # ═══════════════════════════════════════════════════════════════
@@ -341,12 +346,14 @@ def get_casting_stat_value(combatant):
 
 
 def calc_physical_damage(attacker, defender, weapon, position_dmg_mod=1.0,
-                         ability_bonus=0, is_crit=False, crit_data=None):
+                         ability_bonus=0, is_crit=False, crit_data=None, variance=None):
     """
     Full physical damage formula from Combat Design v3:
     Stat Damage = sum(Weapon Stat × Weight for each damage stat)
     Raw Damage  = Stat Damage + Weapon Base + Enhancement + Ability Bonus
     Final       = (Raw × Position × Variance × PhysTypeMod) - Defense
+
+    variance: use this roll instead of a random one (core.combat_odds).
     """
     # Stat damage from weapon scaling
     stat_damage = 0
@@ -371,7 +378,8 @@ def calc_physical_damage(attacker, defender, weapon, position_dmg_mod=1.0,
     raw *= position_dmg_mod
 
     # Variance
-    variance = random.uniform(DAMAGE_VARIANCE_MIN, DAMAGE_VARIANCE_MAX)
+    if variance is None:
+        variance = random.uniform(DAMAGE_VARIANCE_MIN, DAMAGE_VARIANCE_MAX)
     raw *= variance
 
     # Physical type resistance
@@ -440,7 +448,7 @@ def calc_physical_damage(attacker, defender, weapon, position_dmg_mod=1.0,
     return max(MINIMUM_DAMAGE, int(final))
 
 
-def calc_magic_damage(attacker, defender, spell, is_crit=False):
+def calc_magic_damage(attacker, defender, spell, is_crit=False, variance=None):
     """
     Magic damage formula from Combat Design v3:
     Stat Damage = Casting Stat × 1.5 + Focus Bonus
@@ -452,6 +460,8 @@ def calc_magic_damage(attacker, defender, spell, is_crit=False):
     the wand itself determines the spell's power regardless of caster stats.
     This means a Fighter with a Meteor wand does the same damage as a Mage with
     the same wand. Wand tier (common/rare/epic) is the differentiator, not stats.
+
+    variance: use this roll instead of a random one (core.combat_odds).
     """
     spell_power = spell.get("power", 10)
 
@@ -469,7 +479,8 @@ def calc_magic_damage(attacker, defender, spell, is_crit=False):
         raw = stat_damage + spell_power
 
     # Variance
-    variance = random.uniform(MAGIC_VARIANCE_MIN, MAGIC_VARIANCE_MAX)
+    if variance is None:
+        variance = random.uniform(MAGIC_VARIANCE_MIN, MAGIC_VARIANCE_MAX)
     raw *= variance
 
     # Elemental resistance
@@ -538,6 +549,17 @@ def check_crit(attacker, attack_type="physical", weapon=None):
         # Enemies don't crit (for now)
         return False, None
 
+    chance, crit_data = calc_crit_chance(attacker, attack_type, weapon)
+    is_crit = random.randint(1, 100) <= chance
+    return is_crit, crit_data if is_crit else None
+
+
+def calc_crit_chance(attacker, attack_type="physical", weapon=None):
+    """Crit chance (whole %, as check_crit rolls it) and the crit_data a
+    crit would carry. Enemies have no crit chance."""
+    if attacker["type"] != "player":
+        return 0, None
+
     cn = attacker["class_name"]
     chance = CRIT_BASE_CHANCE
 
@@ -582,14 +604,55 @@ def check_crit(attacker, attack_type="physical", weapon=None):
         from core.races import get_racial_crit_bonus
         chance += get_racial_crit_bonus(attacker.get("race_name", "Human")) * 100
 
-    is_crit = random.randint(1, 100) <= int(chance)
-    return is_crit, crit_data if is_crit else None
+    return int(chance), crit_data
 
 
 # ═══════════════════════════════════════════════════════════════
 #  ACTION RESOLUTION
 # ═══════════════════════════════════════════════════════════════
 
+def attack_buff_mult(attacker):
+    """Outgoing basic-attack multiplier from the attacker's buffs
+    (war_cry, rally, conqueror, shadow_step, …) and Weakened."""
+    atk_mult = 1.0
+    for st in attacker.get("status_effects", []):
+        n = st["name"]
+        if n in ("war_cry", "WarCry"):    atk_mult *= 1.25
+        if n == "hawk_eye":               atk_mult *= 1.20
+        if n == "rally":                  atk_mult *= 1.25
+        if n == "conqueror":              atk_mult *= 2.00
+        if n == "shadow_step":            atk_mult *= 1.50
+        if n == "last_stand" and attacker["hp"] / max(1, attacker["max_hp"]) <= 0.25:
+                                          atk_mult *= 1.50
+        if n == "battle_stance":          atk_mult *= 1.20
+        if n == "arcane_surge":           atk_mult *= 1.30
+        if n == "Weakened":               atk_mult *= 0.70   # debuff: -30% outgoing damage
+        if n == "blessed":                atk_mult *= 1.10
+    return atk_mult
+
+
+def defense_buff_reduction(defender):
+    """Flat damage taken off a basic attack by the defender's buffs
+    (defense_up, iron_skin, divine_shield, …)."""
+    def_reduce = 0
+    for st in defender.get("status_effects", []):
+        n = st["name"]
+        if n == "defense_up":            def_reduce += 5
+        if n == "iron_skin":             def_reduce += 8
+        if n == "magic_shield":          def_reduce += 6
+        if n == "runic_armor":           def_reduce += 10
+        if n == "blessed":               def_reduce += 5
+        if n == "spirit_bond":           def_reduce += 6
+        if n == "divine_shield":         def_reduce += 12
+        if n == "shield_of_faith":       def_reduce += 14
+        if n == "fading_ward":           def_reduce += 8
+        if n == "ward_anchor":           def_reduce += 6
+        if n == "battle_prayer":         def_reduce += 4
+        if n in ("unbreakable", "divine_intervention"): def_reduce += 20
+        if n == "fortify":               def_reduce += 18   # heavy physical damage reduction
+    return def_reduce
+
+
 def resolve_basic_attack(attacker, defender, enemies=None):
     """Resolve a basic physical attack. Returns a result dict."""
     weapon = attacker.get("weapon")
@@ -659,41 +722,11 @@ def resolve_basic_attack(attacker, defender, enemies=None):
         crit_data=crit_data,
     )
 
-    # Attacker buff multipliers (war_cry, rally, conqueror, shadow_step, etc.)
-    atk_mult = 1.0
-    for st in attacker.get("status_effects", []):
-        n = st["name"]
-        if n in ("war_cry", "WarCry"):    atk_mult *= 1.25
-        if n == "hawk_eye":               atk_mult *= 1.20
-        if n == "rally":                  atk_mult *= 1.25
-        if n == "conqueror":              atk_mult *= 2.00
-        if n == "shadow_step":            atk_mult *= 1.50
-        if n == "last_stand" and attacker["hp"] / max(1, attacker["max_hp"]) <= 0.25:
-                                          atk_mult *= 1.50
-        if n == "battle_stance":          atk_mult *= 1.20
-        if n == "arcane_surge":           atk_mult *= 1.30
-        if n == "Weakened":               atk_mult *= 0.70   # debuff: -30% outgoing damage
-        if n == "blessed":                atk_mult *= 1.10
+    # Attacker buff multipliers, defender buff reductions
+    atk_mult = attack_buff_mult(attacker)
     if atk_mult != 1.0:
         damage = max(MINIMUM_DAMAGE, int(damage * atk_mult))
-
-    # Defender buff reductions (defense_up, iron_skin, divine_shield, etc.)
-    def_reduce = 0
-    for st in defender.get("status_effects", []):
-        n = st["name"]
-        if n == "defense_up":            def_reduce += 5
-        if n == "iron_skin":             def_reduce += 8
-        if n == "magic_shield":          def_reduce += 6
-        if n == "runic_armor":           def_reduce += 10
-        if n == "blessed":               def_reduce += 5
-        if n == "spirit_bond":           def_reduce += 6
-        if n == "divine_shield":         def_reduce += 12
-        if n == "shield_of_faith":       def_reduce += 14
-        if n == "fading_ward":           def_reduce += 8
-        if n == "ward_anchor":           def_reduce += 6
-        if n == "battle_prayer":         def_reduce += 4
-        if n in ("unbreakable", "divine_intervention"): def_reduce += 20
-        if n == "fortify":               def_reduce += 18   # heavy physical damage reduction
+    def_reduce = defense_buff_reduction(defender)
     if def_reduce:
         damage = max(MINIMUM_DAMAGE, damage - def_reduce)
 
@@ -942,18 +975,12 @@ def _attack_verbs(attacker, is_crit=False):
     return ("slashes", "misses")
 
 
-def resolve_enemy_attack(attacker, defender):
-    """Resolve an enemy's basic attack against a player."""
-    weapon_range = attacker.get("attack_type", "melee")
-    pos_dmg, pos_acc = get_position_mods(
-        weapon_range, attacker["row"], defender["row"]
-    )
-
-    # Accuracy
+def calc_enemy_accuracy(attacker, defender, position_acc_mod=0):
+    """Hit chance for an enemy's basic attack. Returns 0-100."""
     acc = ACCURACY_BASE_PHYSICAL
     acc += (attacker["stats"].get("DEX", 0) - defender["stats"].get("DEX", 0)) * ACCURACY_DEX_SCALE
     acc += attacker.get("accuracy_bonus", 0)
-    acc += pos_acc
+    acc += position_acc_mod
 
     if defender.get("is_defending"):
         acc += DEFEND_ACC_PENALTY
@@ -962,39 +989,45 @@ def resolve_enemy_attack(attacker, defender):
         if status["name"] in ACCURACY_STATUS_PENALTIES:
             acc += ACCURACY_STATUS_PENALTIES[status["name"]]
 
-    acc = max(ACCURACY_MIN, min(ACCURACY_MAX, acc))
-    hit = roll_hit(acc)
+    return max(ACCURACY_MIN, min(ACCURACY_MAX, acc))
 
-    result = {
-        "action": "enemy_attack",
-        "attacker": attacker,
-        "defender": defender,
-        "accuracy": acc,
-        "hit": hit,
-        "damage": 0,
-        "is_crit": False,
-        "messages": [],
-    }
 
-    if not hit:
-        _hv, _mv = _attack_verbs(attacker)
-        result["messages"].append(f"{attacker['name']} {_mv} {defender['name']} — MISS!")
-        return result
+def enemy_damage_range(attacker):
+    """(low, high) of an enemy's attack_damage roll."""
+    ad = attacker.get("attack_damage", 5)
+    try:
+        if isinstance(ad, (list, tuple)) and len(ad) >= 2:
+            return int(ad[0]), max(int(ad[0]), int(ad[1]))
+        elif isinstance(ad, (list, tuple)):
+            return int(ad[0]), int(ad[0])
+        return int(ad), int(ad)
+    except (TypeError, ValueError):
+        return 5, 5
+
 
-    # Enemy damage: attack_damage + STR scaling + variance - defense
+def _roll_enemy_base_damage(attacker):
     ad = attacker.get("attack_damage", 5)
     try:
         if isinstance(ad, (list, tuple)) and len(ad) >= 2:
-            base_dmg = random.randint(int(ad[0]), max(int(ad[0]), int(ad[1])))
+            return random.randint(int(ad[0]), max(int(ad[0]), int(ad[1])))
         elif isinstance(ad, (list, tuple)):
-            base_dmg = int(ad[0])
+            return int(ad[0])
         else:
-            base_dmg = int(ad)
+            return int(ad)
     except (TypeError, ValueError):
-        base_dmg = 5
+        return 5
+
+
+def calc_enemy_damage(attacker, defender, position_dmg_mod=1.0, base_dmg=None, variance=None):
+    """Enemy damage: attack_damage + STR scaling + variance - defense.
+    base_dmg / variance: use these rolls instead of random ones."""
+    if base_dmg is None:
+        base_dmg = _roll_enemy_base_damage(attacker)
     str_bonus = attacker["stats"].get("STR", 0) * 0.3
-    raw = (base_dmg + int(str_bonus)) * pos_dmg
-    raw *= random.uniform(DAMAGE_VARIANCE_MIN, DAMAGE_VARIANCE_MAX)
+    raw = (base_dmg + int(str_bonus)) * position_dmg_mod
+    if variance is None:
+        variance = random.uniform(DAMAGE_VARIANCE_MIN, DAMAGE_VARIANCE_MAX)
+    raw *= variance
 
     # War Cry damage buff
     if attacker.get("_temp_dmg_buff"):
@@ -1010,7 +1043,49 @@ def resolve_enemy_attack(attacker, defender):
     if defender.get("is_defending"):
         defense *= DEFEND_PHYS_MULT
 
-    damage = max(MINIMUM_DAMAGE, int(raw - defense))
+    return max(MINIMUM_DAMAGE, int(raw - defense))
+
+
+def fading_shadow_damage(attacker, defender):
+    """Extra shadow damage a Faded/shadow-touched enemy's hit does to a
+    player (0 if none). Humanoid / undead enemies already have shadow
+    attacks, so other enemies are never hit by it."""
+    _tags = attacker.get("tags", [])
+    if ("faded" not in _tags and "shadow_touched" not in _tags) or defender.get("type") != "player":
+        return 0
+    _shadow_base = 6  # flat shadow damage — bypasses phys resistance
+    # Reduced by defender's shadow resistance
+    _shadow_res = defender.get("resistances", {}).get("shadow", 1.0)
+    return max(1, int(_shadow_base * _shadow_res))
+
+
+def resolve_enemy_attack(attacker, defender):
+    """Resolve an enemy's basic attack against a player."""
+    weapon_range = attacker.get("attack_type", "melee")
+    pos_dmg, pos_acc = get_position_mods(
+        weapon_range, attacker["row"], defender["row"]
+    )
+
+    acc = calc_enemy_accuracy(attacker, defender, pos_acc)
+    hit = roll_hit(acc)
+
+    result = {
+        "action": "enemy_attack",
+        "attacker": attacker,
+        "defender": defender,
+        "accuracy": acc,
+        "hit": hit,
+        "damage": 0,
+        "is_crit": False,
+        "messages": [],
+    }
+
+    if not hit:
+        _hv, _mv = _attack_verbs(attacker)
+        result["messages"].append(f"{attacker['name']} {_mv} {defender['name']} — MISS!")
+        return result
+
+    damage = calc_enemy_damage(attacker, defender, pos_dmg)
     result["damage"] = damage
 
     defender["hp"] = max(0, defender["hp"] - damage)
@@ -1018,21 +1093,15 @@ def resolve_enemy_attack(attacker, defender):
     # ── Fading secondary: shadow corruption on hit ────────────────────────
     # Faded/shadow-touched beasts deal a small extra shadow hit each attack.
     # Represents the Fading energy bleeding through their strikes.
-    _tags = attacker.get("tags", [])
-    if ("faded" in _tags or "shadow_touched" in _tags) and defender.get("alive", True):
-        _shadow_base = 6  # flat shadow damage — bypasses phys resistance
-        # Reduced by defender's shadow resistance
-        _shadow_res = defender.get("resistances", {}).get("shadow", 1.0)
-        _shadow_dmg = max(1, int(_shadow_base * _shadow_res))
-        # Humanoid / undead enemies already have shadow attacks — skip self-damage
-        if defender.get("type") == "player":
-            defender["hp"] = max(0, defender["hp"] - _shadow_dmg)
-            result["messages"].append(
-                f"The Fading corruption bleeds through — {defender['name']} "
-                f"takes {_shadow_dmg} shadow damage!"
-            )
-            if defender["hp"] <= 0:
-                defender["alive"] = False
+    _shadow_dmg = fading_shadow_damage(attacker, defender) if defender.get("alive", True) else 0
+    if _shadow_dmg:
+        defender["hp"] = max(0, defender["hp"] - _shadow_dmg)
+        result["messages"].append(
+            f"The Fading corruption bleeds through — {defender['name']} "
+            f"takes {_shadow_dmg} shadow damage!"
+        )
+        if defender["hp"] <= 0:
+            defender["alive"] = False
 
     if defender["hp"] <= 0 and defender.get("type") == "player":
         if any(st["name"] in ("unbreakable", "divine_intervention")
@@ -2338,40 +2407,143 @@ def _calc_player_threat(player):
     return threat
 
 
-def _calc_finish_bonus(player, enemy):
-    """If an enemy can likely one-shot a player, that's very attractive."""
+def _estimate_enemy_damage(enemy):
+    """Rough per-hit damage an enemy expects to deal (for finish checks)."""
     _ad = enemy.get("attack_damage", 5)
     _ad_val = ((_ad[0] + _ad[1]) / 2) if isinstance(_ad, (list, tuple)) else _ad
-    estimated_dmg = _ad_val + enemy["stats"].get("STR", 0) * 0.3
+    return _ad_val + enemy["stats"].get("STR", 0) * 0.3
+
+
+def _calc_finish_bonus(player, enemy, estimated_dmg=None):
+    """If an enemy can likely one-shot a player, that's very attractive."""
+    if estimated_dmg is None:
+        estimated_dmg = _estimate_enemy_damage(enemy)
     if player["hp"] <= estimated_dmg * 1.2:
         return 8  # big bonus for finishable targets
     return 0
 
 
+_ROW_WEIGHTS = {
+    "melee":  {FRONT: 3.0, MID: 1.5, BACK: 0.5},
+    "ranged": {FRONT: 1.0, MID: 1.5, BACK: 1.2},
+}
+
+
 def _row_weight(attack_type, attacker_row, target_row):
     """How much does position favor this target? Melee strongly prefers
     front row. Ranged slightly prefers mid/back targets."""
-    if attack_type == "melee":
-        weights = {FRONT: 3.0, MID: 1.5, BACK: 0.5}
-    elif attack_type == "ranged":
-        weights = {FRONT: 1.0, MID: 1.5, BACK: 1.2}
-    else:
-        weights = {FRONT: 1.0, MID: 1.0, BACK: 1.0}
+    weights = _ROW_WEIGHTS.get(attack_type)
+    if weights is None:
+        return 1.0
     return weights.get(target_row, 1.0)
 
 
+# ═══════════════════════════════════════════════════════════════
+#  ENEMY AI — SHARED ROUND CONTEXT
+# ═══════════════════════════════════════════════════════════════
+
+class AIContext:
+    """Round-scoped data shared by every enemy decision in a fight.
+
+    Owned by CombatState. Holds the living player/enemy lists (in the same
+    order as the full lists), each player's threat score, each enemy's
+    damage estimate and living-enemy row occupancy. After each action
+    only combatants whose HP, row or life state changed are re-scored
+    (update()); AoE targets, spawns and round ticks trigger a full
+    resync().
+
+    Values are produced by the same helpers the AI used before, so
+    decisions are identical for the same RNG stream.
+    """
+
+    def __init__(self, players, enemies):
+        self.players = players
+        self.enemies = enemies
+        self.resync()
+
+    def resync(self):
+        self.living_players = [p for p in self.players if p["alive"]]
+        self.living_enemies = [e for e in self.enemies if e.get("alive", True)]
+        self.threat = {id(p): _calc_player_threat(p) for p in self.players}
+        self._est_dmg = {}
+        self._count_rows()
+        self._n_enemies = len(self.enemies)
+        self._sig = {id(c): self._signature(c) for c in self.players + self.enemies}
+
+    @staticmethod
+    def _signature(c):
+        return (c["alive"], c["row"], c["hp"], c["max_hp"])
+
+    def _count_rows(self):
+        self.enemy_rows = {FRONT: 0, MID: 0, BACK: 0}
+        for e in self.living_enemies:
+            self.enemy_rows[e["row"]] = self.enemy_rows.get(e["row"], 0) + 1
+
+    def update(self, actor=None, target=None):
+        """Refresh after one action. Cheap signature compare; only players
+        whose HP/row/life changed are re-scored. AoE targets, spawns or a
+        changed enemy count fall back to resync()."""
+        if isinstance(target, list) or len(self.enemies) != self._n_enemies:
+            self.resync()
+            return
+        if isinstance(actor, dict):
+            self._est_dmg.pop(id(actor), None)
+        relist = False
+        sig_of = self._signature
+        for p in self.players:
+            sig = sig_of(p)
+            key = id(p)
+            old = self._sig.get(key)
+            if sig != old:
+                self._sig[key] = sig
+                self.threat[key] = _calc_player_threat(p)
+                if old is None or sig[:2] != old[:2]:
+                    relist = True
+        for e in self.enemies:
+            sig = sig_of(e)
+            key = id(e)
+            old = self._sig.get(key)
+            if sig != old:
+                self._sig[key] = sig
+                if old is None or sig[:2] != old[:2]:
+                    relist = True
+        if relist:
+            self.living_players = [p for p in self.players if p["alive"]]
+            self.living_enemies = [e for e in self.enemies if e.get("alive", True)]
+            self._count_rows()
+
+    def player_threat(self, p):
+        t = self.threat.get(id(p))
+        if t is None:
+            t = self.threat[id(p)] = _calc_player_threat(p)
+        return t
+
+    def est_damage(self, enemy, target=None):
+        """Damage one hit of enemy's basic attack is expected to do — to
+        target when given (core.combat_odds: its defense, resistances and
+        rows counted), otherwise the rough per-enemy estimate."""
+        if target is not None:
+            from core.combat_odds import attack_odds
+            return attack_odds(enemy, target).mean_on_hit
+        d = self._est_dmg.get(id(enemy))
+        if d is None:
+            d = self._est_dmg[id(enemy)] = _estimate_enemy_damage(enemy)
+        return d
+
+
 # ═══════════════════════════════════════════════════════════════
 #  ENEMY AI — ABILITY DECISION LOGIC
 # ═══════════════════════════════════════════════════════════════
 
-def _should_use_heal(enemy, enemies):
+def _should_use_heal(enemy, enemies, ctx=None):
     """Check if a healing ability should be used. Returns (should_heal, target, ability) or (False, None, None)."""
     heal_abilities = [a for a in enemy.get("abilities", []) if isinstance(a, dict) and a.get("type") == "heal"]
     if not heal_abilities:
         return False, None, None
 
     # Find wounded allies below 50% HP
-    wounded = [e for e in enemies if e["alive"] and e["hp"] < e["max_hp"] * 0.50
+    pool = ctx.living_enemies if ctx else enemies
+    wounded = [e for e in pool if e["alive"] and e["hp"] < e["max_hp"] * 0.50
                and e["uid"] != enemy["uid"]]
     if not wounded:
         return False, None, None
@@ -2380,7 +2552,7 @@ def _should_use_heal(enemy, enemies):
     return True, target, heal_abilities[0]
 
 
-def _should_use_buff(enemy, enemies):
+def _should_use_buff(enemy, enemies, ctx=None):
     """Check if a buff ability should be used. Returns (should_buff, targets, ability) or (False, None, None)."""
     buff_abilities = [a for a in enemy.get("abilities", []) if isinstance(a, dict) and a.get("type") == "buff"]
     if not buff_abilities:
@@ -2389,7 +2561,8 @@ def _should_use_buff(enemy, enemies):
     ability = buff_abilities[0]
 
     # Don't buff if most allies already have the buff active
-    living_allies = [e for e in enemies if e["alive"] and e["uid"] != enemy["uid"]]
+    pool = ctx.living_enemies if ctx else enemies
+    living_allies = [e for e in pool if e["alive"] and e["uid"] != enemy["uid"]]
     if not living_allies:
         return False, None, None
 
@@ -2400,7 +2573,7 @@ def _should_use_buff(enemy, enemies):
     return True, living_allies, ability
 
 
-def _should_use_offensive_ability(enemy, players, use_threshold=0.55):
+def _should_use_offensive_ability(enemy, players, use_threshold=0.55, ctx=None):
     """Check if an offensive ability should be used. Returns (should_use, target, ability) or (False, None, None). use_threshold: probability to skip (lower = more aggressive)."""""
     offense_abilities = [a for a in enemy.get("abilities", [])
                          if isinstance(a, dict) and a.get("type") == "damage"]
@@ -2408,7 +2581,7 @@ def _should_use_offensive_ability(enemy, players, use_threshold=0.55):
         return False, None, None
 
     ability = offense_abilities[0]
-    living_players = [p for p in players if p["alive"]]
+    living_players = ctx.living_players if ctx else [p for p in players if p["alive"]]
     if not living_players:
         return False, None, None
 
@@ -2417,7 +2590,8 @@ def _should_use_offensive_ability(enemy, players, use_threshold=0.55):
         return False, None, None
 
     # Prefer high-threat targets
-    target = max(living_players, key=lambda p: _calc_player_threat(p))
+    threat_of = ctx.player_threat if ctx else _calc_player_threat
+    target = max(living_players, key=threat_of)
     return True, target, ability
 
 
@@ -2425,8 +2599,11 @@ def _should_use_offensive_ability(enemy, players, use_threshold=0.55):
 #  ENEMY AI — MAIN DECISION FUNCTION
 # ═══════════════════════════════════════════════════════════════
 
-def enemy_choose_action(enemy, players, enemies):
+def enemy_choose_action(enemy, players, enemies, ctx=None):
     """AI decision-making for enemy turns. Returns (action_type, target, ability).
+
+    ctx: optional AIContext shared across the round (CombatState.ai_ctx);
+    without one, living lists and threat scores are rebuilt here.
     
     AI Types:
       random     — picks a random living player
@@ -2436,9 +2613,12 @@ def enemy_choose_action(enemy, players, enemies):
       supportive — healer AI: heal first, offense second, melee fallback
       boss       — buff allies, smart targeting, can't be kited
     """
-    living_players = [p for p in players if p["alive"]]
+    if ctx is None:
+        ctx = AIContext(players, enemies)
+    living_players = ctx.living_players
     if not living_players:
         return None, None, None
+    threat_of = ctx.player_threat
 
     # ── Taunted override: must target the taunting player ──
     if has_status(enemy, "Taunted"):
@@ -2458,7 +2638,7 @@ def enemy_choose_action(enemy, players, enemies):
             return "flee", None, None
 
     # ── Outnumbered flag for ability escalation ──
-    living_enemies = [e for e in enemies if e.get("alive", True)]
+    living_enemies = ctx.living_enemies
     outnumbered = len(living_players) > len(living_enemies)
 
     # ── Position correction: move toward preferred row if mispositioned ──
@@ -2498,28 +2678,29 @@ def enemy_choose_action(enemy, players, enemies):
             any(isinstance(a, dict) and a.get("type") == "heal" for a in enemy.get("abilities", []))):
 
         # Priority 1: Heal wounded allies
-        should_heal, heal_target, heal_ability = _should_use_heal(enemy, enemies)
+        should_heal, heal_target, heal_ability = _should_use_heal(enemy, enemies, ctx)
         if should_heal:
             return "ability", heal_target, heal_ability
 
         # Priority 2: Offensive ability
-        should_attack, atk_target, atk_ability = _should_use_offensive_ability(enemy, living_players)
+        should_attack, atk_target, atk_ability = _should_use_offensive_ability(
+            enemy, living_players, ctx=ctx)
         if should_attack:
             return "ability", atk_target, atk_ability
 
         # Priority 3: Basic attack on highest-threat target
-        target = max(living_players, key=lambda p: _calc_player_threat(p))
+        target = max(living_players, key=threat_of)
         return "attack", target, None
 
     # ── Boss AI ───────────────────────────────────────────────
     if ai_type == "boss":
         # Priority 1: Buff allies if available and not already buffed
-        should_buff, buff_targets, buff_ability = _should_use_buff(enemy, enemies)
+        should_buff, buff_targets, buff_ability = _should_use_buff(enemy, enemies, ctx)
         if should_buff:
             return "ability", buff_targets, buff_ability
 
         # Priority 2: Tactical targeting (threat + finish potential)
-        target = _pick_tactical_target(enemy, living_players)
+        target = _pick_tactical_target(enemy, living_players, ctx)
         return "attack", target, None
 
     # ── Tactical AI ───────────────────────────────────────────
@@ -2527,11 +2708,11 @@ def enemy_choose_action(enemy, players, enemies):
         # Escalate ability use when outnumbered
         ab_threshold = 0.40 if outnumbered else 0.55
         should_attack, atk_target, atk_ability = _should_use_offensive_ability(
-            enemy, living_players, use_threshold=ab_threshold)
+            enemy, living_players, use_threshold=ab_threshold, ctx=ctx)
         if should_attack:
             return "ability", atk_target, atk_ability
 
-        target = _pick_tactical_target(enemy, living_players)
+        target = _pick_tactical_target(enemy, living_players, ctx)
         return "attack", target, None
 
     # ── Aggressive AI ─────────────────────────────────────────
@@ -2539,13 +2720,12 @@ def enemy_choose_action(enemy, players, enemies):
         # Aggressive enemies use offensive abilities ~30% of the time when available
         if random.random() < 0.30:
             should_attack, atk_target, atk_ability = _should_use_offensive_ability(
-                enemy, living_players, use_threshold=0.35)
+                enemy, living_players, use_threshold=0.35, ctx=ctx)
             if should_attack:
                 return "ability", atk_target, atk_ability
 
         # Pack tactics: pile on the same target an ally is attacking
         if enemy.get("pack_tactics") and random.random() < 0.65:
-            living_enemies = [e for e in enemies if e.get("alive", True)]
             ally_targets = []
             for ally in living_enemies:
                 if ally is not enemy and ally.get("last_target_uid"):
@@ -2559,7 +2739,7 @@ def enemy_choose_action(enemy, players, enemies):
         # Target the most threatening player, weighted by position
         scored = []
         for p in living_players:
-            threat = _calc_player_threat(p)
+            threat = threat_of(p)
             row_w = _row_weight(attack_type, enemy["row"], p["row"])
             scored.append((p, threat * row_w))
         scored.sort(key=lambda x: -x[1])
@@ -2580,7 +2760,7 @@ def enemy_choose_action(enemy, players, enemies):
         scored = []
         for p in living_players:
             score = (1.0 - p["hp"] / max(1, p["max_hp"])) * 10
-            score += _calc_finish_bonus(p, enemy)
+            score += _calc_finish_bonus(p, enemy, ctx.est_damage(enemy, p))
             score *= _row_weight(attack_type, enemy["row"], p["row"])
             scored.append((p, score))
         scored.sort(key=lambda x: -x[1])
@@ -2601,13 +2781,14 @@ def enemy_choose_action(enemy, players, enemies):
     return "attack", target, None
 
 
-def _pick_tactical_target(enemy, living_players):
+def _pick_tactical_target(enemy, living_players, ctx=None):
     """Smart target selection combining threat, position, and finish potential."""
     attack_type = enemy.get("attack_type", "melee")
+    threat_of = ctx.player_threat if ctx else _calc_player_threat
     scored = []
     for p in living_players:
-        threat = _calc_player_threat(p)
-        finish = _calc_finish_bonus(p, enemy)
+        threat = threat_of(p)
+        finish = _calc_finish_bonus(p, enemy, ctx.est_damage(enemy, p) if ctx else None)
         row_w = _row_weight(attack_type, enemy["row"], p["row"])
         total = (threat + finish) * row_w
         scored.append((p, total))
@@ -2688,22 +2869,57 @@ def end_of_round_regen(combatant):
 #  COMBAT STATE MANAGER
 # ═══════════════════════════════════════════════════════════════
 
+@contextmanager
+def _seeded_random(seed):
+    """Run a block on the global random module seeded with seed, then put
+    the caller's RNG state back. seed None: the block uses the RNG as is."""
+    if seed is None:
+        yield
+        return
+    outer = random.getstate()
+    random.seed(seed)
+    try:
+        yield
+    finally:
+        random.setstate(outer)
+
+
 class CombatState:
     """
     Manages the full state of a combat encounter.
     Tracks turn order, round number, combat log, victory/defeat.
     """
 
-    def __init__(self, party_chars, encounter_key, surprise=None, dungeon_id=None):
+    def __init__(self, party_chars, encounter_key, surprise=None, dungeon_id=None,
+                 seed=None, record_to=None, scheduler=None):
+        """seed: set up the fight and run each action on the global RNG
+        reseeded from (seed, action number) so the fight is reproducible;
+        the game's own RNG state is put back afterwards each time.
+        record_to: path of an append-only event file that
+        core.combat_log.replay_combat() can re-run (implies a seed).
+        scheduler: turn scheduling mode, "round" or "timeline" (default
+        TURN_SCHEDULER; see core.turn_scheduler)."""
+        if record_to and seed is None:
+            seed = random.randrange(1 << 31)
+        self.rng_seed = seed
+        self._action_seq = 0
+        self._recorder = None
+        with _seeded_random(seed):
+            self._setup(party_chars, encounter_key, surprise, dungeon_id,
+                        record_to, scheduler)
+
+    def _setup(self, party_chars, encounter_key, surprise, dungeon_id,
+               record_to, scheduler):
         from data.enemies import build_encounter
 
         self.round_num = 1
         self.encounter_name = ""
-        self.combat_log = []
+        self.combat_log = CombatLog()
         self.phase = "player_turn"  # player_turn, enemy_turn, victory, defeat
         self.current_turn_index = 0
         self.turn_order = []
         self.pending_action = None  # set by UI when player chooses
+        self.view_version = 0       # bumped whenever an action resolves (see touch_view)
 
         # Build player combatants — assign rows based on class
         self.players = []
@@ -2812,7 +3028,12 @@ class CombatState:
 
         # Initial turn order
         self.all_combatants = self.players + self.enemies
-        self.turn_order = build_turn_order(self.all_combatants)
+        self.scheduler = TurnScheduler(self.all_combatants, calc_combatant_speed,
+                                       scheduler or TURN_SCHEDULER)
+        self.turn_order = self.scheduler.new_round()
+
+        # Shared enemy-AI context (threat table, living lists, rows)
+        self.ai_ctx = AIContext(self.players, self.enemies)
 
         # XP tracking: count rounds each player was alive (conscious)
         self.rounds_alive = {p["uid"]: 0 for p in self.players}
@@ -2843,6 +3064,20 @@ class CombatState:
         else:
             self.log(f"Round {self.round_num}")
 
+        if record_to:
+            self._recorder = CombatRecorder(record_to)
+            self._recorder.write_header(self, party_chars, encounter_key,
+                                        surprise, dungeon_id)
+            # A fight abandoned before victory/defeat/fled (load, quit,
+            # new combat) still closes its file once the state is dropped
+            weakref.finalize(self, self._recorder.close)
+
+    def close(self):
+        """Close the recording file, if any (also done on victory/defeat/
+        fled and when the CombatState is garbage collected)."""
+        if self._recorder:
+            self._recorder.close()
+
     def _assign_party_rows(self, party_chars):
         """Auto-assign party to rows based on class archetypes."""
         rows = []
@@ -2873,6 +3108,9 @@ class CombatState:
 
     def advance_turn(self):
         """Move to the next combatant's turn. Handle end-of-round."""
+        actor = self.get_current_combatant()
+        if actor is not None:
+            self.scheduler.take(actor)
         self.current_turn_index += 1
 
         # Skip dead combatants
@@ -2940,8 +3178,9 @@ class CombatState:
                 c["is_defending"] = False
 
         # Rebuild turn order
-        self.turn_order = build_turn_order(self.all_combatants)
+        self.turn_order = self.scheduler.new_round()
         self.current_turn_index = 0
+        self.ai_ctx.resync()
 
         # Tally XP: credit players who were alive this round
         for p in self.players:
@@ -2988,6 +3227,64 @@ class CombatState:
             if best > enemy.get("knowledge_tier", 0):
                 enemy["knowledge_tier"] = best
 
+    # ── Event stream ──────────────────────────────────────────────
+
+    def _action_rng(self):
+        """Seeded mode: run one action on the global RNG reseeded per action,
+        so the outcome doesn't depend on how much randomness the rest of
+        the game consumed in between (and the game's RNG is restored)."""
+        if self.rng_seed is None:
+            return _seeded_random(None)
+        return _seeded_random(self.rng_seed * 1000003 + self._action_seq)
+
+    def _finish_action(self, kind, actor, action, target, result, status_before,
+                       ability=None, item=None):
+        """Record a CombatEvent for a resolved action (and write it to disk)."""
+        events = []
+        if actor is not None and result is not None:
+            new_status = ()
+            if isinstance(target, dict):
+                new_status = tuple(
+                    s["name"] for s in target.get("status_effects", [])
+                    if s.get("name") not in status_before)
+            ev = CombatEvent.from_result(self, actor, action, target, result,
+                                         new_status)
+            self.combat_log.record(ev)
+            events.append(ev)
+        if self._recorder:
+            self._recorder.write_action(
+                kind, self._action_seq, events, action=action,
+                target=encode_target(self, target) if kind == "player" else None,
+                ability=ability, item=item)
+        self._action_seq += 1
+        self.ai_ctx.update(actor, target)
+        if self.scheduler.refresh() and self.scheduler.mode == "timeline":
+            # Someone got faster or slower: replan what is left of the round
+            self.turn_order = (self.turn_order[:self.current_turn_index]
+                               + self.scheduler.rest_of_round())
+        self.touch_view()
+        if self._recorder and self.phase in ("victory", "defeat", "fled"):
+            self._recorder.close()
+
+    def turn_preview(self, n=TURN_PREVIEW_LEN, after=None):
+        """The next n combatants to act after turn_order[after] (default:
+        the current turn). Turns past this round are a projection."""
+        if after is None:
+            after = self.current_turn_index
+        return self.scheduler.preview(self.turn_order, after, n)
+
+    def touch_view(self):
+        """Tell the UI's retained view model (ui.combat_ui.CombatView) that
+        combatants may have changed. Every action already does this;
+        anything that edits combatants outside an action must call it."""
+        self.view_version += 1
+
+    @staticmethod
+    def _status_names(target):
+        if isinstance(target, dict):
+            return {s.get("name") for s in target.get("status_effects", [])}
+        return set()
+
     def execute_player_action(self, action_type, target=None, ability=None, item=None):
         """Execute a player's chosen action.
         action_type: attack | defend | ability | move | flee | switch_weapon | use_consumable
@@ -2998,6 +3295,18 @@ class CombatState:
         actor = self.get_current_combatant()
         if not actor or actor["type"] != "player":
             return
+        with self._action_rng():
+            status_before = self._status_names(target)
+            result = self._execute_player_action(actor, action_type, target, ability, item)
+            action = action_type
+            if action_type == "ability" and isinstance(ability, dict):
+                action = f"ability:{ability.get('name', '?')}"
+            self._finish_action("player", actor, action, target,
+                                result if result is not None else {},
+                                status_before, ability=ability, item=item)
+        return result
+
+    def _execute_player_action(self, actor, action_type, target, ability, item):
 
         if action_type == "attack":
             result = resolve_basic_attack(actor, target, enemies=self.enemies)
@@ -3077,6 +3386,7 @@ class CombatState:
         # Equip
         actor["weapon"] = dict(item)
         char_ref.equipment["weapon"] = dict(item)
+        self.scheduler.invalidate(actor)
         return {"messages": [f"{actor['name']} switches to {item.get('name', 'a weapon')}!"]}
 
     def _exec_bolt_attack(self, actor, target, ability):
@@ -3354,6 +3664,23 @@ class CombatState:
         actor = self.get_current_combatant()
         if not actor or actor["type"] != "enemy":
             return {}
+        with self._action_rng():
+            self._enemy_target = None
+            result = self._execute_enemy_turn(actor)
+            target = self._enemy_target
+            result_d = result or {}
+            action = result_d.get("action", "turn")
+            if result_d.get("ability_name"):
+                action = f"ability:{result_d['ability_name']}"
+            elif result_d.get("fled"):
+                action = "flee"
+            self._finish_action("enemy", actor, action, target, result_d,
+                                self._enemy_status_before)
+        self._enemy_target = None
+        return result
+
+    def _execute_enemy_turn(self, actor):
+        self._enemy_status_before = set()
 
         # Skip if time_stop is active on any player (all enemies frozen)
         if any(
@@ -3379,6 +3706,8 @@ class CombatState:
                     import random as _rand
                     confused_target = _rand.choice(all_living)
                     self.log(f"{actor['name']} is Confused and attacks {confused_target['name']}!")
+                    self._enemy_target = confused_target
+                    self._enemy_status_before = self._status_names(confused_target)
                     result = resolve_enemy_attack(actor, confused_target)
                     for m in result.get("messages", []):
                         self.log(m)
@@ -3462,7 +3791,10 @@ class CombatState:
                 _apply_boss_transform(actor, phase_result["transform"])
                 actor = self.get_current_combatant()
 
-        action, target, ability = enemy_choose_action(actor, self.players, self.enemies)
+        action, target, ability = enemy_choose_action(actor, self.players, self.enemies,
+                                                     self.ai_ctx)
+        self._enemy_target = target if isinstance(target, (dict, list)) else None
+        self._enemy_status_before = self._status_names(target)
 
         # ── INT: Enemy ability recognition ────────────────────────
         # If the enemy is about to use a non-basic ability, check if
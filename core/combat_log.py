@@ -0,0 +1,298 @@
+"""
+Realm of Shadows — Combat Log & Event Stream
+
+Bounded storage for everything a fight produces:
+  CombatEvent    — compact typed record of one action (refs, not dicts)
+  CombatLog      — ring buffer of log lines + CombatEvents
+  CombatRecorder — optional append-only JSON-lines file of player input
+  replay_combat  — rebuild a fresh CombatState from a recorded file
+
+Combatants are referred to by stable refs instead of object identity:
+  "p<index>"  — party member by position in CombatState.players
+  "e<uid>"    — enemy by its encounter uid
+so records never keep attacker/target dicts (or Character objects) alive,
+and a replayed fight resolves the same refs to its own combatants.
+
+Recording file format (one JSON object per line):
+  {"kind": "header", "encounter": ..., "seed": ..., "party": [...], ...}
+  {"kind": "player", "seq": 0, "action": "attack", "target": "e2", ...}
+  {"kind": "enemy",  "seq": 1, "events": [...]}
+"""
+
+import json
+from collections import deque
+
+from core.combat_config import COMBAT_LOG_CAPACITY, COMBAT_EVENT_CAPACITY
+
+
+# ═══════════════════════════════════════════════════════════════
+#  COMBATANT REFS
+# ═══════════════════════════════════════════════════════════════
+
+def combatant_ref(combat, c):
+    """Stable string ref for a combatant dict (None for non-combatants)."""
+    if not isinstance(c, dict):
+        return None
+    if c.get("type") == "player":
+        for i, p in enumerate(combat.players):
+            if p is c:
+                return f"p{i}"
+        return None
+    if "uid" in c:
+        return f"e{c['uid']}"
+    return None
+
+
+def resolve_ref(combat, ref):
+    """Inverse of combatant_ref()."""
+    if not isinstance(ref, str) or len(ref) < 2:
+        return None
+    try:
+        n = int(ref[1:])
+    except ValueError:
+        return None
+    if ref[0] == "p":
+        return combat.players[n] if 0 <= n < len(combat.players) else None
+    if ref[0] == "e":
+        return next((e for e in combat.enemies if e.get("uid") == n), None)
+    return None
+
+
+def encode_target(combat, target):
+    """Target → JSON-safe value: ref, list of refs, direction string or None."""
+    if isinstance(target, dict):
+        return combatant_ref(combat, target)
+    if isinstance(target, list):
+        return [combatant_ref(combat, t) for t in target]
+    return target
+
+
+def decode_target(combat, value):
+    if isinstance(value, list):
+        return [resolve_ref(combat, r) for r in value]
+    if isinstance(value, str) and value[:1] in ("p", "e") and value[1:].isdigit():
+        return resolve_ref(combat, value)
+    return value
+
+
+# ═══════════════════════════════════════════════════════════════
+#  TYPED EVENT RECORD
+# ═══════════════════════════════════════════════════════════════
+
+class CombatEvent:
+    """One resolved action. Holds only scalars — never combatant dicts."""
+    __slots__ = ("round", "actor", "action", "target",
+                 "damage", "healing", "hit", "crit", "status")
+
+    def __init__(self, round, actor, action, target=None, damage=0,
+                 healing=0, hit=True, crit=False, status=()):
+        self.round   = round
+        self.actor   = actor      # combatant ref
+        self.action  = action     # attack | ability:<name> | defend | move | ...
+        self.target  = target     # ref, [refs] or direction
+        self.damage  = damage
+        self.healing = healing
+        self.hit     = hit
+        self.crit    = crit
+        self.status  = tuple(status)   # statuses newly applied to target
+
+    @classmethod
+    def from_result(cls, combat, actor, action, target, result, new_status=()):
+        result = result or {}
+        dmg = result.get("damage", 0)
+        heal = result.get("healing", 0)
+        return cls(
+            combat.round_num,
+            combatant_ref(combat, actor),
+            action,
+            encode_target(combat, target),
+            dmg if isinstance(dmg, int) else 0,
+            heal if isinstance(heal, int) else 0,
+            result.get("hit", True) is not False,
+            bool(result.get("is_crit")),
+            new_status,
+        )
+
+    def to_dict(self):
+        return {k: getattr(self, k) for k in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, d):
+        return cls(**{k: d[k] for k in cls.__slots__ if k in d})
+
+    def __eq__(self, other):
+        return (isinstance(other, CombatEvent)
+                and all(getattr(self, k) == getattr(other, k) for k in self.__slots__))
+
+    def format(self, combat=None):
+        """Human-readable one-liner, built only when asked for."""
+        def _name(ref):
+            c = resolve_ref(combat, ref) if combat is not None else None
+            return c["name"] if c else str(ref)
+        tgt = self.target
+        if isinstance(tgt, list):
+            tgt_txt = ", ".join(_name(r) for r in tgt)
+        else:
+            tgt_txt = _name(tgt) if tgt else ""
+        parts = [f"R{self.round} {_name(self.actor)} {self.action}"]
+        if tgt_txt:
+            parts.append(f"→ {tgt_txt}")
+        if not self.hit:
+            parts.append("MISS")
+        if self.damage:
+            parts.append(f"{self.damage} dmg" + (" CRIT" if self.crit else ""))
+        if self.healing:
+            parts.append(f"+{self.healing} HP")
+        if self.status:
+            parts.append("[" + ", ".join(self.status) + "]")
+        return " ".join(parts)
+
+    def __repr__(self):
+        return f"CombatEvent({self.format()})"
+
+
+# ═══════════════════════════════════════════════════════════════
+#  RING BUFFER
+# ═══════════════════════════════════════════════════════════════
+
+class CombatLog:
+    """Bounded combat log. Behaves like the old list of strings for readers
+    (len, indexing, slicing, iteration) but drops the oldest lines once
+    full, and keeps a parallel ring of CombatEvent records."""
+
+    def __init__(self, capacity=COMBAT_LOG_CAPACITY,
+                 event_capacity=COMBAT_EVENT_CAPACITY):
+        self._lines = deque(maxlen=capacity)
+        self.events = deque(maxlen=event_capacity)
+        self.total = 0          # lines ever appended (absolute index of next line)
+
+    def append(self, msg):
+        self._lines.append(msg)
+        self.total += 1
+
+    def record(self, event):
+        self.events.append(event)
+
+    @property
+    def first_index(self):
+        """Absolute index of the oldest line still buffered."""
+        return self.total - len(self._lines)
+
+    def __len__(self):
+        return len(self._lines)
+
+    def __iter__(self):
+        return iter(self._lines)
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            start, stop, step = idx.indices(len(self._lines))
+            return [self._lines[i] for i in range(start, stop, step)]
+        return self._lines[idx]
+
+    def clear(self):
+        self._lines.clear()
+        self.events.clear()
+
+
+# ═══════════════════════════════════════════════════════════════
+#  ON-DISK RECORDING & REPLAY
+# ═══════════════════════════════════════════════════════════════
+
+def _json_safe(obj):
+    """Deep-copy into JSON types, dropping back-references."""
+    return json.loads(json.dumps(obj, default=lambda o: None))
+
+
+class CombatRecorder:
+    """Append-only JSON-lines recording of one fight."""
+
+    def __init__(self, path):
+        self.path = path
+        self._fh = open(path, "a", encoding="utf-8")
+
+    def _write(self, entry):
+        self._fh.write(json.dumps(entry, default=lambda o: None) + "\n")
+        self._fh.flush()
+
+    def write_header(self, combat, party_chars, encounter_key, surprise, dungeon_id):
+        from core.save_load import serialize_character
+        self._write({
+            "kind": "header",
+            "encounter": encounter_key,
+            "surprise": surprise,
+            "dungeon_id": dungeon_id,
+            "seed": combat.rng_seed,
+            "party": [serialize_character(c) for c in party_chars],
+        })
+
+    def write_action(self, kind, seq, events, action=None, target=None,
+                     ability=None, item=None):
+        entry = {"kind": kind, "seq": seq,
+                 "events": [e.to_dict() for e in events]}
+        if kind == "player":
+            entry["action"] = action
+            entry["target"] = target
+            entry["ability"] = _json_safe(ability) if ability else None
+            entry["item"] = _json_safe(item) if item else None
+        self._write(entry)
+
+    def close(self):
+        if self._fh and not self._fh.closed:
+            self._fh.close()
+
+
+def read_recording(path):
+    """Return (header, [action entries]) from a recording file."""
+    header, actions = None, []
+    with open(path, encoding="utf-8") as fh:
+        for line in fh:
+            line = line.strip()
+            if not line:
+                continue
+            entry = json.loads(line)
+            if entry.get("kind") == "header":
+                header = entry
+            else:
+                actions.append(entry)
+    return header, actions
+
+
+def replay_combat(path, upto=None):
+    """Rebuild a fresh CombatState from a recording and re-run every action.
+
+    upto: stop after this many actions (None = all).
+    Returns the CombatState; its combat_log.events can be compared with
+    the events stored in the file.
+    """
+    from core.combat_engine import CombatState
+    from core.save_load import deserialize_character
+
+    header, actions = read_recording(path)
+    if header is None:
+        raise ValueError(f"{path}: no combat header")
+    party = [deserialize_character(d) for d in header["party"]]
+    combat = CombatState(party, header["encounter"],
+                         surprise=header.get("surprise"),
+                         dungeon_id=header.get("dungeon_id"),
+                         seed=header["seed"])
+    for n, entry in enumerate(actions):
+        if upto is not None and n >= upto:
+            break
+        if entry["kind"] == "enemy":
+            combat.execute_enemy_turn()
+            continue
+        actor = combat.get_current_combatant()
+        item = entry.get("item")
+        char_ref = actor.get("character_ref") if actor else None
+        if item and char_ref is not None:
+            # Use the matching inventory entry so removal-by-identity works
+            item = next((i for i in char_ref.inventory
+                         if i.get("name") == item.get("name")), item)
+        combat.execute_player_action(
+            entry["action"],
+            target=decode_target(combat, entry.get("target")),
+            ability=entry.get("ability"),
+            item=item,
+        )
+    return combat
@@ -0,0 +1,278 @@
+"""
+Realm of Shadows — Combat Odds
+
+Hit chance, crit chance and the damage distribution of an attack, worked
+out from the same resolver pieces the fight itself uses
+(calc_physical_accuracy / calc_enemy_accuracy / calc_magic_accuracy,
+calc_crit_chance, calc_physical_damage / calc_enemy_damage /
+calc_magic_damage) instead of by rolling dice.
+
+Every random input to those formulas is either a whole-percent roll
+(hit, crit, dodge — exact probabilities) or a uniform variance roll.
+Damage is non-decreasing in the variance roll, so it is tabulated at
+VARIANCE_STEPS evenly spaced quantiles of that roll (per crit / base-
+damage branch) with the resolvers' own variance= parameter. That gives
+the damage distribution on a hit to within 1/VARIANCE_STEPS of any
+percentile, and its mean to well under a point of damage.
+
+Results are memoized on a signature of everything the formulas read:
+both sides' stats, class, race, level, row, defense, resistances,
+statuses (names and effects, not durations), the weapon or spell, and
+the position modifiers. HP only matters through last_stand, so it only
+enters as that flag — a preview costs one signature per frame.
+
+Used by the combat UI's hover preview and by the enemy AI's finish
+check (AIContext.est_damage).
+"""
+import math
+
+from core.combat_config import (
+    DAMAGE_VARIANCE_MIN, DAMAGE_VARIANCE_MAX,
+    MAGIC_VARIANCE_MIN, MAGIC_VARIANCE_MAX, MINIMUM_DAMAGE,
+)
+
+VARIANCE_STEPS = 64         # variance quantiles tabulated per branch
+MAX_EVALS      = 256        # cap on resolver calls for one enemy attack
+_CACHE_MAX     = 2048
+
+_COMBATANT_KEYS = ("type", "class_name", "race_name", "level", "stats", "row",
+                   "defense", "magic_resist", "resistances", "is_defending",
+                   "focus_bonus", "accuracy_bonus", "attack_damage", "attack_type",
+                   "phys_type", "_temp_dmg_buff", "tags")
+
+_cache = {}
+
+
+# ═══════════════════════════════════════════════════════════════
+#  RESULT
+# ═══════════════════════════════════════════════════════════════
+
+class Odds:
+    """Outcome of one attack.
+
+    hit          — chance the attack connects (after dodges)
+    crit         — chance a connecting attack crits
+    dist         — ((damage, probability), …) for a connecting attack,
+                   ascending, probabilities summing to 1
+    mean_on_hit  — expected damage when it connects
+    mean         — expected damage per attempt (misses count as 0)
+    lo, hi       — least and most damage a hit can do
+    """
+    __slots__ = ("hit", "crit", "dist", "mean_on_hit", "mean", "lo", "hi")
+
+    def __init__(self, hit, crit, dist):
+        self.hit = hit
+        self.crit = crit
+        self.dist = dist
+        self.mean_on_hit = sum(d * p for d, p in dist)
+        self.mean = hit * self.mean_on_hit
+        self.lo = dist[0][0] if dist else 0
+        self.hi = dist[-1][0] if dist else 0
+
+    def percentile(self, q):
+        """Damage of a connecting hit at quantile q (0-1)."""
+        acc = 0.0
+        for d, p in self.dist:
+            acc += p
+            if acc >= q - 1e-9:
+                return d
+        return self.hi
+
+    def kill_chance(self, hp):
+        """Chance one attempt deals at least hp damage."""
+        return self.hit * sum(p for d, p in self.dist if d >= hp)
+
+    def __repr__(self):
+        return (f"Odds(hit={self.hit:.2f}, crit={self.crit:.2f}, "
+                f"dmg={self.lo}-{self.hi}, mean_on_hit={self.mean_on_hit:.1f})")
+
+
+# ═══════════════════════════════════════════════════════════════
+#  SIGNATURES
+# ═══════════════════════════════════════════════════════════════
+
+def _freeze(v):
+    if isinstance(v, dict):
+        return tuple(sorted((k, _freeze(x)) for k, x in v.items()))
+    if isinstance(v, (list, tuple)):
+        return tuple(_freeze(x) for x in v)
+    if isinstance(v, (set, frozenset)):
+        return frozenset(_freeze(x) for x in v)
+    try:
+        hash(v)
+        return v
+    except TypeError:
+        return repr(v)
+
+
+def _status_sig(c):
+    return tuple((s.get("name"), s.get("type"), s.get("effect"), s.get("value"))
+                 for s in c.get("status_effects", ()))
+
+
+def combatant_signature(c):
+    """Everything about a combatant that the damage/accuracy formulas read."""
+    return (tuple(_freeze(c.get(k)) for k in _COMBATANT_KEYS),
+            _status_sig(c),
+            c.get("hp", 0) / max(1, c.get("max_hp", 1)) <= 0.25)
+
+
+def _memo(key, build):
+    hit = _cache.get(key)
+    if hit is None:
+        if len(_cache) >= _CACHE_MAX:
+            _cache.clear()
+        hit = _cache[key] = build()
+    return hit
+
+
+def cache_clear():
+    _cache.clear()
+
+
+# ═══════════════════════════════════════════════════════════════
+#  TABULATION
+# ═══════════════════════════════════════════════════════════════
+
+def _pct(chance):
+    """P(randint(1, 100) <= chance)."""
+    return max(0, min(100, math.floor(chance))) / 100.0
+
+
+def _quantiles(lo, hi, steps):
+    return [lo + (hi - lo) * (i + 0.5) / steps for i in range(steps)]
+
+
+def _tabulate(branches):
+    """branches: [(weight, [damage, …])] with each list an equal-weight
+    sample. Returns the merged ((damage, p), …) table."""
+    table = {}
+    for weight, damages in branches:
+        if weight <= 0 or not damages:
+            continue
+        each = weight / len(damages)
+        for d in damages:
+            table[d] = table.get(d, 0.0) + each
+    total = sum(table.values()) or 1.0
+    return tuple((d, p / total) for d, p in sorted(table.items()))
+
+
+# ═══════════════════════════════════════════════════════════════
+#  ATTACKS
+# ═══════════════════════════════════════════════════════════════
+
+def attack_odds(attacker, defender, enemies=None):
+    """Odds of a basic attack, as resolve_basic_attack (players) or
+    resolve_enemy_attack (enemies) would resolve it. enemies: the enemy
+    list, for the empty-row adjustment players get."""
+    if attacker.get("type") == "player":
+        return _player_attack_odds(attacker, defender, enemies)
+    return _enemy_attack_odds(attacker, defender)
+
+
+def _player_attack_odds(attacker, defender, enemies):
+    from core.combat_engine import (
+        get_position_mods, get_adjusted_position_mods, get_weapon,
+        calc_physical_accuracy, calc_crit_chance, calc_physical_damage,
+        attack_buff_mult, defense_buff_reduction,
+    )
+    weapon = attacker.get("weapon") or get_weapon("Unarmed")
+    weapon_range = weapon.get("range", "melee")
+    is_xbow = weapon.get("special", {}).get("is_crossbow", False)
+    if enemies is not None:
+        pos_dmg, pos_acc = get_adjusted_position_mods(weapon_range, attacker, defender,
+                                                      enemies, is_xbow)
+    else:
+        pos_dmg, pos_acc = get_position_mods(weapon_range, attacker["row"],
+                                             defender["row"], is_xbow)
+    key = ("attack", combatant_signature(attacker), combatant_signature(defender),
+           _freeze(weapon), pos_dmg, pos_acc)
+
+    def build():
+        hit = _pct(calc_physical_accuracy(attacker, defender, weapon, pos_acc))
+        if defender.get("type") == "player":
+            from core.races import get_racial_dodge_bonus
+            dodge = get_racial_dodge_bonus(defender.get("race_name", "Human"))
+            hit *= 1.0 - max(0.0, min(1.0, dodge))
+            evasive = sum(1 for st in defender.get("status_effects", [])
+                          if st["name"] in ("evasion", "smoke_screen"))
+            hit *= 0.55 ** evasive
+        chance, crit_data = calc_crit_chance(attacker, "physical", weapon)
+        crit = _pct(chance)
+        atk_mult = attack_buff_mult(attacker)
+        def_reduce = defense_buff_reduction(defender)
+
+        def damages(is_crit):
+            out = []
+            for v in _quantiles(DAMAGE_VARIANCE_MIN, DAMAGE_VARIANCE_MAX, VARIANCE_STEPS):
+                d = calc_physical_damage(attacker, defender, weapon, position_dmg_mod=pos_dmg,
+                                         is_crit=is_crit, crit_data=crit_data if is_crit else None,
+                                         variance=v)
+                if atk_mult != 1.0:
+                    d = max(MINIMUM_DAMAGE, int(d * atk_mult))
+                if def_reduce:
+                    d = max(MINIMUM_DAMAGE, d - def_reduce)
+                out.append(d)
+            return out
+
+        branches = [(1.0 - crit, damages(False))]
+        if crit > 0:
+            branches.append((crit, damages(True)))
+        return Odds(hit, crit, _tabulate(branches))
+
+    return _memo(key, build)
+
+
+def _enemy_attack_odds(attacker, defender):
+    from core.combat_engine import (
+        get_position_mods, calc_enemy_accuracy, calc_enemy_damage,
+        enemy_damage_range, fading_shadow_damage,
+    )
+    pos_dmg, pos_acc = get_position_mods(attacker.get("attack_type", "melee"),
+                                         attacker["row"], defender["row"])
+    key = ("enemy_attack", combatant_signature(attacker), combatant_signature(defender),
+           pos_dmg, pos_acc)
+
+    def build():
+        hit = _pct(calc_enemy_accuracy(attacker, defender, pos_acc))
+        lo, hi = enemy_damage_range(attacker)
+        bases = range(lo, hi + 1)
+        steps = max(4, min(VARIANCE_STEPS, MAX_EVALS // len(bases)))
+        shadow = fading_shadow_damage(attacker, defender)
+        branches = []
+        for base in bases:
+            branches.append((1.0, [
+                calc_enemy_damage(attacker, defender, pos_dmg, base_dmg=base, variance=v) + shadow
+                for v in _quantiles(DAMAGE_VARIANCE_MIN, DAMAGE_VARIANCE_MAX, steps)]))
+        return Odds(hit, 0.0, _tabulate(branches))
+
+    return _memo(key, build)
+
+
+def spell_odds(attacker, defender, spell, dmg_mult=1.0, bonus_crit=0):
+    """Odds of a single-target damage spell: calc_magic_accuracy, a spell
+    crit check (plus an ability's bonus_crit re-roll) and calc_magic_damage,
+    scaled by the caller's dmg_mult."""
+    from core.combat_engine import calc_magic_accuracy, calc_crit_chance, calc_magic_damage
+    key = ("spell", combatant_signature(attacker), combatant_signature(defender),
+           _freeze(spell), _freeze(attacker.get("weapon")), dmg_mult, bonus_crit)
+
+    def build():
+        hit = _pct(calc_magic_accuracy(attacker, defender, spell))
+        chance, _ = calc_crit_chance(attacker, "spell")
+        crit = _pct(chance)
+        if bonus_crit > 0:
+            crit += (1.0 - crit) * _pct(bonus_crit)
+
+        def damages(is_crit):
+            return [max(MINIMUM_DAMAGE,
+                        int(calc_magic_damage(attacker, defender, spell, is_crit, variance=v)
+                            * dmg_mult))
+                    for v in _quantiles(MAGIC_VARIANCE_MIN, MAGIC_VARIANCE_MAX, VARIANCE_STEPS)]
+
+        branches = [(1.0 - crit, damages(False))]
+        if crit > 0:
+            branches.append((crit, damages(True)))
+        return Odds(hit, crit, _tabulate(branches))
+
+    return _memo(key, build)
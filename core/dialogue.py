@@ -44,10 +44,211 @@ Nodes can have:
   - "choices": list of {text, next, conditions?, on_select?}
   - "next": auto-advance to another node
   - "end": True to end the conversation
+
+Trees are compiled once (compile_tree) into node tables: interned node
+ids, each choice's conditions bound into one predicate, each action
+bound to its handler. Trees registered with add_farewell_exits (the
+static NPC_DIALOGUES tables) also get a "Farewell." exit on every choice
+node that has none; runtime-built trees (boss aftermath "Continue"
+chains) compile exactly as written. The compiler reports next targets
+that don't exist and nodes that can't be reached from "start"
+(compile_dialogues checks a whole dialogue table; the test suite keeps
+it clean).
+DialogueState caches the visible choices of the current node until a
+story flag changes (story_flags.flags_version()).
 """
 
+import operator
+import sys
+
 from core.story_flags import check_conditions, set_flag, start_quest, \
-    complete_quest, discover_lore, meet_npc, defeat_boss, set_quest_state
+    complete_quest, discover_lore, meet_npc, set_quest_state, flags_version
+from core import story_flags
+
+
+END = "__end__"             # choice target that closes the conversation
+FAREWELL_HINTS = {"pass", "leav", "brows", "look", "bye",
+                  "farewel", "nothing", "just"}
+_EXIT_HINTS = FAREWELL_HINTS | {"that's all"}
+_FAREWELL_EXIT = {"text": "Farewell.", "next": None}
+
+
+# ═══════════════════════════════════════════════════════════════
+#  COMPILED GRAPHS
+# ═══════════════════════════════════════════════════════════════
+
+class DialogueNode:
+    """A compiled node. raw is the source dict (what the UI reads)."""
+    __slots__ = ("id", "raw", "speaker", "text", "next", "end",
+                 "on_enter", "choices")
+
+    def __init__(self, node_id, raw, on_enter, choices):
+        self.id = node_id
+        self.raw = raw
+        self.speaker = raw.get("speaker", "")
+        self.text = raw.get("text", "")
+        nxt = raw.get("next")
+        self.next = sys.intern(nxt) if isinstance(nxt, str) else nxt
+        self.end = bool(raw.get("end"))
+        self.on_enter = on_enter
+        self.choices = choices
+
+
+class DialogueChoice:
+    __slots__ = ("raw", "next", "visible", "on_select")
+
+    def __init__(self, raw, visible, on_select):
+        self.raw = raw
+        nxt = raw.get("next")
+        self.next = sys.intern(nxt) if isinstance(nxt, str) else nxt
+        self.visible = visible          # predicate, or None = always shown
+        self.on_select = on_select
+
+
+class DialogueGraph:
+    """A compiled tree: node table, loop flag, and build-time problems."""
+    __slots__ = ("tree", "nodes", "loop", "menu", "problems")
+
+    def __init__(self, tree, nodes, problems):
+        self.tree = tree
+        self.nodes = nodes
+        self.loop = bool(tree.get("loop"))
+        self.problems = problems
+        start = nodes.get("start")
+        # Loop-back menu: start's choices, empty text, no on_enter
+        self.menu = (DialogueNode("start", {"text": "", "choices": start.raw.get("choices", [])},
+                                  (), start.choices)
+                     if start else None)
+
+
+# Condition ops — same semantics as story_flags.check_conditions
+_COND_OPS = {
+    "exists":     lambda a, e: a is not None,
+    "not_exists": lambda a, e: a is None,
+    "==":         operator.eq,
+    "!=":         operator.ne,
+    ">":          lambda a, e: a is not None and a > e,
+    "<":          lambda a, e: a is not None and a < e,
+    ">=":         lambda a, e: a is not None and a >= e,
+    "<=":         lambda a, e: a is not None and a <= e,
+}
+
+
+def compile_conditions(conditions):
+    """Bind a condition list into one predicate (None when always true)."""
+    tests = []
+    for cond in conditions or ():
+        op = _COND_OPS.get(cond.get("op", "=="))
+        if op is not None:          # unknown ops never fail, as before
+            tests.append((cond["flag"], op, cond.get("value", True)))
+    if not tests:
+        return None
+    tests = tuple(tests)
+
+    def visible():
+        flags = story_flags._flags
+        for key, op, expected in tests:
+            if not op(flags.get(key), expected):
+                return False
+        return True
+    return visible
+
+
+def compile_actions(actions):
+    """Bind each action dict to its handler. Unknown actions are dropped."""
+    bound = []
+    for action in actions or ():
+        handler = _ACTIONS.get(action.get("action", ""))
+        if handler is not None:
+            bound.append(lambda h=handler, a=action: h(a))
+    return tuple(bound)
+
+
+def compile_tree(tree, strict=False, add_exits=False):
+    """Compile a dialogue tree into a DialogueGraph. Problems (missing next
+    targets, nodes unreachable from start) are listed on graph.problems;
+    strict=True raises ValueError instead. add_exits gives choice nodes
+    without an exit a "Farewell." choice."""
+    raw_nodes = tree.get("nodes", {})
+    nodes = {}
+    for node_id, raw in raw_nodes.items():
+        node_id = sys.intern(node_id)
+        raw_choices = raw.get("choices")
+        choices = ()
+        if raw_choices:
+            raw_choices = list(raw_choices)
+            # Never leave the player without a way out of a choice node
+            if add_exits and not any(c.get("next") is None for c in raw_choices):
+                raw_choices.append(dict(_FAREWELL_EXIT))
+            choices = tuple(DialogueChoice(c, compile_conditions(c.get("conditions")),
+                                           compile_actions(c.get("on_select")))
+                            for c in raw_choices)
+        nodes[node_id] = DialogueNode(node_id, raw, compile_actions(raw.get("on_enter")),
+                                      choices)
+
+    problems = []
+    if "start" not in nodes:
+        problems.append("no start node")
+    for node in nodes.values():
+        targets = [node.next] + [c.next for c in node.choices]
+        for t in targets:
+            if t and t != END and t not in nodes:
+                problems.append(f"{node.id}: next {t!r} does not exist")
+    reached = {"start"}
+    stack = ["start"]
+    while stack:
+        node = nodes.get(stack.pop())
+        if node is None:
+            continue
+        for t in [node.next] + [c.next for c in node.choices]:
+            if t in nodes and t not in reached:
+                reached.add(t)
+                stack.append(t)
+    problems += [f"{nid}: unreachable" for nid in nodes if nid not in reached]
+
+    if strict and problems:
+        raise ValueError(f"dialogue {tree.get('id', '?')}: " + "; ".join(problems))
+    return DialogueGraph(tree, nodes, problems)
+
+
+_graphs = {}                # id(tree) → (tree, graph)
+_GRAPH_CACHE_MAX = 512
+_exit_trees = {}            # id(tree) → tree compiled with add_exits
+
+
+def add_farewell_exits(dialogues):
+    """Mark every tree in an NPC dialogue table ({npc: [{conditions, tree}]})
+    to be compiled with a "Farewell." exit on choice nodes lacking one."""
+    for branches in dialogues.values():
+        for branch in branches:
+            tree = branch.get("tree")
+            if tree is not None:
+                _exit_trees[id(tree)] = tree
+                _graphs.pop(id(tree), None)
+
+
+def get_graph(tree):
+    """The compiled graph for tree, compiled on first use."""
+    hit = _graphs.get(id(tree))
+    if hit is not None and hit[0] is tree:
+        return hit[1]
+    if len(_graphs) >= _GRAPH_CACHE_MAX:
+        _graphs.clear()
+    graph = compile_tree(tree, add_exits=_exit_trees.get(id(tree)) is tree)
+    _graphs[id(tree)] = (tree, graph)
+    return graph
+
+
+def compile_dialogues(dialogues):
+    """Compile every tree in an NPC dialogue table ({npc: [{conditions, tree}]}).
+    Returns [(npc_id, branch index, problem)]."""
+    problems = []
+    for npc_id, branches in dialogues.items():
+        for i, branch in enumerate(branches):
+            tree = branch.get("tree")
+            if tree is not None:
+                problems += [(npc_id, i, p) for p in get_graph(tree).problems]
+    return problems
 
 
 # ═══════════════════════════════════════════════════════════════
@@ -59,62 +260,73 @@ class DialogueState:
 
     def __init__(self, tree):
         self.tree = tree
+        self.graph = get_graph(tree)
         self.nodes = tree["nodes"]
         self.current_node_id = "start"
-        self.current_node = self.nodes["start"]
+        self._node = self.graph.nodes["start"]
+        self.current_node = self._node.raw
         self.finished = False
         self._end_pending = False  # True when on an end=True node, waiting for final click
         self.log = []  # list of (speaker, text) for scroll-back
+        self._choices = (None, -1, (), ())  # (node, flags version, raw, compiled)
 
         # Execute on_enter for start node
-        self._enter_node(self.current_node)
+        self._enter_node(self._node)
+
+    def _goto(self, node):
+        self._node = node
+        self.current_node_id = node.id
+        self.current_node = node.raw
 
     def _enter_node(self, node):
         """Process entering a node: execute actions, record in log."""
-        speaker = node.get("speaker", "")
-        text = node.get("text", "")
-        if text:
-            self.log.append((speaker, text))
+        if node.text:
+            self.log.append((node.speaker, node.text))
 
         # Execute on_enter actions
-        for action in node.get("on_enter", []):
-            _execute_action(action)
+        for act in node.on_enter:
+            act()
 
         # Check if this is an end node.
         # We do NOT set finished=True here — instead we set _end_pending so
         # the dialogue renders the text first, then closes on the next click.
-        if node.get("end"):
+        if node.end:
             self._end_pending = True
 
     def get_speaker(self):
-        return self.current_node.get("speaker", "")
+        return self._node.speaker
 
     def get_text(self):
-        return self.current_node.get("text", "")
+        return self._node.text
 
-    def get_choices(self):
-        """Get available choices, filtered by conditions."""
-        raw = self.current_node.get("choices", [])
-        result = []
-        for choice in raw:
-            conds = choice.get("conditions", [])
-            if check_conditions(conds):
-                result.append(choice)
+    def _visible_choices(self):
+        node, version, raw, compiled = self._choices
+        current = flags_version()
+        if node is self._node and version == current:
+            return raw, compiled
+        compiled = [c for c in self._node.choices if c.visible is None or c.visible()]
+        raw = [c.raw for c in compiled]
 
         # For looping Q&A trees: ensure there's always an exit option so the
         # player isn't trapped. If the start node has no farewell-type choice,
         # inject one. Only needed when we're displaying the start-menu node.
-        if self.tree.get("loop") and self.current_node_id == "start":
-            FAREWELL_HINTS = {"pass", "leav", "brows", "look", "bye",
-                              "farewel", "nothing", "just"}
+        if self.graph.loop and self.current_node_id == "start":
             has_exit = any(
                 any(h in c["text"].lower() for h in FAREWELL_HINTS)
-                for c in result
+                for c in raw
             )
             if not has_exit:
-                result.append({"text": "Farewell.", "next": "__end__"})
+                raw.append({"text": "Farewell.", "next": END})
+                compiled.append(None)
 
-        return result
+        raw, compiled = tuple(raw), tuple(compiled)
+        self._choices = (self._node, current, raw, compiled)
+        return raw, compiled
+
+    def get_choices(self):
+        """Get available choices, filtered by conditions. Cached until a
+        story flag changes."""
+        return self._visible_choices()[0]
 
     def has_choices(self):
         return len(self.get_choices()) > 0
@@ -130,22 +342,22 @@ class DialogueState:
 
     def advance(self):
         """Auto-advance to the next node (for nodes without choices)."""
-        next_id = self.current_node.get("next")
-        if next_id and next_id in self.nodes:
-            self.current_node_id = next_id
-            self.current_node = self.nodes[next_id]
-            self._enter_node(self.current_node)
+        node = self.graph.nodes.get(self._node.next) if self._node.next else None
+        if node is not None:
+            self._goto(node)
+            self._enter_node(node)
             return True
         self.finished = True
         return False
 
     def select_choice(self, choice_idx):
         """Player selects a choice. Returns True if conversation continues."""
-        choices = self.get_choices()
-        if choice_idx >= len(choices):
+        raw, compiled = self._visible_choices()
+        if choice_idx >= len(raw):
             return False
 
-        choice = choices[choice_idx]
+        choice = raw[choice_idx]
+        bound = compiled[choice_idx]
 
         # Record what the player said
         self.log.append(("You", choice["text"]))
@@ -153,44 +365,36 @@ class DialogueState:
         # Track if this start-level choice was a farewell/exit branch.
         # Used later to decide whether next:None should loop back or end.
         if self.current_node_id == "start":
-            FAREWELL = {"pass", "leav", "brows", "look", "bye", "farewel",
-                        "nothing", "just", "that's all"}
             txt = choice["text"].lower()
-            self._last_exit_branch = any(h in txt for h in FAREWELL)
+            self._last_exit_branch = any(h in txt for h in _EXIT_HINTS)
 
         # Execute on_select actions
-        for action in choice.get("on_select", []):
-            _execute_action(action)
+        if bound is not None:
+            for act in bound.on_select:
+                act()
 
         # Handle __end__ sentinel (injected farewell choice)
-        if choice.get("next") == "__end__":
+        next_id = choice.get("next")
+        if next_id == END:
             self.finished = True
             return False
 
         # Go to next node
-        next_id = choice.get("next")
-        if next_id and next_id in self.nodes:
-            self.current_node_id = next_id
-            self.current_node = self.nodes[next_id]
-            self._enter_node(self.current_node)
+        node = self.graph.nodes.get(next_id) if next_id else None
+        if node is not None:
+            self._goto(node)
+            self._enter_node(node)
             return True
 
         # next_id is None — decide: loop back to menu, or end?
         # Loop when: tree is Q&A-style (loop:True), current node isn't
         # an explicit end, and the player didn't pick an exit branch.
-        if (self.tree.get("loop")
-                and not self.current_node.get("end")
+        if (self.graph.loop
+                and not self._node.end
                 and not getattr(self, "_last_exit_branch", False)):
             # Return to question menu without re-executing on_enter actions
             # (avoids re-firing quest completions etc. from the start node)
-            start = self.nodes["start"]
-            self.current_node_id = "start"
-            # Synthetic menu node: empty text so choices appear immediately,
-            # same choices as start, no on_enter so actions don't re-fire.
-            self.current_node = {
-                "text": "",
-                "choices": start.get("choices", []),
-            }
+            self._goto(self.graph.menu)
             self._last_exit_branch = False  # reset for next loop
             return True
 
@@ -202,46 +406,52 @@ class DialogueState:
 #  ACTION EXECUTION
 # ═══════════════════════════════════════════════════════════════
 
+def _act_complete_quest(action):
+    complete_quest(action["quest"])
+    # Distribute rewards — party will be passed in when available
+    # Rewards are distributed in town_ui after dialogue finishes via auto_advance_quests
+
+
+def _act_give_item(action):
+    # Give an item to every party member (or first member only if target="leader")
+    # Requires party context — stored on a thread-local when dialogue runs in town_ui
+    item_data = action.get("item", {})
+    target = action.get("target", "all")
+    try:
+        from core._dialogue_party import get_party
+        party = get_party()
+        if party:
+            recipients = party[:1] if target == "leader" else party
+            flag = action.get("once_flag")
+            for char in recipients:
+                # Don't give duplicates — check by item flag if set
+                if flag:
+                    from core.story_flags import get_flag
+                    if get_flag(flag):
+                        continue
+                char.inventory.append(dict(item_data))
+            if flag:
+                set_flag(flag, True)
+    except Exception:
+        pass
+
+
+_ACTIONS = {
+    "set_flag":       lambda a: set_flag(a["flag"], a.get("value", True)),
+    "start_quest":    lambda a: start_quest(a["quest"]),
+    "complete_quest": _act_complete_quest,
+    "set_quest":      lambda a: set_quest_state(a["quest"], a["state"]),
+    "discover_lore":  lambda a: discover_lore(a["lore"]),
+    "meet_npc":       lambda a: meet_npc(a["npc"]),
+    "give_item":      _act_give_item,
+}
+
+
 def _execute_action(action):
     """Execute a dialogue action (set flag, start quest, etc.)."""
-    act = action.get("action", "")
-
-    if act == "set_flag":
-        set_flag(action["flag"], action.get("value", True))
-    elif act == "start_quest":
-        start_quest(action["quest"])
-    elif act == "complete_quest":
-        complete_quest(action["quest"])
-        # Distribute rewards — party will be passed in when available
-        # Rewards are distributed in town_ui after dialogue finishes via auto_advance_quests
-    elif act == "set_quest":
-        set_quest_state(action["quest"], action["state"])
-    elif act == "discover_lore":
-        discover_lore(action["lore"])
-    elif act == "meet_npc":
-        meet_npc(action["npc"])
-    elif act == "give_item":
-        # Give an item to every party member (or first member only if target="leader")
-        # Requires party context — stored on a thread-local when dialogue runs in town_ui
-        item_data = action.get("item", {})
-        target = action.get("target", "all")
-        try:
-            from core._dialogue_party import get_party
-            party = get_party()
-            if party:
-                recipients = party[:1] if target == "leader" else party
-                for char in recipients:
-                    # Don't give duplicates — check by item flag if set
-                    flag = action.get("once_flag")
-                    if flag:
-                        from core.story_flags import get_flag
-                        if get_flag(flag):
-                            continue
-                    char.inventory.append(dict(item_data))
-                if flag:
-                    set_flag(flag, True)
-        except Exception:
-            pass
+    handler = _ACTIONS.get(action.get("action", ""))
+    if handler is not None:
+        handler(action)
 
 
 # ═══════════════════════════════════════════════════════════════
@@ -0,0 +1,116 @@
+"""
+Realm of Shadows — Game Event Bus
+
+Lightweight in-process publish/subscribe hub. Game systems emit events when
+something happens (an enemy dies, a floor is reached, a flag changes) and
+listeners such as the achievement tracker and the job board react only to
+the events they declared an interest in, instead of re-scanning everything
+after every combat.
+
+Usage:
+    from core import events
+    events.subscribe(events.ENEMY_KILLED, my_handler)
+    events.emit(events.ENEMY_KILLED, name="Goblin Scout")
+
+Handlers are called synchronously with the emitted keyword payload.
+A failing handler is swallowed — events must never crash the game.
+
+Trace mode (for profiling event volume):
+    events.set_trace(True)
+    ...play...
+    events.get_counts()   # {"flag_set": 812, "enemy_killed": 40, ...}
+    events.get_trace()    # most recent (event, payload) pairs
+"""
+
+from collections import deque
+
+# ═══════════════════════════════════════════════════════════════
+#  EVENT NAMES
+# ═══════════════════════════════════════════════════════════════
+
+ENEMY_KILLED    = "enemy_killed"      # name
+FLOOR_REACHED   = "floor_reached"     # dungeon_id, floor
+FLAG_SET        = "flag_set"          # key, value
+FLAGS_RESET     = "flags_reset"       # (new game / load)
+ITEM_ACQUIRED   = "item_acquired"     # item, character
+QUEST_COMPLETED = "quest_completed"   # quest_id
+LEVEL_UP        = "level_up"          # character, level
+CLASS_CHANGED   = "class_changed"     # character, old_class, new_class
+PARTY_CHANGED   = "party_changed"     # (recruit / dismiss / reassemble)
+
+
+# ═══════════════════════════════════════════════════════════════
+#  SUBSCRIBER STORAGE (module-level singleton)
+# ═══════════════════════════════════════════════════════════════
+
+_subscribers = {}     # event name → list of handlers
+
+_trace = False
+_counts = {}          # event name → times emitted (trace mode only)
+_trace_log = deque(maxlen=256)
+
+
+def subscribe(event, handler):
+    """Register handler(**payload) for an event. Duplicate registrations are ignored."""
+    handlers = _subscribers.setdefault(event, [])
+    if handler not in handlers:
+        handlers.append(handler)
+    return handler
+
+
+def unsubscribe(event, handler):
+    """Remove a handler. Unknown handlers are ignored."""
+    handlers = _subscribers.get(event)
+    if handlers and handler in handlers:
+        handlers.remove(handler)
+
+
+def emit(event, **payload):
+    """Dispatch an event to every subscriber."""
+    if _trace:
+        _counts[event] = _counts.get(event, 0) + 1
+        _trace_log.append((event, payload))
+    handlers = _subscribers.get(event)
+    if not handlers:
+        return
+    for handler in tuple(handlers):
+        try:
+            handler(**payload)
+        except Exception:
+            pass  # never crash the game for a listener
+
+
+def has_subscribers(event) -> bool:
+    return bool(_subscribers.get(event))
+
+
+# ═══════════════════════════════════════════════════════════════
+#  TRACE / PROFILING
+# ═══════════════════════════════════════════════════════════════
+
+def set_trace(enabled, log_size=256):
+    """Turn event counting on/off. Enabling clears previous counts."""
+    global _trace, _trace_log
+    _trace = bool(enabled)
+    if _trace:
+        _counts.clear()
+        _trace_log = deque(maxlen=log_size)
+
+
+def is_tracing() -> bool:
+    return _trace
+
+
+def get_counts() -> dict:
+    """Return {event: times emitted} since tracing was enabled."""
+    return dict(_counts)
+
+
+def get_trace() -> list:
+    """Return the most recent (event, payload) pairs, oldest first."""
+    return list(_trace_log)
+
+
+def reset_counts():
+    _counts.clear()
+    _trace_log.clear()
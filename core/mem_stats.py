@@ -0,0 +1,246 @@
+"""
+Realm of Shadows — Memory Instrumentation
+
+One place to ask "where did the memory go?":
+
+  register(name, source, size=None)
+      A long-lived cache announces itself. source is the container (dict,
+      list, deque ...) or a zero-argument callable returning it — use the
+      callable form for containers that get replaced (Game.dungeon_cache)
+      or live on an object (weakref it, so the registry never keeps a
+      discarded screen alive). size(container) overrides the byte estimate.
+  report()        — [{"name", "entries", "bytes"}], largest first
+  rss_kb()        — current resident set size of the process
+
+  start_trace() / tick(dt) / write_trace()
+      Opt-in tracemalloc: every interval a snapshot is compared with the
+      previous one and with the first (baseline), and the top allocation
+      sites are written to a text file along with the cache report and
+      RSS. Growth that shows up in the baseline diff every time is a leak.
+
+Byte counts are estimates: Surfaces count their pixel buffers, containers
+are walked (with a cycle guard) and everything else is sys.getsizeof.
+Nothing here may raise into the game loop.
+"""
+import os
+import sys
+import time
+from collections import deque
+
+TRACE_INTERVAL_MS = 60_000   # default time between tracemalloc snapshots
+TRACE_FRAMES      = 8        # traceback depth kept by tracemalloc
+TRACE_TOP         = 25       # allocation sites listed per diff
+TRACE_DIR         = os.path.expanduser("~/Documents/RealmOfShadows/memtrace")
+
+_sources = {}                # name → (source, size fn | None)
+
+
+# ═══════════════════════════════════════════════════════════════
+#  CACHE REGISTRY
+# ═══════════════════════════════════════════════════════════════
+
+def register(name, source, size=None):
+    """Register (or replace) a cache under name."""
+    _sources[name] = (source, size)
+
+
+def unregister(name):
+    _sources.pop(name, None)
+
+
+def registered():
+    return sorted(_sources)
+
+
+def _resolve(source):
+    if callable(source) and not hasattr(source, "__len__"):
+        return source()
+    return source
+
+
+def cache_stats(name):
+    """{"name", "entries", "bytes"} for one registered cache."""
+    source, size = _sources[name]
+    try:
+        obj = _resolve(source)
+        if obj is None:
+            return {"name": name, "entries": 0, "bytes": 0}
+        entries = len(obj) if hasattr(obj, "__len__") else 1
+        nbytes = size(obj) if size else estimate_bytes(obj)
+    except Exception:
+        return {"name": name, "entries": -1, "bytes": 0}
+    return {"name": name, "entries": entries, "bytes": int(nbytes)}
+
+
+def report():
+    """Every registered cache, largest estimated size first."""
+    rows = [cache_stats(name) for name in list(_sources)]
+    rows.sort(key=lambda r: (-r["bytes"], r["name"]))
+    return rows
+
+
+# ═══════════════════════════════════════════════════════════════
+#  SIZE ESTIMATES
+# ═══════════════════════════════════════════════════════════════
+
+def surface_bytes(surf):
+    """Pixel buffer size of a pygame Surface (0 for anything else)."""
+    try:
+        w, h = surf.get_size()
+        return w * h * surf.get_bytesize()
+    except Exception:
+        return 0
+
+
+def estimate_bytes(obj, _seen=None):
+    """Approximate retained size of obj: containers, instance dicts and
+    slots are walked, Surfaces count their pixels, shared objects once."""
+    seen = set() if _seen is None else _seen
+    total = 0
+    stack = [obj]
+    while stack:
+        o = stack.pop()
+        if o is None or id(o) in seen:
+            continue
+        seen.add(id(o))
+        if hasattr(o, "get_bytesize") and hasattr(o, "get_size"):
+            total += sys.getsizeof(o) + surface_bytes(o)
+            continue
+        try:
+            total += sys.getsizeof(o)
+        except TypeError:
+            continue
+        if isinstance(o, (str, bytes, bytearray, int, float, bool)):
+            continue
+        if isinstance(o, dict):
+            stack.extend(o.keys())
+            stack.extend(o.values())
+        elif isinstance(o, (list, tuple, set, frozenset, deque)):
+            stack.extend(o)
+        else:
+            d = getattr(o, "__dict__", None)
+            if isinstance(d, dict):
+                stack.append(d)
+            for slot in getattr(type(o), "__slots__", ()):
+                stack.append(getattr(o, slot, None))
+    return total
+
+
+def rss_kb():
+    """Current resident set size in KB (peak RSS where that is all the
+    platform offers; None if neither is available)."""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") // 1024
+    except Exception:
+        pass
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak // 1024 if sys.platform == "darwin" else peak
+    except Exception:
+        return None
+
+
+def format_bytes(n):
+    if n >= 1024 * 1024:
+        return f"{n / (1024 * 1024):.1f} MB"
+    if n >= 1024:
+        return f"{n / 1024:.0f} KB"
+    return f"{n} B"
+
+
+# ═══════════════════════════════════════════════════════════════
+#  TRACEMALLOC SNAPSHOT DIFFS
+# ═══════════════════════════════════════════════════════════════
+
+_trace = None     # {"dir", "interval", "elapsed", "baseline", "previous", "count"}
+
+
+def tracing():
+    return _trace is not None
+
+
+def start_trace(interval_ms=TRACE_INTERVAL_MS, out_dir=None, frames=TRACE_FRAMES):
+    """Start tracemalloc and take the baseline snapshot. tick() writes a
+    diff every interval_ms; write_trace() writes one immediately."""
+    global _trace
+    import tracemalloc
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(frames)
+    out_dir = out_dir or TRACE_DIR
+    os.makedirs(out_dir, exist_ok=True)
+    snap = _snapshot()
+    _trace = {"dir": out_dir, "interval": interval_ms, "elapsed": 0,
+              "baseline": snap, "previous": snap, "count": 0}
+    return out_dir
+
+
+def stop_trace():
+    global _trace
+    import tracemalloc
+    _trace = None
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+
+
+def tick(dt):
+    """Call once per frame with the frame time in ms. Returns the path of
+    the file written this frame, if any."""
+    if _trace is None:
+        return None
+    _trace["elapsed"] += dt
+    if _trace["elapsed"] < _trace["interval"]:
+        return None
+    _trace["elapsed"] = 0
+    return write_trace()
+
+
+def _snapshot():
+    import tracemalloc
+    return tracemalloc.take_snapshot().filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        tracemalloc.Filter(False, "<unknown>"),
+    ))
+
+
+def _diff_lines(new, old, top):
+    stats = new.compare_to(old, "lineno")
+    lines = []
+    for st in stats[:top]:
+        frame = st.traceback[0]
+        lines.append(f"  {st.size_diff / 1024:>+10.1f} KB {st.count_diff:>+8} blocks  "
+                     f"{frame.filename}:{frame.lineno}")
+    return lines
+
+
+def write_trace(label=None, top=TRACE_TOP):
+    """Snapshot now and write the diffs (vs previous and vs baseline) plus
+    the cache report to the trace directory. Returns the file path."""
+    if _trace is None:
+        return None
+    try:
+        snap = _snapshot()
+        _trace["count"] += 1
+        stamp = time.strftime("%Y%m%d_%H%M%S")
+        name = f"memtrace_{stamp}_{_trace['count']:03d}.txt"
+        path = os.path.join(_trace["dir"], name)
+        rss = rss_kb()
+        out = [f"# {label or 'snapshot'} {_trace['count']}  {stamp}",
+               f"rss: {rss if rss is not None else '?'} KB",
+               "",
+               "caches:"]
+        out += [f"  {r['name']:<28} {r['entries']:>6}  {format_bytes(r['bytes']):>9}"
+                for r in report()]
+        out += ["", f"since previous snapshot (top {top}):"]
+        out += _diff_lines(snap, _trace["previous"], top)
+        out += ["", f"since baseline (top {top}):"]
+        out += _diff_lines(snap, _trace["baseline"], top)
+        with open(path, "w") as f:
+            f.write("\n".join(out) + "\n")
+        _trace["previous"] = snap
+        return path
+    except Exception:
+        return None
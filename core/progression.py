@@ -5,6 +5,8 @@ XP tables, per-level stat gains, class transitions, level up at inn.
 """
 import random
 
+from core import events
+
 # ═══════════════════════════════════════════════════════════════
 #  XP TABLE (Level 1-30)
 # ═══════════════════════════════════════════════════════════════
@@ -366,9 +368,49 @@ def apply_level_up(character, free_stat=None):
     summary["new_abilities"] = new_abilities   # available to train, not yet learned
     summary["branch_choice"] = None            # branches removed
 
+    events.emit(events.LEVEL_UP, character=character, level=new_level)
     return summary
 
 
+def level_stat_gains(class_name, from_level, to_level, free_stat=None):
+    """Total stat gains from levelling from_level → to_level, in one pass.
+    Same totals as (to_level - from_level) apply_level_up calls: auto gains
+    every level, even_bonus on even levels, odd_bonus on odd ones, plus the
+    free point."""
+    gains = LEVEL_STAT_GAINS.get(class_name) or LEVEL_STAT_GAINS["Fighter"]
+    to_level = min(to_level, MAX_LEVEL)
+    n = max(0, to_level - from_level)
+    evens = to_level // 2 - from_level // 2             # even levels in (from, to]
+    odds = n - evens
+    total = {}
+    for part, times in (("auto", n), ("even_bonus", evens), ("odd_bonus", odds)):
+        for stat, amount in gains.get(part, {}).items():
+            total[stat] = total.get(stat, 0) + amount * times
+    if free_stat and n:
+        total[free_stat] = total.get(free_stat, 0) + n
+    return total
+
+
+def scale_to_level(character, target_level, free_stat=None):
+    """Raise a fresh character (e.g. a recruit) straight to target_level.
+    Stats come from level_stat_gains, XP is set to the level's threshold and
+    resources are recomputed once. No LEVEL_UP events: this is not a level-up
+    the player earned."""
+    from core.classes import get_all_resources
+    target_level = max(1, min(target_level, MAX_LEVEL))
+    if free_stat not in character.stats:
+        free_stat = None
+    if target_level > character.level:
+        gains = level_stat_gains(character.class_name, character.level, target_level, free_stat)
+        for stat, amount in gains.items():
+            character.stats[stat] = character.stats.get(stat, 0) + amount
+        character.level = target_level
+    character.xp = xp_for_level(character.level)
+    character.resources = get_all_resources(character.class_name, character.stats,
+                                            character.level)
+    return character
+
+
 # ═══════════════════════════════════════════════════════════════
 #  PLANAR ASCENSION TIERS  (Bronze → Iron → Steel → Mithril → Adamantine)
 # ═══════════════════════════════════════════════════════════════
@@ -709,6 +751,9 @@ def apply_class_transition(character, new_class_name: str) -> tuple:
     new_max = get_all_resources(new_class_name, character.stats, 1)
     character.resources = dict(new_max)
 
+    events.emit(events.CLASS_CHANGED, character=character,
+                old_class=old_class, new_class=new_class_name)
+
     kept_str = ", ".join(a["name"] for a in kept) if kept else "none"
     return True, (
         f"{character.name} transitions to {new_class_name} (was {old_class} level {old_level}). "
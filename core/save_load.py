@@ -6,6 +6,9 @@ Save location: ~/Documents/RealmOfShadows/saves/
 """
 import json
 import os
+import atexit
+import pickle
+from collections import deque
 from datetime import datetime
 from core.character import Character
 from core.equipment import empty_equipment
@@ -249,44 +252,6 @@ def serialize_world_state(ws):
         return None
 
 
-def _migrate_save(world_state):
-    """One-shot patches for flag/key mismatches in older builds.
-    All patches must be idempotent — running them on an already-patched save
-    should be a no-op. Best-effort: swallow all exceptions at the caller."""
-    if world_state is None:
-        return
-    from core.story_flags import get_flag
-    from data.world_map import LOCATIONS
-
-    # Patch A: Dragon's Tooth peaceful clear used to grant a dead "dragon_scale"
-    # key instead of "pale_coast_access". If the party has HS3 and Karreth was
-    # spared (or simply boss_defeated.dragons_tooth is set) but pale_coast_access
-    # isn't in their keys, add it so they can unlock the Pale Coast.
-    try:
-        if (get_flag("item.hearthstone.3")
-                and not world_state.has_key("pale_coast_access")):
-            world_state.add_key("pale_coast_access")
-            # Reveal any locations keyed on this
-            for lid, loc in LOCATIONS.items():
-                if loc.get("required_key") == "pale_coast_access":
-                    world_state.discovered_locations.add(lid)
-    except Exception:
-        pass
-
-    # Patch B: Shadow Throne victory used to trigger the ending inline from
-    # _grant_boss_rewards, which got overwritten by the subsequent post-boss
-    # dialogue transition (leaving the game stuck in the throne room with
-    # Valdris dead and no ending shown). If the save has the boss-defeated
-    # flag but no ending-seen marker, queue the ending on the next load.
-    try:
-        from core.story_flags import set_flag as _sf_mig
-        if (get_flag("boss_defeated.shadow_valdris")
-                and not get_flag("ending.shown")):
-            _sf_mig("throne.ending_pending_on_load", True)
-    except Exception:
-        pass
-
-
 def deserialize_world_state(data, party):
     """Reconstruct a WorldState from saved dict. Returns None on failure."""
     if not data:
@@ -332,6 +297,7 @@ def _serialize_dungeon_explored(dungeon_cache):
     - found notes   (from tile["event"])
     - trap states: disarmed, triggered, detected (from tile["event"])
     - dead patrol enemies (by position)
+    Floors evicted by the dungeon floor cache are included via their delta.
     """
     if not dungeon_cache:
         return {}
@@ -385,6 +351,13 @@ def _serialize_dungeon_explored(dungeon_cache):
                     if floor_entry:
                         floors_data[str(floor_num)] = floor_entry
 
+                # Floors evicted from memory carry their own compact delta
+                evicted = getattr(dstate.floors, "save_entries", None)
+                if evicted:
+                    for floor_num, floor_entry in evicted().items():
+                        if floor_entry:
+                            floors_data[str(floor_num)] = floor_entry
+
                 if floors_data:
                     result[dungeon_id] = floors_data
             except Exception:
@@ -393,11 +366,11 @@ def _serialize_dungeon_explored(dungeon_cache):
         pass
     return result
 
-def save_game(party, world_state=None, slot_name="save1", metadata=None, dungeon_cache=None, dungeon_state=None, character_bank=None, **kwargs):
-    """Save the party (and optionally world state) to a JSON file.
-    Returns (success, filepath, message)."""
-    ensure_save_dir()
 
+def _collect_save_data(party, world_state=None, slot_name="save1", metadata=None,
+                       dungeon_cache=None, dungeon_state=None, character_bank=None):
+    """Gather everything a save file holds. Returns (save_data, error_message).
+    Nested item dicts may still be shared with the live party."""
     # Party knowledge (identified items, known enemies)
     from core.party_knowledge import get_save_data as get_knowledge_data
     knowledge = get_knowledge_data()
@@ -447,7 +420,7 @@ def save_game(party, world_state=None, slot_name="save1", metadata=None, dungeon
         try:
             save_data["party"].append(serialize_character(c))
         except Exception as e:
-            return False, None, f"Save failed: could not serialize {getattr(c, 'name', f'character {i}')}: {e}"
+            return None, f"Save failed: could not serialize {getattr(c, 'name', f'character {i}')}: {e}"
 
     # Serialize character bank (Adventurers Guild roster)
     bank = character_bank or []
@@ -462,9 +435,13 @@ def save_game(party, world_state=None, slot_name="save1", metadata=None, dungeon
         f"{c.name} Lv.{c.level} {getattr(c, 'race_name', 'Human')} {c.class_name}" for c in party
     ]
     save_data["metadata"]["total_gold"] = sum(c.gold for c in party)
+    return save_data, None
 
-    filepath = os.path.join(SAVE_DIR, f"{slot_name}.json")
-    tmp_path  = filepath + ".tmp"
+
+def write_json_atomic(filepath, save_data):
+    """Write save_data to filepath so the file is never left half-written.
+    Returns None on success, else an error message."""
+    tmp_path = filepath + ".tmp"
     try:
         # Atomic write: write to a temp file first, fsync, then rename.
         # This means the real save file is never in a partial/corrupt state —
@@ -475,9 +452,9 @@ def save_game(party, world_state=None, slot_name="save1", metadata=None, dungeon
             os.fsync(f.fileno())   # force kernel buffer → physical disk
         # Verify temp file looks valid before replacing the real save
         if not os.path.exists(tmp_path) or os.path.getsize(tmp_path) < 10:
-            return False, None, "Save failed: file not written to disk"
+            return "file not written to disk"
         os.replace(tmp_path, filepath)  # atomic on POSIX/macOS
-        return True, filepath, f"Game saved to {slot_name}"
+        return None
     except Exception as e:
         # Clean up temp file if it exists
         try:
@@ -485,7 +462,148 @@ def save_game(party, world_state=None, slot_name="save1", metadata=None, dungeon
                 os.remove(tmp_path)
         except Exception:
             pass
-        return False, None, f"Save failed: {e}"
+        return str(e)
+
+
+def _write_save_file(save_data, slot_name):
+    """Atomically write save_data to <slot_name>.json. Returns (ok, path, msg)."""
+    ensure_save_dir()
+    filepath = os.path.join(SAVE_DIR, f"{slot_name}.json")
+    err = write_json_atomic(filepath, save_data)
+    if err:
+        return False, None, f"Save failed: {err}"
+    return True, filepath, f"Game saved to {slot_name}"
+
+
+def save_game(party, world_state=None, slot_name="save1", metadata=None, dungeon_cache=None, dungeon_state=None, character_bank=None, **kwargs):
+    """Save the party (and optionally world state) to a JSON file.
+    Returns (success, filepath, message)."""
+    ensure_save_dir()
+    save_data, err = _collect_save_data(
+        party, world_state=world_state, slot_name=slot_name, metadata=metadata,
+        dungeon_cache=dungeon_cache, dungeon_state=dungeon_state,
+        character_bank=character_bank)
+    if err:
+        return False, None, err
+    return _write_save_file(save_data, slot_name)
+
+
+# ═══════════════════════════════════════════════════════════════
+#  BACKGROUND SAVES
+# ═══════════════════════════════════════════════════════════════
+#
+# save_game_async() takes the snapshot on the calling (main) thread —
+# _collect_save_data() frozen with pickle, since serialized characters still
+# share item dicts with the live party — and leaves JSON encoding, fsync and
+# the rename to a single worker thread, so saves land in request order.
+# Completion callbacks run on the main thread from dispatch_save_callbacks().
+
+_save_pool = None
+_inflight = []            # futures not yet finished
+_completed = deque()      # SaveJobs whose callbacks haven't run yet
+
+
+class SaveJob:
+    """Handle for one background save."""
+
+    def __init__(self, slot_name):
+        self.slot_name = slot_name
+        self.done = False
+        self.ok = None
+        self.path = None
+        self.message = ""
+        self._callbacks = []
+        self._future = None
+
+    def add_done_callback(self, fn):
+        """fn(ok, path, message), called on the main thread once written."""
+        self._callbacks.append(fn)
+
+    def _finish(self, ok, path, message):
+        self.ok, self.path, self.message = ok, path, message
+        self.done = True
+        _completed.append(self)
+
+    def wait(self, timeout=None):
+        """Block until written; returns (ok, path, message)."""
+        if self._future is not None:
+            self._future.result(timeout)
+        return self.ok, self.path, self.message
+
+
+def _get_save_pool():
+    global _save_pool
+    if _save_pool is None:
+        from concurrent.futures import ThreadPoolExecutor
+        _save_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="save")
+    return _save_pool
+
+
+def _run_save_job(job, blob):
+    try:
+        save_data = pickle.loads(blob)
+        job._finish(*_write_save_file(save_data, job.slot_name))
+    except Exception as e:
+        job._finish(False, None, f"Save failed: {e}")
+
+
+def save_game_async(party, world_state=None, slot_name="save1", metadata=None,
+                    dungeon_cache=None, dungeon_state=None, character_bank=None,
+                    on_complete=None, **kwargs):
+    """Like save_game(), but the write happens on a background thread.
+
+    Returns a SaveJob. Snapshot errors (e.g. a character that can't be
+    serialized) are reported immediately: the job comes back already done
+    with ok=False.
+    """
+    job = SaveJob(slot_name)
+    if on_complete:
+        job.add_done_callback(on_complete)
+    try:
+        save_data, err = _collect_save_data(
+            party, world_state=world_state, slot_name=slot_name,
+            metadata=metadata, dungeon_cache=dungeon_cache,
+            dungeon_state=dungeon_state, character_bank=character_bank)
+        if err:
+            job._finish(False, None, err)
+            return job
+        blob = pickle.dumps(save_data, pickle.HIGHEST_PROTOCOL)
+    except Exception as e:
+        job._finish(False, None, f"Save failed: {e}")
+        return job
+    fut = _get_save_pool().submit(_run_save_job, job, blob)
+    job._future = fut
+    _inflight.append(fut)
+    return job
+
+
+def dispatch_save_callbacks():
+    """Run completion callbacks of finished saves. Call once per frame."""
+    _inflight[:] = [f for f in _inflight if not f.done()]
+    while _completed:
+        job = _completed.popleft()
+        for fn in job._callbacks:
+            try:
+                fn(job.ok, job.path, job.message)
+            except Exception:
+                pass
+
+
+def saves_pending() -> bool:
+    return any(not f.done() for f in _inflight) or bool(_completed)
+
+
+def flush_saves(timeout=None):
+    """Wait for every queued save to hit the disk (call before exiting)."""
+    for fut in list(_inflight):
+        try:
+            fut.result(timeout)
+        except Exception:
+            pass
+    _inflight.clear()
+
+
+atexit.register(flush_saves)
 
 
 def load_game(slot_name="save1"):
@@ -501,6 +619,12 @@ def load_game(slot_name="save1"):
         with open(filepath, "r") as f:
             save_data = json.load(f)
 
+        # ── Save migrations ──────────────────────────────────────────────────
+        # Patches for data written by older builds (core.save_migrations).
+        # Safe to run on every load; each patch is idempotent and best-effort.
+        from core.save_migrations import apply_migrations
+        apply_migrations(save_data)
+
         party = [deserialize_character(cd) for cd in save_data["party"]]
 
         # Restore character bank (Adventurers Guild roster)
@@ -534,14 +658,6 @@ def load_game(slot_name="save1"):
         # Restore world state (v4+ saves only)
         world_state = deserialize_world_state(save_data.get("world_state"), party)
 
-        # ── Save migrations ──────────────────────────────────────────────────
-        # One-shot patches for flag/key mismatches introduced in older builds.
-        # Safe to run on every load; each patch is idempotent.
-        try:
-            _migrate_save(world_state)
-        except Exception:
-            pass   # migration is best-effort, never block a load
-
         dungeon_explored = save_data.get("dungeon_explored", {})
         dungeon_position = save_data.get("dungeon_position")
         return True, party, world_state, f"Loaded {slot_name}", dungeon_explored, dungeon_position, character_bank
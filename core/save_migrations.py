@@ -0,0 +1,439 @@
+"""
+Realm of Shadows — Save Migrations & Inspector
+
+Registry of patches for save files written by older builds, plus a
+batch inspector that runs them over a whole directory of saves.
+
+Migrations work on the raw save dict (the parsed JSON), so the same code
+runs when the game loads a save (load_game → apply_migrations) and when
+the inspector checks saves offline. Each is registered with @migration,
+must be idempotent and returns a list of human-readable changes (empty
+when there was nothing to do). on_load=False marks repairs that change
+story state and are only applied when asked for (--repair).
+
+Checks (@check) only report: each returns a list of issue strings.
+
+Command line — run from the game folder:
+
+    python3 migrate_saves.py [DIR] [--repair] [--write] [--jobs N]
+
+streams every *.json in DIR (default: the game's save folder) through a
+process pool, and prints one JSON summary: per file the migrations that
+would apply (or did, with --write), check issues and whether the save
+still deserializes the way load_game would. --write rewrites changed
+saves atomically (temp file, fsync, rename), keeping a .bak copy unless
+--no-backup. Exit status is 1 if any save has issues or failed to load.
+"""
+import json
+import os
+import sys
+import copy
+import shutil
+
+MIGRATIONS = []     # [Migration] in registration (= application) order
+CHECKS = []         # [(name, fn)]
+
+
+class Migration:
+    __slots__ = ("name", "fn", "on_load", "summary")
+
+    def __init__(self, name, fn, on_load, summary):
+        self.name = name
+        self.fn = fn
+        self.on_load = on_load
+        self.summary = summary
+
+
+def migration(name, on_load=True):
+    """Register fn(save_data) -> [change, …] as a save migration."""
+    def register(fn):
+        summary = (fn.__doc__ or "").strip().split("\n")[0]
+        MIGRATIONS.append(Migration(name, fn, on_load, summary))
+        return fn
+    return register
+
+
+def check(name):
+    """Register fn(save_data) -> [issue, …] as a save check."""
+    def register(fn):
+        CHECKS.append((name, fn))
+        return fn
+    return register
+
+
+def apply_migrations(save_data, repairs=False, only=None):
+    """Run registered migrations on save_data in place. repairs: also run
+    the on_load=False ones. only: restrict to these names.
+    Returns [(name, change)]; a migration that raises is reported as
+    (name, "error: …") and never stops the others."""
+    done = []
+    for m in MIGRATIONS:
+        if only is not None and m.name not in only:
+            continue
+        if not (m.on_load or repairs or only is not None):
+            continue
+        try:
+            for change in m.fn(save_data) or ():
+                done.append((m.name, change))
+        except Exception as e:
+            done.append((m.name, f"error: {e}"))
+    return done
+
+
+# ═══════════════════════════════════════════════════════════════
+#  MIGRATIONS
+# ═══════════════════════════════════════════════════════════════
+
+def _characters(save_data):
+    for key in ("party", "character_bank"):
+        for cd in save_data.get(key) or []:
+            if isinstance(cd, dict):
+                yield key, cd
+
+
+@migration("weapon_damage_stat")
+def _weapon_damage_stat(save_data):
+    """Give loot weapons saved before the weapon ratio fix their damage_stat."""
+    from core.save_load import _migrate_weapon, _is_weapon_item
+    changes = []
+    for _, cd in _characters(save_data):
+        inv = cd.get("inventory") or []
+        for i, item in enumerate(inv):
+            if isinstance(item, dict) and _is_weapon_item(item):
+                new = _migrate_weapon(item)
+                if new is not item:
+                    inv[i] = new
+                    changes.append(f"{cd.get('name')}: {item.get('name')} (inventory)")
+        equip = cd.get("equipment") or {}
+        for slot, item in list(equip.items()):
+            if isinstance(item, dict) and _is_weapon_item(item):
+                new = _migrate_weapon(item)
+                if new is not item:
+                    equip[slot] = new
+                    changes.append(f"{cd.get('name')}: {item.get('name')} ({slot})")
+    return changes
+
+
+@migration("pale_coast_access")
+def _pale_coast_access(save_data):
+    """Dragon's Tooth used to grant a dead "dragon_scale" key instead of pale_coast_access."""
+    flags = save_data.get("story_flags") or {}
+    ws = save_data.get("world_state")
+    if not isinstance(ws, dict) or not flags.get("item.hearthstone.3"):
+        return []
+    keys = ws.setdefault("key_items", [])
+    if "pale_coast_access" in keys:
+        return []
+    keys.append("pale_coast_access")
+    from data.world_map import LOCATIONS
+    disc = ws.setdefault("discovered_locations", [])
+    for lid, loc in LOCATIONS.items():
+        if loc.get("required_key") == "pale_coast_access" and lid not in disc:
+            disc.append(lid)
+    return ["added pale_coast_access key"]
+
+
+@migration("throne_ending_pending")
+def _throne_ending_pending(save_data):
+    """Shadow Throne victory saved before the ending was shown: queue it for the next load."""
+    flags = save_data.get("story_flags")
+    if (not isinstance(flags, dict) or not flags.get("boss_defeated.shadow_valdris")
+            or flags.get("ending.shown") or flags.get("throne.ending_pending_on_load")):
+        return []
+    flags["throne.ending_pending_on_load"] = True
+    return ["queued the ending for the next load"]
+
+
+# Boss flag → quest that has to be active (or done) for the flag to be earned
+_BOSS_TO_QUEST = {
+    "boss.grak.defeated":           "quest.main_goblin_warren.state",
+    "boss_defeated.goblin_warren":  "quest.main_goblin_warren.state",
+    "boss.korrath.defeated":        "quest.main_hearthstone_1.state",
+    "boss_defeated.abandoned_mine": "quest.main_hearthstone_1.state",
+    "boss.spider_queen.defeated":   "quest.main_spiders_nest.state",
+    "boss_defeated.spiders_nest":   "quest.main_spiders_nest.state",
+    "boss.ashvar.defeated":         "quest.main_ashenmoor.state",
+    "boss_defeated.ruins_ashenmoor": "quest.main_ashenmoor.state",
+    "boss.sunken_warden.defeated":  "quest.main_hearthstone_2.state",
+    "boss_defeated.sunken_crypt":   "quest.main_hearthstone_2.state",
+    "boss.karreth.defeated":        "quest.main_hearthstone_2.state",
+    "boss_defeated.dragons_tooth":  "quest.main_hearthstone_2.state",
+}
+
+
+def _stale_boss_flags(flags):
+    """Boss-defeated flags whose quest was never started: left over from
+    an earlier playthrough, they make Maren offer turn-ins not earned."""
+    return sorted(f for f, q in _BOSS_TO_QUEST.items()
+                  if flags.get(f) and not flags.get(q, 0))
+
+
+def _warren_chain_broken(flags):
+    return (flags.get("boss.grak.defeated") and flags.get("boss_defeated.goblin_warren")
+            and flags.get("quest.main_goblin_warren.state") != -2)
+
+
+# Runs before stale_boss_flags: a broken Warren chain is repaired, not unflagged
+@migration("warren_quest_chain", on_load=False)
+def _warren_quest_chain(save_data):
+    """Grak is dead but main_goblin_warren never completed: finish the chain."""
+    flags = save_data.get("story_flags")
+    if not isinstance(flags, dict) or not _warren_chain_broken(flags):
+        return []
+    changes = ["main_goblin_warren: completed + rewarded"]
+    flags["quest.main_goblin_warren.state"] = -2
+    flags["quest.main_goblin_warren.rewarded"] = True
+    if flags.get("quest.main_hearthstone_1.state") in (None, 0):
+        flags["quest.main_hearthstone_1.state"] = 1
+        changes.append("main_hearthstone_1: started")
+    ws = save_data.get("world_state")
+    if isinstance(ws, dict):
+        keys = ws.setdefault("key_items", [])
+        if "thornwood_map" not in keys:
+            keys.append("thornwood_map")
+            changes.append("thornwood_map key added")
+        disc = ws.setdefault("discovered_locations", [])
+        if "spiders_nest" not in disc:
+            disc.append("spiders_nest")
+            changes.append("spiders_nest discovered")
+    party = save_data.get("party") or []
+    if party and not flags.get("quest.main_goblin_warren.rewarded_gold"):
+        reward_per = 150 // max(1, len(party))
+        for cd in party:
+            cd["gold"] = cd.get("gold", 0) + reward_per
+        flags["quest.main_goblin_warren.rewarded_gold"] = True
+        changes.append(f"quest reward: +{reward_per}g per character")
+    return changes
+
+
+@migration("stale_boss_flags", on_load=False)
+def _remove_stale_boss_flags(save_data):
+    """Remove boss-defeated flags whose quest was never started."""
+    flags = save_data.get("story_flags")
+    if not isinstance(flags, dict):
+        return []
+    stale = _stale_boss_flags(flags)
+    for f in stale:
+        del flags[f]
+    return [f"removed {f}" for f in stale]
+
+
+# ═══════════════════════════════════════════════════════════════
+#  CHECKS
+# ═══════════════════════════════════════════════════════════════
+
+_CHAR_FIELDS = {"name": str, "class_name": str, "level": int, "stats": dict,
+                "inventory": list, "equipment": dict}
+
+
+@check("schema")
+def _check_schema(save_data):
+    issues = []
+    if not isinstance(save_data, dict):
+        return ["save is not a JSON object"]
+    if not isinstance(save_data.get("version"), int):
+        issues.append("missing or non-integer version")
+    party = save_data.get("party")
+    if not isinstance(party, list) or not party:
+        issues.append("party missing or empty")
+        party = []
+    for key, cd in [("party", c) for c in party] + [
+            ("character_bank", c) for c in save_data.get("character_bank") or []]:
+        if not isinstance(cd, dict):
+            issues.append(f"{key}: entry is not an object")
+            continue
+        who = f"{key}[{cd.get('name', '?')}]"
+        if "name" not in cd:
+            issues.append(f"{who}.name: missing")
+        for field, kind in _CHAR_FIELDS.items():
+            if cd.get(field) is not None and not isinstance(cd[field], kind):
+                issues.append(f"{who}.{field}: expected {kind.__name__}")
+    if not isinstance(save_data.get("story_flags", {}), dict):
+        issues.append("story_flags: expected object")
+    ws = save_data.get("world_state")
+    if ws is not None:
+        if not isinstance(ws, dict):
+            issues.append("world_state: expected object")
+        else:
+            for field in ("key_items", "discovered_locations"):
+                if not isinstance(ws.get(field, []), list):
+                    issues.append(f"world_state.{field}: expected list")
+    pos = save_data.get("dungeon_position")
+    if pos is not None and not (isinstance(pos, dict) and "dungeon_id" in pos):
+        issues.append("dungeon_position: expected object with dungeon_id")
+    return issues
+
+
+@check("stale_boss_flags")
+def _check_stale_boss_flags(save_data):
+    flags = save_data.get("story_flags")
+    if not isinstance(flags, dict):
+        return []
+    return [f"{f} set but {_BOSS_TO_QUEST[f]} = {flags.get(_BOSS_TO_QUEST[f], 0)}"
+            for f in _stale_boss_flags(flags)]
+
+
+@check("warren_quest_chain")
+def _check_warren_chain(save_data):
+    flags = save_data.get("story_flags")
+    if isinstance(flags, dict) and _warren_chain_broken(flags):
+        return ["Grak defeated but main_goblin_warren not completed"]
+    return []
+
+
+# ═══════════════════════════════════════════════════════════════
+#  INSPECTOR
+# ═══════════════════════════════════════════════════════════════
+
+def _load_check(save_data, world=True):
+    """Deserialize the way load_game does. Returns a list of problems."""
+    from core.save_load import deserialize_character, deserialize_world_state
+    problems = []
+    party = []
+    for key in ("party", "character_bank"):
+        for i, cd in enumerate(save_data.get(key) or []):
+            try:
+                c = deserialize_character(cd)
+                if key == "party":
+                    party.append(c)
+            except Exception as e:
+                problems.append(f"{key}[{i}]: {type(e).__name__}: {e}")
+    if world and save_data.get("world_state") is not None and party:
+        if deserialize_world_state(save_data["world_state"], party) is None:
+            problems.append("world_state: could not be rebuilt")
+    return problems
+
+
+def inspect_save(path, repairs=False, write=False, backup=True, world=True):
+    """Inspect (and with write=True, migrate) one save file.
+    Returns a JSON-ready report dict."""
+    report = {"path": path, "version": None, "changes": [], "issues": [],
+              "load_errors": [], "written": False, "error": None}
+    try:
+        with open(path) as f:
+            save_data = json.load(f)
+    except Exception as e:
+        report["error"] = f"unreadable: {e}"
+        return report
+    if isinstance(save_data, dict):
+        report["version"] = save_data.get("version")
+    migrated = copy.deepcopy(save_data)
+    report["changes"] = [{"migration": n, "change": c}
+                         for n, c in apply_migrations(migrated, repairs=repairs)]
+    for name, fn in CHECKS:
+        try:
+            report["issues"] += [{"check": name, "issue": i} for i in fn(migrated)]
+        except Exception as e:
+            report["issues"].append({"check": name, "issue": f"check failed: {e}"})
+    if isinstance(migrated, dict):
+        report["load_errors"] = _load_check(migrated, world)
+    if write and report["changes"] and not report["load_errors"]:
+        from core.save_load import write_json_atomic
+        if backup:
+            shutil.copy2(path, path + ".bak")
+        err = write_json_atomic(path, migrated)
+        if err:
+            report["error"] = f"write failed: {err}"
+        else:
+            report["written"] = True
+    return report
+
+
+def _save_files(root):
+    with os.scandir(root) as it:
+        for entry in sorted(it, key=lambda e: e.name):
+            if (entry.is_file() and entry.name.endswith(".json")
+                    and "_backup_" not in entry.name):
+                yield entry.path
+
+
+def inspect_dir(root, jobs=None, **opts):
+    """Yield inspect_save reports for every save in root, in file order,
+    from a process pool (jobs=1: in this process). At most 2×jobs files
+    are in flight at once, so huge directories stream."""
+    paths = _save_files(root)
+    if jobs == 1:
+        for p in paths:
+            yield inspect_save(p, **opts)
+        return
+    from concurrent.futures import ProcessPoolExecutor
+    from collections import deque
+    jobs = jobs or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        window = deque()
+        limit = 2 * jobs
+        for p in paths:
+            window.append(pool.submit(inspect_save, p, **opts))
+            if len(window) >= limit:
+                yield window.popleft().result()
+        while window:
+            yield window.popleft().result()
+
+
+def summarize(reports):
+    """Collect reports into the CLI's JSON summary."""
+    summary = {"files": 0, "clean": 0, "changed": 0, "written": 0,
+               "with_issues": 0, "load_failed": 0, "unreadable": 0,
+               "by_migration": {}, "by_check": {}, "saves": []}
+    for r in reports:
+        summary["files"] += 1
+        summary["saves"].append(r)
+        if r["error"] and r["error"].startswith("unreadable"):
+            summary["unreadable"] += 1
+            continue
+        if r["changes"]:
+            summary["changed"] += 1
+        if r["written"]:
+            summary["written"] += 1
+        if r["issues"]:
+            summary["with_issues"] += 1
+        if r["load_errors"]:
+            summary["load_failed"] += 1
+        if not (r["changes"] or r["issues"] or r["load_errors"] or r["error"]):
+            summary["clean"] += 1
+        for c in r["changes"]:
+            summary["by_migration"][c["migration"]] = summary["by_migration"].get(c["migration"], 0) + 1
+        for i in r["issues"]:
+            summary["by_check"][i["check"]] = summary["by_check"].get(i["check"], 0) + 1
+    return summary
+
+
+def main(argv=None):
+    import argparse
+    from core.save_load import SAVE_DIR
+    ap = argparse.ArgumentParser(
+        description="Inspect and migrate Realm of Shadows save files.",
+        epilog="Migrations: " + "; ".join(
+            f"{m.name}{'' if m.on_load else ' (repair)'} — {m.summary}" for m in MIGRATIONS))
+    ap.add_argument("dir", nargs="?", default=SAVE_DIR, help="save directory")
+    ap.add_argument("--repair", action="store_true",
+                    help="also run story repairs (warren_quest_chain, stale_boss_flags)")
+    ap.add_argument("--write", action="store_true", help="rewrite changed saves atomically")
+    ap.add_argument("--no-backup", action="store_true", help="don't keep <save>.json.bak")
+    ap.add_argument("--no-world", action="store_true",
+                    help="skip rebuilding the world map when validating (much faster)")
+    ap.add_argument("--jobs", type=int, default=None, help="worker processes (default: CPUs)")
+    ap.add_argument("--output", help="write the JSON summary here instead of stdout")
+    args = ap.parse_args(argv)
+
+    if not os.path.isdir(args.dir):
+        print(f"Save directory not found: {args.dir}", file=sys.stderr)
+        return 2
+    summary = summarize(inspect_dir(args.dir, jobs=args.jobs, repairs=args.repair,
+                                    write=args.write, backup=not args.no_backup,
+                                    world=not args.no_world))
+    text = json.dumps(summary, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    print(f"{summary['files']} save(s): {summary['clean']} clean, {summary['changed']} "
+          f"to migrate, {summary['written']} written, {summary['with_issues']} with issues, "
+          f"{summary['load_failed']} failed to load, {summary['unreadable']} unreadable",
+          file=sys.stderr)
+    return 1 if (summary["with_issues"] or summary["load_failed"] or summary["unreadable"]) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,9 +1,15 @@
 """
 Realm of Shadows — Sound Engine
-All sounds generated procedurally at startup — no audio files needed.
+All sounds generated procedurally — no audio files needed.
+SFX are built at startup; music loops and ambiences are built on demand
+(in the background) and kept under an LRU byte budget.
 Gracefully handles missing/failed audio initialization.
 """
-import math, array, random
+import math, array, random, atexit
+from collections import OrderedDict
+
+from core import mem_stats
+
 try:
     import numpy as _np
     from scipy import signal as _signal
@@ -20,6 +26,7 @@ _master_vol     = 0.6
 _sfx_vol        = 0.7
 _music_vol      = 0.35
 _ambient_vol    = 0.65  # raised to match combat SFX level
+_DSP_ARRAYS     = _HAS_NUMPY   # list-style helpers synthesize with numpy arrays
 
 # ── Incremental generation queues ─────────────────────────────────────────
 _gen_batch1     = []   # (name, callable) — fast SFX, generates during Splash 1
@@ -28,6 +35,16 @@ _b1_idx         = 0    # next batch1 item to generate
 _b2_idx         = 0    # next batch2 item to generate
 _gen_ready      = False  # True when all sounds generated
 
+# ── On-demand music / ambience (see ON-DEMAND TRACKS) ─────────────────────
+TRACK_BUDGET_MB = 48
+_track_budget   = TRACK_BUDGET_MB * 1024 * 1024
+_track_lru      = OrderedDict()  # resident track name → bytes, least recent first
+_track_jobs     = {}     # track name → Future while it is being synthesized
+_track_missing  = set()  # tracks that cannot be built here (e.g. no numpy)
+_track_pool     = None
+_channel_now    = {}     # "music"/"ambient" → track playing on that channel
+_channel_want   = {}     # "music"/"ambient" → (track, fallback) waiting on a build
+
 try:
     import pygame.mixer as _mixer
 except ImportError:
@@ -115,6 +132,7 @@ def save_settings():
         "music_vol":   _music_vol,
         "ambient_vol": _ambient_vol,
         "display_mode": _display_mode,
+        "audio_cache_mb": _track_budget // (1024 * 1024),
     }
     try:
         with open(_SETTINGS_FILE, "w") as f:
@@ -133,6 +151,7 @@ def load_settings():
         set_music_volume( float(data.get("music_vol",   _music_vol)))
         set_ambient_volume(float(data.get("ambient_vol",_ambient_vol)))
         set_display_mode(data.get("display_mode", "fullscreen"))
+        set_track_budget(int(data.get("audio_cache_mb", TRACK_BUDGET_MB)) * 1024 * 1024)
     except (FileNotFoundError, Exception):
         pass  # Use defaults if file missing or corrupt
 
@@ -145,14 +164,159 @@ SR = 22050
 
 
 def _make_sound(samples):
+    """Wrap 16-bit samples (a list or an integer numpy array) in a pygame Sound."""
     if not _mixer:
         return None
     try:
-        return _mixer.Sound(buffer=array.array('h', samples))
+        if _HAS_NUMPY and isinstance(samples, _np.ndarray):
+            buf = _np.ascontiguousarray(_np.clip(samples, -32767, 32767), dtype=_np.int16)
+        else:
+            buf = array.array('h', samples)
+        return _mixer.Sound(buffer=buf)
     except Exception:
         return None
 
 
+def set_dsp_backend(name):
+    """Select how the list-style helpers (_sine, _noise, _mix, ...) synthesize:
+    "array" (numpy, the default when available) or "list" (pure Python,
+    the reference implementation). Returns the previous backend name."""
+    global _DSP_ARRAYS
+    prev = "array" if _DSP_ARRAYS else "list"
+    _DSP_ARRAYS = (name == "array") and _HAS_NUMPY
+    return prev
+
+
+def get_dsp_backend():
+    return "array" if _DSP_ARRAYS else "list"
+
+
+# ═══════════════════════════════════════════════════════════════
+#  ARRAY DSP LAYER  (numpy twins of the list helpers below)
+# ═══════════════════════════════════════════════════════════════
+# Each _dsp_* function reproduces its list counterpart sample for sample:
+# the same truncating int conversion, the same per-layer clipping and the
+# same random stream (Python's Mersenne Twister state is handed to numpy),
+# so sounds only differ by float rounding. Results are int32 arrays so
+# layers can be summed before the final clip in _make_sound.
+
+def _dsp_ints(x):
+    """Float samples → int32, truncated toward zero and clipped like int()."""
+    return _np.clip(_np.trunc(x), -32767, 32767).astype(_np.int32)
+
+def _dsp_uniform(seed, n):
+    """The first n values random.Random(seed).random() would return."""
+    state = random.Random(seed).getstate()[1]
+    rs = _np.random.RandomState()
+    rs.set_state(("MT19937", _np.array(state[:624], dtype=_np.uint32), state[624], 0, 0.0))
+    return rs.random_sample(n)
+
+def _dsp_phase(freqs):
+    """Running phase of an oscillator whose frequency changes every sample."""
+    return _np.cumsum(2 * _np.pi * freqs / SR)
+
+def _dsp_decay(n, duration, fade_out):
+    if not fade_out:
+        return 1.0
+    return _np.maximum(0.0, 1.0 - _np.arange(n) / SR / duration)
+
+def _dsp_add_clipped(out, offset, chunk):
+    """out[offset:] += chunk, clipped to 16 bits, dropping what overruns."""
+    e = min(len(out), offset + len(chunk))
+    if offset < e:
+        out[offset:e] = _np.clip(out[offset:e] + chunk[:e - offset], -32767, 32767)
+
+def _dsp_sine(freq, duration, volume, fade_out):
+    n, amp = int(SR * duration), int(32000 * volume)
+    i = _np.arange(n, dtype=_np.float64)
+    return _dsp_ints(amp * _dsp_decay(n, duration, fade_out)
+                     * _np.sin(2 * math.pi * freq * i / SR))
+
+def _dsp_noise(duration, volume, fade_out, seed):
+    n, amp = int(SR * duration), int(32000 * volume)
+    return _dsp_ints(amp * _dsp_decay(n, duration, fade_out)
+                     * (_dsp_uniform(seed, n) * 2 - 1))
+
+def _dsp_sweep(f_start, f_end, duration, volume):
+    n, amp = int(SR * duration), int(32000 * volume)
+    frac  = _np.arange(n) / n
+    phase = _dsp_phase(f_start + (f_end - f_start) * frac)
+    return _dsp_ints(amp * _np.maximum(0.0, 1.0 - frac) * _np.sin(phase))
+
+def _dsp_bandpass_noise(duration, center_freq, bandwidth, volume, seed):
+    n     = int(SR * duration)
+    w0    = 2 * math.pi * center_freq / SR
+    alpha = math.sin(w0) / (2 * center_freq / bandwidth)
+    b = [alpha / (1 + alpha), 0.0, -alpha / (1 + alpha)]
+    a = [1.0, -2 * math.cos(w0) / (1 + alpha), (1 - alpha) / (1 + alpha)]
+    raw  = _signal.lfilter(b, a, _dsp_uniform(seed, n) * 2 - 1)
+    peak = float(_np.max(_np.abs(raw))) if n else 0.0
+    return _dsp_ints(raw * (32000 * volume / (peak or 1.0)))
+
+def _dsp_stick_slip_env(n, slip_count, seed):
+    rng = random.Random(seed)
+    env = _np.ones(n)
+    a, r = int(SR * 0.04), int(SR * 0.18)
+    env[:a] *= _np.arange(a) / a
+    # release ramp indexes env[n - 1 - i]; on sounds shorter than the ramp
+    # the list version wraps to negative indices, so wrap the same way
+    _np.multiply.at(env, (n - 1 - _np.arange(r)) % n, _np.arange(r) / r)
+    for _ in range(slip_count):
+        pos   = rng.randint(int(n * 0.05), int(n * 0.85))
+        surge = rng.uniform(1.1, 1.6)
+        drop  = rng.uniform(0.3, 0.65)
+        width = rng.randint(int(SR * 0.015), int(SR * 0.05))
+        tail  = rng.randint(int(SR * 0.03),  int(SR * 0.10))
+        j = _np.arange(width)
+        e = min(n, pos + width)
+        env[pos:e] *= _np.minimum(2.0, surge * (1 - j / width) + j / width)[:e - pos]
+        j = _np.arange(tail)
+        s = pos + width; e = min(n, s + tail)
+        if s < e:
+            env[s:e] *= (drop + (1.0 - drop) * j / tail)[:e - s]
+    return _np.clip(env, 0.0, 2.0)
+
+def _dsp_thud(duration, volume):
+    i = _np.arange(int(SR * duration), dtype=_np.float64)
+    return _dsp_ints(32000 * volume * _np.exp(-i / SR * 32) * _np.sin(2 * math.pi * 58 * i / SR))
+
+def _dsp_coin_clink(freq, duration, volume):
+    t = _np.arange(int(SR * duration)) / SR
+    return _dsp_ints(32000 * volume * _np.exp(-t * 22) * (
+        _np.sin(2 * math.pi * freq * t)
+        + _np.sin(2 * math.pi * freq * 1.41 * t) * 0.25))
+
+def _dsp_coin_scatter(num_coins, seed):
+    rng, total = random.Random(seed), int(SR * 1.1)
+    out = _np.zeros(total, _np.int32)
+    for _ in range(num_coins):
+        freq, offset, vol = rng.randint(1400, 2800), rng.randint(0, int(SR * 0.55)), rng.uniform(0.28, 0.42)
+        _dsp_add_clipped(out, offset, _dsp_coin_clink(freq, 0.14, vol))
+    _dsp_add_clipped(out, int(SR * 0.65), _dsp_coin_clink(rng.randint(900, 1200), 0.18, 0.22))
+    return out
+
+def _dsp_wah_note(freq, duration, volume):
+    n    = int(SR * duration)
+    i    = _np.arange(n, dtype=_np.float64)
+    t, frac = i / SR, i / n
+    env  = _np.where(frac < 0.08, frac / 0.08, _np.exp(-(frac - 0.08) * 3.5))
+    wah  = _np.sin(math.pi * frac)
+    sig  = (_np.sin(2 * math.pi * freq * t)
+            + _np.sin(2 * math.pi * freq * 3 * t) * 0.18
+            + _np.sin(2 * math.pi * freq * 5 * t) * 0.08
+            + _np.sin(2 * math.pi * (500 + 600 * wah) * t) * 0.35 * wah)
+    return _dsp_ints(32000 * volume * env * sig)
+
+def _dsp_mix(lists):
+    out = _np.zeros(max(len(s) for s in lists), _np.int32)
+    for sl in lists:
+        _dsp_add_clipped(out, 0, _np.asarray(sl, _np.int32))
+    return out
+
+def _dsp_concat(lists):
+    return _np.concatenate([_np.asarray(sl, _np.int32) for sl in lists])
+
+
 
 # ═══════════════════════════════════════════════════════════════
 #  NUMPY BIOME HELPERS  (used only if numpy/scipy available)
@@ -162,59 +326,36 @@ def _np_make_sound(sig):
     """Convert a numpy float32 array [-1,1] to a pygame Sound."""
     if not _mixer or not _HAS_NUMPY:
         return None
-    try:
-        d = (_np.clip(sig, -1.0, 1.0) * 32767).astype(_np.int16)
-        return _mixer.Sound(buffer=array.array('h', d.tolist()))
-    except Exception:
-        return None
+    return _make_sound((_np.clip(sig, -1.0, 1.0) * 32767).astype(_np.int16))
 
 def _np_sine(n, freq, vol=0.4, phase=0.0):
     t = _np.arange(n, dtype=_np.float32) / SR
     return (vol * _np.sin(2 * _np.pi * freq * t + phase))
 
 def _np_bandpass(n, cf, bw, vol=0.5, seed=0):
-    rng = _np.random.default_rng(seed)
-    noise = rng.standard_normal(n).astype(_np.float64)
-    b, a = _signal.iirfilter(4,
-        [max(20.0, cf - bw/2), min(float(SR)/2 - 1, cf + bw/2)],
-        btype='band', fs=SR, ftype='butter')
-    filtered = _signal.lfilter(b, a, noise)
-    peak = _np.max(_np.abs(filtered)) or 1.0
-    return (filtered / peak * vol).astype(_np.float32)
+    return _np_bp(n, cf, bw, seed) * _np.float32(vol)
 
 def _np_swell(n, period, phase=0.0, depth=0.55):
     t = _np.arange(n, dtype=_np.float32) / SR
     return (1.0 - depth + depth * (0.5 + 0.5 * _np.sin(2*_np.pi*t/period + phase)))
 
 def _np_fade(sig, attack=0.05, release=0.1):
-    out = sig.copy(); n = len(sig)
-    a = min(int(SR*attack), n//2); r = min(int(SR*release), n//2)
-    if a: out[:a] *= _np.linspace(0, 1, a, dtype=_np.float32)
-    if r: out[-r:] *= _np.linspace(1, 0, r, dtype=_np.float32)
-    return out
+    return _np_fade2(sig, attack, release)
 
 def _np_mix(*arrays):
-    n = max(len(a) for a in arrays)
-    out = _np.zeros(n, _np.float32)
-    for a in arrays: out[:len(a)] += a
-    return _np.clip(out, -1.0, 1.0)
+    return _np_mix2(*arrays)
 
 def _np_place(buf, onset_s, chunk):
-    s = int(SR * onset_s); e = min(len(buf), s + len(chunk))
-    buf[s:e] += chunk[:e-s]
+    _np_place2(buf, onset_s, chunk)
 
 def _np_seamless(sig, fade=0.08):
-    n = len(sig); f = int(SR * fade); out = sig.copy()
-    ramp = _np.linspace(0, 1, f, dtype=_np.float32)
-    out[:f]  += sig[-f:] * (1 - ramp)
-    out[-f:] += sig[:f]  * (1 - ramp[::-1])
-    return _np.clip(out, -1.0, 1.0)
-
-def _make_biome(fn):
-    """Generate a biome sound using numpy (if available) or return silence."""
+    return _np_seamless2(sig, fade)
+
+def _biome_track(fn):
+    """Samples of a biome loop using numpy (if available), else 4s of silence."""
     if not _HAS_NUMPY:
-        return _make_sound([0] * int(SR * 4.0))
-    return _np_make_sound(_np_seamless(fn()))
+        return [0] * int(SR * 4.0)
+    return (_np.clip(_np_seamless(fn()), -1.0, 1.0) * 32767).astype(_np.int16)
 
 def _biome_grassland():
     N = int(SR * 8.0)
@@ -322,6 +463,8 @@ def _biome_desert():
 
 
 def _sine(freq, duration, volume=0.5, fade_out=True):
+    if _DSP_ARRAYS:
+        return _dsp_sine(freq, duration, volume, fade_out)
     n, amp = int(SR * duration), int(32000 * volume)
     return [max(-32767, min(32767, int(
         amp * (max(0.0, 1.0 - i/SR/duration) if fade_out else 1.0)
@@ -330,6 +473,8 @@ def _sine(freq, duration, volume=0.5, fade_out=True):
 
 
 def _noise(duration, volume=0.3, fade_out=True, seed=42):
+    if _DSP_ARRAYS:
+        return _dsp_noise(duration, volume, fade_out, seed)
     n, amp, rng = int(SR * duration), int(32000 * volume), random.Random(seed)
     return [max(-32767, min(32767, int(
         amp * (max(0.0, 1.0 - i/SR/duration) if fade_out else 1.0)
@@ -338,6 +483,8 @@ def _noise(duration, volume=0.3, fade_out=True, seed=42):
 
 
 def _sweep(f_start, f_end, duration, volume=0.4):
+    if _DSP_ARRAYS:
+        return _dsp_sweep(f_start, f_end, duration, volume)
     n, amp, phase = int(SR * duration), int(32000 * volume), 0.0
     out = []
     for i in range(n):
@@ -349,6 +496,8 @@ def _sweep(f_start, f_end, duration, volume=0.4):
 
 def _bandpass_noise(duration, center_freq, bandwidth, volume=0.5, seed=42):
     """White noise through a biquad bandpass filter — core of creak sounds."""
+    if _DSP_ARRAYS:
+        return _dsp_bandpass_noise(duration, center_freq, bandwidth, volume, seed)
     n     = int(SR * duration)
     rng   = random.Random(seed)
     w0    = 2 * math.pi * center_freq / SR
@@ -371,6 +520,8 @@ def _bandpass_noise(duration, center_freq, bandwidth, volume=0.5, seed=42):
 
 def _stick_slip_env(n, slip_count=12, seed=5):
     """Irregular amplitude envelope simulating a hinge catching and releasing."""
+    if _DSP_ARRAYS:
+        return _dsp_stick_slip_env(n, slip_count, seed)
     rng = random.Random(seed)
     env = [1.0] * n
     for i in range(int(SR * 0.04)):
@@ -396,16 +547,22 @@ def _creak(duration, center_freq, bandwidth, volume, slip_count, seed):
     n     = int(SR * duration)
     noise = _bandpass_noise(duration, center_freq, bandwidth, volume, seed)
     env   = _stick_slip_env(n, slip_count, seed + 1)
+    if _DSP_ARRAYS:
+        return _dsp_ints(noise * env)
     return [max(-32767, min(32767, int(s * e))) for s, e in zip(noise, env)]
 
 
 def _thud(duration=0.12, volume=0.14):
+    if _DSP_ARRAYS:
+        return _dsp_thud(duration, volume)
     return [max(-32767, min(32767,
         int(32000 * volume * math.exp(-i/SR * 32) * math.sin(2 * math.pi * 58 * i/SR))))
         for i in range(int(SR * duration))]
 
 
 def _coin_clink(freq, duration=0.12, volume=0.4):
+    if _DSP_ARRAYS:
+        return _dsp_coin_clink(freq, duration, volume)
     out = []
     for i in range(int(SR * duration)):
         t   = i / SR
@@ -418,6 +575,8 @@ def _coin_clink(freq, duration=0.12, volume=0.4):
 
 
 def _coin_scatter(num_coins=6, seed=7):
+    if _DSP_ARRAYS:
+        return _dsp_coin_scatter(num_coins, seed)
     rng, total = random.Random(seed), int(SR * 1.1)
     out = [0] * total
     for _ in range(num_coins):
@@ -433,6 +592,8 @@ def _coin_scatter(num_coins=6, seed=7):
 
 
 def _wah_note(freq, duration, volume=0.38):
+    if _DSP_ARRAYS:
+        return _dsp_wah_note(freq, duration, volume)
     out = []
     for i in range(int(SR * duration)):
         t, frac = i / SR, i / int(SR * duration)
@@ -453,15 +614,17 @@ def _peanuts_talk(num_syllables=5, seed=99):
         for w in range(word_len):
             if i >= num_syllables:
                 break
-            parts += _wah_note(240 * rng.uniform(0.82, 1.22), rng.uniform(0.13, 0.21), rng.uniform(0.30, 0.40))
+            parts.append(_wah_note(240 * rng.uniform(0.82, 1.22), rng.uniform(0.13, 0.21), rng.uniform(0.30, 0.40)))
             if w < word_len - 1:
-                parts += [0] * int(SR * 0.04)
+                parts.append(_silence(0.04))
             i += 1
-        parts += [0] * int(SR * 0.13)
-    return parts
+        parts.append(_silence(0.13))
+    return _concat(*parts)
 
 
 def _mix(*lists):
+    if _DSP_ARRAYS:
+        return _dsp_mix(lists)
     n, out = max(len(s) for s in lists), []
     out = [0] * n
     for sl in lists:
@@ -471,6 +634,8 @@ def _mix(*lists):
 
 
 def _concat(*lists):
+    if _DSP_ARRAYS:
+        return _dsp_concat(lists)
     out = []
     for sl in lists:
         out.extend(sl)
@@ -478,6 +643,8 @@ def _concat(*lists):
 
 
 def _silence(duration):
+    if _DSP_ARRAYS:
+        return _np.zeros(int(SR * duration), _np.int32)
     return [0] * int(SR * duration)
 
 
@@ -548,8 +715,7 @@ def _make_np_sound(fn):
     if not _HAS_NUMPY: return None
     try:
         sig = fn()
-        d = (_np.clip(sig,-1,1)*32767).astype(_np.int16)
-        return _make_sound(list(d))
+        return _make_sound((_np.clip(sig,-1,1)*32767).astype(_np.int16))
     except Exception:
         return None
 
@@ -641,10 +807,8 @@ def _gen_hit_arcane():
     """Arcane hit: rising sweep → crystalline shimmer → echo decay."""
     n=int(SR*.38)
     # Frequency sweep (low→high)
-    sweep=_np.zeros(n,_np.float32); phase=0.0
-    for i in range(n):
-        frac=i/n; freq=400+2000*frac*(1-frac*0.5); phase+=2*_np.pi*freq/SR
-        sweep[i]=_np.sin(phase)*(frac**0.4)*((1-frac)**0.6)
+    frac=_np.arange(n)/n; phase=_dsp_phase(400+2000*frac*(1-frac*0.5))
+    sweep=(_np.sin(phase)*(frac**0.4)*((1-frac)**0.6)).astype(_np.float32)
     sweep=_np_lp(sweep*0.55, 4000)
     # Crystal resonance
     cryst=_np.zeros(n,_np.float32)
@@ -743,14 +907,11 @@ def _gen_miss_magic():
     """Spell fizzles out — energy that built up but didn't release. Low thump."""
     n = int(SR * 0.45)
     # Energy that was building suddenly dissipates — low collapse
-    charge = _np.zeros(n, _np.float32)
-    phase = 0.0
-    for i in range(n):
-        frac = i / n
-        # Builds then collapses
-        freq = 80 + 120 * frac * (1 - frac) * 4
-        phase += 2 * _np.pi * freq / SR
-        charge[i] = _np.sin(phase) * min(frac * 4, 1.0) * max(1 - frac * 1.5, 0) * 0.40
+    frac = _np.arange(n) / n
+    # Builds then collapses
+    phase = _dsp_phase(80 + 120 * frac * (1 - frac) * 4)
+    charge = (_np.sin(phase) * _np.minimum(frac * 4, 1.0)
+              * _np.maximum(1 - frac * 1.5, 0) * 0.40).astype(_np.float32)
     charge = _np_lp(charge, 500)
     # Low hollow thud when it collapses
     n3 = int(SR * 0.15); t3 = int(SR * 0.28)
@@ -781,9 +942,8 @@ def _gen_heal():
         return vol*env*(_np_sinev(n,freq,1.0)+_np_sinev(n,freq*2,.12))
     return _np_norm(_np.concatenate([nn(523,.16),nn(659,.16),nn(784,.22)]))
 def _gen_revive():
-    n_r=int(SR*.5); hum=_np.zeros(n_r,_np.float32)
-    for i in range(n_r):
-        frac=i/n_r; freq=180+320*frac**2; hum[i]=_np.sin(2*_np.pi*freq*i/SR)*(frac**1.5)*.3
+    n_r=int(SR*.5); i=_np.arange(n_r); frac=i/n_r; freq=180+320*frac**2
+    hum=(_np.sin(2*_np.pi*freq*i/SR)*(frac**1.5)*.3).astype(_np.float32)
     hum=_np_lp(hum,800)
     n_p=int(SR*.45); chords=_np.zeros(n_p,_np.float32)
     for freq,vol in [(523,.28),(659,.22),(784,.18),(1047,.14),(1318,.10)]:
@@ -831,11 +991,9 @@ def _gen_buff_magic():
     Centroid ~800Hz — present and clearly 'magical'."""
     n = int(SR * 0.65)
     # Rising frequency sweep — clearly audible upward motion
-    sweep = _np.zeros(n, _np.float32); phase = 0.0
-    for i in range(n):
-        freq = 300 + 700 * (i/n) ** 1.0   # 300 → 1000Hz linear rise
-        phase += 2 * _np.pi * freq / SR
-        sweep[i] = _np.sin(phase) * (i/n) ** 0.5 * (1 - i/n) ** 0.3 * 0.38
+    frac = _np.arange(n) / n
+    phase = _dsp_phase(300 + 700 * frac ** 1.0)   # 300 → 1000Hz linear rise
+    sweep = (_np.sin(phase) * frac ** 0.5 * (1 - frac) ** 0.3 * 0.38).astype(_np.float32)
     # Sustaining chord that rings out
     chord = _np.zeros(n, _np.float32)
     for f, v, tau in [(330, 0.30, 0.25), (440, 0.22, 0.20), (550, 0.16, 0.16), (660, 0.10, 0.12)]:
@@ -887,11 +1045,9 @@ def _gen_debuff_physical():
     """Thief mark / physical cripple — scrape and drag, weight being stripped away."""
     n = int(SR * 0.55)
     # Descending scrape (higher → lower, like something being stripped)
-    scrape = _np.zeros(n, _np.float32); phase = 0.0
-    for i in range(n):
-        freq = 280 - 180 * (i/n) ** 0.6   # 280 → 100 Hz drop
-        phase += 2 * _np.pi * freq / SR
-        scrape[i] = _np.sin(phase) * (1 - i/n) ** 0.5 * 0.38
+    frac = _np.arange(n) / n
+    phase = _dsp_phase(280 - 180 * frac ** 0.6)   # 280 → 100 Hz drop
+    scrape = (_np.sin(phase) * (1 - frac) ** 0.5 * 0.38).astype(_np.float32)
     scrape = _np_lp(scrape, 400)
     # Low grinding undertone
     grind = _np_bp(n, 140, 65, 100) * _np_exp(n, 0.14) * 0.45
@@ -919,15 +1075,11 @@ def _gen_debuff_divine():
     return _np_norm(_np_mix2(toll, clash, low, rumble) * _np_fade2(_np.ones(n, _np.float32), .003, .25))
 
 # ── Dungeon music tracks ──────────────────────────────────────
-def _gen_dungeon(fn):
+def _np_track(fn):
+    """Samples of a numpy-synthesized music loop, or None without numpy."""
     if not _HAS_NUMPY: return None
-    try:
-        sig = fn()
-        sig = _np.nan_to_num(sig, nan=0.0, posinf=0.0, neginf=0.0)
-        d = (_np.clip(sig, -1, 1) * 32767).astype(_np.int16)
-        return _make_sound(list(d))
-    except Exception:
-        return None
+    sig = _np.nan_to_num(fn(), nan=0.0, posinf=0.0, neginf=0.0)
+    return (_np.clip(sig, -1, 1) * 32767).astype(_np.int16)
 
 
 def _dungeon_goblin_warren():
@@ -1466,13 +1618,9 @@ def _gen_cast_attack():
     n = int(SR * 0.40)
     ramp = _np.linspace(0.0, 1.0, n).astype(_np.float32)
     # Rising tone sweep — 150Hz → 600Hz, clearly audible build
-    charge = _np.zeros(n, _np.float32)
-    phase = 0.0
-    for i in range(n):
-        frac = i / n
-        freq = 150 + 450 * (frac ** 1.2)   # 150 → 600Hz
-        phase += 2 * _np.pi * freq / SR
-        charge[i] = _np.sin(phase) * (frac ** 0.6) * 0.40
+    frac = _np.arange(n) / n
+    phase = _dsp_phase(150 + 450 * (frac ** 1.2))   # 150 → 600Hz
+    charge = (_np.sin(phase) * (frac ** 0.6) * 0.40).astype(_np.float32)
     # Harmonic shimmer at mid frequencies — gives "magical" feel
     shimmer = _np.zeros(n, _np.float32)
     for f, v in [(320, 0.20), (480, 0.15), (640, 0.10)]:
@@ -1548,13 +1696,9 @@ def _gen_cast_debuff():
     Audible threat. Centroid ~800Hz — present, menacing, not too low."""
     n = int(SR * 0.32)
     # Descending sweep — something being pulled down
-    sweep = _np.zeros(n, _np.float32)
-    phase = 0.0
-    for i in range(n):
-        frac = i / n
-        freq = 1200 - 800 * (frac ** 0.6)   # 1200 → 400Hz descent
-        phase += 2 * _np.pi * freq / SR
-        sweep[i] = _np.sin(phase) * min(frac * 5, 1.0) * (1 - frac) ** 0.6 * 0.35
+    frac = _np.arange(n) / n
+    phase = _dsp_phase(1200 - 800 * (frac ** 0.6))   # 1200 → 400Hz descent
+    sweep = (_np.sin(phase) * _np.minimum(frac * 5, 1.0) * (1 - frac) ** 0.6 * 0.35).astype(_np.float32)
     # Scratchy noise texture — knife/blade quality
     scratch = _np_bp(n, 1800, 900, 260) * _np.linspace(0.4, 1.0, n).astype(_np.float32) ** 0.5 * 0.28
     scratch *= _np.linspace(1.0, 0.2, n).astype(_np.float32)   # fade out
@@ -2100,25 +2244,17 @@ def play_dungeon_music(dungeon_id):
     """Play the matching dungeon track, falling back to dungeon_ambient."""
     if not _enabled: return
     name = f"dungeon_{dungeon_id}"
-    snd = _sounds.get(name)
-    if not snd:
-        snd = _sounds.get("dungeon_ambient")
-    if snd:
-        snd.set_volume(_master_vol * _music_vol)
-        if _music_channel:
-            _music_channel.play(snd, loops=-1)
+    if name not in _TRACKS:
+        name = "dungeon_ambient"
+    _play_track("music", name, fallback="dungeon_ambient")
 
 def play_town_music(town_id):
     """Play the matching town track, falling back to town_ambient."""
     if not _enabled: return
     name = f"town_{town_id}"
-    snd = _sounds.get(name)
-    if not snd:
-        snd = _sounds.get("town_ambient")
-    if snd:
-        snd.set_volume(_master_vol * _music_vol)
-        if _music_channel:
-            _music_channel.play(snd, loops=-1)
+    if name not in _TRACKS:
+        name = "town_ambient"
+    _play_track("music", name, fallback="town_ambient")
 
 # ═══════════════════════════════════════════════════════════════
 #  SOUND DEFINITIONS
@@ -2281,56 +2417,33 @@ def _build_gen_queues():
         ("Exploration sounds",  _b1_exploration),
     ]
 
-    # ── BATCH 2: Music and ambient — generated one per frame during Splash 2 ──
-    # Each entry is a label + callable. The callable generates and registers one sound.
+    # ── BATCH 2: startup music — generated during Splash 2 ──
+    # Only the Briarhollow theme (it plays over the loading screen and is the
+    # starting town). Every other music loop and ambience is a _TRACKS entry,
+    # built on demand when its town, dungeon or biome is entered.
 
     _gen_batch2 = [
-        # town_briarhollow FIRST so music can start during loading screen
-        ("Briarhollow music",         lambda: _sounds.update({"town_briarhollow": _gen_dungeon(_town_briarhollow)})),
-        ("World ambient",             lambda: _generate_world_ambient()),
-        ("Town ambient music",        lambda: _generate_town_ambient()),
-        ("Town crowd ambience",       lambda: _generate_town_env()),
-        ("Grassland sounds",          lambda: _sounds.update({"ambient_grassland": _make_biome(_biome_grassland)})),
-        ("Forest sounds",             lambda: _sounds.update({"ambient_forest": _make_biome(_biome_forest)})),
-        ("Hills sounds",              lambda: _sounds.update({"ambient_hills": _make_biome(_biome_hills)})),
-        ("Swamp sounds",              lambda: _sounds.update({"ambient_swamp": _make_biome(_biome_swamp)})),
-        ("Coast sounds",              lambda: _sounds.update({"ambient_coast": _make_biome(_biome_coast)})),
-        ("Desert sounds",             lambda: _sounds.update({"ambient_desert": _make_biome(_biome_desert)})),
-        ("Dungeon ambience",          lambda: _sounds.update({"dungeon_ambient": _make_sound(_mix(_sine(65, 2.5, 0.08, fade_out=False), _bandpass_noise(2.5, 110, 40, volume=0.05, seed=66)))})),
-        ("Goblin Warren music",       lambda: _sounds.update({"dungeon_goblin_warren": _gen_dungeon(_dungeon_goblin_warren)})),
-        ("Spider\'s Nest music",     lambda: _sounds.update({"dungeon_spiders_nest": _gen_dungeon(_dungeon_spiders_nest)})),
-        ("Abandoned Mine music",      lambda: _sounds.update({"dungeon_abandoned_mine": _gen_dungeon(_dungeon_abandoned_mine)})),
-        ("Ruins of Ashenmoor music",  lambda: _sounds.update({"dungeon_ruins_ashenmoor": _gen_dungeon(_dungeon_ruins_ashenmoor)})),
-        ("Sunken Crypt music",        lambda: _sounds.update({"dungeon_sunken_crypt": _gen_dungeon(_dungeon_sunken_crypt)})),
-        ("Pale Coast music",          lambda: _sounds.update({"dungeon_pale_coast": _gen_dungeon(_dungeon_pale_coast)})),
-        ("Windswept Isle music",      lambda: _sounds.update({"dungeon_windswept_isle": _gen_dungeon(_dungeon_windswept_isle)})),
-        ("Dragon\'s Tooth music",    lambda: _sounds.update({"dungeon_dragons_tooth": _gen_dungeon(_dungeon_dragons_tooth)})),
-        ("Valdris\' Spire music",    lambda: _sounds.update({"dungeon_valdris_spire": _gen_dungeon(_dungeon_valdris_spire)})),
-        ("Woodhaven music",           lambda: _sounds.update({"town_woodhaven": _gen_dungeon(_town_woodhaven)})),
-        ("Ironhearth music",          lambda: _sounds.update({"town_ironhearth": _gen_dungeon(_town_ironhearth)})),
-        ("Greenwood music",           lambda: _sounds.update({"town_greenwood": _gen_dungeon(_town_greenwood)})),
-        ("Saltmere music",            lambda: _sounds.update({"town_saltmere": _gen_dungeon(_town_saltmere)})),
-        ("Sanctum music",             lambda: _sounds.update({"town_sanctum": _gen_dungeon(_town_sanctum)})),
-        ("Crystalspire music",        lambda: _sounds.update({"town_crystalspire": _gen_dungeon(_town_crystalspire)})),
-        ("Thornhaven music",          lambda: _sounds.update({"town_thornhaven": _gen_dungeon(_town_thornhaven)})),
+        ("Briarhollow music",         lambda: load_track("town_briarhollow")),
     ]
 
 
-def _generate_world_ambient():
-    _sounds["world_ambient"] = _make_sound(_bandpass_noise(3.0, 180, 80, volume=0.08, seed=88))
-
-
-def _generate_town_ambient():
-    """Town ambient — warm Briarhollow-style loop (fallback for all towns)."""
-    _sounds["town_ambient"] = _gen_dungeon(_town_briarhollow)
-
-
-def _generate_town_env():
+def _town_env_samples():
     """Crowd murmur + distant bell dings — ambient layer played over town music."""
     env_dur = 8.0
     env_n   = int(SR * env_dur)
     crowd   = _bandpass_noise(env_dur, 250, 60, volume=0.025, seed=71)
     wind    = _bandpass_noise(env_dur, 380, 120, volume=0.018, seed=99)
+    if _DSP_ARRAYS:
+        bell = _np.zeros(env_n, _np.int32)
+        for t_hit in (1.8, 4.6, 7.1):
+            pos = int(t_hit * SR); j = _np.arange(min(int(SR * 0.8), env_n - pos))
+            bell[pos:pos + len(j)] += _np.trunc(
+                3500 * _np.exp(-j / (SR * 0.25)) * _np.sin(2*math.pi*880.0*j/SR)).astype(_np.int32)
+        samp = _np.clip(crowd + wind + bell, -32767, 32767)
+        f = _np.arange(int(SR * 0.12)) / int(SR * 0.12)
+        samp[:len(f)] = _np.trunc(samp[:len(f)] * f)
+        samp[env_n - len(f):] = _np.trunc(samp[env_n - len(f):] * f[::-1])
+        return samp
     bell    = [0] * env_n
     for t_hit in (1.8, 4.6, 7.1):
         pos = int(t_hit * SR); freq = 880.0; bdur = int(SR * 0.8)
@@ -2343,7 +2456,44 @@ def _generate_town_env():
         f = i / fade_e
         samp[i] = int(samp[i] * f)
         samp[env_n-1-i] = int(samp[env_n-1-i] * f)
-    _sounds["town_env"] = _make_sound(samp)
+    return samp
+
+
+# Music loops and ambiences, by sound name → sample producer (list, int
+# array, or None when the track cannot be synthesized here).
+_TRACKS = {
+    "world_ambient":          lambda: _bandpass_noise(3.0, 180, 80, volume=0.08, seed=88),
+    "town_env":               _town_env_samples,
+    "dungeon_ambient":        lambda: _mix(_sine(65, 2.5, 0.08, fade_out=False),
+                                           _bandpass_noise(2.5, 110, 40, volume=0.05, seed=66)),
+    "ambient_grassland":      lambda: _biome_track(_biome_grassland),
+    "ambient_forest":         lambda: _biome_track(_biome_forest),
+    "ambient_hills":          lambda: _biome_track(_biome_hills),
+    "ambient_swamp":          lambda: _biome_track(_biome_swamp),
+    "ambient_coast":          lambda: _biome_track(_biome_coast),
+    "ambient_desert":         lambda: _biome_track(_biome_desert),
+    "dungeon_goblin_warren":  lambda: _np_track(_dungeon_goblin_warren),
+    "dungeon_spiders_nest":   lambda: _np_track(_dungeon_spiders_nest),
+    "dungeon_abandoned_mine": lambda: _np_track(_dungeon_abandoned_mine),
+    "dungeon_ruins_ashenmoor":lambda: _np_track(_dungeon_ruins_ashenmoor),
+    "dungeon_sunken_crypt":   lambda: _np_track(_dungeon_sunken_crypt),
+    "dungeon_pale_coast":     lambda: _np_track(_dungeon_pale_coast),
+    "dungeon_windswept_isle": lambda: _np_track(_dungeon_windswept_isle),
+    "dungeon_dragons_tooth":  lambda: _np_track(_dungeon_dragons_tooth),
+    "dungeon_valdris_spire":  lambda: _np_track(_dungeon_valdris_spire),
+    "town_briarhollow":       lambda: _np_track(_town_briarhollow),
+    "town_woodhaven":         lambda: _np_track(_town_woodhaven),
+    "town_ironhearth":        lambda: _np_track(_town_ironhearth),
+    "town_greenwood":         lambda: _np_track(_town_greenwood),
+    "town_saltmere":          lambda: _np_track(_town_saltmere),
+    "town_sanctum":           lambda: _np_track(_town_sanctum),
+    "town_crystalspire":      lambda: _np_track(_town_crystalspire),
+    "town_thornhaven":        lambda: _np_track(_town_thornhaven),
+}
+# town_ambient was a second copy of the Briarhollow theme
+_TRACK_ALIASES = {"town_ambient": "town_briarhollow"}
+
+
 
 
 def step_batch1():
@@ -2395,6 +2545,188 @@ def _generate_all_sounds():
     _gen_ready = True
 
 
+# ═══════════════════════════════════════════════════════════════
+#  ON-DEMAND TRACKS
+# ═══════════════════════════════════════════════════════════════
+# A music loop or ambience is synthesized the first time it is asked for
+# (play_* or prefetch) on a single background worker, then lives in
+# _sounds like any other sound. _track_lru keeps the resident tracks in
+# use order; once their bytes exceed the budget the least recently used
+# are dropped — never the ones playing or waiting to play.
+
+def _get_track_pool():
+    global _track_pool
+    if _track_pool is None:
+        from concurrent.futures import ThreadPoolExecutor
+        _track_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="audio")
+    return _track_pool
+
+
+def _track_name(name):
+    return _TRACK_ALIASES.get(name, name)
+
+
+def _sound_bytes(snd, samples=None):
+    """Bytes a Sound occupies in the mixer's own format."""
+    try:
+        freq, fmt, channels = _mixer.get_init()
+        return int(snd.get_length() * freq) * channels * (abs(fmt) // 8)
+    except Exception:
+        return 2 * len(samples) if samples is not None else 0
+
+
+def _install_track(name, samples):
+    snd = _make_sound(samples) if samples is not None else None
+    if snd is None:
+        _track_missing.add(name)
+        return None
+    _sounds[name] = snd
+    _track_lru[name] = _sound_bytes(snd, samples)
+    _track_lru.move_to_end(name)
+    _evict_tracks()
+    return snd
+
+
+def _evict_tracks():
+    pinned = set(_channel_now.values()) | {want[0] for want in _channel_want.values()}
+    total = sum(_track_lru.values())
+    for name in list(_track_lru):
+        if total <= _track_budget:
+            break
+        if name in pinned:
+            continue
+        total -= _track_lru.pop(name)
+        _sounds.pop(name, None)
+
+
+def set_track_budget(nbytes):
+    """Cap the bytes of resident music/ambience (evicts immediately)."""
+    global _track_budget
+    _track_budget = max(0, int(nbytes))
+    _evict_tracks()
+
+
+def get_track_budget():
+    return _track_budget
+
+
+def prefetch(name):
+    """Start building a track in the background unless it is resident,
+    already queued or unavailable. Returns True if a build was queued."""
+    name = _track_name(name)
+    if (not _enabled or name not in _TRACKS or name in _track_lru
+            or name in _track_jobs or name in _track_missing):
+        return False
+    _track_jobs[name] = _get_track_pool().submit(_TRACKS[name])
+    return True
+
+
+def load_track(name):
+    """Build (or fetch) a track synchronously. Returns its Sound or None."""
+    name = _track_name(name)
+    if name in _track_lru:
+        _track_lru.move_to_end(name)
+        return _sounds.get(name)
+    if name not in _TRACKS or name in _track_missing:
+        return None
+    job = _track_jobs.pop(name, None)
+    try:
+        samples = job.result() if job else _TRACKS[name]()
+    except Exception:
+        samples = None
+    return _install_track(name, samples)
+
+
+def update():
+    """Call once per frame: installs finished background builds and starts
+    any channel that was waiting for one."""
+    for name, job in list(_track_jobs.items()):
+        if not job.done():
+            continue
+        del _track_jobs[name]
+        try:
+            samples = job.result()
+        except Exception:
+            samples = None
+        _install_track(name, samples)
+    for chan, (name, fallback) in list(_channel_want.items()):
+        if name in _track_lru:
+            del _channel_want[chan]
+            _start_channel(chan, name)
+        elif name in _track_missing:
+            del _channel_want[chan]
+            if fallback and _track_name(fallback) != name:
+                _play_track(chan, fallback)
+
+
+def tracks_pending():
+    return bool(_track_jobs)
+
+
+def _channel(chan):
+    return _music_channel if chan == "music" else _ambient_channel
+
+
+def _start_channel(chan, name):
+    snd = _sounds.get(name)
+    channel = _channel(chan)
+    if not snd or channel is None:
+        return
+    snd.set_volume(_master_vol * (_music_vol if chan == "music" else _ambient_vol))
+    channel.play(snd, loops=-1)
+    _channel_now[chan] = name
+    _track_lru.move_to_end(name)
+
+
+def _play_track(chan, name, fallback=None):
+    """Loop a track on a channel, building it first if it is not resident."""
+    name = _track_name(name)
+    if name in _track_lru:
+        _channel_want.pop(chan, None)
+        _start_channel(chan, name)
+    elif name in _track_missing or name not in _TRACKS:
+        _channel_want.pop(chan, None)
+        if fallback and _track_name(fallback) != name:
+            _play_track(chan, fallback)
+    else:
+        _channel_want[chan] = (name, fallback)
+        for other, job in list(_track_jobs.items()):
+            if other != name and job.cancel():   # still queued: this one goes first
+                del _track_jobs[other]
+        prefetch(name)
+
+
+def audio_memory():
+    """Resident audio memory report (bytes):
+    {"tracks": {name: bytes}, "track_bytes", "budget", "sfx_bytes", "total",
+     "pending": [names being built]}"""
+    seen, sfx_bytes = set(), 0
+    for name, snd in _sounds.items():
+        if snd is None or name in _track_lru or id(snd) in seen:
+            continue        # aliases (hit_physical → hit_medium) share one Sound
+        seen.add(id(snd))
+        sfx_bytes += _sound_bytes(snd)
+    track_bytes = sum(_track_lru.values())
+    return {
+        "tracks":      dict(_track_lru),
+        "track_bytes": track_bytes,
+        "budget":      _track_budget,
+        "sfx_bytes":   sfx_bytes,
+        "total":       track_bytes + sfx_bytes,
+        "pending":     sorted(_track_jobs),
+    }
+
+
+mem_stats.register("sound", _sounds, size=lambda _s: audio_memory()["total"])
+
+
+def _cancel_track_jobs():
+    for job in _track_jobs.values():
+        job.cancel()
+
+atexit.register(_cancel_track_jobs)
+
+
 # ═══════════════════════════════════════════════════════════════
 #  PUBLIC API
 # ═══════════════════════════════════════════════════════════════
@@ -2413,6 +2745,9 @@ def play_music(name):
     """Play a sound on the music channel, looping indefinitely."""
     if not _enabled or _music_channel is None:
         return
+    if _track_name(name) in _TRACKS:
+        _play_track("music", name)
+        return
     snd = _sounds.get(name)
     if snd:
         snd.set_volume(_master_vol * _music_vol)
@@ -2423,6 +2758,9 @@ def play_ambient(name):
     """Play a sound on the ambient channel, looping indefinitely."""
     if not _enabled or _ambient_channel is None:
         return
+    if _track_name(name) in _TRACKS:
+        _play_track("ambient", name)
+        return
     snd = _sounds.get(name)
     if snd:
         snd.set_volume(_master_vol * _ambient_vol)
@@ -2431,17 +2769,23 @@ def play_ambient(name):
 
 def stop_music():
     """Stop the music channel."""
+    _channel_want.pop("music", None)
+    _channel_now.pop("music", None)
     if _enabled and _music_channel:
         _music_channel.stop()
 
 
 def stop_ambient():
     """Stop the ambient channel."""
+    _channel_want.pop("ambient", None)
+    _channel_now.pop("ambient", None)
     if _enabled and _ambient_channel:
         _ambient_channel.stop()
 
 
 def stop_all():
     """Stop all currently playing sounds."""
+    _channel_want.clear()
+    _channel_now.clear()
     if _enabled and _mixer:
         _mixer.stop()
@@ -14,22 +14,72 @@ Flag naming convention:
   boss.<boss_id>.defeated    — boss kill tracking
   npc.<npc_id>.met           — whether an NPC has been spoken to
   item.hearthstone.<n>       — hearthstone collection progress
+
+Every flag written through this module's functions emits
+core.events.FLAG_SET so listeners (achievements, jobs) can re-evaluate
+only what changed; reset() and load_save_data() emit FLAGS_RESET instead.
+flags_version() changes on any write at all, including direct writes to
+_flags, so callers can cache anything derived from the flags (dialogue
+choice visibility) and check one integer per frame.
 """
 
+from core import events
+
 # ═══════════════════════════════════════════════════════════════
 #  FLAG STORAGE (module-level singleton)
 # ═══════════════════════════════════════════════════════════════
 
-_flags = {}
+_version = 0
+
+
+class _Flags(dict):
+    """The flag dict: a plain dict that bumps _version on every write."""
+    __slots__ = ()
+
+    def __setitem__(self, key, value):
+        global _version
+        _version += 1
+        dict.__setitem__(self, key, value)
+
+    def __delitem__(self, key):
+        global _version
+        _version += 1
+        dict.__delitem__(self, key)
+
+    def _bump(name):
+        def write(self, *args, **kwargs):
+            global _version
+            _version += 1
+            return getattr(dict, name)(self, *args, **kwargs)
+        write.__name__ = name
+        return write
+
+    clear = _bump("clear")
+    pop = _bump("pop")
+    popitem = _bump("popitem")
+    setdefault = _bump("setdefault")
+    update = _bump("update")
+    del _bump
+
+
+_flags = _Flags()
+
+
+def flags_version():
+    """Counter that changes whenever any flag is written or the flags are
+    reset/loaded."""
+    return _version
 
 
 def reset():
     """Clear all flags (new game)."""
-    global _flags
-    _flags = {
+    global _flags, _version
+    _flags = _Flags({
         "act": 1,
         "intro_seen": False,
-    }
+    })
+    _version += 1
+    events.emit(events.FLAGS_RESET)
 
 
 def get(key, default=None):
@@ -45,6 +95,7 @@ def get_flag(key, default=None):
 def set_flag(key, value):
     """Set a flag value."""
     _flags[key] = value
+    events.emit(events.FLAG_SET, key=key, value=value)
 
 
 def get_all_flags() -> dict:
@@ -60,6 +111,7 @@ def has(key):
 def increment(key, amount=1):
     """Increment a numeric flag."""
     _flags[key] = _flags.get(key, 0) + amount
+    events.emit(events.FLAG_SET, key=key, value=_flags[key])
 
 
 def get_quest_state(quest_id):
@@ -69,7 +121,11 @@ def get_quest_state(quest_id):
 
 def set_quest_state(quest_id, state):
     """Set quest progress."""
-    _flags[f"quest.{quest_id}.state"] = state
+    key = f"quest.{quest_id}.state"
+    _flags[key] = state
+    events.emit(events.FLAG_SET, key=key, value=state)
+    if state == -2:
+        events.emit(events.QUEST_COMPLETED, quest_id=quest_id)
 
 
 def start_quest(quest_id):
@@ -77,6 +133,7 @@ def start_quest(quest_id):
     key = f"quest.{quest_id}.state"
     if _flags.get(key, 0) == 0:
         _flags[key] = 1
+        events.emit(events.FLAG_SET, key=key, value=1)
         try:
             import core.sound as sfx
             sfx.play("quest_accept")
@@ -86,7 +143,10 @@ def start_quest(quest_id):
 
 def complete_quest(quest_id):
     """Mark a quest as complete."""
-    _flags[f"quest.{quest_id}.state"] = -2  # -2 = complete
+    key = f"quest.{quest_id}.state"
+    _flags[key] = -2  # -2 = complete
+    events.emit(events.FLAG_SET, key=key, value=-2)
+    events.emit(events.QUEST_COMPLETED, quest_id=quest_id)
     try:
         import core.sound as sfx
         sfx.play("quest_complete")
@@ -143,7 +203,7 @@ def all_objectives_complete(quest_id):
 
 def discover_lore(lore_id):
     """Mark a lore entry as discovered."""
-    _flags[f"lore.{lore_id}"] = True
+    set_flag(f"lore.{lore_id}", True)
 
 
 def has_lore(lore_id):
@@ -152,7 +212,9 @@ def has_lore(lore_id):
 
 def defeat_boss(boss_id):
     """Record a boss defeat."""
-    _flags[f"boss.{boss_id}.defeated"] = True
+    key = f"boss.{boss_id}.defeated"
+    _flags[key] = True
+    events.emit(events.FLAG_SET, key=key, value=True)
 
 
 def is_boss_defeated(boss_id):
@@ -161,7 +223,7 @@ def is_boss_defeated(boss_id):
 
 def meet_npc(npc_id):
     """Record that the party has met an NPC."""
-    _flags[f"npc.{npc_id}.met"] = True
+    set_flag(f"npc.{npc_id}.met", True)
 
 
 def has_met_npc(npc_id):
@@ -170,7 +232,9 @@ def has_met_npc(npc_id):
 
 def collect_hearthstone(n):
     """Record collection of hearthstone #n (1-5)."""
-    _flags[f"item.hearthstone.{n}"] = True
+    key = f"item.hearthstone.{n}"
+    _flags[key] = True
+    events.emit(events.FLAG_SET, key=key, value=True)
 
 
 def hearthstone_count():
@@ -235,11 +299,13 @@ def get_save_data():
 
 
 def load_save_data(data):
-    global _flags
-    _flags = dict(data) if data else {}
+    global _flags, _version
+    _flags = _Flags(data or ())
+    _version += 1
     # Ensure defaults
     if "act" not in _flags:
         _flags["act"] = 1
+    events.emit(events.FLAGS_RESET)
 
 
 # Initialize with defaults
@@ -267,7 +333,7 @@ def auto_advance_quests(party=None):
         # Distribute rewards for quests recently completed via dialogue
         if state == -2 and not _flags.get(rewarded_key):
             _distribute_quest_rewards(qid, party)
-            _flags[rewarded_key] = True
+            set_flag(rewarded_key, True)
             completed_now.append(qid)
             continue
 
@@ -280,20 +346,20 @@ def auto_advance_quests(party=None):
         if turnin is None or q.get("auto_complete"):
             complete_quest(qid)
             _distribute_quest_rewards(qid, party)
-            _flags[rewarded_key] = True
+            set_flag(rewarded_key, True)
             completed_now.append(qid)
         elif state < 2:
             # Turn-in quest: objectives done but needs NPC — advance to state 2
             # so dialogue conditions using ">= 2" know it's ready to hand in
-            _flags[f"quest.{qid}.state"] = 2
+            set_quest_state(qid, 2)
     # ── Advance act flag based on story milestones ─────────────────────────
     # Act 1→2: first Hearthstone recovered (Abandoned Mine boss dead)
     # Act 2→3: Maren takes the stones and leaves
     current_act = _flags.get("act", 1)
     if current_act < 2 and _flags.get("hearthstone.abandoned_mine"):
-        _flags["act"] = 2
+        set_flag("act", 2)
     if current_act < 3 and _flags.get("maren.left"):
-        _flags["act"] = 3
+        set_flag("act", 3)
         # Safety net: start the Spire quest if it wasn't started via Varek dialogue
         if not _flags.get("quest.main_act3_spire.state"):
             start_quest("main_act3_spire")
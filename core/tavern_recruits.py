@@ -6,10 +6,21 @@ party's average level. Recruits are real Character objects with proper
 stats, abilities, and equipment — not stat dicts.
 
 Called when the player opens the Adventurers tab in any tavern.
-Roster is cached until party average level shifts by 2 or more.
+
+A town's pool depends only on (town, party average level): every roll
+comes from one random.Random seeded with those, and recruits are raised
+to level in a single step (progression.scale_to_level) rather than one
+level-up at a time. Pools are cached (up to _POOL_MAX), and
+prefetch_near() builds them on a background thread while the party is
+walking up to a town. Hired recruits are tracked per town apart from the
+pools (mark_hired), so they stay gone even when the party's level moves
+the town to a different pool or the pool is evicted and rebuilt.
 """
 
 import random
+import threading
+
+from core import events
 
 # ═══════════════════════════════════════════════════════════════
 #  TOWN ROSTER TEMPLATES
@@ -76,12 +87,13 @@ _FALLBACK_ROSTER = [
 ]
 
 
-def _make_recruit_char(name, cls, race, target_level):
+def _make_recruit_char(name, cls, race, target_level, rng=None):
     """Build a properly levelled Character for a recruit."""
     from core.character import Character
-    from core.classes import get_all_resources, CLASSES
-    from core.progression import apply_level_up, xp_for_level, CLASS_TRANSITIONS
+    from core.classes import CLASSES
+    from core.progression import scale_to_level, CLASS_TRANSITIONS
 
+    rng = rng or random
     # Use base class for any hybrid/apex target
     base_cls = cls
     if cls not in CLASSES:
@@ -89,53 +101,36 @@ def _make_recruit_char(name, cls, race, target_level):
         base_cls = trans["base_classes"][0] if trans and trans.get("base_classes") else "Fighter"
 
     c = Character(name, base_cls, race)
-    c.quick_roll(base_cls)
-    c.resources = get_all_resources(base_cls, c.stats, 1)
+    c.quick_roll(base_cls, rng=rng)
 
-    # Level up to target, auto-assigning primary stat each time
+    # Straight to target level; no free stat, as before
     target_level = max(1, target_level)
-    if target_level > 1:
-        c.xp = xp_for_level(target_level)
-        for _ in range(target_level - 1):
-            apply_level_up(c)   # no free_stat → auto-assigns primary stat
-        c.resources = get_all_resources(base_cls, c.stats, c.level)
+    scale_to_level(c, target_level)
 
     # Give recruits a bit of starting gold proportional to level
-    c.gold = target_level * 8 + random.randint(0, 20)
+    c.gold = target_level * 8 + rng.randint(0, 20)
 
     return c
 
 
-def generate_recruits(party, town_id):
-    """
-    Return a list of recruit dicts for the given town, scaled to party level.
-    Each dict has all fields the draw code expects, plus _char = Character.
-
-    Level range: [max(1, avg-1) .. avg+1], each recruit gets a random level
-    in that range so they're not all identical.
-    """
-    if not party:
-        avg = 1
-    else:
-        avg = max(1, round(sum(c.level for c in party) / len(party)))
-
+def _build_pool(town_id, avg):
     lo = max(1, avg - 1)
     hi = avg + 1
 
     roster = TOWN_ROSTERS.get(town_id, _FALLBACK_ROSTER)
     recruits = []
-    rng = random.Random(town_id + str(avg))   # deterministic per town+level
+    rng = random.Random(str(town_id) + str(avg))   # deterministic per town+level
 
     for name, cls, race, color, pitch in roster:
         level = rng.randint(lo, hi)
         try:
-            char = _make_recruit_char(name, cls, race, level)
+            char = _make_recruit_char(name, cls, race, level, rng)
         except Exception:
             # Never crash the game for recruits
             from core.character import Character
             from core.classes import get_all_resources
             char = Character(name, cls, race)
-            char.quick_roll(cls)
+            char.quick_roll(cls, rng=rng)
             char.resources = get_all_resources(cls, char.stats, 1)
 
         recruits.append({
@@ -152,6 +147,102 @@ def generate_recruits(party, town_id):
     return recruits
 
 
+# ═══════════════════════════════════════════════════════════════
+#  POOL CACHE
+# ═══════════════════════════════════════════════════════════════
+
+PREFETCH_RADIUS = 8         # tiles from a town at which its pool is built ahead
+_POOL_MAX       = 32        # cached (town, level) pools
+
+_pools = {}                 # (town_id, avg) → recruit list
+_hired = {}                 # town_id → names hired there this game
+_pending = {}               # (town_id, avg) → Future of a background build
+_lock = threading.Lock()
+_executor = None
+
+
+def recruit_pool(town_id, avg):
+    """The recruit list for town_id at party average level avg, built on
+    first use (or taken from a background prefetch) and cached."""
+    key = (town_id, avg)
+    with _lock:
+        pool = _pools.get(key)
+        fut = _pending.get(key)
+    if pool is not None:
+        return pool
+    if fut is not None:
+        try:
+            return fut.result()
+        except Exception:
+            pass
+    return _store(key, _build_pool(town_id, avg))
+
+
+def _store(key, pool):
+    with _lock:
+        if key in _pools:               # a prefetch got there first
+            return _pools[key]
+        while len(_pools) >= _POOL_MAX:
+            _pools.pop(next(iter(_pools)))
+        _pools[key] = pool
+        _pending.pop(key, None)
+    return pool
+
+
+def prefetch(town_id, avg):
+    """Build the pool for (town_id, avg) on a background thread."""
+    global _executor
+    key = (town_id, avg)
+    with _lock:
+        if key in _pools or key in _pending:
+            return
+        if _executor is None:
+            from concurrent.futures import ThreadPoolExecutor
+            _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="recruits")
+        _pending[key] = _executor.submit(lambda: _store(key, _build_pool(town_id, avg)))
+
+
+def prefetch_near(x, y, party, radius=PREFETCH_RADIUS):
+    """Prefetch the pools of every town within radius tiles of (x, y)."""
+    from data.world_map import LOCATIONS, LOC_TOWN
+    avg = avg_party_level(party)
+    for town_id, loc in LOCATIONS.items():
+        if (loc.get("type") == LOC_TOWN
+                and max(abs(loc["x"] - x), abs(loc["y"] - y)) <= radius):
+            prefetch(town_id, avg)
+
+
+def clear_pools():
+    """Forget every cached pool and hire (new game / load)."""
+    with _lock:
+        _pools.clear()
+        _hired.clear()
+
+
+def mark_hired(town_id, name):
+    """Remove a recruit from town_id's roster for the rest of the game."""
+    _hired.setdefault(town_id, set()).add(name)
+
+
+events.subscribe(events.FLAGS_RESET, lambda **_: clear_pools())
+
+
+def generate_recruits(party, town_id):
+    """
+    Return a list of recruit dicts for the given town, scaled to party level.
+    Each dict has all fields the draw code expects, plus _char = Character.
+
+    Level range: [max(1, avg-1) .. avg+1], each recruit gets a random level
+    in that range so they're not all identical. Recruits already hired in
+    this town are left out.
+    """
+    pool = recruit_pool(town_id, avg_party_level(party))
+    hired = _hired.get(town_id)
+    if not hired:
+        return pool
+    return [r for r in pool if r["name"] not in hired]
+
+
 def avg_party_level(party):
     """Return rounded average party level, or 1 for empty party."""
     if not party:
@@ -0,0 +1,184 @@
+"""
+Realm of Shadows — Turn Scheduler
+
+Priority-queue initiative for CombatState, in one of two modes:
+
+  round     — the classic order (default): once per round every living
+              combatant is ranked by speed, then DEX, then a fresh random
+              tiebreak. Reproduces build_turn_order exactly, including how
+              much randomness it draws and when.
+  timeline  — speed-weighted: each combatant's next turn sits at a point
+              on a shared clock and moves TIMELINE_ROUND × mean speed /
+              own speed ticks further after every turn. A Hasted fighter
+              acts more often than a Slowed one instead of merely sooner.
+              Rounds (status ticks, regen) are windows of TIMELINE_ROUND
+              ticks.
+
+Effective speed (calc_combatant_speed) is cached per combatant with a
+signature of what it depends on that can change mid-fight: alive, the
+speed-modifying statuses (Hasted, Slowed, Stunned, …) and the weapon.
+refresh() after each action recomputes only combatants whose signature
+changed; _exec_switch_weapon calls invalidate() directly. In timeline
+mode a changed speed rescales that combatant's pending delay and the
+rest of the current round is replanned.
+
+preview(n) lists the next n turns after the current one for the turn
+bar. Beyond the current round in round mode it is a projection: the
+random tiebreak for later rounds has not been rolled yet.
+"""
+import heapq
+import random
+
+from core.combat_config import SPEED_MODIFIERS, TIMELINE_ROUND
+
+MODES = ("round", "timeline")
+
+
+class TurnScheduler:
+
+    def __init__(self, combatants, speed_fn, mode="round"):
+        if mode not in MODES:
+            raise ValueError(f"unknown turn scheduler mode {mode!r}")
+        self.combatants = combatants
+        self.mode = mode
+        self._speed_fn = speed_fn
+        self._seq = {id(c): i for i, c in enumerate(combatants)}
+        self._speed = {}            # id → cached effective speed
+        self._sig = {}              # id → signature the speed was computed for
+        self.refresh()
+        # Timeline state
+        self.clock = 0.0            # time of the last turn taken
+        self.round_end = 0.0
+        self._next_at = {}          # id → time of the combatant's next turn
+        if mode == "timeline":
+            living = [c for c in combatants if self._living(c)]
+            speeds = [self._speed[id(c)] for c in living if self._speed[id(c)] > 0]
+            self._mean = (sum(speeds) / len(speeds)) if speeds else 1.0
+            for c in combatants:
+                # First turns spread over the first round by speed; everyone
+                # gets one, however slow
+                self._next_at[id(c)] = min(self._delay(c) / 2.0, TIMELINE_ROUND - 1.0)
+
+    # ── speed cache ──────────────────────────────────────────────
+    @staticmethod
+    def _living(c):
+        return c["alive"] and c["hp"] > 0
+
+    @staticmethod
+    def _signature(c):
+        return (c["alive"],
+                tuple(s["name"] for s in c.get("status_effects", ())
+                      if s["name"] in SPEED_MODIFIERS),
+                id(c.get("weapon")))
+
+    def speed(self, c):
+        return self._speed[id(c)]
+
+    def invalidate(self, c):
+        """Forget c's cached speed (e.g. after an equipment swap)."""
+        self._sig.pop(id(c), None)
+
+    def refresh(self):
+        """Recompute speed for combatants whose signature changed.
+        Returns the list of those whose speed actually changed."""
+        changed = []
+        for c in self.combatants:
+            key = id(c)
+            sig = self._signature(c)
+            if self._sig.get(key) == sig:
+                continue
+            self._sig[key] = sig
+            old = self._speed.get(key)
+            new = self._speed[key] = self._speed_fn(c)
+            if old is not None and old != new:
+                changed.append((c, old, new))
+        if changed and self.mode == "timeline":
+            for c, old, new in changed:
+                self._rescale(c, old, new)
+        return [c for c, _, _ in changed]
+
+    # ── round mode ───────────────────────────────────────────────
+    def _ranked(self, living, tiebreaks):
+        heap = [(-self._speed[id(c)], -c["stats"].get("DEX", 0), -tb, self._seq[id(c)], c)
+                for c, tb in zip(living, tiebreaks)]
+        heapq.heapify(heap)
+        return [heapq.heappop(heap)[-1] for _ in range(len(heap))]
+
+    def new_round(self):
+        """Turn order for the round about to start."""
+        self.refresh()
+        living = [c for c in self.combatants if self._living(c)]
+        if self.mode == "round":
+            return self._ranked(living, [random.random() for _ in living])
+        order = []
+        while living and not order:
+            self.round_end += TIMELINE_ROUND
+            order = self.rest_of_round()
+        return order
+
+    # ── timeline mode ────────────────────────────────────────────
+    def _delay(self, c):
+        speed = self._speed[id(c)]
+        if speed <= 0:
+            return float(TIMELINE_ROUND)    # can't act: one (skipped) turn per round
+        return TIMELINE_ROUND * self._mean / speed
+
+    def _rescale(self, c, old, new):
+        key = id(c)
+        if key not in self._next_at:
+            return
+        remaining = max(0.0, self._next_at[key] - self.clock)
+        if old > 0 and new > 0:
+            remaining *= old / new
+        elif new <= 0:
+            remaining = max(remaining, self.round_end - self.clock)
+        else:
+            remaining = min(remaining, self._delay(c))
+        self._next_at[key] = self.clock + remaining
+
+    def _upcoming(self, until=None, limit=None):
+        """[(time, combatant)] of the next turns before `until` (or the
+        next `limit` turns), simulated from the current clock."""
+        heap = [(self._next_at[id(c)], -c["stats"].get("DEX", 0), self._seq[id(c)], c)
+                for c in self.combatants if self._living(c)]
+        heapq.heapify(heap)
+        out = []
+        while heap and (limit is None or len(out) < limit):
+            t, dex, seq, c = heapq.heappop(heap)
+            if until is not None and t >= until:
+                break
+            out.append((t, c))
+            heapq.heappush(heap, (t + self._delay(c), dex, seq, c))
+        return out
+
+    def take(self, c):
+        """c has just had its turn (timeline mode): advance its clock."""
+        if self.mode != "timeline" or id(c) not in self._next_at:
+            return
+        key = id(c)
+        self.clock = max(self.clock, self._next_at[key])
+        self._next_at[key] += self._delay(c)
+
+    def rest_of_round(self):
+        """Timeline mode: remaining turns of the current round, replanned."""
+        return [c for _, c in self._upcoming(self.round_end)]
+
+    # ── preview ──────────────────────────────────────────────────
+    def preview(self, order, index, n):
+        """The next n turns after order[index]: the rest of this round,
+        then projected following rounds."""
+        out = [c for c in order[index + 1:] if self._living(c)][:n]
+        if len(out) >= n:
+            return out
+        if self.mode == "timeline":
+            # the rest of this round's list is at most len(order) - index
+            # of the simulated turns; skip those, they are already listed
+            ahead = self._upcoming(limit=len(order) - index + n)
+            return out + [c for t, c in ahead if t >= self.round_end][:n - len(out)]
+        living = [c for c in self.combatants if self._living(c)]
+        if not living:
+            return out
+        nxt = self._ranked(living, [0.0] * len(living))
+        while len(out) < n:
+            out.extend(nxt[:n - len(out)])
+        return out
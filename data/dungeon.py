@@ -7,6 +7,12 @@ treasure, and stairs connecting floors.
 """
 import random
 import math
+import threading
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from core.alias_table import AliasTable
 
 # ═══════════════════════════════════════════════════════════════
 #  DUNGEON TILE TYPES
@@ -269,6 +275,8 @@ TRAP_TIERS = {
     },
 }
 
+_TRAP_TABLES = {tier: AliasTable(t["traps"]) for tier, t in TRAP_TIERS.items()}
+
 def _dungeon_trap_offset(dungeon_id):
     """Trap tier offset based on dungeon difficulty."""
     offsets = {
@@ -283,7 +291,7 @@ def _dungeon_trap_offset(dungeon_id):
 def _make_tiered_trap(tier, rng):
     """Create a trap event dict of the given tier."""
     tier = max(1, min(5, tier))
-    trap_def = rng.choice(TRAP_TIERS[tier]["traps"])
+    trap_def = _TRAP_TABLES[tier].draw(rng)
     dmg = rng.randint(trap_def["damage"][0], trap_def["damage"][1])
     event = {
         "type": "trap",
@@ -998,6 +1006,40 @@ def _carve_v_corridor(tiles, y1, y2, x, max_h):
                 tiles[y][x]["type"] = DT_CORRIDOR
 
 
+# ── Chest consumables ─────────────────────────────────────────
+_CHEST_POTIONS_T1 = [
+    {"name": "Minor Healing Potion", "type": "consumable", "subtype": "potion",
+     "heal_amount": 25, "identified": True, "estimated_value": 15},
+    {"name": "Antidote", "type": "consumable", "subtype": "potion",
+     "cures": ["Poison"], "identified": True, "estimated_value": 20},
+]
+_CHEST_POTIONS_T2 = [
+    {"name": "Healing Potion", "type": "consumable", "subtype": "potion",
+     "heal_amount": 50, "identified": True, "estimated_value": 30},
+    {"name": "Mana Crystal", "type": "consumable", "subtype": "crystal",
+     "restore_mp": 30, "identified": True, "estimated_value": 35},
+    {"name": "Scroll of Protection", "type": "consumable", "subtype": "scroll",
+     "effect": "defense_buff", "identified": True, "estimated_value": 40},
+]
+_CHEST_POTIONS_T3 = [
+    {"name": "Greater Healing Potion", "type": "consumable", "subtype": "potion",
+     "heal_amount": 100, "identified": True, "estimated_value": 60},
+    {"name": "Elixir of Focus", "type": "consumable", "subtype": "potion",
+     "restore_mp": 60, "effect": "focus_buff",
+     "identified": True, "estimated_value": 65},
+    {"name": "Scroll of Fireball", "type": "consumable", "subtype": "scroll",
+     "effect": "fireball", "identified": True, "estimated_value": 55},
+    {"name": "Scroll of Recall", "type": "consumable", "subtype": "scroll",
+     "effect": "recall", "identified": True, "estimated_value": 80},
+]
+# Depth band → pool (see _make_treasure_event); drawn items are copied
+_CHEST_POTION_TABLES = {
+    "shallow": AliasTable(_CHEST_POTIONS_T1),
+    "mid":     AliasTable(_CHEST_POTIONS_T1 + _CHEST_POTIONS_T2),
+    "deep":    AliasTable(_CHEST_POTIONS_T2 + _CHEST_POTIONS_T3),
+}
+
+
 def _make_treasure_event(floor_num, rng, total_floors=5, dungeon_id=None):
     """Generate chest loot scaled to dungeon depth.
 
@@ -1015,41 +1057,15 @@ def _make_treasure_event(floor_num, rng, total_floors=5, dungeon_id=None):
     depth = floor_num / max(total_floors, 1)
 
     # ── Consumables ──────────────────────────────────────────
-    POTIONS_T1 = [
-        {"name": "Minor Healing Potion", "type": "consumable", "subtype": "potion",
-         "heal_amount": 25, "identified": True, "estimated_value": 15},
-        {"name": "Antidote", "type": "consumable", "subtype": "potion",
-         "cures": ["Poison"], "identified": True, "estimated_value": 20},
-    ]
-    POTIONS_T2 = [
-        {"name": "Healing Potion", "type": "consumable", "subtype": "potion",
-         "heal_amount": 50, "identified": True, "estimated_value": 30},
-        {"name": "Mana Crystal", "type": "consumable", "subtype": "crystal",
-         "restore_mp": 30, "identified": True, "estimated_value": 35},
-        {"name": "Scroll of Protection", "type": "consumable", "subtype": "scroll",
-         "effect": "defense_buff", "identified": True, "estimated_value": 40},
-    ]
-    POTIONS_T3 = [
-        {"name": "Greater Healing Potion", "type": "consumable", "subtype": "potion",
-         "heal_amount": 100, "identified": True, "estimated_value": 60},
-        {"name": "Elixir of Focus", "type": "consumable", "subtype": "potion",
-         "restore_mp": 60, "effect": "focus_buff",
-         "identified": True, "estimated_value": 65},
-        {"name": "Scroll of Fireball", "type": "consumable", "subtype": "scroll",
-         "effect": "fireball", "identified": True, "estimated_value": 55},
-        {"name": "Scroll of Recall", "type": "consumable", "subtype": "scroll",
-         "effect": "recall", "identified": True, "estimated_value": 80},
-    ]
-
     consumable_chance = 0.50 + depth * 0.25   # 50% → 75%
     if rng.random() < consumable_chance:
         if depth >= 0.7:
-            pool = POTIONS_T2 + POTIONS_T3
+            pool = _CHEST_POTION_TABLES["deep"]
         elif depth >= 0.4:
-            pool = POTIONS_T1 + POTIONS_T2
+            pool = _CHEST_POTION_TABLES["mid"]
         else:
-            pool = POTIONS_T1
-        items.append(dict(rng.choice(pool)))
+            pool = _CHEST_POTION_TABLES["shallow"]
+        items.append(dict(pool.draw(rng)))
 
     # ── Magic item drop ───────────────────────────────────────
     # Probability ramp: ~5% floor 1 → ~35% floor 5+
@@ -1072,7 +1088,7 @@ def _make_treasure_event(floor_num, rng, total_floors=5, dungeon_id=None):
     trap_data = None
     if rng.random() < trap_chance:
         tier = max(1, min(5, floor_num))
-        trap_def = rng.choice(TRAP_TIERS[tier]["traps"])
+        trap_def = _TRAP_TABLES[tier].draw(rng)
         dmg = rng.randint(trap_def["damage"][0], trap_def["damage"][1])
         trap_data = {
             "name":        trap_def["name"],
@@ -1098,6 +1114,225 @@ def _make_treasure_event(floor_num, rng, total_floors=5, dungeon_id=None):
 #  DUNGEON STATE
 # ═══════════════════════════════════════════════════════════════
 
+# ═══════════════════════════════════════════════════════════════
+#  FLOOR PREFETCH
+# ═══════════════════════════════════════════════════════════════
+# Floors are deterministic per (dungeon_id, floor_num), so the next floor
+# can be built on a worker thread while the party explores the current
+# one. go_downstairs() then just swaps the finished dict in.
+
+PREFETCH_FLOORS = True
+
+_prefetch_pool = None
+_prefetch_lock = threading.Lock()
+
+
+def _get_prefetch_pool():
+    global _prefetch_pool
+    with _prefetch_lock:
+        if _prefetch_pool is None:
+            _prefetch_pool = ThreadPoolExecutor(max_workers=1,
+                                                thread_name_prefix="floorgen")
+        return _prefetch_pool
+
+
+def floor_seed(dungeon_id, floor_num):
+    """RNG seed for a floor — the same every time the floor is generated."""
+    _seed = floor_num
+    for _c in dungeon_id:
+        _seed = _seed * 31 + ord(_c)
+    return _seed & 0xFFFFFFFF
+
+
+# ═══════════════════════════════════════════════════════════════
+#  FLOOR CACHE — LRU WITH SEED + DELTA EVICTION
+# ═══════════════════════════════════════════════════════════════
+# A floor is fully determined by floor_seed() plus what the party has done
+# to it. Cold floors (across every cached DungeonState) are dropped down to
+# a small mutation delta and rebuilt transparently on the next access.
+
+MAX_RESIDENT_FLOORS = 4          # full floors kept in memory, all dungeons
+
+# Tile / event keys that gameplay flips from their generated value
+TILE_STATE_KEYS  = ("secret_found", "journal_read")
+EVENT_STATE_KEYS = ("opened", "found", "triggered", "disarmed", "detected", "used")
+
+_resident = OrderedDict()        # (id(cache), floor_num) → weakref(cache); oldest first
+
+
+def capture_floor_delta(floor):
+    """Reduce a live floor to what differs from its freshly generated state."""
+    w, h = floor["width"], floor["height"]
+    bits = bytearray((w * h + 7) // 8)
+    tile_state, event_state = {}, {}
+    for y, row in enumerate(floor["tiles"]):
+        for x, tile in enumerate(row):
+            if tile.get("discovered"):
+                i = y * w + x
+                bits[i >> 3] |= 1 << (i & 7)
+            ts = {k: tile[k] for k in TILE_STATE_KEYS if tile.get(k)}
+            if ts:
+                tile_state[(x, y)] = ts
+            ev = tile.get("event")
+            if ev:
+                es = {k: ev[k] for k in EVENT_STATE_KEYS if ev.get(k)}
+                trap = ev.get("trap")
+                if isinstance(trap, dict):
+                    ts2 = {k: trap[k] for k in EVENT_STATE_KEYS if trap.get(k)}
+                    if ts2:
+                        es["trap"] = ts2
+                if es:
+                    es["type"] = ev.get("type", "")
+                    event_state[(x, y)] = es
+    return {
+        "width":      w,
+        "height":     h,
+        "discovered": bytes(bits),
+        "tiles":      tile_state,
+        "events":     event_state,
+        "enemies":    [dict(e) for e in floor.get("enemies", [])],
+    }
+
+
+def apply_floor_delta(floor, delta):
+    """Re-apply a delta from capture_floor_delta() to a regenerated floor."""
+    w = floor["width"]
+    bits = delta["discovered"]
+    for y, row in enumerate(floor["tiles"]):
+        for x, tile in enumerate(row):
+            i = y * w + x
+            if bits[i >> 3] & (1 << (i & 7)):
+                tile["discovered"] = True
+    for (x, y), ts in delta["tiles"].items():
+        floor["tiles"][y][x].update(ts)
+    for (x, y), es in delta["events"].items():
+        ev = floor["tiles"][y][x].get("event")
+        if not ev:
+            continue
+        for k, v in es.items():
+            if k == "trap":
+                if isinstance(ev.get("trap"), dict):
+                    ev["trap"].update(v)
+            elif k != "type":
+                ev[k] = v
+    floor["enemies"] = [dict(e) for e in delta["enemies"]]
+
+
+def delta_save_entry(delta):
+    """Save-file entry (see core.save_load._serialize_dungeon_explored) for
+    a floor that is currently evicted."""
+    w, bits = delta["width"], delta["discovered"]
+    discovered = [[i % w, i // w] for i in range(delta["width"] * delta["height"])
+                  if bits[i >> 3] & (1 << (i & 7))]
+    opened_chests, found_notes, trap_states = [], [], []
+    for (x, y), es in delta["events"].items():
+        etype = es.get("type", "")
+        if etype == "treasure" and es.get("opened"):
+            opened_chests.append([x, y])
+        elif etype in ("note", "journal", "scroll") and es.get("found"):
+            found_notes.append([x, y])
+        elif etype == "trap":
+            dis, tri, det = (bool(es.get("disarmed")), bool(es.get("triggered")),
+                             bool(es.get("detected")))
+            if dis or tri or det:
+                trap_states.append([x, y, dis, tri, det])
+        elif etype == "fixed_encounter" and es.get("triggered"):
+            trap_states.append([x, y, False, True, False])
+    dead = [[e["x"], e["y"]] for e in delta["enemies"] if e.get("state") == "dead"]
+    entry = {}
+    if discovered:    entry["discovered"]    = discovered
+    if opened_chests: entry["opened_chests"] = opened_chests
+    if found_notes:   entry["found_notes"]   = found_notes
+    if trap_states:   entry["trap_states"]   = trap_states
+    if dead:          entry["dead_enemies"]  = dead
+    return entry
+
+
+class FloorCache(dict):
+    """DungeonState.floors. A plain {floor_num: floor} dict for readers, but
+    floors evicted by the global LRU are kept as deltas and rebuilt on
+    access (floors[n] / floors.get(n)). `n in floors` is True only for
+    resident floors, so _ensure_floor() still decides when to build."""
+
+    def __init__(self, owner):
+        super().__init__()
+        self._owner = weakref.ref(owner)
+        self.deltas = {}              # floor_num → delta
+        self._last_key = None
+        self._ref = weakref.ref(self)
+
+    # ── dict interface ────────────────────────────────────────────
+    def __setitem__(self, floor_num, floor):
+        super().__setitem__(floor_num, floor)
+        self.deltas.pop(floor_num, None)
+        self._touch(floor_num)
+        _enforce_floor_budget()
+
+    def __getitem__(self, floor_num):
+        if floor_num != self._last_key:
+            self._touch(floor_num)
+        return super().__getitem__(floor_num)
+
+    def __missing__(self, floor_num):
+        owner = self._owner()
+        if owner is None or floor_num not in self.deltas:
+            raise KeyError(floor_num)
+        owner._ensure_floor(floor_num)
+        return super().__getitem__(floor_num)
+
+    def get(self, floor_num, default=None):
+        if dict.__contains__(self, floor_num) or floor_num in self.deltas:
+            return self[floor_num]
+        return default
+
+    def __delitem__(self, floor_num):
+        super().__delitem__(floor_num)
+        _resident.pop((id(self), floor_num), None)
+
+    # ── LRU bookkeeping ───────────────────────────────────────────
+    def _touch(self, floor_num):
+        if dict.__contains__(self, floor_num):
+            self._last_key = floor_num
+            key = (id(self), floor_num)
+            _resident[key] = self._ref
+            _resident.move_to_end(key)
+
+    def evict(self, floor_num):
+        """Drop a resident floor down to its delta."""
+        floor = dict.get(self, floor_num)
+        if floor is None:
+            return
+        self.deltas[floor_num] = capture_floor_delta(floor)
+        dict.__delitem__(self, floor_num)
+        _resident.pop((id(self), floor_num), None)
+        if self._last_key == floor_num:
+            self._last_key = None
+
+    def evict_all(self, keep=None):
+        for floor_num in [n for n in self.keys() if n != keep]:
+            self.evict(floor_num)
+
+    def save_entries(self):
+        """Save-file entries for evicted floors (resident ones are read live)."""
+        return {n: delta_save_entry(d) for n, d in self.deltas.items()}
+
+
+def _enforce_floor_budget():
+    """Evict the least-recently-used floors beyond MAX_RESIDENT_FLOORS.
+    The most recently touched floor (the one being played) is never evicted."""
+    while len(_resident) > MAX_RESIDENT_FLOORS:
+        (cache_id, floor_num), ref = next(iter(_resident.items()))
+        cache = ref()
+        if cache is None or not dict.__contains__(cache, floor_num):
+            _resident.pop((cache_id, floor_num), None)
+            continue
+        cache.evict(floor_num)
+
+
+def resident_floor_count():
+    return len(_resident)
+
+
 class DungeonState:
     """Manages dungeon exploration state."""
 
@@ -1112,7 +1347,8 @@ class DungeonState:
         self.fading_level = fading_level   # 0-3; raises encounter difficulty in Fading zones
 
         self.current_floor = 1
-        self.floors = {}
+        self.floors = FloorCache(self)
+        self._pending_floors = {}   # floor_num → Future from the prefetch pool
         self.step_counter = 0
 
         # Generate first floor
@@ -1120,6 +1356,7 @@ class DungeonState:
         floor = self.floors[1]
         self.party_x, self.party_y = floor["entrance"]
         self._update_fog()
+        self.prefetch_adjacent()
 
     def enemies_nearby(self, threat_radius=6):
         """Return list of alive, non-dead enemies within threat_radius tiles
@@ -1204,26 +1441,58 @@ class DungeonState:
 
 
     def _ensure_floor(self, floor_num):
-        if floor_num not in self.floors:
-            _seed = floor_num
-            for _c in self.dungeon_id:
-                _seed = _seed * 31 + ord(_c)
-            rng = random.Random(_seed & 0xFFFFFFFF)
-            self.floors[floor_num] = generate_floor(
-                self.definition["width"],
-                self.definition["height"],
-                floor_num,
-                self.total_floors,
-                self.theme,
-                rng,
-                self.dungeon_id,
-            )
-            # Spawn visible enemies on the floor
-            self._spawn_floor_enemies(floor_num, rng)
-            # Place story journals from DUNGEON_STORY_EVENTS
-            self._place_story_journals(floor_num, rng)
+        if floor_num in self.floors:
+            return
+        future = self._pending_floors.pop(floor_num, None)
+        floor = None
+        if future is not None:
+            try:
+                floor = future.result()   # waits only if still generating
+            except Exception:
+                floor = None              # fall back to a synchronous build
+        if floor is None:
+            floor = self._build_floor(floor_num)
+        delta = self.floors.deltas.get(floor_num)
+        if delta is not None:
+            apply_floor_delta(floor, delta)
+        self.floors[floor_num] = floor
+
+    def _build_floor(self, floor_num):
+        """Generate a complete floor dict without touching self.floors.
+        Safe to run on the prefetch thread."""
+        rng = random.Random(floor_seed(self.dungeon_id, floor_num))
+        floor = generate_floor(
+            self.definition["width"],
+            self.definition["height"],
+            floor_num,
+            self.total_floors,
+            self.theme,
+            rng,
+            self.dungeon_id,
+        )
+        # Spawn visible enemies on the floor
+        self._spawn_floor_enemies(floor_num, rng, floor)
+        # Place story journals from DUNGEON_STORY_EVENTS
+        self._place_story_journals(floor_num, rng, floor)
+        return floor
+
+    def prefetch_floor(self, floor_num):
+        """Start generating a floor in the background if it isn't built yet."""
+        if not PREFETCH_FLOORS:
+            return
+        if not (1 <= floor_num <= self.total_floors):
+            return
+        if floor_num in self.floors or floor_num in self._pending_floors:
+            return
+        self._pending_floors[floor_num] = _get_prefetch_pool().submit(
+            self._build_floor, floor_num)
 
-    def _place_story_journals(self, floor_num, rng):
+    def prefetch_adjacent(self):
+        """Queue the floors reachable by stairs from the current one."""
+        self.prefetch_floor(self.current_floor + 1)
+        self.prefetch_floor(self.current_floor - 1)
+
+    def _place_story_journals(self, floor_num, rng, floor=None):
         """Place journal tiles from DUNGEON_STORY_EVENTS onto the floor."""
         try:
             from data.story_data import get_dungeon_journals
@@ -1232,7 +1501,8 @@ class DungeonState:
         journals = get_dungeon_journals(self.dungeon_id, floor_num)
         if not journals:
             return
-        floor = self.floors[floor_num]
+        if floor is None:
+            floor = self.floors[floor_num]
         tiles = floor["tiles"]
         fw, fh = floor["width"], floor["height"]
         entrance = floor.get("entrance", (0, 0))
@@ -1272,9 +1542,10 @@ class DungeonState:
                 "triggered": False,
             }
 
-    def _spawn_floor_enemies(self, floor_num, rng):
+    def _spawn_floor_enemies(self, floor_num, rng, floor=None):
         """Place visible enemy entities on floor tiles."""
-        floor = self.floors[floor_num]
+        if floor is None:
+            floor = self.floors[floor_num]
         tiles = floor["tiles"]
         fw, fh = floor["width"], floor["height"]
 
@@ -1301,12 +1572,9 @@ class DungeonState:
         base_count = 3 + floor_num * 2
         count = min(base_count, len(walkable) // 8)
 
-        # Get encounter keys for this floor
-        from data.enemies import DUNGEON_ENCOUNTER_TABLES
-        table = DUNGEON_ENCOUNTER_TABLES.get(self.dungeon_id, {})
-        enc_keys = table.get(floor_num, table.get(1, ["tutorial"]))
-        if isinstance(enc_keys, str):
-            enc_keys = [enc_keys]
+        # Compiled encounter table for this floor
+        from data.enemies import floor_encounter_table
+        enc_table = floor_encounter_table(self.dungeon_id, floor_num, default=("tutorial",))
 
         enemies = []
         used_positions = set()
@@ -1321,7 +1589,7 @@ class DungeonState:
             else:
                 continue
 
-            enc_key = rng.choice(enc_keys)
+            enc_key = enc_table.draw(rng)
             enemy = {
                 "x": pos[0],
                 "y": pos[1],
@@ -1683,6 +1951,7 @@ class DungeonState:
             floor = self.floors[self.current_floor]
             self.party_x, self.party_y = floor["entrance"]
             self._update_fog()
+            self.prefetch_adjacent()
             return True
         return False
 
@@ -1690,11 +1959,13 @@ class DungeonState:
         """Ascend to the previous floor."""
         if self.current_floor > 1:
             self.current_floor -= 1
+            self._ensure_floor(self.current_floor)
             floor = self.floors[self.current_floor]
             # Go to stairs down position of upper floor
             if floor["stairs_down"]:
                 self.party_x, self.party_y = floor["stairs_down"]
             self._update_fog()
+            self.prefetch_adjacent()
             return True
         return False
 
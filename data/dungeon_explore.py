@@ -0,0 +1,317 @@
+"""
+Realm of Shadows — Dungeon Auto-Explore
+
+Walks the party across the current dungeon floor for three commands:
+
+  explore  — head for the nearest discovered tile that borders fog
+  stairs   — go to the known stairs down
+  mark     — go to a tile the player marked on the minimap
+
+Paths are breadth-first searches over the tiles the party has already
+seen (PASSABLE_TILES, minus secret doors nobody has found). The
+exploration frontier — seen, walkable tiles with an unseen neighbour — is
+built once per walk and then only refreshed in the sight window around
+the party after each step, because that is the only place fog can clear.
+Each step goes through DungeonState.move, so fog, traps, regen, status
+ticks and enemy movement all happen exactly as for a key press; the walk
+stops on any event that move() returns (enemy contact, chest, trap,
+journal, shrine, stairs), when a trap is newly spotted, or when a step
+is blocked.
+"""
+from collections import deque
+
+from data.dungeon import (
+    PASSABLE_TILES, DT_SECRET_DOOR, DT_TRAP, DT_TREASURE,
+    DT_STAIRS_DOWN, DT_STAIRS_UP, DT_ENTRANCE,
+)
+
+_DIRS = ((1, 0), (-1, 0), (0, 1), (0, -1))
+
+# Tiles that do something the moment the party steps on them: never
+# walked through on the way somewhere else, only as the destination.
+_EXIT_TILES = {DT_STAIRS_DOWN, DT_STAIRS_UP, DT_ENTRANCE}
+
+
+# ═══════════════════════════════════════════════════════════════
+#  TILE RULES
+# ═══════════════════════════════════════════════════════════════
+
+def is_walkable(tile):
+    """Can the party enter this tile at all (as far as it knows)?"""
+    if not tile.get("discovered") or tile["type"] not in PASSABLE_TILES:
+        return False
+    if tile["type"] == DT_SECRET_DOOR and not tile.get("secret_found"):
+        return False
+    return True
+
+
+def _armed_trap(tile):
+    ev = tile.get("event")
+    return (tile["type"] == DT_TRAP and ev is not None
+            and ev.get("detected") and not ev.get("disarmed"))
+
+
+def _pending_event(tile):
+    """Would stepping here stop the walk with a chest / note / shrine?"""
+    ev = tile.get("event")
+    if not ev:
+        return False
+    if tile["type"] == DT_TREASURE:
+        return not ev.get("opened")
+    kind = ev.get("type")
+    if kind == "interactable":
+        return not ev.get("used")
+    if kind in ("journal", "fixed_encounter"):
+        return not ev.get("triggered")
+    return False
+
+
+def _passable_en_route(tile, allow_events):
+    """May a path pass *through* this tile?"""
+    if not is_walkable(tile) or _armed_trap(tile) or tile["type"] in _EXIT_TILES:
+        return False
+    return allow_events or not _pending_event(tile)
+
+
+# ═══════════════════════════════════════════════════════════════
+#  FRONTIER + BFS
+# ═══════════════════════════════════════════════════════════════
+
+class ExploreFrontier:
+    """Set of (x, y) tiles worth walking to when exploring: seen, safe to
+    stand on, with at least one unseen 4-neighbour. Standing on one always
+    reveals its neighbours, so every visit shrinks the set."""
+
+    def __init__(self, floor):
+        self.floor = floor
+        self.tiles = set()
+        self.refresh(0, 0, max(floor["width"], floor["height"]))
+
+    def _is_frontier(self, x, y):
+        floor = self.floor
+        tiles = floor["tiles"]
+        tile = tiles[y][x]
+        if not is_walkable(tile) or _armed_trap(tile) or tile["type"] in _EXIT_TILES:
+            return False
+        fw, fh = floor["width"], floor["height"]
+        for dx, dy in _DIRS:
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < fw and 0 <= ny < fh and not tiles[ny][nx].get("discovered"):
+                return True
+        return False
+
+    def refresh(self, cx, cy, radius):
+        """Re-evaluate every tile within `radius` (Chebyshev) of (cx, cy)."""
+        fw, fh = self.floor["width"], self.floor["height"]
+        for y in range(max(0, cy - radius), min(fh, cy + radius + 1)):
+            for x in range(max(0, cx - radius), min(fw, cx + radius + 1)):
+                if self._is_frontier(x, y):
+                    self.tiles.add((x, y))
+                else:
+                    self.tiles.discard((x, y))
+
+    def __contains__(self, pos):
+        return pos in self.tiles
+
+    def __len__(self):
+        return len(self.tiles)
+
+
+def find_path(floor, start, goals):
+    """Shortest 4-way path from start to the nearest tile in `goals` (any
+    container of (x, y)). Returns the list of tiles after start, [] when
+    start is itself a goal, or None when no goal can be reached.
+
+    Tiles with an untouched chest or event are first routed around; only
+    if that fails is a path through them accepted (the walk will then stop
+    there, which is what stepping on one by hand does too)."""
+    if start in goals:
+        return []
+    for allow_events in (False, True):
+        path = _bfs(floor, start, goals, allow_events)
+        if path is not None:
+            return path
+    return None
+
+
+def _bfs(floor, start, goals, allow_events):
+    tiles = floor["tiles"]
+    fw, fh = floor["width"], floor["height"]
+    came = {start: None}
+    queue = deque([start])
+    while queue:
+        x, y = queue.popleft()
+        for dx, dy in _DIRS:
+            nx, ny = x + dx, y + dy
+            nxt = (nx, ny)
+            if nxt in came or not (0 <= nx < fw and 0 <= ny < fh):
+                continue
+            tile = tiles[ny][nx]
+            if nxt in goals:
+                if not is_walkable(tile):
+                    continue
+                came[nxt] = (x, y)
+                path = [nxt]
+                while came[path[-1]] != start:
+                    path.append(came[path[-1]])
+                path.reverse()
+                return path
+            if _passable_en_route(tile, allow_events):
+                came[nxt] = (x, y)
+                queue.append(nxt)
+    return None
+
+
+# ═══════════════════════════════════════════════════════════════
+#  AUTO-WALK
+# ═══════════════════════════════════════════════════════════════
+
+class AutoWalk:
+    """One auto-explore / travel command on the current floor.
+
+    status: walking → arrived | explored | stopped | no_route
+    next_dir() says which way the next step goes (planning if needed) so
+    the UI can turn to face it; step() then takes that step through
+    DungeonState.move and returns its event. reason says why a walk
+    stopped: the event type, "trap_detected" or "blocked".
+    """
+
+    def __init__(self, ds, mode, target=None):
+        self.ds = ds
+        self.mode = mode            # "explore" | "stairs" | "mark"
+        self.target = target        # (x, y) for stairs / mark
+        self.floor_num = ds.current_floor
+        self.status = "walking"
+        self.reason = None
+        self.steps_taken = 0
+        self._path = deque()
+        floor = ds.get_current_floor_data()
+        self.frontier = ExploreFrontier(floor) if mode == "explore" else None
+        self._known_traps = self._armed_traps_near(floor, None)
+
+    @property
+    def active(self):
+        return self.status == "walking"
+
+    def stop(self, reason="cancelled"):
+        if self.active:
+            self.status = "stopped"
+            self.reason = reason
+
+    # ── planning ──────────────────────────────────────────────
+    def _plan(self):
+        ds = self.ds
+        floor = ds.get_current_floor_data()
+        here = (ds.party_x, ds.party_y)
+        if self.mode == "explore":
+            path = find_path(floor, here, self.frontier)
+            if path is None:
+                self.status = "explored"
+                return False
+        else:
+            path = find_path(floor, here, (self.target,))
+            if path is None:
+                self.status = "no_route"
+                return False
+        if not path:
+            # Already standing on the goal. For explore that means a
+            # frontier tile whose neighbours are in view now — drop it.
+            if self.mode == "explore":
+                self.frontier.tiles.discard(here)
+                return self._plan()
+            self.status = "arrived"
+            return False
+        self._path = deque(path)
+        return True
+
+    def _path_valid(self):
+        if not self._path:
+            return False
+        if self.mode == "explore" and self._path[-1] not in self.frontier:
+            return False
+        floor = self.ds.get_current_floor_data()
+        tiles = floor["tiles"]
+        # A trap spotted or a door found along the way can change the route
+        for i, (x, y) in enumerate(self._path):
+            tile = tiles[y][x]
+            last = i == len(self._path) - 1
+            if not (is_walkable(tile) if last else _passable_en_route(tile, True)):
+                return False
+        return True
+
+    def next_dir(self):
+        """(dx, dy) of the next step, or None once the walk is over."""
+        if not self.active:
+            return None
+        if self.ds.current_floor != self.floor_num:
+            self.stop("floor_change")
+            return None
+        if not self._path_valid() and not self._plan():
+            return None
+        x, y = self._path[0]
+        return x - self.ds.party_x, y - self.ds.party_y
+
+    # ── walking ───────────────────────────────────────────────
+    def step(self):
+        """Take one step. Returns whatever DungeonState.move returned."""
+        d = self.next_dir()
+        if d is None:
+            return None
+        ds = self.ds
+        if abs(d[0]) + abs(d[1]) != 1:
+            self._path.clear()          # moved by something else — replan
+            d = self.next_dir()
+            if d is None or abs(d[0]) + abs(d[1]) != 1:
+                self.stop("blocked")
+                return None
+        before = (ds.party_x, ds.party_y)
+        event = ds.move(*d)
+        here = (ds.party_x, ds.party_y)
+        if here == before:
+            self.stop(event["type"] if event else "blocked")
+            return event
+        self.steps_taken += 1
+        self._path.popleft()
+        floor = ds.get_current_floor_data()
+        if self.frontier is not None:
+            self.frontier.refresh(here[0], here[1], ds.SIGHT_RADIUS + 1)
+        traps = self._armed_traps_near(floor, here)
+        if traps - self._known_traps:
+            self._known_traps |= traps
+            self.stop("trap_detected")
+        if event:
+            self.stop(event["type"])
+        elif self.active and not self._path and self.mode != "explore":
+            self.status = "arrived"
+        return event
+
+    @staticmethod
+    def _armed_traps_near(floor, pos):
+        """Detected, armed traps on the whole floor (pos None) or in the
+        3×3 block _check_trap_detection rolls for around pos."""
+        tiles = floor["tiles"]
+        fw, fh = floor["width"], floor["height"]
+        if pos is None:
+            ys, xs = range(fh), range(fw)
+        else:
+            ys = range(max(0, pos[1] - 1), min(fh, pos[1] + 2))
+            xs = range(max(0, pos[0] - 1), min(fw, pos[0] + 2))
+        return {(x, y) for y in ys for x in xs if _armed_trap(tiles[y][x])}
+
+
+def stairs_target(ds):
+    """Position of the stairs down if the party has seen them, else None.
+    floor["stairs_down"] is the room centre the stairs were placed at;
+    _create_stair_alcove may have moved the tile itself, so look for it."""
+    floor = ds.get_current_floor_data()
+    tiles = floor["tiles"]
+    pos = floor.get("stairs_down")
+    if pos and tiles[pos[1]][pos[0]]["type"] == DT_STAIRS_DOWN:
+        found = [tuple(pos)]
+    else:
+        found = [(x, y) for y, row in enumerate(tiles)
+                 for x, tile in enumerate(row) if tile["type"] == DT_STAIRS_DOWN]
+    for x, y in found:
+        if tiles[y][x].get("discovered"):
+            return (x, y)
+    return None
@@ -9,6 +9,7 @@ from core.combat_config import (
     IMMUNE, RESISTANT, NEUTRAL, VULNERABLE, VERY_VULNERABLE,
     FRONT, MID, BACK,
 )
+from core.alias_table import table_for
 
 # ═══════════════════════════════════════════════════════════════
 #  ENEMY DEFINITIONS
@@ -1140,7 +1141,20 @@ DUNGEON_ENCOUNTER_TABLES = {
 
 }
 
-def get_floor_encounter(dungeon_id, floor_num, total_floors, is_boss_floor=False):
+def floor_encounter_table(dungeon_id, floor_num, default=("medium_goblins",)):
+    """Compiled encounter table (core.alias_table) for a dungeon floor.
+    Floors without their own list use floor 1's, then default."""
+    table = DUNGEON_ENCOUNTER_TABLES.get(dungeon_id, {})
+    floor_key = floor_num if floor_num in table else 1
+    keys = table.get(floor_key)
+    if keys is None:
+        return table_for(("floor_default",) + tuple(default), default)
+    if isinstance(keys, str):
+        keys = [keys]
+    return table_for(("floor", dungeon_id, floor_key), keys)
+
+
+def get_floor_encounter(dungeon_id, floor_num, total_floors, is_boss_floor=False, rng=None):
     """Get a random encounter key appropriate for this dungeon floor."""
     import random
     table = DUNGEON_ENCOUNTER_TABLES.get(dungeon_id)
@@ -1150,8 +1164,7 @@ def get_floor_encounter(dungeon_id, floor_num, total_floors, is_boss_floor=False
     if is_boss_floor or floor_num >= total_floors:
         return table.get("boss", "hard_mixed")
 
-    floor_table = table.get(floor_num, table.get(1, ["medium_goblins"]))
-    return random.choice(floor_table)
+    return floor_encounter_table(dungeon_id, floor_num).draw(rng or random)
 
 
 def create_enemy_instance(enemy_key, uid):
@@ -8,8 +8,13 @@ Job types:
   - bounty: kill N enemies of a type (tracked by enemy kill flags)
   - fetch: collect N items and turn them in
   - explore: visit a specific dungeon floor
+
+Progress is driven by core.events: each job type declares the event it
+listens to in JOB_TYPE_EVENTS, and only jobs of that type are touched
+when the event fires.
 """
 
+from core import events
 from core.story_flags import get_flag, set_flag, get_quest_state, set_quest_state
 
 # ═══════════════════════════════════════════════════════════════
@@ -463,17 +468,37 @@ def complete_job(job_id, party):
     return {"gold": gold, "xp": xp}
 
 
+# ═══════════════════════════════════════════════════════════════
+#  EVENT HOOKS
+# ═══════════════════════════════════════════════════════════════
+
+# Which game event advances each job type. Fetch jobs count inventory
+# at turn-in time, so they need no event.
+JOB_TYPE_EVENTS = {
+    "bounty":  events.ENEMY_KILLED,
+    "explore": events.FLOOR_REACHED,
+}
+
+# enemy name → bounty job ids hunting it
+_BOUNTIES_BY_ENEMY = {}
+for _jid, _job in JOBS.items():
+    if _job["type"] == "bounty":
+        _BOUNTIES_BY_ENEMY.setdefault(_job["enemy_name"], []).append(_jid)
+
+
 def on_enemy_killed(enemy_name):
     """Called after combat to update bounty jobs."""
-    for job_id, job in JOBS.items():
-        if job["type"] != "bounty":
-            continue
-        if not is_job_accepted(job_id):
-            continue
-        if job["enemy_name"] == enemy_name:
+    for job_id in _BOUNTIES_BY_ENEMY.get(enemy_name, ()):
+        if is_job_accepted(job_id):
             add_job_progress(job_id)
 
 
 def on_dungeon_floor_reached(dungeon_id, floor_num):
     """Called when player enters a dungeon floor — updates explore jobs."""
     set_flag(f"explored.{dungeon_id}.floor{floor_num}", True)
+
+
+events.subscribe(JOB_TYPE_EVENTS["bounty"],
+                 lambda name, **_: on_enemy_killed(name))
+events.subscribe(JOB_TYPE_EVENTS["explore"],
+                 lambda dungeon_id, floor, **_: on_dungeon_floor_reached(dungeon_id, floor))
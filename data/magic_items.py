@@ -3,6 +3,7 @@ Realm of Shadows — Magic Items
 Unique items found in secret rooms and dropped by bosses.
 Organized by tier (1=early, 2=mid, 3=late).
 """
+from core.alias_table import AliasTable
 
 # ══════════════════════════════════════════════════════════
 #  SECRET ROOM ITEMS — Found in hidden chests
@@ -321,6 +322,15 @@ _ACT1_DUNGEONS = frozenset({"goblin_warren", "spiders_nest"})
 _ACT2_DUNGEONS = frozenset({"abandoned_mine", "sunken_crypt", "ruins_ashenmoor", "dragons_tooth"})
 # Act 3 dungeons use T2/T3 — everything else falls through to default
 
+# Compiled pools for get_secret_item (drawn items are copied)
+_SECRET_TABLES = {
+    "da1":   AliasTable(SECRET_ITEMS_DA1),
+    "t1":    AliasTable(SECRET_ITEMS_T1),
+    "t1_t2": AliasTable(SECRET_ITEMS_T1 + SECRET_ITEMS_T2[:3]),   # Act 2 mid floors
+    "t2":    AliasTable(SECRET_ITEMS_T2),
+    "t3":    AliasTable(SECRET_ITEMS_T3),
+}
+
 
 def get_secret_item(floor_num, total_floors, rng, party=None, dungeon_id=None):
     """Pick a random magic item appropriate to dungeon act and depth.
@@ -342,18 +352,18 @@ def get_secret_item(floor_num, total_floors, rng, party=None, dungeon_id=None):
     if dungeon_id in _ACT1_DUNGEONS:
         # Only the final floor gets a small chance at a T1 item
         if floor_num >= total_floors and rng.random() < 0.35:
-            return dict(rng.choice(SECRET_ITEMS_T1))
-        return dict(rng.choice(SECRET_ITEMS_DA1))
+            return dict(_SECRET_TABLES["t1"].draw(rng))
+        return dict(_SECRET_TABLES["da1"].draw(rng))
 
     # ── Act 2 dungeons ─────────────────────────────────────────
     if dungeon_id in _ACT2_DUNGEONS:
         if depth_ratio >= 0.75:
-            pool = SECRET_ITEMS_T2
+            pool = _SECRET_TABLES["t2"]
         elif depth_ratio >= 0.4:
-            pool = SECRET_ITEMS_T1 + SECRET_ITEMS_T2[:3]
+            pool = _SECRET_TABLES["t1_t2"]
         else:
-            pool = SECRET_ITEMS_T1
-        return dict(rng.choice(pool))
+            pool = _SECRET_TABLES["t1"]
+        return dict(pool.draw(rng))
 
     # ── Act 3 dungeons (default: full range) ───────────────────
     # Deep secret rooms: chance for unique items
@@ -366,12 +376,12 @@ def get_secret_item(floor_num, total_floors, rng, party=None, dungeon_id=None):
                 return item
 
     if depth_ratio >= 0.8 and rng.random() < 0.3:
-        pool = SECRET_ITEMS_T3
+        pool = _SECRET_TABLES["t3"]
     elif depth_ratio >= 0.4:
-        pool = SECRET_ITEMS_T2
+        pool = _SECRET_TABLES["t2"]
     else:
-        pool = SECRET_ITEMS_T1
-    return dict(rng.choice(pool))
+        pool = _SECRET_TABLES["t1"]
+    return dict(pool.draw(rng))
 
 
 def get_boss_bonus_drops(boss_name, rng, party=None):
@@ -495,19 +505,21 @@ CURSED_ITEMS = [
 CURSED_ITEMS_T1 = [i for i in CURSED_ITEMS if i["tier"] == 1]
 CURSED_ITEMS_T2 = [i for i in CURSED_ITEMS if i["tier"] == 2]
 CURSED_ITEMS_T3 = [i for i in CURSED_ITEMS if i["tier"] == 3]
+_CURSED_TABLES = {tier: AliasTable(pool) for tier, pool in
+                  ((1, CURSED_ITEMS_T1), (2, CURSED_ITEMS_T2), (3, CURSED_ITEMS_T3)) if pool}
 
 
 def get_cursed_item(floor_num, total_floors, rng):
     """Return a cursed item appropriate to dungeon depth, or None.
     Called with ~8% chance from the loot generator on chest/secret finds."""
     depth_ratio = floor_num / max(total_floors, 1)
-    if depth_ratio >= 0.8 and CURSED_ITEMS_T3:
-        pool = CURSED_ITEMS_T3
-    elif depth_ratio >= 0.4 and CURSED_ITEMS_T2:
-        pool = CURSED_ITEMS_T2
+    if depth_ratio >= 0.8 and 3 in _CURSED_TABLES:
+        pool = _CURSED_TABLES[3]
+    elif depth_ratio >= 0.4 and 2 in _CURSED_TABLES:
+        pool = _CURSED_TABLES[2]
     else:
-        pool = CURSED_ITEMS_T1
-    item = dict(rng.choice(pool))
+        pool = _CURSED_TABLES[1]
+    item = dict(pool.draw(rng))
     # Copy stat_penalty into the item's stat_bonus so combat engine picks it up
     # Penalties are negative values in stat_bonus
     bonuses = dict(item.get("stat_bonus", {}))
@@ -3,6 +3,9 @@ Realm of Shadows — Shop Inventory Data
 Items available for purchase at shops, organized by tier/location.
 """
 
+from types import MappingProxyType
+
+from core import events
 from core.equipment import ARMOR
 
 # ═══════════════════════════════════════════════════════════════
@@ -837,99 +840,113 @@ TOWN_SHOP_PROFILES = {
 }
 
 
-def get_town_shop(town_id, party_classes=None):
-    """Return a shop inventory tailored to the given town.
-    Falls back to GENERAL_STORE if town not defined.
-    party_classes: list of class names to filter class-specific items.
-    """
+# ═══════════════════════════════════════════════════════════════
+#  COMPILED SHOP CATALOGS
+# ═══════════════════════════════════════════════════════════════
+# A town's stock only depends on its profile and on which classes are in
+# the party, so each (town, sorted class set) is compiled once into
+# read-only, price-adjusted item tables. The cache is dropped when the
+# party changes (events.PARTY_CHANGED).
+
+_catalogs = {}          # (town_id, class tuple) → compiled shop
+_prepared = False
+
+
+def _prepare_catalogs():
+    """Build step: fill in missing 'slot' fields on every source item list.
+    Runs once, on the first shop lookup."""
+    global _prepared
+    if _prepared:
+        return
+    from core.item_slot_fixer import fix_item_list
+    fix_item_list(GENERAL_STORE.get("weapons", []))
+    fix_item_list(GENERAL_STORE.get("armor", []))
+    fix_item_list(GENERAL_STORE.get("accessories", []))
+    for town_data in TOWN_SHOP_PROFILES.values():
+        fix_item_list(town_data.get("bonus_items", []))
+        fix_item_list(town_data.get("weapons", []))
+        fix_item_list(town_data.get("armor", []))
+    _prepared = True
+
+
+def _compile_town_shop(profile, party_classes):
+    """Compile one town's stock: category → tuple of read-only item views."""
     from data.advanced_equipment import get_shop_weapons, get_shop_armor, get_shop_accessories
-    profile = TOWN_SHOP_PROFILES.get(town_id)
-    if not profile:
-        return GENERAL_STORE
-
     max_wpn = profile["max_weapon_price"]
     max_arm = profile["max_armor_price"]
     mult = profile.get("price_mult", 1.0)
-
-    shop = {
-        "name": profile["name"],
-        "welcome": profile["welcome"],
-        "weapons": [],
-        "armor": [],
-        "consumables": [],
-    }
-
     tier = profile.get("tier", "village")
+    weapons, armor, consumables = [], [], []
 
-    # Class-specific weapons from advanced catalog
-    seen_names = set()
-    for item in get_shop_weapons(tier, party_classes):
-        if item["buy_price"] <= max_wpn and item["name"] not in seen_names:
-            it = dict(item)
-            it["buy_price"] = int(it["buy_price"] * mult)
-            it["sell_price"] = it["buy_price"] // 4
-            shop["weapons"].append(it)
-            seen_names.add(item["name"])
-
-    # Generic weapons from GENERAL_STORE as variety fallback
-    for item in GENERAL_STORE.get("weapons", []):
-        if item.get("buy_price", 0) <= max_wpn and item["name"] not in seen_names:
-            it = dict(item)
-            it["buy_price"] = int(it["buy_price"] * mult)
-            shop["weapons"].append(it)
-            seen_names.add(item["name"])
-
-    # Class-specific armor + accessories
-    seen_names = set()
-    for item in get_shop_armor(tier, party_classes):
-        if item["buy_price"] <= max_arm and item["name"] not in seen_names:
-            it = dict(item)
-            it["buy_price"] = int(it["buy_price"] * mult)
-            it["sell_price"] = it["buy_price"] // 4
-            shop["armor"].append(it)
-            seen_names.add(item["name"])
-
-    for item in get_shop_accessories(tier, party_classes):
-        if item["buy_price"] <= max_arm and item["name"] not in seen_names:
-            it = dict(item)
-            it["buy_price"] = int(it["buy_price"] * mult)
+    def priced(item, resell):
+        it = dict(item)
+        it["buy_price"] = int(it["buy_price"] * mult)
+        if resell:
             it["sell_price"] = it["buy_price"] // 4
-            shop["armor"].append(it)
-            seen_names.add(item["name"])
-
-    # GENERAL_STORE armor fallback
-    for item in GENERAL_STORE.get("armor", []):
-        if item.get("buy_price", 0) <= max_arm and item["name"] not in seen_names:
-            it = dict(item)
-            it["buy_price"] = int(it["buy_price"] * mult)
-            shop["armor"].append(it)
-            seen_names.add(item["name"])
+        return it
+
+    def stock(dest, items, cap, resell, seen):
+        for item in items:
+            if item.get("buy_price", 0) <= cap and item["name"] not in seen:
+                dest.append(priced(item, resell))
+                seen.add(item["name"])
+
+    # Class-specific weapons from advanced catalog, then GENERAL_STORE
+    # weapons as variety fallback
+    seen = set()
+    stock(weapons, get_shop_weapons(tier, party_classes), max_wpn, True, seen)
+    stock(weapons, GENERAL_STORE.get("weapons", []), max_wpn, False, seen)
+
+    # Class-specific armor + accessories, then GENERAL_STORE armor
+    seen = set()
+    stock(armor, get_shop_armor(tier, party_classes), max_arm, True, seen)
+    stock(armor, get_shop_accessories(tier, party_classes), max_arm, True, seen)
+    stock(armor, GENERAL_STORE.get("armor", []), max_arm, False, seen)
 
     # Always include all consumables
-    for item in GENERAL_STORE.get("consumables", []):
-        it = dict(item)
-        it["buy_price"] = int(it["buy_price"] * mult)
-        shop["consumables"].append(it)
+    consumables.extend(priced(item, False) for item in GENERAL_STORE.get("consumables", []))
 
     # Add bonus items to appropriate category
     for bonus in profile.get("bonus_items", []):
         it = dict(bonus)
         if it.get("type") == "weapon":
-            shop["weapons"].append(it)
+            weapons.append(it)
         elif it.get("type") in ("armor", "accessory"):
-            shop["armor"].append(it)
+            armor.append(it)
         else:
-            shop["consumables"].append(it)
+            consumables.append(it)
+
+    return MappingProxyType({
+        "name": profile["name"],
+        "welcome": profile["welcome"],
+        "weapons": tuple(MappingProxyType(it) for it in weapons),
+        "armor": tuple(MappingProxyType(it) for it in armor),
+        "consumables": tuple(MappingProxyType(it) for it in consumables),
+    })
+
 
+def get_town_shop(town_id, party_classes=None):
+    """Return a shop inventory tailored to the given town.
+    Falls back to GENERAL_STORE if town not defined.
+    party_classes: list of class names to filter class-specific items.
+
+    Town shops are compiled once per (town, party class set) and shared:
+    the result and its items are read-only — copy an item before handing
+    it to a character.
+    """
+    _prepare_catalogs()
+    profile = TOWN_SHOP_PROFILES.get(town_id)
+    if not profile:
+        return GENERAL_STORE
+    key = (town_id, tuple(sorted(set(party_classes or ()))))
+    shop = _catalogs.get(key)
+    if shop is None:
+        shop = _catalogs[key] = _compile_town_shop(profile, list(key[1]) or None)
     return shop
 
 
-# ── Fix missing slot fields on all shop item lists ─────────────
-from core.item_slot_fixer import fix_item_list as _fix_items
-_fix_items(GENERAL_STORE.get("weapons", []))
-_fix_items(GENERAL_STORE.get("armor", []))
-_fix_items(GENERAL_STORE.get("accessories", []))
-for _town_id, _town_data in TOWN_SHOP_PROFILES.items():
-    _fix_items(_town_data.get("bonus_items", []))
-    _fix_items(_town_data.get("weapons", []))
-    _fix_items(_town_data.get("armor", []))
+def clear_shop_catalogs():
+    _catalogs.clear()
+
+
+events.subscribe(events.PARTY_CHANGED, lambda **_: clear_shop_catalogs())
@@ -11549,21 +11549,7 @@ _TRAINER_DIALOGUES = {
 
 NPC_DIALOGUES.update(_TRAINER_DIALOGUES)
 
-
-# ══════════════════════════════════════════════════════════════
-#  DIALOGUE EXIT PATCHER — added Session 19
-#  Adds a "Farewell." exit option to every choice node that
-#  had choices but no exit path (next=None).  Runs once at
-#  module load.  Do not remove — prevents dialogue dead-ends.
-# ══════════════════════════════════════════════════════════════
-def _patch_dialogue_exits(dialogues):
-    _farewell = {"text": "Farewell.", "next": None}
-    for branches in dialogues.values():
-        for branch in branches:
-            nodes = branch.get("tree", {}).get("nodes", {})
-            for node in nodes.values():
-                choices = node.get("choices")
-                if choices and not any(c.get("next") is None for c in choices):
-                    choices.append(dict(_farewell))
-
-_patch_dialogue_exits(NPC_DIALOGUES)
+# Every choice node in the static tables gets a "Farewell." exit when
+# compiled (core.dialogue); trees built at runtime are left as written.
+from core.dialogue import add_farewell_exits
+add_farewell_exits(NPC_DIALOGUES)
@@ -8,6 +8,8 @@ rivers flow downhill, terrain transitions are gradual.
 import random
 import math
 
+from core.alias_table import table_for
+
 # ═══════════════════════════════════════════════════════════════
 #  TERRAIN TYPES
 # ═══════════════════════════════════════════════════════════════
@@ -357,11 +359,13 @@ ENCOUNTER_ZONES = {
 }
 
 
-def get_encounter_for_zone(region, difficulty_tier="easy"):
-    zone = ENCOUNTER_ZONES.get(region, ENCOUNTER_ZONES.get("briarhollow", {}))
+def get_encounter_for_zone(region, difficulty_tier="easy", rng=random):
+    if region not in ENCOUNTER_ZONES:
+        region = "briarhollow"
+    zone = ENCOUNTER_ZONES.get(region, {})
     for tier in [difficulty_tier, "medium", "easy"]:
         if tier in zone:
-            return random.choice(zone[tier])
+            return table_for(("zone", region, tier), zone[tier]).draw(rng)
     return "tutorial"
 
 
@@ -838,6 +842,70 @@ class TravelState:
         return terrain not in (T_DENSE_FOREST, T_SWAMP, T_MOUNTAIN, T_WATER, T_LAKE)
 
 
+# ═══════════════════════════════════════════════════════════════
+#  SPATIAL MASKS — per-step lookups for WorldState.move
+# ═══════════════════════════════════════════════════════════════
+
+SAFE_ZONE_RADIUS = 2    # no random encounters this close (Chebyshev) to a location
+
+_SIGHT_DISKS = {}       # sight radius → ((dy, dx_lo, dx_hi), ...)
+
+
+def sight_disk(radius):
+    """Row spans of the fog-of-war circle: every (dx, dy) with
+    sqrt(dx² + dy²) <= radius is dx_lo <= dx <= dx_hi on row dy."""
+    disk = _SIGHT_DISKS.get(radius)
+    if disk is None:
+        spans = []
+        for dy in range(-radius, radius + 1):
+            row = [dx for dx in range(-radius, radius + 1)
+                   if math.sqrt(dx * dx + dy * dy) <= radius]
+            if row:
+                spans.append((dy, row[0], row[-1]))
+        disk = _SIGHT_DISKS[radius] = tuple(spans)
+    return disk
+
+
+# terrain → (sight radius, disk spans)
+TERRAIN_SIGHT = {t: (d["sight"], sight_disk(d["sight"])) for t, d in TERRAIN_DATA.items()}
+
+
+class WorldMasks:
+    """Lookup tables built once per generated world. Tiles are indexed
+    y * MAP_W + x.
+
+      safe       bytearray — 1 within SAFE_ZONE_RADIUS of any location tile
+      proximity  {tile index: (loc_id, ...)} — hidden (not "visible")
+                 locations whose discovery_radius (Manhattan) covers the
+                 tile, in LOCATIONS order
+    """
+    __slots__ = ("safe", "proximity")
+
+    def __init__(self, tiles):
+        r = SAFE_ZONE_RADIUS
+        safe = bytearray(MAP_W * MAP_H)
+        for y, row in enumerate(tiles):
+            for x, tile in enumerate(row):
+                if not tile.get("location_id"):
+                    continue
+                x0, x1 = max(0, x - r), min(MAP_W, x + r + 1)
+                for ny in range(max(0, y - r), min(MAP_H, y + r + 1)):
+                    safe[ny * MAP_W + x0:ny * MAP_W + x1] = b"\x01" * (x1 - x0)
+        self.safe = safe
+
+        proximity = {}
+        for loc_id, loc in LOCATIONS.items():
+            if loc.get("visible"):
+                continue
+            lx, ly = loc["x"], loc["y"]
+            rad = loc.get("discovery_radius", 2)
+            for y in range(max(0, ly - rad), min(MAP_H, ly + rad + 1)):
+                span = rad - abs(y - ly)
+                for x in range(max(0, lx - span), min(MAP_W, lx + span + 1)):
+                    proximity.setdefault(y * MAP_W + x, []).append(loc_id)
+        self.proximity = {i: tuple(ids) for i, ids in proximity.items()}
+
+
 # ═══════════════════════════════════════════════════════════════
 #  WORLD STATE
 # ═══════════════════════════════════════════════════════════════
@@ -848,6 +916,7 @@ class WorldState:
     def __init__(self, party, seed=42):
         self.party = party
         self.tiles = generate_world_map(seed)
+        self.masks = WorldMasks(self.tiles)
         self.discovered_locations = set()
         self.travel = TravelState()
         self.key_items = []  # list of key item ID strings
@@ -914,6 +983,13 @@ class WorldState:
         for c in self.party:
             tick_step(c)
 
+        # Roll up nearby towns' tavern recruits before the party arrives
+        try:
+            from core.tavern_recruits import prefetch_near
+            prefetch_near(nx, ny, self.party)
+        except Exception:
+            pass
+
         # Location check
         loc_id = tile.get("location_id")
         if loc_id and loc_id in LOCATIONS:
@@ -949,7 +1025,9 @@ class WorldState:
         return None
 
     def _near_location(self, x, y, radius=2):
-        """Check if position is within radius of any discovered location."""
+        """Check if position is within radius of any location tile."""
+        if radius == SAFE_ZONE_RADIUS and 0 <= x < MAP_W and 0 <= y < MAP_H:
+            return self.masks.safe[y * MAP_W + x] == 1
         for dy in range(-radius, radius + 1):
             for dx in range(-radius, radius + 1):
                 nx, ny = x + dx, y + dy
@@ -1043,37 +1121,42 @@ class WorldState:
         return self.get_current_tile()["region"]
 
     def _update_fog(self):
-        tile = self.tiles[self.party_y][self.party_x]
-        terrain = tile["terrain"]
-        sight = TERRAIN_DATA.get(terrain, {}).get("sight", 4)
-        for dy in range(-sight, sight + 1):
-            for dx in range(-sight, sight + 1):
-                nx = self.party_x + dx
-                ny = self.party_y + dy
-                if 0 <= nx < MAP_W and 0 <= ny < MAP_H:
-                    if math.sqrt(dx * dx + dy * dy) <= sight:
-                        self.tiles[ny][nx]["discovered"] = True
+        px, py = self.party_x, self.party_y
+        tiles = self.tiles
+        terrain = tiles[py][px]["terrain"]
+        sight, disk = TERRAIN_SIGHT.get(terrain) or (4, sight_disk(4))
+        if sight <= px < MAP_W - sight and sight <= py < MAP_H - sight:
+            for dy, lo, hi in disk:
+                row = tiles[py + dy]
+                for nx in range(px + lo, px + hi + 1):
+                    row[nx]["discovered"] = True
+            return
+        for dy, lo, hi in disk:
+            ny = py + dy
+            if 0 <= ny < MAP_H:
+                row = tiles[ny]
+                for nx in range(max(0, px + lo), min(MAP_W, px + hi + 1)):
+                    row[nx]["discovered"] = True
 
     def _check_nearby_discoveries(self):
-        for loc_id, loc in LOCATIONS.items():
+        nearby = self.masks.proximity.get(self.party_y * MAP_W + self.party_x)
+        if not nearby:
+            return None
+        for loc_id in nearby:
             if loc_id in self.discovered_locations:
                 continue
-            if loc.get("visible"):
-                continue
-            lx, ly = loc["x"], loc["y"]
-            dist = abs(self.party_x - lx) + abs(self.party_y - ly)
-            if dist <= loc.get("discovery_radius", 2):
-                base_chance = loc.get("discovery_chance", 15)
-                for c in self.party:
-                    if c.class_name == "Thief":
-                        base_chance += 10
-                    elif c.class_name == "Ranger":
-                        base_chance += 10
-                    elif c.class_name == "Mage":
-                        base_chance += 5
-                if random.randint(1, 100) <= base_chance:
-                    self.discovered_locations.add(loc_id)
-                    return {"type": "discovery", "id": loc_id, "data": loc}
+            loc = LOCATIONS[loc_id]
+            base_chance = loc.get("discovery_chance", 15)
+            for c in self.party:
+                if c.class_name == "Thief":
+                    base_chance += 10
+                elif c.class_name == "Ranger":
+                    base_chance += 10
+                elif c.class_name == "Mage":
+                    base_chance += 5
+            if random.randint(1, 100) <= base_chance:
+                self.discovered_locations.add(loc_id)
+                return {"type": "discovery", "id": loc_id, "data": loc}
         return None
 
     def get_visible_tiles(self, view_w=22, view_h=16):
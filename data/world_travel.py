@@ -0,0 +1,431 @@
+"""
+Realm of Shadows — Overworld Auto-Travel
+
+Route planning across the world map and the step-by-step travel loop:
+  terrain_costs  — cost of entering each terrain in the current travel mode
+  LandRegions    — top level of the search: which tiles a mode can walk
+                   between (connected land masses), joined by voyages and
+                   rail rides
+  RoutePlanner   — A* on the tile grid inside a region, plus at most one
+                   voyage or rail ride when that is cheaper or the only way
+  AutoTravel     — walks a planned route one WorldState.move per step and
+                   stops on encounters, discoveries and blocked tiles
+
+Costs follow WorldState.move: entering a tile costs its TERRAIN_DATA
+move_cost divided by TravelState.get_move_speed. Horses keep off terrain
+can_ride_terrain refuses, the carpet flies over everything, ships follow
+PORT_ROUTES (key-gated like the port picker) and, once the rail is
+unlocked, every open station links to the others.
+
+Roads need no graph of their own: they cost the same as open ground, so
+A* with a Manhattan heuristic follows them whenever they are the short
+way. What made long queries slow was asking for a place the mode cannot
+reach (an island on foot) — A* floods the whole continent before giving
+up. The region labels answer that without searching.
+
+Planning is a generator that yields every PLAN_SLICE tiles, so
+AutoTravel.update() can spread a long search over several frames.
+"""
+import heapq
+import time
+from collections import deque
+
+from data.world_map import (
+    TERRAIN_DATA, LOCATIONS, PORT_ROUTES, RAIL_STATIONS, RAIL_STATIONS_ACT2,
+    MAP_W, MAP_H,
+)
+
+SEA_LEG_COST   = 24     # one voyage, in tiles of walking
+RAIL_LEG_COST  = 12     # one rail ride
+COST_SCALE     = 6      # tile costs are integers: move_cost × COST_SCALE / speed
+PLAN_SLICE     = 128    # tiles expanded / labelled between planner yields
+PLAN_BUDGET_MS = 4.0    # planning time AutoTravel.update() spends per call
+
+# WorldState.move results that end a trip
+STOP_EVENTS = ("blocked", "encounter", "discovery")
+
+_N = MAP_W * MAP_H
+_INF = float("inf")
+
+
+def _neighbour_table():
+    out = []
+    for i in range(_N):
+        x, y = i % MAP_W, i // MAP_W
+        n = []
+        if y > 0:
+            n.append(i - MAP_W)
+        if x > 0:
+            n.append(i - 1)
+        if x < MAP_W - 1:
+            n.append(i + 1)
+        if y < MAP_H - 1:
+            n.append(i + MAP_W)
+        out.append(tuple(n))
+    return tuple(out)
+
+
+_NEIGHBOURS = _neighbour_table()   # tile index → 4-connected neighbour indices
+
+
+def tile_index(x, y):
+    return y * MAP_W + x
+
+
+def _manhattan(a, b):
+    return abs(a % MAP_W - b % MAP_W) + abs(a // MAP_W - b // MAP_W)
+
+
+def terrain_costs(travel):
+    """{terrain: cost of entering one tile} for travel.travel_mode, in
+    1/COST_SCALE steps of walking so sums stay exact (equal-cost routes then
+    tie exactly and A* settles them without wandering). Terrain the party
+    cannot enter in that mode is left out."""
+    out = {}
+    for terrain, data in TERRAIN_DATA.items():
+        if travel.travel_mode == "carpet":
+            pass
+        elif not data["passable"]:
+            continue
+        elif travel.travel_mode == "horse" and not travel.can_ride_terrain(terrain):
+            continue
+        speed = travel.get_move_speed(terrain)
+        if speed <= 0:
+            continue
+        out[terrain] = max(1, data["move_cost"]) * COST_SCALE // speed
+    return out
+
+
+def transit_legs(world):
+    """[(kind, origin_id, dest_id, cost)] for every voyage and rail ride the
+    party could take right now. Voyages leave from discovered ports and skip
+    destinations whose key the party lacks, as Game._handle_port does."""
+    legs = []
+    found = world.discovered_locations
+    for origin, routes in PORT_ROUTES.items():
+        if origin not in found or origin not in LOCATIONS:
+            continue
+        for dest in routes:
+            loc = LOCATIONS.get(dest)
+            if loc is None:
+                continue
+            req = loc.get("required_key")
+            if req and not world.has_key(req):
+                continue
+            legs.append(("sail", origin, dest, SEA_LEG_COST * COST_SCALE))
+    if world.travel.rail_unlocked:
+        stations = [s for s in RAIL_STATIONS if s in LOCATIONS]
+        stations += [s for s in RAIL_STATIONS_ACT2 if s in found]
+        legs += [("rail", a, b, RAIL_LEG_COST * COST_SCALE)
+                 for a in stations for b in stations if a != b]
+    return legs
+
+
+def _location_tile(loc_id):
+    loc = LOCATIONS[loc_id]
+    return tile_index(loc["x"], loc["y"])
+
+
+# ═══════════════════════════════════════════════════════════════
+#  GRID SEARCH
+# ═══════════════════════════════════════════════════════════════
+
+def _astar(cost, unit, start, goal):
+    """Generator: A* over tiles with a Manhattan × unit heuristic, where
+    cost[i] is the cost of entering tile i (0 = impassable). Returns
+    (path, cost) with the path excluding start, or None."""
+    gx, gy = goal % MAP_W, goal // MAP_W
+    g = {start: 0}
+    parent = {start: None}
+    closed = set()
+    heap = [(0, 0, start)]     # (f, h, tile): ties go to the tile nearer the goal
+    expanded = 0
+    while heap:
+        _f, _h, cur = heapq.heappop(heap)
+        if cur in closed:
+            continue
+        if cur == goal:
+            path = []
+            while cur != start:
+                path.append(cur)
+                cur = parent[cur]
+            path.reverse()
+            return path, g[goal]
+        closed.add(cur)
+        expanded += 1
+        if expanded % PLAN_SLICE == 0:
+            yield
+        base = g[cur]
+        for n in _NEIGHBOURS[cur]:
+            c = cost[n]
+            if not c or n in closed:
+                continue
+            ng = base + c
+            if ng < g.get(n, _INF):
+                g[n] = ng
+                parent[n] = cur
+                h = (abs(n % MAP_W - gx) + abs(n // MAP_W - gy)) * unit
+                heapq.heappush(heap, (ng + h, h, n))
+    return None
+
+
+# ═══════════════════════════════════════════════════════════════
+#  LAND REGIONS
+# ═══════════════════════════════════════════════════════════════
+
+class LandRegions:
+    """Connected land masses for one travel mode: label[i] is the region of
+    tile i, 0 where the mode cannot go. Built once per mode by
+    RoutePlanner (see build())."""
+    __slots__ = ("label", "count")
+
+    def __init__(self):
+        self.label = None
+        self.count = 0
+
+    @classmethod
+    def build(cls, cost):
+        """Generator: flood-fill the passable tiles of a cost grid."""
+        self = cls()
+        label = [0] * _N
+        count = 0
+        done = 0
+        for i in range(_N):
+            if label[i] or not cost[i]:
+                continue
+            count += 1
+            label[i] = count
+            todo = [i]
+            while todo:
+                cur = todo.pop()
+                done += 1
+                if done % (PLAN_SLICE * 8) == 0:
+                    yield
+                for n in _NEIGHBOURS[cur]:
+                    if cost[n] and not label[n]:
+                        label[n] = count
+                        todo.append(n)
+        self.label = label
+        self.count = count
+        return self
+
+    def reachable(self, tile):
+        """Regions the party can walk into from tile — its own, or those of
+        its neighbours when the mode cannot stand there (e.g. switching to
+        the horse in a swamp)."""
+        own = self.label[tile]
+        if own:
+            return {own}
+        return {self.label[n] for n in _NEIGHBOURS[tile] if self.label[n]}
+
+
+# ═══════════════════════════════════════════════════════════════
+#  ROUTE PLANNER
+# ═══════════════════════════════════════════════════════════════
+
+class Route:
+    """A planned trip. legs is a list of ("walk", (tile, ...)) and
+    ("sail" | "rail", dest_id) entries; cost is in terrain_costs units."""
+    __slots__ = ("goal_id", "legs", "cost")
+
+    def __init__(self, goal_id, legs, cost):
+        self.goal_id = goal_id
+        self.legs = legs
+        self.cost = cost
+
+    @property
+    def steps(self):
+        """Number of WorldState.move calls (voyages count as one)."""
+        return sum(len(leg[1]) if leg[0] == "walk" else 1 for leg in self.legs)
+
+
+class RoutePlanner:
+    """Plans routes over one world's tiles. Cost grids and land regions are
+    cached per travel mode (terrain never changes after generation)."""
+
+    def __init__(self, tiles):
+        self.tiles = tiles
+        self._grids = {}     # mode → (cost list, cheapest tile cost)
+        self._regions = {}   # mode → LandRegions
+
+    def _grid(self, travel):
+        mode = travel.travel_mode
+        grid = self._grids.get(mode)
+        if grid is None:
+            costs = terrain_costs(travel)
+            cost = [costs.get(t["terrain"], 0) for row in self.tiles for t in row]
+            grid = self._grids[mode] = (cost, min(costs.values()))
+        return grid
+
+    def regions(self, travel):
+        """Generator: the LandRegions for this travel mode."""
+        mode = travel.travel_mode
+        regions = self._regions.get(mode)
+        if regions is None:
+            regions = yield from LandRegions.build(self._grid(travel)[0])
+            self._regions[mode] = regions
+        return regions
+
+    def land_route(self, travel, start, goal):
+        """Generator: (tiles, cost) over land from start to goal, or None
+        when they are on different land masses for this mode."""
+        if start == goal:
+            return [], 0
+        regions = yield from self.regions(travel)
+        if regions.label[goal] not in regions.reachable(start):
+            return None
+        cost, unit = self._grid(travel)
+        return (yield from _astar(cost, unit, start, goal))
+
+    def plan(self, world, goal_id):
+        """Generator: the cheapest Route from the party to a location, or
+        None. Takes at most one voyage or rail ride."""
+        travel = world.travel
+        regions = yield from self.regions(travel)
+        unit = self._grid(travel)[1]
+        start = tile_index(world.party_x, world.party_y)
+        goal = _location_tile(goal_id)
+        here = regions.reachable(start)
+        there = regions.label[goal]
+
+        best = None
+        found = yield from self.land_route(travel, start, goal)
+        if found:
+            best = Route(goal_id, [("walk", tuple(found[0]))], found[1])
+
+        # Voyages/rides that start on the party's land mass and end on the
+        # goal's, cheapest lower bound first
+        legs = []
+        for kind, a, b, leg in transit_legs(world):
+            ai, bi = _location_tile(a), _location_tile(b)
+            if ai != start and regions.label[ai] not in here:
+                continue
+            if bi != goal and regions.label[bi] != there:
+                continue
+            bound = (_manhattan(start, ai) + _manhattan(bi, goal)) * unit + leg
+            legs.append((bound, kind, a, b, ai, bi, leg))
+        legs.sort()
+        to_port, from_port = {}, {}
+        for bound, kind, a, b, ai, bi, leg in legs:
+            if best is not None and bound >= best.cost:
+                break
+            if a not in to_port:
+                to_port[a] = yield from self.land_route(travel, start, ai)
+            if b not in from_port:
+                from_port[b] = yield from self.land_route(travel, bi, goal)
+            out, back = to_port[a], from_port[b]
+            if out is None or back is None:
+                continue
+            total = out[1] + leg + back[1]
+            if best is None or total < best.cost:
+                trip = [("walk", tuple(out[0])), (kind, b), ("walk", tuple(back[0]))]
+                best = Route(goal_id, [l for l in trip if l[0] != "walk" or l[1]], total)
+        return best
+
+
+def get_route_planner(world):
+    """The RoutePlanner for a WorldState (created on first use)."""
+    planner = getattr(world, "_route_planner", None)
+    if planner is None or planner.tiles is not world.tiles:
+        planner = world._route_planner = RoutePlanner(world.tiles)
+    return planner
+
+
+def plan_route(world, goal_id):
+    """Plan a Route to goal_id in one go (tests, tools)."""
+    gen = get_route_planner(world).plan(world, goal_id)
+    while True:
+        try:
+            next(gen)
+        except StopIteration as done:
+            return done.value
+
+
+# ═══════════════════════════════════════════════════════════════
+#  TRAVEL LOOP
+# ═══════════════════════════════════════════════════════════════
+
+class AutoTravel:
+    """One auto-travel trip to a location.
+
+    status: planning → travelling → arrived | stopped | no_route
+    update() spends up to PLAN_BUDGET_MS per call on planning; step() then
+    takes a single step per call and returns what WorldState.move returned
+    (or a port_travel / rail_travel event for a voyage) so the caller can
+    handle it like a key press. reason says why a trip stopped.
+    """
+
+    def __init__(self, world, goal_id):
+        self.world = world
+        self.goal_id = goal_id
+        self.status = "planning"
+        self.reason = None
+        self.route = None
+        self._steps = deque()
+        self._plan = get_route_planner(world).plan(world, goal_id)
+
+    @property
+    def active(self):
+        return self.status in ("planning", "travelling")
+
+    def update(self, budget_ms=PLAN_BUDGET_MS):
+        """Advance planning. True once there is a route to walk."""
+        if self.status == "planning":
+            deadline = time.perf_counter() + budget_ms / 1000.0
+            try:
+                while time.perf_counter() < deadline:
+                    next(self._plan)
+            except StopIteration as done:
+                self._set_route(done.value)
+        return self.status == "travelling"
+
+    def finish_planning(self):
+        """Plan to completion without a time budget."""
+        while self.status == "planning":
+            self.update(budget_ms=1000.0)
+        return self.route
+
+    def _set_route(self, route):
+        self._plan = None
+        self.route = route
+        if route is None:
+            self.status = "no_route"
+            return
+        for leg in route.legs:
+            if leg[0] == "walk":
+                self._steps.extend(leg[1])
+            else:
+                self._steps.append(leg)
+        self.status = "travelling" if self._steps else "arrived"
+
+    def stop(self, reason="cancelled"):
+        if self.active:
+            self.status = "stopped"
+            self.reason = reason
+            self._plan = None
+
+    def step(self):
+        """Take the next step of the route."""
+        if self.status != "travelling":
+            return None
+        world = self.world
+        nxt = self._steps.popleft()
+        if isinstance(nxt, tuple):
+            kind, dest_id = nxt
+            dest = LOCATIONS[dest_id]
+            world.party_x, world.party_y = dest["x"], dest["y"]
+            world.discovered_locations.add(dest_id)
+            event = {"type": "port_travel" if kind == "sail" else "rail_travel",
+                     "dest_id": dest_id, "dest": dest}
+        else:
+            dx, dy = nxt % MAP_W - world.party_x, nxt // MAP_W - world.party_y
+            if abs(dx) + abs(dy) != 1:
+                self.stop("off_route")
+                return None
+            event = world.move(dx, dy)
+            if event and event["type"] in STOP_EVENTS:
+                self.stop(event["type"])
+                return event
+        if not self._steps:
+            self.status = "arrived"
+        return event
@@ -8,7 +8,7 @@
 
 Run:  python3 main.py
 """
-import sys, os, random
+import sys, os, random, weakref
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
@@ -33,10 +33,22 @@ from ui.dungeon_ui import DungeonUI
 from data.world_map import (WorldState, LOCATIONS, LOC_TOWN, LOC_DUNGEON,
                             LOC_PORT, LOC_SECRET, LOC_POI, LOC_STABLE, LOC_RAIL)
 from data.dungeon import DungeonState, DUNGEONS
-from core.save_load import save_game, load_game
+from core.save_load import (save_game_async, load_game,
+                            dispatch_save_callbacks, flush_saves)
+from core import events
+import data.job_board          # registers job-board event listeners
+import achievement_tracker     # registers achievement event listeners
 import core.sound as sfx
+from core import mem_stats
 
 FPS = 60
+IDLE_WAIT_MS = 100   # max sleep between loop passes on a static screen
+FADE_OUT_MS = 330    # go_fade: outgoing screen → black
+RANDOM_REVEAL_MS = 1500  # draw_random: last timed reveal of a random event
+AUDIO_PREFETCH_TILES = 10   # world map: build a town/dungeon theme this close
+BIOME_PREFETCH_TILES = 3    # world map: build neighbouring biome ambiences
+AUTO_TRAVEL_STEP_MS = 90    # world map: time between auto-travel steps
+MEM_OVERLAY_REFRESH_MS = 1000  # debug memory overlay: re-measure caches this often
 PARTY_SIZE = 6
 
 # States
@@ -141,6 +153,8 @@ class Game:
         # World Map
         self.world_state = None
         self.world_map_ui = None
+        self.auto_travel = None         # data.world_travel.AutoTravel while a trip runs
+        self._auto_travel_ms = 0
         # Dungeon
         self.dungeon_state = None
         self.dungeon_ui = None
@@ -172,6 +186,24 @@ class Game:
         self.debug_mode = False
         self.debug_encounter = "tutorial"
         self.debug_enc_hover = -1
+        self.mem_overlay = False        # F3 in debug mode: RSS + cache sizes
+        self._mem_rows = None           # (rss_kb, mem_stats.report()) last measured
+        self._mem_refresh_ms = 0
+        _me = weakref.ref(self)
+        mem_stats.register("game.dungeon_cache",
+                           lambda: getattr(_me(), "dungeon_cache", None))
+        mem_stats.register("game.combat_log",
+                           lambda: getattr(getattr(_me(), "combat_state", None),
+                                           "combat_log", None))
+        # Frame scheduler (see run / _frame_is_animating)
+        self._idle_frames = 0           # consecutive frames with nothing to animate
+        self._last_drawn_state = None
+        self.frames_drawn = 0
+        self.frames_skipped = 0
+        # Screen transitions (see go_fade / _draw_transition)
+        self._transition = None         # {"elapsed": ms} while fading out
+        self._snapshot = None           # reused copy of the outgoing screen
+        self._fade_overlay = None       # reused full-screen black surface
 
     def _create_window(self):
         """Create display surface based on saved display_mode preference."""
@@ -192,78 +224,171 @@ class Game:
         except Exception:
             return pygame.display.set_mode((SCREEN_W, SCREEN_H))
 
+    # States whose draw code is time-driven (timers, pulses, typewriters)
+    # and which have no UI object that can say otherwise.
+    ANIMATED_STATES = frozenset({
+        S_SPLASH, S_TITLE, S_NAME, S_COMBAT, S_WORLD_MAP, S_DUNGEON,
+        S_OPENING, S_CHEST, S_ATTACK_CINEMATIC, S_ENDING, S_GAME_OVER,
+    })
+
+    def _state_ui(self):
+        """UI object that owns the current state's drawing, if any."""
+        return {
+            S_TOWN:        self.town_ui,
+            S_INVENTORY:   self.inventory_ui,
+            S_POST_COMBAT: self.post_combat_ui,
+            S_DIALOGUE:    self.dialogue_ui,
+            S_CAMP:        self.camp_ui,
+            S_SAVE_LOAD:   self.save_load_ui,
+            S_SETTINGS:    self.settings_ui,
+        }.get(self.state)
+
+    def _frame_is_animating(self):
+        """True if the next frame can differ from the last one without input.
+
+        UIs declare this via is_animating(); a UI without the method is
+        assumed to animate. States with no UI object are static unless
+        listed in ANIMATED_STATES or revealing on self.timer (S_RANDOM,
+        until RANDOM_REVEAL_MS). Toasts, banners, fades and queued sounds
+        keep the loop at full rate.
+        """
+        if (self.fade > 0 or self._transition or self._toasts or self._quest_notifications
+                or self._achievement_toast or self._achievement_queue
+                or self._sfx_pending or self.mem_overlay):
+            return True
+        if self.state in self.ANIMATED_STATES:
+            return True
+        if self.state == S_RANDOM and self.timer <= RANDOM_REVEAL_MS:
+            return True
+        ui = self._state_ui()
+        if ui is None:
+            return False
+        check = getattr(ui, "is_animating", None)
+        return True if check is None else bool(check())
+
     def run(self):
         while self.running:
+            frame = self._frame_update()
+            if frame is None:
+                return
+            if not self._frame_draw(*frame):
+                return
+        flush_saves()
+        pygame.quit()
+
+    def _frame_update(self):
+        """Input/timer half of a frame (benchmarks/bench_headless.py times
+        the two halves separately). Returns (dt, mx, my, had_input), or None
+        once the game has quit or crashed."""
+        # ── Frame scheduling ──
+        # Static screen and nothing changed for two frames: sleep until
+        # input arrives (or IDLE_WAIT_MS passes) instead of ticking at FPS.
+        idle = self._idle_frames >= 2
+        queued = []
+        if idle:
+            first = pygame.event.wait(IDLE_WAIT_MS)
+            if first.type != pygame.NOEVENT:
+                queued.append(first)
+            dt = self.clock.tick()
+        else:
             dt = self.clock.tick(FPS)
-            self.title_t += dt
-            # ── Two-phase sound queue ──────────────────────────────
-            if self._sfx_pending:
-                fired, remaining = [], []
-                for delay, key in self._sfx_pending:
-                    delay -= dt
-                    if delay <= 0:
-                        fired.append(key)
-                    else:
-                        remaining.append((delay, key))
-                self._sfx_pending = remaining
-                for key in fired:
-                    sfx.play(key)
-            self.title_t += dt
-            if self.state == S_SPLASH:
-                self.intro.update(dt)
-            self.blink += dt
-            self.timer += dt
-            mx, my = pygame.mouse.get_pos()
-            for e in pygame.event.get():
-                if e.type == pygame.QUIT:
-                    # Autosave to inn_autosave whenever the window is closed so
-                    # progress is never lost regardless of how the game exits.
-                    if self.party:
-                        try:
-                            from core.save_load import save_game as _sg
-                            _sg(self.party,
-                                world_state=self.world_state,
-                                slot_name="inn_autosave",
-                                dungeon_cache=self.dungeon_cache,
-                                dungeon_state=self.dungeon_state,
-                                character_bank=self.character_bank)
-                        except Exception:
-                            pass
-                    self.running = False
-                    return
-                try:
-                    self.on_event(e, mx, my)
-                except Exception as _exc:
-                    self._show_crash(_exc)
-                    return
-            self.screen.fill(BG_COLOR)
+        self.title_t += dt
+        # ── Two-phase sound queue ──────────────────────────────
+        if self._sfx_pending:
+            fired, remaining = [], []
+            for delay, key in self._sfx_pending:
+                delay -= dt
+                if delay <= 0:
+                    fired.append(key)
+                else:
+                    remaining.append((delay, key))
+            self._sfx_pending = remaining
+            for key in fired:
+                sfx.play(key)
+        self.title_t += dt
+        if self.state == S_SPLASH:
+            self.intro.update(dt)
+        self.blink += dt
+        self.timer += dt
+        dispatch_save_callbacks()   # toasts for finished background saves
+        sfx.update()                # install music/ambience built in the background
+        mem_stats.tick(dt)          # tracemalloc diff to disk when --memtrace is on
+        if self.auto_travel:
+            self._update_auto_travel(dt)
+        if self.state == S_DUNGEON and self.dungeon_ui and self.dungeon_ui.auto_walk:
+            self._update_auto_walk()
+        mx, my = pygame.mouse.get_pos()
+        queued.extend(pygame.event.get())
+        for e in queued:
+            if e.type == pygame.QUIT:
+                # Autosave to inn_autosave whenever the window is closed so
+                # progress is never lost regardless of how the game exits.
+                if self.party:
+                    try:
+                        from core.save_load import save_game_async as _sg
+                        _sg(self.party,
+                            world_state=self.world_state,
+                            slot_name="inn_autosave",
+                            dungeon_cache=self.dungeon_cache,
+                            dungeon_state=self.dungeon_state,
+                            character_bank=self.character_bank)
+                    except Exception:
+                        pass
+                self.running = False
+                flush_saves()
+                return None
             try:
-                self.draw_state(mx, my)
+                self.on_event(e, mx, my)
             except Exception as _exc:
                 self._show_crash(_exc)
-                return
-            # Journal overlay — never draw on top of active dialogue
-            if self.quest_log_ui and not self._is_dialogue_active():
-                try:
-                    self.quest_log_ui.draw(self.screen, mx, my)
-                except Exception:
-                    pass
-            # Menu overlay — drawn on top of everything except toasts/fade
-            if self.show_menu_overlay and self.state != S_COMBAT:
-                self._draw_menu_overlay(self.screen)
-            self._draw_toasts(self.screen)
-            self._draw_quest_banner(self.screen, dt)
-            self._tick_toasts(dt)
-            # Achievement toast
-            self._update_achievement_toast(dt)
-            self._draw_achievement_toast(self.screen)
-            # Fade
-            if self.fade > 0:
-                s = pygame.Surface((SCREEN_W, SCREEN_H)); s.fill(BLACK)
-                s.set_alpha(self.fade); self.screen.blit(s, (0,0))
-                self.fade = max(0, self.fade - 10)
+                return None
+        return dt, mx, my, bool(queued)
+
+    def _frame_draw(self, dt, mx, my, had_input):
+        """Render half of a frame. Returns False after a crash."""
+        if self._frame_is_animating() or had_input or self.state != self._last_drawn_state:
+            self._idle_frames = 0
+        else:
+            self._idle_frames += 1
+            if self._idle_frames >= 2:
+                # Nothing new to show — keep the last frame on screen
+                self.frames_skipped += 1
+                return True
+        self._last_drawn_state = self.state
+        self.frames_drawn += 1
+        if self._transition:
+            self._draw_transition(dt)
             pygame.display.flip()
-        pygame.quit()
+            return True
+        self.screen.fill(BG_COLOR)
+        try:
+            self.draw_state(mx, my)
+        except Exception as _exc:
+            self._show_crash(_exc)
+            return False
+        # Journal overlay — never draw on top of active dialogue
+        if self.quest_log_ui and not self._is_dialogue_active():
+            try:
+                self.quest_log_ui.draw(self.screen, mx, my)
+            except Exception:
+                pass
+        # Menu overlay — drawn on top of everything except toasts/fade
+        if self.show_menu_overlay and self.state != S_COMBAT:
+            self._draw_menu_overlay(self.screen)
+        self._draw_toasts(self.screen)
+        self._draw_quest_banner(self.screen, dt)
+        self._tick_toasts(dt)
+        # Achievement toast
+        self._update_achievement_toast(dt)
+        self._draw_achievement_toast(self.screen)
+        if self.mem_overlay:
+            self._draw_mem_overlay(self.screen, dt)
+        # Fade
+        if self.fade > 0:
+            self._blit_fade(self.fade)
+            self.fade = max(0, self.fade - 10)
+        pygame.display.flip()
+        return True
 
     def _show_crash(self, exc):
         """Display a readable crash screen with full traceback instead of silent close."""
@@ -345,25 +470,58 @@ class Game:
             sfx.stop_ambient()
 
     def go_fade(self, state):
-        """Fade-out current screen, switch state, then fade-in."""
-        # Fade out over ~200ms (20 frames at 60fps, step 13/frame)
-        mx, my = pygame.mouse.get_pos()
-        for alpha in range(0, 256, 13):
-            self.screen.fill(BG_COLOR)
-            self.draw_state(mx, my)
-            s = pygame.Surface((SCREEN_W, SCREEN_H))
-            s.fill(BLACK)
-            s.set_alpha(min(255, alpha))
-            self.screen.blit(s, (0, 0))
-            pygame.display.flip()
-            self.clock.tick(FPS)
+        """Fade-out current screen, switch state, then fade-in.
+
+        Non-blocking: the outgoing frame is captured once and the state
+        switches immediately. run() then shows the snapshot fading to black
+        over FADE_OUT_MS while still pumping events and sounds, and the
+        usual self.fade fade-in follows. Clicks and key presses are dropped
+        until the snapshot is gone (see on_event).
+
+        This is deliberately a fade through black, as the old blocking loop
+        was, not a crossfade: the incoming screen is never drawn under the
+        snapshot, so screens that are expensive to draw (the dungeon) or
+        still settling on their first frame cost nothing during the fade.
+        """
+        snap = self._snapshot
+        if snap is None or snap.get_size() != self.screen.get_size():
+            snap = self._snapshot = self.screen.copy()
+        else:
+            snap.blit(self.screen, (0, 0))
         self.go(state)
+        self._transition = {"elapsed": 0}
+
+    def _blit_fade(self, alpha):
+        """Darken the screen with the shared black overlay."""
+        ov = self._fade_overlay
+        if ov is None or ov.get_size() != self.screen.get_size():
+            ov = self._fade_overlay = pygame.Surface(self.screen.get_size())
+            ov.fill(BLACK)
+        ov.set_alpha(alpha)
+        self.screen.blit(ov, (0, 0))
+
+    def _draw_transition(self, dt):
+        """One frame of a go_fade fade-out; ends the transition when black."""
+        tr = self._transition
+        tr["elapsed"] += dt
+        self.screen.blit(self._snapshot, (0, 0))
+        self._blit_fade(min(255, int(255 * tr["elapsed"] / FADE_OUT_MS)))
+        if tr["elapsed"] >= FADE_OUT_MS:
+            self._transition = None
 
     # ══════════════════════════════════════════════════════════
     #  EVENT HANDLING
     # ══════════════════════════════════════════════════════════
 
     def on_event(self, e, mx, my):
+        # ── go_fade in progress: the screen shown is the old one ─────
+        if self._transition and e.type in (pygame.KEYDOWN, pygame.MOUSEBUTTONDOWN):
+            return
+        # ── F3 (debug mode): memory overlay ──────────────────────────
+        if self.debug_mode and e.type == pygame.KEYDOWN and e.key == pygame.K_F3:
+            self.mem_overlay = not self.mem_overlay
+            self._mem_rows = None
+            return
         # ── Quest banner dismissal (any click/key dismisses front banner) ──
         if self._quest_notifications:
             if e.type in (pygame.MOUSEBUTTONDOWN, pygame.KEYDOWN):
@@ -781,16 +939,7 @@ class Game:
                 elif result == "inn_save":
                     # Auto-save when resting at inn (keyboard path)
                     try:
-                        ok, _path, _msg = save_game(
-                            self.party,
-                            world_state=self.world_state,
-                            slot_name="inn_autosave",
-                            dungeon_cache=self.dungeon_cache,
-                            character_bank=self.character_bank
-                        )
-                        toast_col = (80, 200, 120) if ok else (220, 80, 80)
-                        toast_msg = "✓ Progress saved at inn." if ok else "✗ Autosave failed."
-                        self.add_toast(toast_msg, toast_col)
+                        self._autosave_inn()
                     except Exception:
                         pass
                 elif result == "show_menu":
@@ -804,16 +953,7 @@ class Game:
                     elif result == "inn_save":
                         # Auto-save when resting at inn
                         try:
-                            ok, _path, _msg = save_game(
-                                self.party,
-                                world_state=self.world_state,
-                                slot_name="inn_autosave",
-                                dungeon_cache=self.dungeon_cache,
-                                character_bank=self.character_bank
-                            )
-                            toast_col = (80, 200, 120) if ok else (220, 80, 80)
-                            toast_msg = "✓ Progress saved at inn." if ok else "✗ Autosave failed."
-                            self.add_toast(toast_msg, toast_col)
+                            self._autosave_inn()
                         except Exception:
                             pass  # save is best-effort
                     elif result == "open_party_review":
@@ -827,7 +967,10 @@ class Game:
                     self.town_ui.handle_scroll(1)
 
         elif self.state == S_WORLD_MAP:
-            if e.type == pygame.KEYDOWN:
+            if self.auto_travel and e.type in (pygame.KEYDOWN, pygame.MOUSEBUTTONDOWN):
+                # Any key or click stops an auto-travel trip (and only that)
+                self._end_auto_travel("cancelled")
+            elif e.type == pygame.KEYDOWN:
                 event = self.world_map_ui.handle_key(e.key)
                 self._process_world_event(event)
             elif e.type == pygame.MOUSEBUTTONDOWN and e.button == 1:
@@ -999,7 +1142,16 @@ class Game:
                     if isinstance(result, tuple) and result[0] == "saved":
                         sfx.play("ui_confirm")
                         slot_label = result[1].replace("save","Slot ").replace("_"," ").title()
-                        self.add_toast(f"✓ Saved to {slot_label}.", (80, 200, 120))
+
+                        def _saved(ok, _path, msg, _label=slot_label):
+                            if ok:
+                                self.add_toast(f"✓ Saved to {_label}.", (80, 200, 120))
+                            else:
+                                self.add_toast(f"✗ {msg}", (220, 80, 80))
+                        if len(result) > 2:
+                            result[2].add_done_callback(_saved)
+                        else:
+                            _saved(True, None, "")
                         self.go(self._save_load_return_state)
                     elif isinstance(result, tuple) and result[0] == "loaded":
                         _, party, world_state = result[0], result[1], result[2]
@@ -1221,21 +1373,35 @@ class Game:
             # Save immediately to inn_autosave without opening the slot picker.
             # Opening the slot picker then setting running=False means the game
             # exits before the user can click a slot — the save never happens.
-            from core.save_load import save_game
+            # The write finishes on the save worker; run() flushes it on exit.
+            from core.save_load import save_game_async
             try:
-                ok, _path, msg = save_game(
+                save_game_async(
                     self.party,
                     world_state=self.world_state,
                     slot_name="inn_autosave",
                     dungeon_cache=self.dungeon_cache,
                     dungeon_state=self.dungeon_state,
                 )
-                if ok:
-                    self.add_toast("✓ Progress autosaved.", (80, 200, 120))
             except Exception:
                 pass
         self.running = False
 
+    def _autosave_inn(self):
+        """Resting at an inn: autosave in the background, toast when written."""
+        def _done(ok, _path, _msg):
+            toast_col = (80, 200, 120) if ok else (220, 80, 80)
+            toast_msg = "✓ Progress saved at inn." if ok else "✗ Autosave failed."
+            self.add_toast(toast_msg, toast_col)
+        save_game_async(
+            self.party,
+            world_state=self.world_state,
+            slot_name="inn_autosave",
+            dungeon_cache=self.dungeon_cache,
+            character_bank=self.character_bank,
+            on_complete=_done,
+        )
+
     # ──────────────────────────────────────────────────────────
     #  MENU OVERLAY  (Save / Save & Exit / Exit — over any state)
     # ──────────────────────────────────────────────────────────
@@ -1384,6 +1550,30 @@ class Game:
             draw_text(surface, msg, bx + 12, y + 6, col, 13)
             y += 32
 
+    def _draw_mem_overlay(self, surface, dt):
+        """Debug overlay: resident memory and every registered cache
+        (core.mem_stats), largest first. Re-measured once a second."""
+        self._mem_refresh_ms -= dt
+        if self._mem_rows is None or self._mem_refresh_ms <= 0:
+            self._mem_refresh_ms = MEM_OVERLAY_REFRESH_MS
+            self._mem_rows = (mem_stats.rss_kb(), mem_stats.report())
+        rss, rows = self._mem_rows
+        w, line_h = 340, 15
+        x, y = SCREEN_W - w - 8, 8
+        bg = pygame.Surface((w, 30 + line_h * len(rows)), pygame.SRCALPHA)
+        bg.fill((8, 6, 18, 210))
+        surface.blit(bg, (x, y))
+        head = f"RSS {rss / 1024:.1f} MB" if rss is not None else "RSS ?"
+        if mem_stats.tracing():
+            head += "   tracemalloc on"
+        draw_text(surface, head, x + 8, y + 6, GOLD, 13, bold=True)
+        y += 26
+        for r in rows:
+            draw_text(surface, r["name"], x + 8, y, CREAM, 11)
+            draw_text(surface, str(r["entries"]), x + 200, y, GREY, 11)
+            draw_text(surface, mem_stats.format_bytes(r["bytes"]), x + 256, y, GREY, 11)
+            y += line_h
+
     def _tick_toasts(self, dt):
         """Advance toast timers each frame."""
         self._toasts = [t for t in self._toasts if t[2] > 0]
@@ -1720,25 +1910,14 @@ class Game:
     }
 
     def _scale_recruit_to_level(self, character, target_level: int):
-        """Level a freshly quick_rolled (level 1) character up to target_level.
-        Free stat points are auto-assigned to the class primary stat.
-        Resources are recalculated after all levels are applied."""
-        from core.progression import apply_level_up, MAX_LEVEL, xp_for_level
-        from core.classes import CLASSES, get_all_resources
+        """Raise a freshly quick_rolled (level 1) character to target_level.
+        Free stat points go to the class primary stat; stats, XP and
+        resources are set in one step (progression.scale_to_level)."""
+        from core.progression import scale_to_level
+        from core.classes import CLASSES
 
-        target_level = max(1, min(target_level, MAX_LEVEL))
         primary = CLASSES[character.class_name].get("primary", "STR")
-
-        # Grant enough XP so can_level_up always passes, then clear it after
-        character.xp = xp_for_level(target_level) + 1
-        for _ in range(target_level - 1):
-            apply_level_up(character, free_stat=primary)
-        character.xp = xp_for_level(character.level)   # XP at exact level threshold
-
-        # Recalculate resources at the new level/stats
-        character.resources = get_all_resources(
-            character.class_name, character.stats, character.level
-        )
+        scale_to_level(character, target_level, free_stat=primary)
 
     def _recruit_target_level(self) -> int:
         """Return the target level for new recruits: party average, ±1 at random.
@@ -1903,6 +2082,7 @@ class Game:
             if btn.collidepoint(mx, my):
                 for i in sorted(self.inn_selected):
                     self.party.append(self.inn_recruits[i])
+                events.emit(events.PARTY_CHANGED)
                 self.char_index = PARTY_SIZE  # set directly — don't increment per-recruit
                 self.party_scroll = 0
                 # Always call _start_opening so flags are cleared.
@@ -2579,6 +2759,7 @@ class Game:
         if r_begin.collidepoint(mx, my) and len(self._assemble_sel) >= self.PARTY_MIN:
             # Build party from selection, set up game
             self.party = [self.character_bank[i] for i in self._assemble_sel]
+            events.emit(events.PARTY_CHANGED)
             self.char_index = len(self.party)
             self._gen_inn_recruits()
             self._gen_tavern_recruits()
@@ -3065,7 +3246,7 @@ class Game:
             draw_wrapped_text(self.screen, outcome_text,
                               80, 390, SCREEN_W - 160, WHITE, get_font(15))
 
-        if self.timer > 1500:
+        if self.timer > RANDOM_REVEAL_MS:
             draw_text(self.screen, "Click to continue...",
                       SCREEN_W//2 - 100, SCREEN_H - 60, DIM_GOLD, 14)
 
@@ -3456,6 +3637,7 @@ class Game:
         # ALWAYS clear flags — this is the guaranteed clean-slate point
         # for every new game, regardless of whether it's the first run.
         _flags.clear()
+        events.emit(events.FLAGS_RESET)
         self.dungeon_cache = {}  # clear explored dungeon data
         self.world_state  = None  # fresh world state
         already_seen = has("intro_seen")  # always False now since we just cleared
@@ -4064,8 +4246,7 @@ class Game:
             set_flag("total_kills", cur + kills)
         # Check achievements after combat
         try:
-            from achievement_tracker import check_achievements
-            newly = check_achievements(self.party)
+            newly = achievement_tracker.check_achievements(self.party)
             self._queue_achievements(newly)
         except Exception:
             pass
@@ -4738,6 +4919,36 @@ class Game:
             self._current_biome_sound = biome_sound
             sfx.stop_ambient()
             sfx.play_ambient(biome_sound)
+        self._prefetch_region_audio()
+
+    def _prefetch_region_audio(self):
+        """Queue background builds for the music of towns/dungeons the party
+        is approaching and the ambience of nearby biomes, so entering them
+        does not wait on synthesis."""
+        ws = self.world_state
+        px, py = ws.party_x, ws.party_y
+        pos = (px, py)
+        if getattr(self, "_audio_prefetch_pos", None) == pos:
+            return
+        self._audio_prefetch_pos = pos
+        near = []
+        for loc_id, loc in LOCATIONS.items():
+            if loc.get("type") not in (LOC_TOWN, LOC_DUNGEON):
+                continue
+            d = max(abs(loc["x"] - px), abs(loc["y"] - py))
+            if d <= AUDIO_PREFETCH_TILES:
+                near.append((d, f"{loc['type']}_{loc_id}"))
+        for _d, track in sorted(near):
+            sfx.prefetch(track)
+        r = BIOME_PREFETCH_TILES
+        seen = {self._current_biome_sound}
+        for y in range(max(0, py - r), min(len(ws.tiles), py + r + 1)):
+            row = ws.tiles[y]
+            for x in range(max(0, px - r), min(len(row), px + r + 1)):
+                biome = self._TERRAIN_TO_BIOME.get(row[x].get("terrain", "grass"), "ambient_grassland")
+                if biome not in seen:
+                    seen.add(biome)
+                    sfx.prefetch(biome)
 
     def _check_proximity_discoveries(self):
         """Reveal locations within discovery_radius of the party's current position."""
@@ -4768,6 +4979,74 @@ class Game:
                     icon = "🏰" if loc_type == "dungeon" else "🏘" if loc_type == "town" else "✦"
                     self.add_toast(f"{icon} Discovered: {loc_name}", (180, 220, 255))
 
+    # ─────────────────────────────────────────────────────────
+    #  AUTO-TRAVEL
+    # ─────────────────────────────────────────────────────────
+
+    def _start_auto_travel(self, dest_id):
+        """Begin walking to a discovered location (T on the world map)."""
+        from data.world_travel import AutoTravel
+        self.auto_travel = AutoTravel(self.world_state, dest_id)
+        self._auto_travel_ms = AUTO_TRAVEL_STEP_MS   # first step as soon as the route is ready
+        name = LOCATIONS[dest_id]["name"]
+        self.world_map_ui.travel_status = f"Travelling to {name}  ·  any key stops"
+
+    def _update_auto_travel(self, dt):
+        """Advance the current trip: plan in small time slices, then take one
+        step every AUTO_TRAVEL_STEP_MS. Each step goes through the same event
+        handling as a key press; encounters, discoveries and blocked tiles
+        end the trip."""
+        trip = self.auto_travel
+        ui = self.world_map_ui
+        if self.state != S_WORLD_MAP or ui is None:
+            self._end_auto_travel("cancelled")
+            return
+        if (self.show_menu_overlay or self.quest_log_ui or ui.port_modal
+                or ui.island_choice_modal or ui.show_camp_confirm or ui.travel_modal):
+            return
+        if trip.status == "planning" and not trip.update():
+            if trip.status == "no_route":
+                self._end_auto_travel("no_route")
+            return
+        self._auto_travel_ms += dt
+        if self._auto_travel_ms < AUTO_TRAVEL_STEP_MS:
+            return
+        self._auto_travel_ms = 0
+        ws = self.world_state
+        known = len(ws.discovered_locations)
+        event = trip.step()
+        if event is None or event["type"] == "location":
+            self._process_world_event(None)
+            if trip.active and len(ws.discovered_locations) > known:
+                trip.stop("discovery")      # spotted by _check_proximity_discoveries
+        else:
+            if event["type"] == "discovery":
+                ui._show_event(f"Discovered: {event['data']['name']}!", (180, 120, 255))
+            self._process_world_event(event)
+        if not trip.active:
+            self._end_auto_travel(trip.status)
+
+    def _end_auto_travel(self, reason):
+        """Finish or cancel the current trip and report how it ended."""
+        trip = self.auto_travel
+        self.auto_travel = None
+        if trip is None:
+            return
+        trip.stop(reason)
+        ui = self.world_map_ui
+        if ui is None:
+            return
+        ui.travel_status = ""
+        name = LOCATIONS[trip.goal_id]["name"]
+        if trip.status == "arrived":
+            ui._show_event(f"Arrived at {name}.", GREEN)
+        elif trip.status == "no_route":
+            mode = self.world_state.travel.travel_mode
+            how = "on foot" if mode == "walk" else f"by {mode}"
+            ui._show_event(f"No known way to reach {name} {how}.", ORANGE)
+        elif trip.reason in ("cancelled", "blocked", "off_route"):
+            ui._show_event("Travel stopped.", GREY)
+
     def _process_world_event(self, event):
         """Handle events from the world map."""
         if event is None:
@@ -4905,8 +5184,7 @@ class Game:
                         self.pre_dungeon_state = S_WORLD_MAP
                         self.go_fade(S_DUNGEON)
                         # Track floor 1 for job board
-                        from data.job_board import on_dungeon_floor_reached
-                        on_dungeon_floor_reached(dungeon_id, 1)
+                        events.emit(events.FLOOR_REACHED, dungeon_id=dungeon_id, floor=1)
                         # Set explored flag (quest objectives check these)
                         from core.story_flags import set_flag as _sf_fl
                         _sf_fl(f"explored.{dungeon_id}.floor1", True)
@@ -4964,8 +5242,12 @@ class Game:
                 self.world_map_ui._show_event(
                     f"{loc['name']}: Horses available here.", (180, 140, 80))
 
-        elif event["type"] == "port_travel":
-            # Player chose a port destination — teleport there
+        elif event["type"] == "auto_travel":
+            self._start_auto_travel(event["dest_id"])
+
+        elif event["type"] in ("port_travel", "rail_travel"):
+            # Player chose a port destination (or auto-travel sailed/rode
+            # there) — teleport there
             dest_id = event.get("dest_id", "")
             dest    = event.get("dest", {})
             if dest:
@@ -5010,6 +5292,15 @@ class Game:
         elif event["type"] == "menu":
             self.show_menu_overlay = True
 
+    def _update_auto_walk(self):
+        """Dungeon auto-explore / travel (X, G, K): DungeonUI paces the steps
+        to its move animation; every step's event is handled exactly as if
+        the player had pressed the key. Paused while the menu or journal is
+        open."""
+        if self.show_menu_overlay or self.quest_log_ui:
+            return
+        self._process_dungeon_event(self.dungeon_ui.update_auto_walk())
+
     def _process_dungeon_event(self, event):
         """Handle events from the dungeon."""
         # Show any step messages (poison ticks, curse effects, etc.)
@@ -5338,8 +5629,8 @@ class Game:
                         self.dungeon_ui.show_event(
                             "Level up available! Visit the guild to train.", GOLD)
                 # Track exploration for job board
-                from data.job_board import on_dungeon_floor_reached
-                on_dungeon_floor_reached(self.dungeon_state.dungeon_id, floor)
+                events.emit(events.FLOOR_REACHED,
+                            dungeon_id=self.dungeon_state.dungeon_id, floor=floor)
                 # Quest hooks: guild trial, act3 finale
                 if floor >= 3:
                     _sf("guild_trial.complete", True)
@@ -5900,10 +6191,9 @@ class Game:
                     self._grant_boss_rewards(self.dungeon_state.dungeon_id)
 
                 # ── Track kills for job board bounties ──
-                from data.job_board import on_enemy_killed
                 for e in self.combat_state.enemies:
                     if not e.get("alive", True):
-                        on_enemy_killed(e["name"])
+                        events.emit(events.ENEMY_KILLED, name=e["name"])
                         # Track wolf pelts for side quest
                         if "Wolf" in e.get("name", "") or "wolf" in e.get("name", ""):
                             from core.story_flags import increment
@@ -6235,6 +6525,9 @@ def make_debug_party():
 
 if __name__ == "__main__":
     debug = "--debug" in sys.argv or "-d" in sys.argv
+    if "--memtrace" in sys.argv:
+        # Periodic tracemalloc diffs (see core/mem_stats.py)
+        print(f"tracemalloc snapshots → {mem_stats.start_trace()}")
     game = Game()
 
     if debug:
@@ -0,0 +1,16 @@
+#!/usr/bin/env python3
+"""
+Realm of Shadows — Save Inspector & Migrator
+
+Run from ~/Documents/RealmOfShadows/:
+    python3 migrate_saves.py [saves/] [--repair] [--write]
+
+Checks every save in the folder and reports pending migrations, stale
+story flags and load problems as JSON. See core/save_migrations.py.
+"""
+import sys
+
+from core.save_migrations import main
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -132,6 +132,9 @@ class CampUI:
         # Formation state
         self.formation_selected = -1   # index of char being dragged/moved
 
+    def is_animating(self):
+        return self.msg_timer > 0
+
     def draw(self, surface, mx, my, dt=16):
         surface.fill(CAMP_BG)
 
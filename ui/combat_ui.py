@@ -26,7 +26,7 @@ from ui.renderer import (
     draw_text, get_font,
 )
 from ui.pixel_art import draw_character_silhouette, draw_enemy_silhouette, CLASS_COLORS
-from core.combat_config import FRONT, MID, BACK
+from core.combat_config import FRONT, MID, BACK, TURN_PREVIEW_LEN
 from core.party_knowledge import get_enemy_display_name
 
 # ── Canonical status names and abbreviations ─────────────────────────────────
@@ -118,6 +118,8 @@ PLAYER_ACTIVE_BG = (30, 22, 50)
 #  LAYOUT
 # ═══════════════════════════════════════════════════════════════
 TURN_H       = 44
+PREVIEW_GAP  = 14     # space for the divider before next-round slots
+PREVIEW_MIN_SLOT_W = 64
 ACTION_H     = 100
 ACTION_Y     = SCREEN_H - ACTION_H
 
@@ -139,6 +141,7 @@ ROW_LABEL_W  = 52
 ROW_AREA_X   = RIGHT_X + ROW_LABEL_W
 ROW_AREA_W   = RIGHT_W - ROW_LABEL_W - 6
 ROW_H        = ENEMY_H // 3
+PLAYER_ROW_HDR_H = 16    # row section header in the left column
 
 # Action bar buttons
 _ACT_LABELS  = ["Attack", "Spell", "Skill", "Item", "Move", "Defend", "Flee"]
@@ -218,6 +221,163 @@ def _ability_flash_color(ability, result):
     if result.get("is_crit"):
         return _ELEMENT_FLASH_COLORS["crit"]
     return (220, 200, 255)
+
+
+def _log_line_style(msg):
+    """Return (display_text, color) for one combat log line."""
+    if msg.startswith("[PHASE]"):
+        return msg[7:].strip(), (255, 140, 40)
+    if "Round" in msg or "VICTORY" in msg or "DEFEAT" in msg:
+        return msg, GOLD
+    low = msg.lower()
+    if "heal" in low or "restore" in low:
+        return msg, HEAL_COLOR
+    if "CRITICAL" in msg or "FATAL" in msg or "falls" in msg:
+        return msg, (255, 80, 80)
+    return msg, CREAM
+
+
+# ═══════════════════════════════════════════════════════════════
+#  VIEW MODEL
+# ═══════════════════════════════════════════════════════════════
+
+def _status_key(c):
+    return tuple((e["name"], e.get("duration", 0)) if isinstance(e, dict) else (e, 0)
+                 for e in c.get("status_effects", ()))
+
+
+class _EnemyCard:
+    """One card in the enemy zone: the enemies of one template in one row."""
+    __slots__ = ("row", "key", "enemies", "alive", "rep", "rect",
+                 "stack_label", "statuses")
+
+
+class CombatView:
+    """Retained screen model of a CombatState.
+
+    CombatState bumps view_version whenever an action resolves. sync()
+    compares it and only then recomputes the layout key (who is alive, in
+    which row, with which statuses, and the turn order); row groups, card
+    rects and turn-bar slots are rebuilt only when that key changes. An
+    HP-only change keeps the layout — the widgets cached by CombatUI are
+    keyed on state_version and simply re-render.
+    """
+
+    def __init__(self, combat):
+        self.combat = combat
+        self.state_version  = None    # combat.view_version last synced
+        self.layout_version = 0       # bumped on every rebuild
+        self._layout_key    = None
+        self.player_rows    = []      # [(row, [player, ...])] BACK→MID→FRONT, non-empty
+        self.player_card_h  = 0
+        self.cards          = []      # [_EnemyCard] in draw order
+        self.enemy_rows     = {}      # row → [_EnemyCard]
+        self.turn_slots     = []      # [(combatant, is_player, rect)]
+        self.preview_slots  = []      # next round, projected: same shape
+
+    def sync(self):
+        """Bring the model up to date. True if the layout was rebuilt."""
+        version = getattr(self.combat, "view_version", None)
+        if version is None:
+            # No change tracking on this combat object — treat every call
+            # as a new state (correct, just uncached)
+            version = (self.state_version or 0) + 1
+        elif version == self.state_version:
+            return False
+        self.state_version = version
+        combat = self.combat
+        key = (tuple((id(c), c.get("alive", True), c.get("row"), _status_key(c))
+                     for c in combat.players),
+               tuple((id(c), c.get("alive", True), c.get("row"), _status_key(c))
+                     for c in combat.enemies),
+               tuple(id(c) for c in combat.turn_order),
+               tuple(id(c) for c in self._preview()))
+        if key == self._layout_key:
+            return False
+        self._layout_key = key
+        self._build_players()
+        self._build_enemies()
+        self._build_turn_slots()
+        self.layout_version += 1
+        return True
+
+    def _build_players(self):
+        players = self.combat.players
+        by_row = {r: [] for r in (BACK, MID, FRONT)}
+        for p in players:
+            by_row.setdefault(p.get("row", FRONT), []).append(p)
+        self.player_rows = [(r, by_row[r]) for r in (BACK, MID, FRONT) if by_row[r]]
+        avail_h = LEFT_H - len(self.player_rows) * PLAYER_ROW_HDR_H
+        self.player_card_h = min(avail_h // max(1, len(players)), 130)
+
+    def _build_enemies(self):
+        by_row = {r: [] for r in (BACK, MID, FRONT)}
+        for e in self.combat.enemies:
+            by_row.setdefault(e["row"], []).append(e)
+        self.cards = []
+        self.enemy_rows = {}
+        for ri, row_key in enumerate((BACK, MID, FRONT)):
+            # Group enemies by template_key (stacking same-type)
+            groups = {}
+            for e in by_row[row_key]:
+                groups.setdefault(e.get("template_key") or e.get("name", "Unknown"), []).append(e)
+            row_cards = self.enemy_rows[row_key] = []
+            if not groups:
+                continue
+            n = len(groups)
+            GAP = 6
+            card_w = max(100, min(200, (ROW_AREA_W - (n - 1) * GAP) // n))
+            card_h = ROW_H - 14
+            total_w = n * card_w + (n - 1) * GAP
+            start_x = ROW_AREA_X + (ROW_AREA_W - total_w) // 2
+            ry = RIGHT_Y + ri * ROW_H
+            for gi, (gkey, members) in enumerate(groups.items()):
+                card = _EnemyCard()
+                card.row, card.key, card.enemies = row_key, gkey, members
+                card.alive = [e for e in members if e.get("alive", True)]
+                card.rep = card.alive[0] if card.alive else members[0]
+                card.rect = pygame.Rect(start_x + gi * (card_w + GAP), ry + 7, card_w, card_h)
+                # Stack = multiple ALIVE enemies of same type; dead ones don't count
+                n_alive = len(card.alive)
+                card.stack_label = None
+                if n_alive > 1:
+                    card.stack_label = (f"×{len(members)}" if n_alive == len(members)
+                                        else f"×{n_alive}/{len(members)}")
+                # Status badges aggregated across every alive enemy in the group
+                agg = {}
+                for e in card.alive:
+                    for name, dur in _status_key(e):
+                        if name not in agg or dur > agg[name]:
+                            agg[name] = dur
+                card.statuses = [{"name": k, "duration": d} for k, d in agg.items()]
+                row_cards.append(card)
+                self.cards.append(card)
+
+    def _preview(self):
+        """Who acts after this round, as far as the bar has room for."""
+        combat = self.combat
+        order = combat.turn_order
+        room = (SCREEN_W - PREVIEW_GAP) // PREVIEW_MIN_SLOT_W - len(order)
+        if room <= 0 or not hasattr(combat, "turn_preview"):
+            return []
+        return combat.turn_preview(min(room, TURN_PREVIEW_LEN), after=len(order) - 1)
+
+    def _build_turn_slots(self):
+        order = self.combat.turn_order
+        preview = self._preview()
+        gap = PREVIEW_GAP if preview else 0
+        slot_w = min(120, (SCREEN_W - gap) // max(1, len(order) + len(preview)))
+        self.turn_slots = [
+            (c, c.get("type") == "player", pygame.Rect(6 + i * slot_w, 4, slot_w - 4, TURN_H - 8))
+            for i, c in enumerate(order)
+        ]
+        x0 = 6 + len(order) * slot_w + gap
+        self.preview_slots = [
+            (c, c.get("type") == "player", pygame.Rect(x0 + i * slot_w, 4, slot_w - 4, TURN_H - 8))
+            for i, c in enumerate(preview)
+        ]
+
+
 class CombatUI:
     def __init__(self, combat_state):
         self.combat = combat_state
@@ -246,6 +406,18 @@ class CombatUI:
 
         # Log
         self.log_scroll     = 0
+        self._log_surfs     = {}           # absolute line index → rendered Surface
+
+        # Retained view model + cached widgets (rebuilt on state change only)
+        self.view           = CombatView(combat_state)
+        self._widgets       = {}           # card key → ((state_version, flags), Surface)
+        self._turn_bar_surf = None
+        self._turn_bar_key  = None
+        self._card_rects    = []           # [(card_rect, group_key, enemies_in_group)]
+        self._row_label_rects = {
+            row: pygame.Rect(RIGHT_X, RIGHT_Y + ri * ROW_H, ROW_LABEL_W, ROW_H)
+            for ri, row in enumerate((BACK, MID, FRONT))
+        }
 
         # Flash / animations
         self.flash_messages = []           # [(msg, color, timer_ms)]
@@ -256,6 +428,11 @@ class CombatUI:
     #  MAIN DRAW
     # ─────────────────────────────────────────────────────────
     def draw(self, surface, mx, my):
+        if self.view.sync():
+            # Layout changed (death, row move, status, new round) — drop
+            # widgets of cards that no longer exist
+            self._widgets.clear()
+            self._card_rects = [(c.rect, c.key, c.enemies) for c in self.view.cards]
         surface.fill((8, 6, 16))
 
         self._draw_turn_bar(surface, mx, my)
@@ -282,29 +459,34 @@ class CombatUI:
     #  TURN ORDER BAR
     # ─────────────────────────────────────────────────────────
     def _draw_turn_bar(self, surface, mx, my):
-        pygame.draw.rect(surface, (14, 11, 26), (0, 0, SCREEN_W, TURN_H))
-        pygame.draw.line(surface, PANEL_BORDER, (0, TURN_H), (SCREEN_W, TURN_H))
+        # Nothing here depends on the mouse: the whole bar is one cached
+        # surface, redrawn only when the combat state or current turn moves.
+        key = (self.view.state_version, self.combat.current_turn_index)
+        if self._turn_bar_surf is None or self._turn_bar_key != key:
+            self._turn_bar_key = key
+            self._turn_bar_surf = self._render_turn_bar()
+        surface.blit(self._turn_bar_surf, (0, 0))
+
+    def _render_turn_bar(self):
+        surf = pygame.Surface((SCREEN_W, TURN_H + 1))
+        surf.fill((14, 11, 26))
+        pygame.draw.line(surf, PANEL_BORDER, (0, TURN_H), (SCREEN_W, TURN_H))
 
-        order = self.combat.turn_order
-        cur   = self.combat.get_current_combatant()
-        slot_w = min(120, SCREEN_W // max(1, len(order)))
-        x = 6
-        for c in order:
+        cur = self.combat.get_current_combatant()
+        for c, is_p, r in self.view.turn_slots:
             is_cur = (c is cur)
-            is_p   = c in self.combat.players
-            r = pygame.Rect(x, 4, slot_w - 4, TURN_H - 8)
             bg = PLAYER_ACTIVE_BG if (is_p and is_cur) else \
                  (ENEMY_HOVER_BG  if (not is_p and is_cur) else
                  (PLAYER_BG       if is_p else ENEMY_BG))
             border = GOLD if is_cur else PANEL_BORDER
-            _draw_panel(surface, r, bg, border)
+            _draw_panel(surf, r, bg, border)
             name = c.get("name", "?")[:10]
             hp, mhp = c.get("hp", 0), c.get("max_hp", 1)
             col = _hp_color(hp, mhp) if c.get("alive") else DEAD_COLOR
             fw = max(0, int((r.w - 2) * hp / max(1, mhp)))
-            pygame.draw.rect(surface, (30, 10, 10), (r.x + 1, r.y + r.h - 5, r.w - 2, 4))
-            if fw: pygame.draw.rect(surface, col, (r.x + 1, r.y + r.h - 5, fw, 4))
-            draw_text(surface, name, r.x + 4, r.y + 4, GOLD if is_cur else CREAM, 11, bold=is_cur)
+            pygame.draw.rect(surf, (30, 10, 10), (r.x + 1, r.y + r.h - 5, r.w - 2, 4))
+            if fw: pygame.draw.rect(surf, col, (r.x + 1, r.y + r.h - 5, fw, 4))
+            draw_text(surf, name, r.x + 4, r.y + 4, GOLD if is_cur else CREAM, 11, bold=is_cur)
             # Status indicators in turn bar — show up to 3 abbreviated badges
             _se = c.get("status_effects", [])
             if _se:
@@ -317,11 +499,33 @@ class CombatUI:
                     if _sx + _sw > r.right - 2:
                         break
                     _br = pygame.Rect(_sx, r.y + r.h - 16, _sw, 11)
-                    pygame.draw.rect(surface, (int(_sc[0]*.2), int(_sc[1]*.2), int(_sc[2]*.2)), _br, border_radius=2)
-                    pygame.draw.rect(surface, _sc, _br, 1, border_radius=2)
-                    draw_text(surface, _ab, _sx + 2, r.y + r.h - 15, _sc, 8, bold=True)
+                    pygame.draw.rect(surf, (int(_sc[0]*.2), int(_sc[1]*.2), int(_sc[2]*.2)), _br, border_radius=2)
+                    pygame.draw.rect(surf, _sc, _br, 1, border_radius=2)
+                    draw_text(surf, _ab, _sx + 2, r.y + r.h - 15, _sc, 8, bold=True)
                     _sx += _sw + 2
-            x += slot_w
+
+        # Next round (projected): dimmed, behind a divider
+        if self.view.preview_slots:
+            dx = self.view.preview_slots[0][2].x - PREVIEW_GAP // 2 - 2
+            pygame.draw.line(surf, PANEL_BORDER, (dx, 6), (dx, TURN_H - 6))
+        for c, is_p, r in self.view.preview_slots:
+            _draw_panel(surf, r, PLAYER_BG if is_p else ENEMY_BG, PANEL_BORDER)
+            draw_text(surf, c.get("name", "?")[:10], r.x + 4, r.y + 4, GREY, 11)
+            draw_text(surf, "next", r.x + 4, r.y + r.h - 15, DIM_GOLD, 8)
+        return surf
+
+    def _cached_widget(self, key, flags, size, bg, render):
+        """Blit-ready Surface for one card. Re-rendered only when the combat
+        state (view.state_version) or the card's own flags change."""
+        stamp = (self.view.state_version, flags)
+        hit = self._widgets.get(key)
+        if hit is not None and hit[0] == stamp:
+            return hit[1]
+        surf = pygame.Surface(size)
+        surf.fill(bg)
+        render(surf, pygame.Rect(0, 0, size[0], size[1]))
+        self._widgets[key] = (stamp, surf)
+        return surf
 
     # ─────────────────────────────────────────────────────────
     #  LEFT COLUMN — CHARACTER CARDS
@@ -332,159 +536,149 @@ class CombatUI:
 
         cur = self.combat.get_current_combatant()
         self.hover_player = None
+        is_target = (self.action_mode == "target_heal")  # all allies targetable, including fallen
 
-        # ── Group players by row, display BACK→MID→FRONT (mirrors enemy side) ──
-        row_order = [BACK, MID, FRONT]
-        players_by_row = {r: [] for r in row_order}
-        for p in self.combat.players:
-            players_by_row.setdefault(p.get("row", FRONT), []).append(p)
-
-        ROW_HDR_H = 16          # height of each row section header
-        n_players = max(1, len(self.combat.players))
-        non_empty_rows = [r for r in row_order if players_by_row[r]]
-        n_hdrs = len(non_empty_rows)
-        avail_h = LEFT_H - n_hdrs * ROW_HDR_H
-        card_h  = min(avail_h // n_players, 130)
-
+        # ── Players grouped by row, BACK→MID→FRONT (mirrors enemy side) ──
+        card_h = self.view.player_card_h
         cy = LEFT_Y
-        for row_key in row_order:
-            row_players = players_by_row[row_key]
-            if not row_players:
-                continue
-
+        for row_key, row_players in self.view.player_rows:
             # ── Row section header ──
             rc = ROW_COLORS[row_key]
-            hdr_r = pygame.Rect(LEFT_X, cy, LEFT_W, ROW_HDR_H)
+            hdr_r = pygame.Rect(LEFT_X, cy, LEFT_W, PLAYER_ROW_HDR_H)
             pygame.draw.rect(surface, (rc[0]//5, rc[1]//5, rc[2]//5), hdr_r)
             pygame.draw.line(surface, rc, (LEFT_X, cy), (LEFT_W, cy), 1)
             row_label = {BACK: "BACK ROW", MID: "MID ROW", FRONT: "FRONT ROW"}[row_key]
             draw_text(surface, row_label, LEFT_X + 6, cy + 2, rc, 9, bold=True)
-            cy += ROW_HDR_H
+            cy += PLAYER_ROW_HDR_H
 
             for p in row_players:
                 r = pygame.Rect(LEFT_X + 3, cy + 2, LEFT_W - 6, card_h - 4)
-                is_cur  = (p is cur)
-                is_dead = not p.get("alive", True)
-                is_target = (self.action_mode == "target_heal")  # all allies targetable, including fallen
-
-                bg     = PLAYER_ACTIVE_BG if is_cur else PLAYER_BG
-                border = GOLD if is_cur else ((200, 200, 80) if (is_target and r.collidepoint(mx, my))
-                                              else PANEL_BORDER)
-                if r.collidepoint(mx, my):
+                is_cur = (p is cur)
+                hov = r.collidepoint(mx, my)
+                if hov:
                     self.hover_player = p
-                    if not is_cur:
-                        bg = (22, 18, 40)
-
-                _draw_panel(surface, r, bg, border)
-
-                # Silhouette — maintain 48:80 (0.6) aspect ratio
-                sil_w = 44
-                sil_h = int(sil_w * 80 / 48)   # correct ratio: ~73px
-                # Centre vertically within the card
-                sil_top = r.y + max(3, (r.h - sil_h) // 2)
-                sil_r = pygame.Rect(r.x + 3, sil_top, sil_w, sil_h)
-                cls   = p.get("class_name", "Fighter")
-                equip = p.get("equipment", {})
-                armor_tier = None
-                if equip.get("armor"): armor_tier = equip["armor"].get("armor_tier")
-                draw_character_silhouette(surface, sil_r, cls,
-                                           equipped_weapon=equip.get("weapon"),
-                                           armor_tier=armor_tier,
-                                           highlight=is_cur and not is_dead)
-
-                # Info right of silhouette
-                ix = r.x + sil_w + 8
-                iy = r.y + 3
-                iw = r.w - sil_w - 12
-
-                name_col = DEAD_COLOR if is_dead else (GOLD if is_cur else CREAM)
-                draw_text(surface, p["name"][:14], ix, iy, name_col, 13, bold=is_cur)
-                draw_text(surface, f"Lv.{p.get('level', 1)} {cls[:10]}", ix, iy + 13, GREY, 11)
-
-                if is_dead:
-                    draw_text(surface, "FALLEN", ix, iy + 28, DEAD_COLOR, 12, bold=True)
-                    cy += card_h
-                    continue
-
-                # Resource bars — HP first, then all other resources in priority order
-                # Compact sizing to fit up to 4 bars in tight cards (6-person party)
-                bar_h_each = 5
-                bar_gap    = 10
-                bar_y      = iy + 26
-
-                hp  = p.get("hp", 0)
-                mhp = p.get("max_hp", 1)
-                _draw_resource_bar(surface, ix, bar_y, iw, bar_h_each, hp, mhp,
-                                    RES_COLORS["HP"])
-                draw_text(surface, f"HP {hp}/{mhp}", ix, bar_y + bar_h_each + 1,
-                          (190, 150, 145), 9)
-                bar_y += bar_gap + bar_h_each
-
-                res     = p.get("resources", {})
-                max_res = p.get("max_resources", {})
-                # Fallback: recalculate max if not in combatant (old save compat)
-                if not max_res:
-                    try:
-                        from core.classes import get_all_resources
-                        max_res = get_all_resources(cls, p.get("stats", {}), p.get("level", 1))
-                    except Exception:
-                        max_res = {}
-
-                # Priority order: spell points → skill points → Ki (matches user-facing order)
-                _RES_ORDER = ["INT-MP", "WIS-MP", "PIE-MP", "STR-SP", "DEX-SP", "Ki", "EP"]
-                shown_keys = [k for k in _RES_ORDER if k in res or k in max_res]
-                # Also catch any unexpected resource keys not in priority list
-                for k in res:
-                    if k != "HP" and k not in shown_keys:
-                        shown_keys.append(k)
-
-                for rk in shown_keys:
-                    cur_r = res.get(rk, 0)
-                    max_r = max(1, max_res.get(rk, cur_r) or cur_r)
-                    rc2   = RES_COLORS.get(rk, RES_COLORS.get(
-                        "SP" if "SP" in rk else "MP" if "MP" in rk else "Ki",
-                        RES_COLORS["MP"]))
-                    _draw_resource_bar(surface, ix, bar_y, iw, bar_h_each, cur_r, max_r, rc2)
-                    draw_text(surface, f"{rk} {cur_r}/{max_r}", ix, bar_y + bar_h_each + 1,
-                              rc2[2], 9)
-                    bar_y += bar_gap + bar_h_each
-                    if bar_y > r.bottom - 14:
-                        break
+                flags = (is_cur, hov, is_target and hov)
+                surf = self._cached_widget(
+                    ("p", id(p)), flags, r.size, (12, 10, 22),
+                    lambda s, lr, p=p, flags=flags: self._render_player_card(s, lr, p, *flags))
+                surface.blit(surf, r.topleft)
+                cy += card_h
 
-                # Status effect badges — bottom of card, never overlap resource bars
-                se = p.get("status_effects", [])
-                if se:
-                    badge_y = max(bar_y + 2, r.bottom - 20)
-                    if badge_y + 16 <= r.bottom:   # only draw if it fits
-                        _draw_status_badges(surface, se, ix, badge_y, iw, font_size=10)
-
-                # Momentum pips — shown for physical classes (those with momentum abilities)
-                # Draw as small filled/empty diamonds just above the card bottom
-                momentum = p.get("momentum", 0)
-                max_mom  = p.get("max_momentum", 6)
-                has_momentum_ability = any(
-                    a.get("resource") == "momentum"
-                    for a in p.get("abilities", [])
-                )
-                if has_momentum_ability:
-                    MOM_FILLED  = (220, 170, 50)   # gold
-                    MOM_EMPTY   = (60,  50,  30)   # dark
-                    MOM_OUTLINE = (100, 85,  40)
-                    pip_size = 6
-                    pip_gap  = 2
-                    total_w  = max_mom * (pip_size + pip_gap) - pip_gap
-                    pip_x    = ix + (iw - total_w) // 2
-                    pip_y    = r.bottom - pip_size - 3
-                    for idx in range(max_mom):
-                        filled = idx < momentum
-                        col = MOM_FILLED if filled else MOM_EMPTY
-                        pygame.draw.rect(surface, col,
-                                         (pip_x, pip_y, pip_size, pip_size))
-                        pygame.draw.rect(surface, MOM_OUTLINE,
-                                         (pip_x, pip_y, pip_size, pip_size), 1)
-                        pip_x += pip_size + pip_gap
+    def _render_player_card(self, surface, r, p, is_cur, hovered, target_hover):
+        """Draw one party card into r (card-local coordinates)."""
+        is_dead = not p.get("alive", True)
+        bg     = PLAYER_ACTIVE_BG if is_cur else PLAYER_BG
+        border = GOLD if is_cur else ((200, 200, 80) if target_hover else PANEL_BORDER)
+        if hovered and not is_cur:
+            bg = (22, 18, 40)
+
+        _draw_panel(surface, r, bg, border)
+
+        # Silhouette — maintain 48:80 (0.6) aspect ratio
+        sil_w = 44
+        sil_h = int(sil_w * 80 / 48)   # correct ratio: ~73px
+        # Centre vertically within the card
+        sil_top = r.y + max(3, (r.h - sil_h) // 2)
+        sil_r = pygame.Rect(r.x + 3, sil_top, sil_w, sil_h)
+        cls   = p.get("class_name", "Fighter")
+        equip = p.get("equipment", {})
+        armor_tier = None
+        if equip.get("armor"): armor_tier = equip["armor"].get("armor_tier")
+        draw_character_silhouette(surface, sil_r, cls,
+                                   equipped_weapon=equip.get("weapon"),
+                                   armor_tier=armor_tier,
+                                   highlight=is_cur and not is_dead)
+
+        # Info right of silhouette
+        ix = r.x + sil_w + 8
+        iy = r.y + 3
+        iw = r.w - sil_w - 12
+
+        name_col = DEAD_COLOR if is_dead else (GOLD if is_cur else CREAM)
+        draw_text(surface, p["name"][:14], ix, iy, name_col, 13, bold=is_cur)
+        draw_text(surface, f"Lv.{p.get('level', 1)} {cls[:10]}", ix, iy + 13, GREY, 11)
+
+        if is_dead:
+            draw_text(surface, "FALLEN", ix, iy + 28, DEAD_COLOR, 12, bold=True)
+            return
 
-                cy += card_h
+        # Resource bars — HP first, then all other resources in priority order
+        # Compact sizing to fit up to 4 bars in tight cards (6-person party)
+        bar_h_each = 5
+        bar_gap    = 10
+        bar_y      = iy + 26
+
+        hp  = p.get("hp", 0)
+        mhp = p.get("max_hp", 1)
+        _draw_resource_bar(surface, ix, bar_y, iw, bar_h_each, hp, mhp,
+                            RES_COLORS["HP"])
+        draw_text(surface, f"HP {hp}/{mhp}", ix, bar_y + bar_h_each + 1,
+                  (190, 150, 145), 9)
+        bar_y += bar_gap + bar_h_each
+
+        res     = p.get("resources", {})
+        max_res = p.get("max_resources", {})
+        # Fallback: recalculate max if not in combatant (old save compat)
+        if not max_res:
+            try:
+                from core.classes import get_all_resources
+                max_res = get_all_resources(cls, p.get("stats", {}), p.get("level", 1))
+            except Exception:
+                max_res = {}
+
+        # Priority order: spell points → skill points → Ki (matches user-facing order)
+        _RES_ORDER = ["INT-MP", "WIS-MP", "PIE-MP", "STR-SP", "DEX-SP", "Ki", "EP"]
+        shown_keys = [k for k in _RES_ORDER if k in res or k in max_res]
+        # Also catch any unexpected resource keys not in priority list
+        for k in res:
+            if k != "HP" and k not in shown_keys:
+                shown_keys.append(k)
+
+        for rk in shown_keys:
+            cur_r = res.get(rk, 0)
+            max_r = max(1, max_res.get(rk, cur_r) or cur_r)
+            rc2   = RES_COLORS.get(rk, RES_COLORS.get(
+                "SP" if "SP" in rk else "MP" if "MP" in rk else "Ki",
+                RES_COLORS["MP"]))
+            _draw_resource_bar(surface, ix, bar_y, iw, bar_h_each, cur_r, max_r, rc2)
+            draw_text(surface, f"{rk} {cur_r}/{max_r}", ix, bar_y + bar_h_each + 1,
+                      rc2[2], 9)
+            bar_y += bar_gap + bar_h_each
+            if bar_y > r.bottom - 14:
+                break
+
+        # Status effect badges — bottom of card, never overlap resource bars
+        se = p.get("status_effects", [])
+        if se:
+            badge_y = max(bar_y + 2, r.bottom - 20)
+            if badge_y + 16 <= r.bottom:   # only draw if it fits
+                _draw_status_badges(surface, se, ix, badge_y, iw, font_size=10)
+
+        # Momentum pips — shown for physical classes (those with momentum abilities)
+        # Draw as small filled/empty diamonds just above the card bottom
+        momentum = p.get("momentum", 0)
+        max_mom  = p.get("max_momentum", 6)
+        has_momentum_ability = any(
+            a.get("resource") == "momentum"
+            for a in p.get("abilities", [])
+        )
+        if has_momentum_ability:
+            MOM_FILLED  = (220, 170, 50)   # gold
+            MOM_EMPTY   = (60,  50,  30)   # dark
+            MOM_OUTLINE = (100, 85,  40)
+            pip_size = 6
+            pip_gap  = 2
+            total_w  = max_mom * (pip_size + pip_gap) - pip_gap
+            pip_x    = ix + (iw - total_w) // 2
+            pip_y    = r.bottom - pip_size - 3
+            for idx in range(max_mom):
+                filled = idx < momentum
+                col = MOM_FILLED if filled else MOM_EMPTY
+                pygame.draw.rect(surface, col,
+                                 (pip_x, pip_y, pip_size, pip_size))
+                pygame.draw.rect(surface, MOM_OUTLINE,
+                                 (pip_x, pip_y, pip_size, pip_size), 1)
+                pip_x += pip_size + pip_gap
 
     # ─────────────────────────────────────────────────────────
     #  ENEMY ZONE
@@ -497,28 +691,19 @@ class CombatUI:
         self.hover_enemy = None
         self.hover_stack_enemy = None
 
-        rows = [BACK, MID, FRONT]
-        enemies_by_row = {r: [] for r in rows}
-        for e in self.combat.enemies:
-            enemies_by_row.setdefault(e["row"], []).append(e)
-
-        # Track all card rects for this frame (used by click handler)
-        self._card_rects = []        # [(card_rect, group_key, enemies_in_group)]
-        self._stack_popover_draw = None  # set below if popover is open
+        # Highlight row labels when targeting a row-AoE ability
+        _row_tgt_spec = ""
+        if self.selected_ability and is_targeting:
+            _row_tgt_spec = self.selected_ability.get("target", "")
+        _row_clickable = is_targeting and _row_tgt_spec in ("row", "front_row", "back_row")
 
-        for ri, row_key in enumerate(rows):
+        for ri, row_key in enumerate((BACK, MID, FRONT)):
             ry = RIGHT_Y + ri * ROW_H
 
             # Row label — clickable when in row-targeting mode
             row_label = row_key[0].upper() + row_key[1:]
             rc = ROW_COLORS[row_key]
-            is_targeting = self.action_mode in ("target_attack", "target_ability", "target_bolt")
-            _row_label_r = pygame.Rect(RIGHT_X, ry, ROW_LABEL_W, ROW_H)
-            # Highlight row label when targeting a row-AoE ability
-            _row_tgt_spec = ""
-            if self.selected_ability and is_targeting:
-                _row_tgt_spec = self.selected_ability.get("target", "")
-            _row_clickable = is_targeting and _row_tgt_spec in ("row", "front_row", "back_row")
+            _row_label_r = self._row_label_rects[row_key]
             if _row_clickable and _row_label_r.collidepoint(mx, my):
                 # Bright highlight on hover
                 pygame.draw.rect(surface, (rc[0]//2, rc[1]//2, rc[2]//2), _row_label_r)
@@ -531,175 +716,163 @@ class CombatUI:
             if _row_clickable:
                 draw_text(surface, "▶", RIGHT_X + 4, ry + ROW_H//2 + 6, rc, 9)
             pygame.draw.line(surface, PANEL_BORDER, (RIGHT_X, ry), (SCREEN_W, ry))
-            # Store row label rect for click detection
-            if not hasattr(self, "_row_label_rects"):
-                self._row_label_rects = {}
-            self._row_label_rects[row_key] = _row_label_r
 
-            row_enemies = enemies_by_row.get(row_key, [])
-            if not row_enemies:
+            cards = self.view.enemy_rows.get(row_key)
+            if not cards:
                 draw_text(surface, "—", ROW_AREA_X + ROW_AREA_W // 2 - 4,
                           ry + ROW_H // 2 - 7, DARK_GREY, 12)
                 continue
 
-            # ── Group enemies by template_key (stacking same-type) ──
-            groups = {}   # template_key -> list of enemies
-            group_order = []
-            for e in row_enemies:
-                key = e.get("template_key") or e.get("name", "Unknown")
-                if key not in groups:
-                    groups[key] = []
-                    group_order.append(key)
-                groups[key].append(e)
-
-            num_groups = len(group_order)
-            GAP = 6
-
-            # Dynamic card width — fit all groups in available space
-            MAX_CARD_W = 200
-            card_w = min(MAX_CARD_W, (ROW_AREA_W - (num_groups - 1) * GAP) // num_groups)
-            card_w = max(100, card_w)   # never go below readable minimum
-            card_h = ROW_H - 14
-
-            total_w = num_groups * card_w + (num_groups - 1) * GAP
-            start_x = ROW_AREA_X + (ROW_AREA_W - total_w) // 2
-
-            for gi, group_key in enumerate(group_order):
-                group_enemies = groups[group_key]
-                alive_enemies = [e for e in group_enemies if e.get("alive", True)]
-                # Stack = multiple ALIVE enemies of same type; dead ones don't count
-                is_stack = len(alive_enemies) > 1
-
-                cx = start_x + gi * (card_w + GAP)
-                cy = ry + 7
-                card_r = pygame.Rect(cx, cy, card_w, card_h)
-                self._card_rects.append((card_r, group_key, group_enemies))
-
-                # Hover detection — entire card
+            for card in cards:
+                card_r = card.rect
                 is_hover = card_r.collidepoint(mx, my)
-                if is_hover and alive_enemies and not is_stack:
+                if is_hover and len(card.alive) == 1:
                     # Single enemy — hover sets target directly
-                    self.hover_enemy = alive_enemies[0]
-                elif is_hover and alive_enemies and is_stack:
-                    # Stack — hover highlights card but doesn't set single target
-                    pass
-
-                # Pick representative enemy for display (topmost alive, or first dead)
-                rep = alive_enemies[0] if alive_enemies else group_enemies[0]
-                alive = bool(alive_enemies)
-
-                # Card colours
-                stack_open = (self.stack_popover_key == group_key)
-                if not alive:
-                    bg, border = (12, 8, 12), DEAD_COLOR
-                elif stack_open:
-                    bg, border = (50, 30, 50), (200, 140, 220)
-                elif is_hover and is_targeting and alive:
-                    bg, border = (60, 20, 20), (255, 100, 100)
-                elif is_hover and alive:
-                    bg, border = ENEMY_HOVER_BG, (180, 100, 80)
-                else:
-                    bg, border = ENEMY_BG, (80, 50, 55)
-
-                _draw_panel(surface, card_r, bg, border, radius=5)
-
-                # Silhouette — reserve bottom 60px for name+HP+badges
-                # cap silhouette to at most 55% of card height
-                sil_h = min(card_h - 65, int(card_h * 0.55))
-                sil_h = max(20, sil_h)
-                sil_w = max(16, int(sil_h * 48 / 80))   # 48:80 = 0.6
-                sil_w = min(sil_w, card_w - 8)
-                sil_h = int(sil_w * 80 / 48)
-                sil_x = cx + (card_w - sil_w) // 2
-                sil_r = pygame.Rect(sil_x, cy + 4, sil_w, sil_h)
-                tier = rep.get("knowledge_tier", -1)
-                tkey = rep.get("template_key") or rep.get("name", "")
-                draw_enemy_silhouette(surface, sil_r, tkey,
-                                      knowledge_tier=tier,
-                                      hover=is_hover,
-                                      dead=not alive)
-
-                # Stack ×N badge (top-left corner)
-                if is_stack:
-                    alive_count = len(alive_enemies)
-                    badge_label = f"×{len(group_enemies)}" if alive_count == len(group_enemies) \
-                                  else f"×{alive_count}/{len(group_enemies)}"
-                    badge_col = (220, 160, 80) if alive_count > 0 else DEAD_COLOR
-                    pygame.draw.rect(surface, (30, 20, 10), (cx + 2, cy + 2, 28, 14), border_radius=3)
-                    pygame.draw.rect(surface, badge_col, (cx + 2, cy + 2, 28, 14), 1, border_radius=3)
-                    draw_text(surface, badge_label, cx + 4, cy + 3, badge_col, 9, bold=True)
-
-                # Name
-                name_y = cy + max(30, sil_h) + 5
-                display_name = get_enemy_display_name(rep)
-                font_s = get_font(10)
-                max_name_w = card_w - 8
-                while font_s.size(display_name)[0] > max_name_w and len(display_name) > 4:
-                    display_name = display_name[:-1]
-                if len(display_name) < font_s.size(display_name + "…")[0] and display_name:
-                    display_name = display_name[:-1] + "…"
-                name_col = DEAD_COLOR if not alive else (CREAM if not is_hover else GOLD)
-                draw_text(surface, display_name, cx + 4, name_y, name_col, 13)
-
-                # HP bar — for stacks show total HP of all alive enemies
-                bar_y = name_y + 14
-                if alive:
-                    if is_stack:
-                        total_hp  = sum(e.get("hp", 0) for e in alive_enemies)
-                        total_mhp = sum(e.get("max_hp", 1) for e in alive_enemies)
-                        _draw_resource_bar(surface, cx + 4, bar_y,
-                                           card_w - 8, 7, total_hp, total_mhp,
-                                           (HP_BG, _hp_color(total_hp, total_mhp), (190,150,145)))
-                        _hp_lbl = f"{total_hp} HP" if card_w < 80 else f"{total_hp} HP total"
-                        draw_text(surface, _hp_lbl,
-                                  cx + 4, bar_y + 9, _hp_color(total_hp, total_mhp), 9)
-                    else:
-                        hp, mhp = rep.get("hp", 0), rep.get("max_hp", 1)
-                        _draw_resource_bar(surface, cx + 4, bar_y,
-                                           card_w - 8, 7, hp, mhp,
-                                           (HP_BG, _hp_color(hp, mhp), (190,150,145)))
-                        _hp_lbl2 = f"{hp}/{mhp}" if card_w >= 70 else str(hp)
-                        draw_text(surface, _hp_lbl2,
-                                  cx + 4, bar_y + 9, _hp_color(hp, mhp), 9)
-                        # Row badge
-                        rc2 = ROW_COLORS[rep.get("row", FRONT)]
-                        draw_text(surface, f"[{row_key[0].upper()}]",
-                                  card_r.right - 22, cy + 3, rc2, 9)
-
-                    # Status badges — always visible, for ALL card types
-                    # Aggregate across every alive enemy in the group
-                    _all_se: dict = {}
-                    for _ae in alive_enemies:
-                        for _ef in _ae.get("status_effects", []):
-                            _n = _ef["name"] if isinstance(_ef, dict) else _ef
-                            _d = _ef.get("duration", 0) if isinstance(_ef, dict) else 0
-                            if _n not in _all_se or _d > _all_se[_n]:
-                                _all_se[_n] = _d
-                    _se_list = [{"name": n, "duration": d}
-                                for n, d in _all_se.items()]
-                    if _se_list:
-                        _badge_y = card_r.bottom - 20
-                        _draw_status_badges(surface, _se_list,
-                                            cx + 4, _badge_y,
-                                            card_w - 8, font_size=10)
-
-                    # Stack hint text (when in targeting mode)
-                    if is_stack and alive and is_targeting:
-                        hint = "▲ click to pick"
-                        draw_text(surface, hint, cx + 4, cy + card_h - 14,
-                                  (160, 120, 200), 9)
-                else:
-                    draw_text(surface, "DEAD", cx + 4, bar_y, DEAD_COLOR, 12)
+                    # (a stack only highlights; its popover picks the target)
+                    self.hover_enemy = card.alive[0]
+                flags = (is_hover, is_targeting, self.stack_popover_key == card.key)
+                surf = self._cached_widget(
+                    ("e", row_key, card.key), flags, card_r.size, (10, 8, 18),
+                    lambda s, lr, card=card, flags=flags: self._render_enemy_card(s, lr, card, *flags))
+                surface.blit(surf, card_r.topleft)
 
         # ── Draw stack popover on top of everything ──
         if self.stack_popover_key:
             self._draw_stack_popover(surface, mx, my)
 
+        if self.action_mode == "target_attack" and self.hover_enemy and self.hover_enemy["alive"]:
+            self._draw_attack_preview(surface, self.hover_enemy)
+
         # Bottom border
         pygame.draw.line(surface, PANEL_BORDER,
                          (RIGHT_X, RIGHT_Y + ENEMY_H),
                          (SCREEN_W, RIGHT_Y + ENEMY_H))
 
+    def _draw_attack_preview(self, surface, enemy):
+        """Hit / crit / damage odds of the current player's basic attack on
+        enemy, in a strip above its card. Numbers that depend on the enemy's
+        hidden stats stay '?' until it has been recognised (knowledge tier 1)."""
+        actor = self.combat.get_current_combatant()
+        card = next((c for c in self.view.cards if enemy in c.alive), None)
+        if not actor or actor.get("type") != "player" or card is None:
+            return
+        try:
+            from core.combat_odds import attack_odds
+            odds = attack_odds(actor, enemy, self.combat.enemies)
+        except Exception:
+            return
+        if enemy.get("knowledge_tier", -1) >= 1:
+            text = (f"Hit {odds.hit:.0%}  Crit {odds.crit:.0%}  "
+                    f"Dmg {odds.lo}–{odds.hi} (~{odds.mean_on_hit:.0f})")
+            ko = odds.kill_chance(enemy["hp"])
+            if ko >= 0.01:
+                text += f"  KO {ko:.0%}"
+        else:
+            text = f"Hit ?  Crit {odds.crit:.0%}  Dmg ?"
+        w = get_font(10).size(text)[0] + 10
+        r = pygame.Rect(0, 0, w, 16)
+        r.midbottom = (card.rect.centerx, card.rect.y - 1)
+        r.clamp_ip(pygame.Rect(RIGHT_X, RIGHT_Y, RIGHT_W, ENEMY_H))
+        _draw_panel(surface, r, (30, 12, 16), (255, 100, 100), radius=3)
+        draw_text(surface, text, r.x + 5, r.y + 2, CREAM, 10)
+
+    def _render_enemy_card(self, surface, card_r, card, is_hover, is_targeting, stack_open):
+        """Draw one enemy card (a single enemy or a stack) into card_r
+        (card-local coordinates)."""
+        alive_enemies = card.alive
+        alive = bool(alive_enemies)
+        is_stack = card.stack_label is not None
+        rep = card.rep
+        cx, cy = card_r.x, card_r.y
+        card_w, card_h = card_r.w, card_r.h
+
+        # Card colours
+        if not alive:
+            bg, border = (12, 8, 12), DEAD_COLOR
+        elif stack_open:
+            bg, border = (50, 30, 50), (200, 140, 220)
+        elif is_hover and is_targeting:
+            bg, border = (60, 20, 20), (255, 100, 100)
+        elif is_hover:
+            bg, border = ENEMY_HOVER_BG, (180, 100, 80)
+        else:
+            bg, border = ENEMY_BG, (80, 50, 55)
+
+        _draw_panel(surface, card_r, bg, border, radius=5)
+
+        # Silhouette — reserve bottom 60px for name+HP+badges
+        # cap silhouette to at most 55% of card height
+        sil_h = min(card_h - 65, int(card_h * 0.55))
+        sil_h = max(20, sil_h)
+        sil_w = max(16, int(sil_h * 48 / 80))   # 48:80 = 0.6
+        sil_w = min(sil_w, card_w - 8)
+        sil_h = int(sil_w * 80 / 48)
+        sil_x = cx + (card_w - sil_w) // 2
+        sil_r = pygame.Rect(sil_x, cy + 4, sil_w, sil_h)
+        tier = rep.get("knowledge_tier", -1)
+        tkey = rep.get("template_key") or rep.get("name", "")
+        draw_enemy_silhouette(surface, sil_r, tkey,
+                              knowledge_tier=tier,
+                              hover=is_hover,
+                              dead=not alive)
+
+        # Stack ×N badge (top-left corner)
+        if is_stack:
+            badge_col = (220, 160, 80)
+            pygame.draw.rect(surface, (30, 20, 10), (cx + 2, cy + 2, 28, 14), border_radius=3)
+            pygame.draw.rect(surface, badge_col, (cx + 2, cy + 2, 28, 14), 1, border_radius=3)
+            draw_text(surface, card.stack_label, cx + 4, cy + 3, badge_col, 9, bold=True)
+
+        # Name
+        name_y = cy + max(30, sil_h) + 5
+        display_name = get_enemy_display_name(rep)
+        font_s = get_font(10)
+        max_name_w = card_w - 8
+        while font_s.size(display_name)[0] > max_name_w and len(display_name) > 4:
+            display_name = display_name[:-1]
+        if len(display_name) < font_s.size(display_name + "…")[0] and display_name:
+            display_name = display_name[:-1] + "…"
+        name_col = DEAD_COLOR if not alive else (CREAM if not is_hover else GOLD)
+        draw_text(surface, display_name, cx + 4, name_y, name_col, 13)
+
+        # HP bar — for stacks show total HP of all alive enemies
+        bar_y = name_y + 14
+        if not alive:
+            draw_text(surface, "DEAD", cx + 4, bar_y, DEAD_COLOR, 12)
+            return
+        if is_stack:
+            total_hp  = sum(e.get("hp", 0) for e in alive_enemies)
+            total_mhp = sum(e.get("max_hp", 1) for e in alive_enemies)
+            _draw_resource_bar(surface, cx + 4, bar_y,
+                               card_w - 8, 7, total_hp, total_mhp,
+                               (HP_BG, _hp_color(total_hp, total_mhp), (190,150,145)))
+            _hp_lbl = f"{total_hp} HP" if card_w < 80 else f"{total_hp} HP total"
+            draw_text(surface, _hp_lbl,
+                      cx + 4, bar_y + 9, _hp_color(total_hp, total_mhp), 9)
+        else:
+            hp, mhp = rep.get("hp", 0), rep.get("max_hp", 1)
+            _draw_resource_bar(surface, cx + 4, bar_y,
+                               card_w - 8, 7, hp, mhp,
+                               (HP_BG, _hp_color(hp, mhp), (190,150,145)))
+            _hp_lbl2 = f"{hp}/{mhp}" if card_w >= 70 else str(hp)
+            draw_text(surface, _hp_lbl2,
+                      cx + 4, bar_y + 9, _hp_color(hp, mhp), 9)
+            # Row badge
+            rc2 = ROW_COLORS[rep.get("row", FRONT)]
+            draw_text(surface, f"[{card.row[0].upper()}]",
+                      card_r.right - 22, cy + 3, rc2, 9)
+
+        # Status badges — always visible, for ALL card types
+        if card.statuses:
+            _draw_status_badges(surface, card.statuses,
+                                cx + 4, card_r.bottom - 20,
+                                card_w - 8, font_size=10)
+
+        # Stack hint text (when in targeting mode)
+        if is_stack and is_targeting:
+            draw_text(surface, "▲ click to pick", cx + 4, cy + card_h - 14,
+                      (160, 120, 200), 9)
+
     def _draw_stack_popover(self, surface, mx, my):
         """Draw the mini popover listing all enemies in an open stack."""
         key = self.stack_popover_key
@@ -805,16 +978,23 @@ class CombatUI:
         end   = max(0, total - self.log_scroll)
         shown = log[start:end]
 
+        # Lines are classified and rendered only when they scroll into
+        # view; surfaces are keyed by absolute line index so the cache
+        # survives the ring buffer dropping old lines.
+        base = getattr(log, "first_index", 0) + start
+        cache = self._log_surfs
         for i, msg in enumerate(shown):
-            col = (255, 140, 40) if msg.startswith("[PHASE]") else \
-                  GOLD if ("Round" in msg or "VICTORY" in msg or "DEFEAT" in msg) else \
-                  HEAL_COLOR if ("heal" in msg.lower() or "restore" in msg.lower()) else \
-                  (255, 80, 80) if ("CRITICAL" in msg or "FATAL" in msg or "falls" in msg) else \
-                  CREAM
-            display = msg[7:].strip() if msg.startswith("[PHASE]") else msg
             y = LOG_Y + 16 + i * line_h
-            if y < LOG_Y + LOG_H - 4:
-                surface.blit(font.render(display[:90], True, col), (RIGHT_X + 6, y))
+            if y >= LOG_Y + LOG_H - 4:
+                break
+            surf = cache.get(base + i)
+            if surf is None:
+                display, col = _log_line_style(msg)
+                surf = cache[base + i] = font.render(display[:90], True, col)
+            surface.blit(surf, (RIGHT_X + 6, y))
+        if len(cache) > visible * 2:
+            for k in [k for k in cache if not base <= k < base + len(shown)]:
+                del cache[k]
 
         # Scroll indicator
         if self.log_scroll > 0:
@@ -10,6 +10,7 @@ from ui.renderer import (
     CREAM, GOLD, GREY, DARK_GREY, WHITE, PANEL_BG, PANEL_BORDER,
     HIGHLIGHT, DIM_GOLD, ORANGE, RED,
 )
+from ui.text_layout import text_layout, wrap_lines
 
 # Colors
 DIALOGUE_BG = (12, 10, 25)
@@ -48,6 +49,10 @@ class DialogueUI:
         # Text scroll
         self.text_scroll = 0
 
+    def is_animating(self):
+        """Typewriter still revealing text (or finish not yet picked up)."""
+        return not self.full_text_shown or self.state.finished
+
     def draw(self, surface, mx, my, dt=16):
         surface.set_clip(None)   # clear any clip rect from prior draw passes
         surface.fill(DIALOGUE_BG)
@@ -106,11 +111,14 @@ class DialogueUI:
 
         # ── Text with typing effect ──
         self.displayed_chars = min(self.displayed_chars + self.type_speed, len(text))
-        shown_text = text[:int(self.displayed_chars)]
+        shown_chars = int(self.displayed_chars)
         self.full_text_shown = self.displayed_chars >= len(text)
 
+        # Laid out once per node (and shared with the journal): the
+        # typewriter only advances how much of it is drawn
         max_w = SCREEN_W - text_x - DIALOGUE_MARGIN
-        lines = self._wrap_text(shown_text, max_w, 17)  # wrap at render size
+        layout = text_layout(text, max_w, 17)  # wrap at render size
+        n_lines = layout.visible_lines(shown_chars)
 
         # Determine how much space choices need
         choices = self.state.get_choices() if self.full_text_shown else []
@@ -126,22 +134,21 @@ class DialogueUI:
         # After typing finishes: lock scroll at top so full text is readable from start.
         if not self.full_text_shown:
             # Push scroll forward to keep the newest typed line in view
-            self.text_scroll = max(0, len(lines) - max_visible)
+            self.text_scroll = max(0, n_lines - max_visible)
         else:
             # Text fully shown — reset to top so player reads from the beginning
             if not getattr(self, "_scroll_unlocked", False):
                 self.text_scroll = 0
                 self._scroll_unlocked = True
         # Clamp to valid range
-        self.text_scroll = max(0, min(self.text_scroll, max(0, len(lines) - max_visible)))
+        self.text_scroll = max(0, min(self.text_scroll, max(0, n_lines - max_visible)))
 
-        visible_lines = lines[self.text_scroll:self.text_scroll + max_visible]
-        for i, line in enumerate(visible_lines):
-            col = TEXT_COL if speaker else NARRATOR_COL
-            draw_text(surface, line, text_x, text_y + i * line_h, col, 17)
+        col = TEXT_COL if speaker else NARRATOR_COL
+        layout.draw(surface, text_x, text_y, col, line_h,
+                    first=self.text_scroll, count=max_visible, chars=shown_chars)
 
         # Scroll indicator
-        if len(lines) > max_visible:
+        if n_lines > max_visible:
             draw_text(surface, "▼ more ▼", text_x, text_y + max_visible * line_h,
                       DARK_GREY, 10)
 
@@ -371,18 +378,4 @@ class DialogueUI:
 
     def _wrap_text(self, text, max_width, font_size):
         """Simple word-wrap for dialogue text."""
-        font = get_font(font_size)
-        words = text.split()
-        lines = []
-        current = ""
-        for word in words:
-            test = current + (" " if current else "") + word
-            if font.size(test)[0] <= max_width:
-                current = test
-            else:
-                if current:
-                    lines.append(current)
-                current = word
-        if current:
-            lines.append(current)
-        return lines if lines else [""]
+        return wrap_lines(text, max_width, font_size) or [""]
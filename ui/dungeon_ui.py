@@ -14,7 +14,8 @@ Public interface (unchanged from v2):
     on_floor_change()
 """
 
-import pygame, math, random
+import pygame, math, random, weakref
+from core import mem_stats
 from ui.renderer import SCREEN_W, SCREEN_H, CREAM, GOLD, get_font
 from ui.pixel_art import draw_dungeon_object
 from data.dungeon import (
@@ -1098,6 +1099,11 @@ class DungeonUI:
         # Arch sprite cache: key=(width,height) -> Surface.
         # Generated lazily and cached so each unique door size is only built once.
         self._arch_cache: dict = {}
+        # Only the live screen is reported; a weakref so the registry
+        # never keeps a left-behind DungeonUI (and its textures) alive
+        _me = weakref.ref(self)
+        mem_stats.register("dungeon_ui.arch",
+                           lambda: getattr(_me(), "_arch_cache", None))
         # Stairs down: cool blue-grey (going deeper into darkness)
         _sd_l = (max(0,self.wall_light[0]-20), max(0,self.wall_light[1]-10), min(255,self.wall_light[2]+40))
         _sd_d = (max(0,self.wall_dark[0]-15),  max(0,self.wall_dark[1]-8),   min(255,self.wall_dark[2]+25))
@@ -1164,6 +1170,10 @@ class DungeonUI:
         self._pending_event  = None   # event returned by dungeon.move()
         self.pulse = 0.0
 
+        # Auto-explore / travel (data.dungeon_explore.AutoWalk while walking)
+        self.auto_walk = None
+        self.marks: dict = {}         # floor_num → (x, y) marked on the minimap
+
         self._sync_grid_pos()
 
     # ─────────────────────────────────────────────────────────
@@ -1196,6 +1206,7 @@ class DungeonUI:
         # Snap to new floor entrance immediately — cancel any in-progress animation
         self.px = float(self.dungeon.party_x) + 0.5
         self.py = float(self.dungeon.party_y) + 0.5
+        self.auto_walk = None
         # Reset movement animation so the next frame doesn't resume interpolating
         # toward a target on the previous floor
         self._move_anim_t   = 1.0
@@ -1999,13 +2010,9 @@ class DungeonUI:
     def _draw_minimap(self, surface):
         fl    = self.dungeon.get_current_floor_data()
         tiles = fl["tiles"]
-        fw, fh = fl["width"], fl["height"]
         ts = MM_TS
-        cols = min(fw, MM_W // ts)
-        rows = min(fh, MM_H // ts)
         px_i, py_i = int(self.px), int(self.py)
-        x0 = max(0, min(px_i - cols//2, fw - cols))
-        y0 = max(0, min(py_i - rows//2, fh - rows))
+        x0, y0, cols, rows = self._minimap_window()
 
         bg = pygame.Surface((cols*ts, rows*ts), pygame.SRCALPHA)
         bg.fill((0,0,0,155))
@@ -2073,6 +2080,13 @@ class DungeonUI:
                 ecol = (255, 60, 60, 255) if enemy.get("state") == "chase" else (200, 80, 80, 220)
                 pygame.draw.circle(bg, ecol, (esx, esy), max(2, ts // 2 - 1))
 
+        # Travel mark (click the map to set, K to walk there)
+        mark = self.marks.get(self.dungeon.current_floor)
+        if mark and x0 <= mark[0] < x0 + cols and y0 <= mark[1] < y0 + rows:
+            mcx = (mark[0] - x0) * ts + ts // 2
+            mcy = (mark[1] - y0) * ts + ts // 2
+            pygame.draw.circle(bg, (255, 215, 40, 255), (mcx, mcy), max(3, ts // 2), 2)
+
         # ── Party figure — helm + body + directional facing indicator ──
         ppx = (px_i - x0) * ts + ts // 2
         ppy = (py_i - y0) * ts + ts // 2
@@ -2113,6 +2127,14 @@ class DungeonUI:
         font = get_font(14)
         lbl  = font.render(f"Floor {self.dungeon.current_floor}", True, (170,160,130))
         surface.blit(lbl, (MM_X+2, MM_Y+rows*ts+2))
+        hy = MM_Y + rows*ts + 20
+        if self.auto_walk:
+            what = {"explore": "Exploring", "stairs": "To the stairs",
+                    "mark": "To your mark"}[self.auto_walk.mode]
+            surface.blit(font.render(f"{what}…  any key stops", True, GOLD), (MM_X+2, hy))
+        else:
+            surface.blit(font.render("X Explore   G Stairs   K Mark", True, (130,120,100)),
+                         (MM_X+2, hy))
 
     # ─────────────────────────────────────────────────────────
     #  HUD
@@ -2836,28 +2858,14 @@ class DungeonUI:
         if key in (pygame.K_UP, pygame.K_w):
             # Move forward — route through dungeon.move() so fog/encounters work
             event = self.dungeon.move(fdx, fdy)
-            tx, ty = self.dungeon.party_x, self.dungeon.party_y
-            if tx != int(self.px) or ty != int(self.py):
-                self._move_start_x = self.px
-                self._move_start_y = self.py
-                self._move_target_x = tx + 0.5
-                self._move_target_y = ty + 0.5
-                self._move_anim_t = 0.0
-                moved = True
+            moved = self._animate_to_party()
             if event:
                 self._pending_event = event
 
         elif key in (pygame.K_DOWN, pygame.K_s):
             # Move backward — route through dungeon.move()
             event = self.dungeon.move(-fdx, -fdy)
-            tx, ty = self.dungeon.party_x, self.dungeon.party_y
-            if tx != int(self.px) or ty != int(self.py):
-                self._move_start_x = self.px
-                self._move_start_y = self.py
-                self._move_target_x = tx + 0.5
-                self._move_target_y = ty + 0.5
-                self._move_anim_t = 0.0
-                moved = True
+            moved = self._animate_to_party()
             if event:
                 self._pending_event = event
 
@@ -2884,7 +2892,130 @@ class DungeonUI:
             except Exception:
                 pass
 
+    def _animate_to_party(self):
+        """Start the slide animation toward the party's grid position after
+        dungeon.move(). Returns True if the party actually moved."""
+        tx, ty = self.dungeon.party_x, self.dungeon.party_y
+        if tx == int(self.px) and ty == int(self.py):
+            return False
+        self._move_start_x = self.px
+        self._move_start_y = self.py
+        self._move_target_x = tx + 0.5
+        self._move_target_y = ty + 0.5
+        self._move_anim_t = 0.0
+        return True
+
+    # ─────────────────────────────────────────────────────────
+    #  AUTO-EXPLORE / TRAVEL
+    # ─────────────────────────────────────────────────────────
+
+    def start_auto_walk(self, mode):
+        """X explores, G walks to the stairs down, K to the minimap mark."""
+        from data.dungeon_explore import AutoWalk, stairs_target
+        ds = self.dungeon
+        target = None
+        if mode == "stairs":
+            target = stairs_target(ds)
+            if target is None:
+                self.show_event("You haven't found the stairs down yet.", CREAM)
+                return
+        elif mode == "mark":
+            target = self.marks.get(ds.current_floor)
+            if target is None:
+                self.show_event("No mark on this floor — click the map to set one.", CREAM)
+                return
+        self.auto_walk = AutoWalk(ds, mode, target)
+
+    def update_auto_walk(self):
+        """Called every frame while a walk is running. Waits for the current
+        slide/turn to finish, turns to face the next step, then takes it —
+        the same animation and cooldown as a key press. Returns the dungeon
+        event of the step (or None) for main to process."""
+        walk = self.auto_walk
+        if walk is None:
+            return None
+        if self.show_camp_confirm or self.show_stairs_confirm or self.chest_modal \
+                or self.scroll_modal or self.interactable_modal or self.spire_choice_modal:
+            walk.stop("cancelled")
+        if (self._move_anim_t < 1.0 or self._turn_anim_t < 1.0
+                or self._step_cooldown > 0) and walk.active:
+            return None
+        d = walk.next_dir() if walk.active else None
+        if d is None:
+            self._end_auto_walk()
+            return None
+
+        # Face the way we're going first; the step follows next frame
+        want = math.atan2(d[1], d[0])
+        turn = (want - self.angle + math.pi) % (2 * math.pi) - math.pi
+        if abs(turn) > 0.01:
+            self._turn_start  = self.angle
+            self._turn_target = self.angle + turn
+            self._turn_anim_t = 0.0
+            return None
+
+        event = walk.step()
+        if self._animate_to_party():
+            self._step_cooldown = 0.13
+            try:
+                import core.sound as _sfx
+                _sfx.play("step")
+            except Exception:
+                pass
+        if not walk.active:
+            self._end_auto_walk()
+        return event
+
+    def _end_auto_walk(self):
+        walk = self.auto_walk
+        self.auto_walk = None
+        if walk is None:
+            return
+        if walk.status == "explored":
+            self.show_event("Nothing left to explore within reach.", CREAM)
+        elif walk.status == "no_route":
+            self.show_event("No known path there.", (220, 150, 80))
+        elif walk.status == "arrived" and walk.mode == "mark":
+            self.show_event("Reached your mark.", CREAM)
+        elif walk.reason == "trap_detected":
+            self.show_event("A trap! Stopping.", (255, 140, 0))
+        elif walk.reason in ("cancelled", "blocked"):
+            self.show_event("Stopped.", CREAM)
+
+    def _minimap_window(self):
+        """(x0, y0, cols, rows) of the floor area the minimap shows."""
+        fl = self.dungeon.get_current_floor_data()
+        fw, fh = fl["width"], fl["height"]
+        cols = min(fw, MM_W // MM_TS)
+        rows = min(fh, MM_H // MM_TS)
+        px_i, py_i = int(self.px), int(self.py)
+        x0 = max(0, min(px_i - cols//2, fw - cols))
+        y0 = max(0, min(py_i - rows//2, fh - rows))
+        return x0, y0, cols, rows
+
+    def _toggle_mark(self, mx, my):
+        """Click on the minimap: mark that tile (or clear the mark)."""
+        from data.dungeon_explore import is_walkable
+        x0, y0, cols, rows = self._minimap_window()
+        tx = x0 + (mx - MM_X) // MM_TS
+        ty = y0 + (my - MM_Y) // MM_TS
+        if not (x0 <= tx < x0 + cols and y0 <= ty < y0 + rows):
+            return
+        floor = self.dungeon.current_floor
+        if self.marks.get(floor) == (tx, ty):
+            del self.marks[floor]
+            return
+        tile = self.dungeon.get_tile(tx, ty)
+        if tile and is_walkable(tile):
+            self.marks[floor] = (tx, ty)
+            self.show_event("Mark set — press K to walk there.", CREAM)
+
     def handle_key(self, key):
+        if self.auto_walk:
+            # Any key stops a walk in progress (and does nothing else)
+            self.auto_walk.stop("cancelled")
+            self._end_auto_walk()
+            return None
         movement_keys = (
             pygame.K_UP, pygame.K_DOWN, pygame.K_LEFT, pygame.K_RIGHT,
             pygame.K_w, pygame.K_a, pygame.K_s, pygame.K_d,
@@ -2955,6 +3086,15 @@ class DungeonUI:
             return None
         if key == pygame.K_t:
             return self._try_disarm()
+        if key == pygame.K_x:
+            self.start_auto_walk("explore")
+            return None
+        if key == pygame.K_g:
+            self.start_auto_walk("stairs")
+            return None
+        if key == pygame.K_k:
+            self.start_auto_walk("mark")
+            return None
         if key == pygame.K_m:
             return {"type": "menu"}
         return None
@@ -2970,6 +3110,10 @@ class DungeonUI:
         if self.scroll_modal:
             self.scroll_modal = None
             return None
+        if self.auto_walk:
+            self.auto_walk.stop("cancelled")
+            self._end_auto_walk()
+            return None
 
         dw, dh = 400, 160
         dx = SCREEN_W//2 - dw//2
@@ -3018,6 +3162,8 @@ class DungeonUI:
             return {"type": "menu"}
         if pygame.Rect(_btn_x, _btn_y + 60, _btn_w, 24).collidepoint(mx,my):
             return self._try_disarm()
+        if pygame.Rect(MM_X, MM_Y, MM_W, MM_H).collidepoint(mx, my):
+            self._toggle_mark(mx, my)
         return None
 
     def _handle_chest_modal_click(self, mx, my):
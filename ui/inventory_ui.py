@@ -122,6 +122,9 @@ class InventoryUI:
     #  DRAWING
     # ─────────────────────────────────────────────────────────
 
+    def is_animating(self):
+        return self.message_timer > 0
+
     def draw(self, surface, mx, my, dt):
         self.message_timer = max(0, self.message_timer - dt)
         surface.fill(BG_COLOR)
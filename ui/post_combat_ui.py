@@ -146,6 +146,9 @@ class PostCombatUI:
     #  MAIN DRAW
     # ─────────────────────────────────────────────────────────
 
+    def is_animating(self):
+        return False   # every phase redraws only in response to input
+
     def draw(self, surface, mx, my, dt):
         self.timer += dt
         surface.fill(BG_COLOR)
@@ -11,6 +11,7 @@ from ui.renderer import (
     CREAM, GOLD, GREY, DARK_GREY, WHITE, PANEL_BG, PANEL_BORDER,
     HIGHLIGHT, DIM_GOLD, RED,
 )
+from ui.text_layout import text_layout, wrap_lines
 
 # ── Palette ──────────────────────────────────────────────────────────
 LOG_BG         = (10, 8, 20)
@@ -44,32 +45,7 @@ PAD_BOTTOM = 20
 
 def _wrap_text(text, max_width, font_size):
     """Break text into lines that fit within max_width pixels."""
-    font = None
-    try:
-        font = get_font(font_size)
-    except Exception:
-        font = None
-    if font is not None:
-        _f = font
-        measure = lambda t, f=_f: f.size(t)[0]
-    else:
-        # Fallback for headless/test environments: estimate by character count
-        chars_per_line = max(10, int(max_width / (font_size * 0.6)))
-        measure = lambda t: len(t) * int(font_size * 0.6)
-    words = text.split()
-    lines = []
-    current = ""
-    for word in words:
-        test = (current + " " + word).strip()
-        if measure(test) <= max_width:
-            current = test
-        else:
-            if current:
-                lines.append(current)
-            current = word
-    if current:
-        lines.append(current)
-    return lines
+    return wrap_lines(text, max_width, font_size)
 
 
 class QuestLogUI:
@@ -400,22 +376,7 @@ class QuestLogUI:
 
     def _wrap(self, surface, text, x, y, max_w, color, size):
         """Word-wrap text, return new y."""
-        font  = get_font(size)
-        words = text.split()
-        line  = ""
-        for w in words:
-            test = line + (" " if line else "") + w
-            if font.size(test)[0] <= max_w:
-                line = test
-            else:
-                if line:
-                    draw_text(surface, line, x, y, color, size)
-                    y += size + 4
-                line = w
-        if line:
-            draw_text(surface, line, x, y, color, size)
-            y += size + 4
-        return y
+        return text_layout(text, max_w, size).draw(surface, x, y, color, size + 4)
 
     # ─── Input ────────────────────────────────────────────────────────
 
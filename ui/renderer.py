@@ -4,6 +4,8 @@ Retro pixel-art RPG styling.
 """
 import pygame
 
+from core import mem_stats as _mem_stats
+
 # ── Colors ────────────────────────────────────────────────────
 BLACK       = (0, 0, 0)
 WHITE       = (255, 255, 255)
@@ -42,6 +44,7 @@ SCREEN_H = 900
 
 # ── Font Cache ────────────────────────────────────────────────
 _font_cache = {}
+_mem_stats.register("renderer.fonts", _font_cache)
 
 def get_font(size, bold=False):
     key = (size, bold)
@@ -28,7 +28,7 @@ from ui.renderer import (
     HIGHLIGHT, DIM_GOLD, ORANGE, RED, GREEN,
 )
 from core.save_load import (
-    save_game, load_game, list_saves, delete_save, SAVE_DIR,
+    save_game_async, load_game, list_saves, delete_save, SAVE_DIR,
 )
 
 # ── Canonical dungeon progression for "furthest location" ───────────────────
@@ -213,6 +213,9 @@ class SaveLoadUI:
                 self._on_slot_click(idx)
         return None
 
+    def is_animating(self):
+        return bool(self._error_msg) and self._error_timer > 0
+
     def draw(self, surface, mx, my):
         # Dim background
         overlay = pygame.Surface((SCREEN_W, SCREEN_H), pygame.SRCALPHA)
@@ -467,8 +470,11 @@ class SaveLoadUI:
             self._error_msg   = "Save failed: no active party."
             self._error_timer = 3000
             return
+        # Snapshot now, write in the background; the caller attaches its
+        # toast to the returned job. Snapshot errors come back immediately.
+        job = None
         try:
-            ok, _path, msg = save_game(
+            job = save_game_async(
                 self.party,
                 world_state=self.world_state,
                 slot_name=slot,
@@ -476,11 +482,13 @@ class SaveLoadUI:
                 dungeon_state=getattr(self, "dungeon_state", None),
                 character_bank=self.character_bank,
             )
+            ok  = not (job.done and not job.ok)
+            msg = job.message
         except Exception as _e:
             ok  = False
             msg = f"Save failed: {_e}"
         if ok:
-            self.result   = ("saved", slot)
+            self.result   = ("saved", slot, job)
             self.finished = True
         else:
             self._error_msg   = msg
@@ -158,6 +158,9 @@ class SettingsUI:
 
         return None
 
+    def is_animating(self):
+        return False
+
     def draw(self, surface, mx, my):
         # Dim the screen behind the panel
         overlay = pygame.Surface((SCREEN_W, SCREEN_H), pygame.SRCALPHA)
@@ -245,3 +248,12 @@ class SettingsUI:
         draw_text(surface, "ESC to close",
                   PANEL_X + PANEL_W // 2 - 42, PANEL_Y + PANEL_H - 14,
                   DARK_GREY, 11)
+
+        # Resident audio (SFX + cached music/ambience)
+        import core.sound as sfx
+        mem = sfx.audio_memory()
+        mb = 1024 * 1024
+        draw_text(surface,
+                  f"Audio memory {mem['total'] / mb:.1f} MB  "
+                  f"(music cache {mem['track_bytes'] / mb:.1f}/{mem['budget'] / mb:.0f} MB)",
+                  LABEL_X, PANEL_Y + PANEL_H - 80, DARK_GREY, 11)
@@ -12,6 +12,8 @@ Public API (same signatures as wiz_sprites.py):
 import os
 import pygame
 
+from core import mem_stats
+
 # ── Paths ────────────────────────────────────────────────────────────────────
 _HERE = os.path.dirname(os.path.abspath(__file__))
 _BASE = os.path.join(_HERE, '..', 'assets', 'sprites')
@@ -24,6 +26,10 @@ _char_cache:  dict = {}   # class_name → Surface | None
 _enemy_cache: dict = {}   # filename   → Surface | None
 _npc_cache:   dict = {}   # npc_name   → Surface | None
 _effect_cache: dict = {}  # (filename, dead, hover, tier) → Surface
+mem_stats.register("sprites.characters", _char_cache)
+mem_stats.register("sprites.enemies", _enemy_cache)
+mem_stats.register("sprites.npcs", _npc_cache)
+mem_stats.register("sprites.effects", _effect_cache)
 
 # ── Filename mappings ─────────────────────────────────────────────────────────
 # Maps class_name → PNG filename (without .png)
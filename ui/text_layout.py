@@ -0,0 +1,155 @@
+"""
+Realm of Shadows — Text Layout Cache
+
+Word-wrapped, pre-rendered blocks of long text: dialogue nodes, quest
+journal entries and lore pages. A layout is built once per (text, width,
+font size) and shared by every panel that shows that text:
+
+  lines      — the wrapped lines (same greedy word wrap the panels used)
+  ends       — for each line, the offset in the source text just past its
+               last character, so a typewriter position (characters of
+               the source typed so far) maps straight to a line
+  surfaces() — each line rendered once per colour
+
+The dialogue typewriter no longer re-wraps the typed prefix every frame:
+draw(..., chars=n) blits the finished lines and a clipped slice of the
+line being typed. Text is laid out in full from the first frame, so a
+word that will wrap starts on its final line instead of jumping there.
+"""
+import re
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+
+from core import mem_stats
+from ui.renderer import get_font
+
+_CACHE_MAX = 256            # layouts kept (LRU)
+
+_layouts = OrderedDict()    # (text, max_width, size, bold) → TextLayout
+_WORD = re.compile(r"\S+")
+mem_stats.register("text_layouts", _layouts)
+
+
+def _measure_fn(font, size):
+    if font is not None:
+        return lambda t: font.size(t)[0]
+    # Headless/test environments: estimate by character count
+    return lambda t: len(t) * int(size * 0.6)
+
+
+def wrap_words(text, max_width, measure):
+    """Greedy word wrap. Returns [(line, [(start, end) of each word])]."""
+    out = []
+    line, spans = "", []
+    for m in _WORD.finditer(text):
+        word = m.group()
+        test = line + " " + word if line else word
+        if not line or measure(test) <= max_width:
+            line = test
+            spans.append(m.span())
+        else:
+            out.append((line, spans))
+            line, spans = word, [m.span()]
+    if line:
+        out.append((line, spans))
+    return out
+
+
+class TextLayout:
+    __slots__ = ("text", "max_width", "size", "bold", "lines", "ends",
+                 "_font", "_measure", "_char_pos", "_surfaces")
+
+    def __init__(self, text, max_width, size, bold=False):
+        self.text = text
+        self.max_width = max_width
+        self.size = size
+        self.bold = bold
+        try:
+            self._font = get_font(size, bold)
+        except Exception:
+            self._font = None
+        self._measure = _measure_fn(self._font, size)
+        wrapped = wrap_words(text, max_width, self._measure)
+        self.lines = tuple(line for line, _ in wrapped)
+        self.ends = tuple(spans[-1][1] for _, spans in wrapped)
+        # Source offset of every rendered character, per line; the space
+        # between two words counts as the source character after the first
+        self._char_pos = []
+        for _, spans in wrapped:
+            pos = []
+            for i, (a, b) in enumerate(spans):
+                if i:
+                    pos.append(spans[i - 1][1])
+                pos.extend(range(a, b))
+            self._char_pos.append(pos)
+        self._surfaces = {}
+
+    def __len__(self):
+        return len(self.lines)
+
+    # ── typewriter ──────────────────────────────────────────────
+    def reveal(self, chars):
+        """(full lines shown, characters shown of the next line) once
+        `chars` characters of the source text have been typed."""
+        full = bisect_right(self.ends, chars)
+        if full >= len(self.lines):
+            return len(self.lines), 0
+        return full, bisect_left(self._char_pos[full], chars)
+
+    def visible_lines(self, chars=None):
+        """Lines with anything on them after `chars` typed (None: all)."""
+        if chars is None:
+            return len(self.lines)
+        full, partial = self.reveal(chars)
+        return full + (1 if partial else 0)
+
+    # ── rendering ───────────────────────────────────────────────
+    def surfaces(self, color):
+        """Every line rendered in color (cached per colour)."""
+        key = tuple(color)
+        surfs = self._surfaces.get(key)
+        if surfs is None:
+            surfs = self._surfaces[key] = tuple(
+                self._font.render(line, True, color) for line in self.lines)
+        return surfs
+
+    def draw(self, surface, x, y, color, line_h, first=0, count=None, chars=None):
+        """Blit lines[first:first+count] from y down, line_h apart. With
+        chars, only what the typewriter has revealed: finished lines whole,
+        the current one clipped to its typed width. Returns the y below
+        the last line slot drawn."""
+        last = len(self.lines) if count is None else min(len(self.lines), first + count)
+        full, partial = self.reveal(chars) if chars is not None else (len(self.lines), 0)
+        if self._font is None:
+            return y + max(0, last - first) * line_h
+        surfs = self.surfaces(color)
+        for i in range(first, last):
+            if i < full:
+                surface.blit(surfs[i], (x, y))
+            elif i == full and partial:
+                width = self._measure(self.lines[i][:partial])
+                surface.blit(surfs[i], (x, y), (0, 0, width, surfs[i].get_height()))
+            y += line_h
+        return y
+
+
+def text_layout(text, max_width, size, bold=False):
+    """The (cached) layout of text wrapped at max_width in a size-pt font."""
+    key = (text, max_width, size, bold)
+    lay = _layouts.get(key)
+    if lay is not None:
+        _layouts.move_to_end(key)
+        return lay
+    lay = _layouts[key] = TextLayout(text, max_width, size, bold)
+    if len(_layouts) > _CACHE_MAX:
+        _layouts.popitem(last=False)
+    return lay
+
+
+def wrap_lines(text, max_width, size, bold=False):
+    """Just the wrapped lines (a list), via the layout cache."""
+    return list(text_layout(text, max_width, size, bold).lines)
+
+
+def cache_clear():
+    _layouts.clear()
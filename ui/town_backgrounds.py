@@ -18,7 +18,10 @@ caller falls back to the plain dark background gracefully.
 import pygame
 import os
 
+from core import mem_stats
+
 _CACHE: dict = {}   # (town_id, image_type) → Surface | None
+mem_stats.register("town_backgrounds", _CACHE)
 
 _BASE   = os.path.join(os.path.dirname(__file__), '..', 'assets', 'backgrounds')
 _TOWNS  = os.path.join(_BASE, 'towns')
@@ -346,6 +346,14 @@ class TownUI:
 
         return pygame.Rect(0, 0, panel_w, SCREEN_H)
 
+    def is_animating(self):
+        """True while the town screen changes without input (frame scheduler)."""
+        if self.active_dialogue:
+            return self.active_dialogue.is_animating()
+        return (self.view == self.VIEW_WALK
+                or self.msg_timer > 0
+                or getattr(self, "_inn_save_timer", 0) > 0)
+
     def draw(self, surface, mx, my, dt):
         self.msg_timer = max(0, self.msg_timer - dt)
         if getattr(self, "_inn_save_timer", 0) > 0:
@@ -4169,11 +4177,13 @@ class TownUI:
             # Save button
             save_btn = pygame.Rect(SCREEN_W - 280, 20, 128, 34)
             if save_btn.collidepoint(mx, my):
-                from core.save_load import save_game
-                ok, path, msg = save_game(self.party)
-                self._inn_save_msg = msg
-                self._inn_save_ok  = ok
-                self._inn_save_timer = 3000
+                from core.save_load import save_game_async
+
+                def _saved(ok, _path, msg):
+                    self._inn_save_msg = msg
+                    self._inn_save_ok  = ok
+                    self._inn_save_timer = 3000
+                save_game_async(self.party, on_complete=_saved)
                 return None
 
             # Party management button
@@ -4592,8 +4602,12 @@ class TownUI:
                                 )
                                 new_char.gold = 0
                             self.party.append(new_char)
+                            from core import events
+                            events.emit(events.PARTY_CHANGED)
                             # Remove this recruit from the pool so they can't be hired twice
                             rec["_char"] = None
+                            from core.tavern_recruits import mark_hired
+                            mark_hired(self.town_id, rec["name"])
                             sfx.play("ui_confirm")
                             self._msg(f"{rec['name']} joins your party!", GOLD)
                         return None
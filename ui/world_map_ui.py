@@ -60,6 +60,8 @@ LOC_PORT_COL    = (80, 180, 220)
 
 HUD_BG          = (12, 10, 24, 200)
 
+TRAVEL_MODAL_ROWS = 12  # destinations listed in the auto-travel picker
+
 
 class WorldMapUI:
     """Renders the world map and handles movement input."""
@@ -72,6 +74,11 @@ class WorldMapUI:
         self.show_camp_confirm = False
         self.port_modal        = None   # {"loc_id", "loc", "routes", "hover_idx"}
         self.island_choice_modal = None # {"loc_id", "loc"}
+        self.travel_modal      = None   # {"dests": [loc_id, ...]} auto-travel picker
+        self.travel_status     = ""     # set by main.py while auto-travel runs
+        # Pre-rendered Fading overlay layers (see _draw_fading_overlay)
+        self._fading_cache   = {}       # (kind, count, W, H) → Surface
+        self._tendril_frame  = None     # ((bucket, count, W, H), Surface)
 
     def draw(self, surface, mx, my, dt):
         self.event_timer = max(0, self.event_timer - dt)
@@ -102,6 +109,10 @@ class WorldMapUI:
         if self.island_choice_modal:
             self._draw_island_choice_modal(surface, mx, my)
 
+        # ── Auto-travel destination picker ──
+        if self.travel_modal:
+            self._draw_travel_modal(surface, mx, my)
+
         # ── Fading world corruption overlay ──
         self._draw_fading_overlay(surface)
 
@@ -479,9 +490,13 @@ class WorldMapUI:
                 best_hint = (f"Something lies to the {compass} ({int(_dist)} tiles away)",
                              (180, 200, 255))
         # Controls hint — bottom-left, clear of the Camp/Menu button row
-        draw_text(surface, "Arrow keys / WASD  ·  C Camp  ·  M Menu",
+        draw_text(surface, "Arrow keys / WASD  ·  T Travel  ·  C Camp  ·  M Menu",
                   15, SCREEN_H - 20, DARK_GREY, 12)
 
+        if self.travel_status:
+            draw_text(surface, self.travel_status,
+                      SCREEN_W // 2 - 160, 52, GOLD, 14)
+
         if best_hint:
             draw_text(surface, best_hint[0], 15, SCREEN_H - 36, best_hint[1], 12)
 
@@ -535,18 +550,60 @@ class WorldMapUI:
         Intensity rises with hearthstones collected (0-5).
         At 0: very faint edge vignette.
         At 5: heavy purple-black tide consuming the map edges.
+
+        Layers are pre-rendered: the vignette and corner bloom once per
+        (hearthstone count, screen size), the tendrils once per half-second
+        seed bucket. A frame is then only a handful of blits.
         """
-        import math, random
+        import math
         from core.story_flags import hearthstone_count
 
-        count     = hearthstone_count()
-        # Base intensity: even with 0 stones there's a very light vignette
-        intensity = 0.12 + count * 0.17   # 0.12 → 0.97 over 0-5 stones
-
+        count = hearthstone_count()
         t = pygame.time.get_ticks() / 1000.0
         W, H = surface.get_size()
 
         # ── Edge vignette (always present, scaled by intensity) ──
+        surface.blit(self._fading_layer("vignette", count, W, H), (0, 0))
+
+        if count == 0:
+            return   # pure vignette is enough at story start
+
+        # ── Animated corruption tendrils along all four edges ──
+        # Seeded per bucket so they wiggle but stay stable between frames
+        bucket = int(t * 2)   # changes twice per second
+        key = (bucket, count, W, H)
+        if self._tendril_frame is None or self._tendril_frame[0] != key:
+            self._tendril_frame = (key, self._render_tendrils(bucket, count, W, H))
+        surface.blit(self._tendril_frame[1], (0, 0))
+
+        # ── Pulsing dark bloom in corners at high intensity ──
+        if count >= 3:
+            bloom_alpha = int(80 * (count - 2) / 3 * (0.8 + 0.2 * math.sin(t * 0.9)))
+            disk = self._fading_layer("bloom", count, W, H)
+            r = disk.get_width() // 2
+            if r <= 0:
+                return
+            disk.set_alpha(max(0, bloom_alpha))
+            for cx, cy in [(0, 0), (W, 0), (0, H), (W, H)]:
+                surface.blit(disk, (cx - r, cy - r))
+
+    def _fading_layer(self, kind, count, W, H):
+        """Cached static Fading layer ("vignette" or "bloom")."""
+        key = (kind, count, W, H)
+        layer = self._fading_cache.get(key)
+        if layer is None:
+            if len(self._fading_cache) >= 8:
+                self._fading_cache.clear()   # count or resolution changed
+            if kind == "vignette":
+                layer = self._render_vignette(count, W, H)
+            else:
+                layer = self._render_bloom(count, W, H)
+            self._fading_cache[key] = layer
+        return layer
+
+    @staticmethod
+    def _render_vignette(count, W, H):
+        intensity = 0.12 + count * 0.17   # 0.12 → 0.97 over 0-5 stones
         vig = pygame.Surface((W, H), pygame.SRCALPHA)
         depth = int(min(W, H) * intensity * 0.55)
         for i in range(depth):
@@ -555,14 +612,24 @@ class WorldMapUI:
             col   = (20 + int(15 * intensity), 0, int(40 * intensity), alpha)
             # draw 1px border rect inset by i
             pygame.draw.rect(vig, col, (i, i, W - i*2, H - i*2), 1)
-        surface.blit(vig, (0, 0))
-
-        if count == 0:
-            return   # pure vignette is enough at story start
-
-        # ── Animated corruption tendrils along all four edges ──
-        # Seeded per-frame so they wiggle but stay stable between frames
-        rng    = random.Random(int(t * 2))   # changes twice per second
+        return vig
+
+    @staticmethod
+    def _render_bloom(count, W, H):
+        """One corner disk at full strength; per-frame pulse is applied
+        with set_alpha, and the disk is blitted centred on each corner."""
+        bloom_r = int(min(W, H) * 0.35 * ((count - 2) / 3))
+        disk = pygame.Surface((bloom_r * 2, bloom_r * 2), pygame.SRCALPHA)
+        for ring in range(bloom_r, 0, -max(1, bloom_r // 12)):
+            a = int(255 * (bloom_r - ring) / bloom_r)
+            pygame.draw.circle(disk, (30, 0, 55, a), (bloom_r, bloom_r), ring)
+        return disk
+
+    @staticmethod
+    def _render_tendrils(bucket, count, W, H):
+        import random
+        intensity = 0.12 + count * 0.17
+        rng    = random.Random(bucket)
         stroke = pygame.Surface((W, H), pygame.SRCALPHA)
 
         def tendril(ox, oy, dx, dy, length, width, alpha):
@@ -580,7 +647,6 @@ class WorldMapUI:
 
         # Number of tendrils scales with intensity
         n_edge = int(6 * intensity)
-        step   = W // max(1, n_edge)
         fade_len = int(min(W, H) * intensity * 0.5)
 
         for i in range(n_edge):
@@ -596,19 +662,7 @@ class WorldMapUI:
             # Right edge
             oy = rng.randint(0, H)
             tendril(W, oy, -1, 0, fade_len, 2, 100)
-
-        surface.blit(stroke, (0, 0))
-
-        # ── Pulsing dark bloom in corners at high intensity ──
-        if count >= 3:
-            bloom_alpha = int(80 * (count - 2) / 3 * (0.8 + 0.2 * math.sin(t * 0.9)))
-            bloom       = pygame.Surface((W, H), pygame.SRCALPHA)
-            bloom_r     = int(min(W, H) * 0.35 * ((count - 2) / 3))
-            for cx, cy in [(0, 0), (W, 0), (0, H), (W, H)]:
-                for ring in range(bloom_r, 0, -max(1, bloom_r // 12)):
-                    a = int(bloom_alpha * (bloom_r - ring) / bloom_r)
-                    pygame.draw.circle(bloom, (30, 0, 55, a), (cx, cy), ring)
-            surface.blit(bloom, (0, 0))
+        return stroke
 
     def _draw_port_modal(self, surface, mx, my):
         """Draw port destination picker modal."""
@@ -773,6 +827,74 @@ class WorldMapUI:
 
         return None  # click inside modal but not on a button
 
+    def _open_travel_modal(self):
+        """Auto-travel picker: discovered locations, nearest first."""
+        px, py = self.world.party_x, self.world.party_y
+        here = self.world.get_current_tile().get("location_id")
+        dests = [lid for lid in self.world.discovered_locations
+                 if lid in LOCATIONS and lid != here]
+        dests.sort(key=lambda lid: (abs(LOCATIONS[lid]["x"] - px)
+                                    + abs(LOCATIONS[lid]["y"] - py), lid))
+        if not dests:
+            self._show_event("No known destinations yet.", GREY)
+            return
+        self.travel_modal = {"dests": dests[:TRAVEL_MODAL_ROWS]}
+
+    def _draw_travel_modal(self, surface, mx, my):
+        """Draw the auto-travel destination picker."""
+        m = self.travel_modal
+        dests = m["dests"]
+
+        overlay = pygame.Surface((SCREEN_W, SCREEN_H), pygame.SRCALPHA)
+        overlay.fill((0, 0, 0, 150))
+        surface.blit(overlay, (0, 0))
+
+        dlg_h = 110 + len(dests) * 38 + 44
+        dlg = pygame.Rect(SCREEN_W // 2 - 260, SCREEN_H // 2 - dlg_h // 2, 520, dlg_h)
+        pygame.draw.rect(surface, (20, 16, 36), dlg, border_radius=6)
+        pygame.draw.rect(surface, GOLD, dlg, 2, border_radius=6)
+
+        draw_text(surface, "Travel To", dlg.x + 20, dlg.y + 16, GOLD, 22, bold=True)
+        draw_text(surface, "The party walks there on its own and stops for "
+                  "anything that happens on the way.",
+                  dlg.x + 20, dlg.y + 48, GREY, 13, max_width=dlg.width - 40)
+        pygame.draw.line(surface, PANEL_BORDER,
+                         (dlg.x + 10, dlg.y + 96), (dlg.right - 10, dlg.y + 96))
+
+        px, py = self.world.party_x, self.world.party_y
+        m["_dest_rects"] = []
+        for i, dest_id in enumerate(dests):
+            loc = LOCATIONS[dest_id]
+            btn = pygame.Rect(dlg.x + 20, dlg.y + 104 + i * 38, dlg.width - 40, 32)
+            hover = btn.collidepoint(mx, my)
+            pygame.draw.rect(surface, (50, 40, 70) if hover else (28, 22, 44),
+                             btn, border_radius=4)
+            pygame.draw.rect(surface, GOLD if hover else PANEL_BORDER, btn, 1, border_radius=4)
+            draw_text(surface, loc["name"], btn.x + 14, btn.y + 7,
+                      GOLD if hover else CREAM, 14, bold=hover)
+            dist = abs(loc["x"] - px) + abs(loc["y"] - py)
+            draw_text(surface, f"{dist} tiles", btn.right - 90, btn.y + 8, GREY, 12)
+            m["_dest_rects"].append((btn, dest_id))
+
+        cancel_btn = pygame.Rect(dlg.x + dlg.width - 120, dlg.bottom - 40, 100, 30)
+        pygame.draw.rect(surface, (40, 30, 50), cancel_btn, border_radius=4)
+        pygame.draw.rect(surface, PANEL_BORDER, cancel_btn, 1, border_radius=4)
+        draw_text(surface, "Cancel", cancel_btn.x + 16, cancel_btn.y + 6, GREY, 13)
+        m["_cancel_rect"] = cancel_btn
+
+    def _handle_travel_modal_click(self, mx, my):
+        """Handle clicks inside the auto-travel picker."""
+        m = self.travel_modal
+        cancel = m.get("_cancel_rect")
+        if cancel and cancel.collidepoint(mx, my):
+            self.travel_modal = None
+            return None
+        for btn, dest_id in m.get("_dest_rects", []):
+            if btn.collidepoint(mx, my):
+                self.travel_modal = None
+                return {"type": "auto_travel", "dest_id": dest_id}
+        return None
+
     def _draw_camp_dialog(self, surface, mx, my):
         """Draw camp confirmation dialog."""
         overlay = pygame.Surface((SCREEN_W, SCREEN_H), pygame.SRCALPHA)
@@ -806,11 +928,14 @@ class WorldMapUI:
 
     def handle_key(self, key):
         """Handle keyboard input. Returns event dict or None."""
-        if self.show_camp_confirm or self.port_modal or self.island_choice_modal:
+        if (self.show_camp_confirm or self.port_modal or self.island_choice_modal
+                or self.travel_modal):
             if self.port_modal and key == pygame.K_ESCAPE:
                 self.port_modal = None
             if self.island_choice_modal and key == pygame.K_ESCAPE:
                 self.island_choice_modal = None
+            if self.travel_modal and key in (pygame.K_ESCAPE, pygame.K_t):
+                self.travel_modal = None
             return None  # handled by click
 
         # Movement
@@ -834,6 +959,9 @@ class WorldMapUI:
             return None
         elif key == pygame.K_c:
             return {"type": "open_camp"}
+        elif key == pygame.K_t:
+            self._open_travel_modal()
+            return None
 
         if dx == 0 and dy == 0:
             return None
@@ -862,6 +990,10 @@ class WorldMapUI:
         if self.port_modal:
             return self._handle_port_modal_click(mx, my)
 
+        # Auto-travel picker
+        if self.travel_modal:
+            return self._handle_travel_modal_click(mx, my)
+
         # Camp dialog
         if self.show_camp_confirm:
             yes_btn = pygame.Rect(SCREEN_W // 2 - 220 + 60, SCREEN_H // 2 - 100 + 140, 140, 40)